@@ -0,0 +1,36 @@
+"""add_escalated_at_to_alerts
+
+Revision ID: 5ff2719edb57
+Revises: 6c613af09d46
+Create Date: 2025-07-28 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5ff2719edb57'
+down_revision: Union[str, None] = '6c613af09d46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Momento del último escalamiento: permite recalcular los plazos tras un reinicio
+    op.add_column('alerts', sa.Column('escalated_at', sa.DateTime(timezone=True), nullable=True))
+    # Índice parcial para cargar solo las alertas abiertas sin reconocer
+    op.create_index(
+        'ix_alerts_open_unacknowledged',
+        'alerts',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('acknowledged_at IS NULL AND resolved_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_alerts_open_unacknowledged', table_name='alerts')
+    op.drop_column('alerts', 'escalated_at')
@@ -0,0 +1,75 @@
+"""payload_columns_to_jsonb
+
+Revision ID: a4d8e2f6c913
+Revises: e7b1c5a0d942
+Create Date: 2025-08-04 09:26:51.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8e2f6c913'
+down_revision: Union[str, None] = 'e7b1c5a0d942'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabla, columna) guardadas hasta ahora como JSON en Text
+PAYLOAD_COLUMNS = [
+    ('events', 'event_data'),
+    ('alerts', 'alert_data'),
+    ('reminders', 'reminder_data'),
+    ('devices', 'settings'),
+    ('device_configs', 'config_data'),
+    ('audit_logs', 'old_data'),
+    ('audit_logs', 'new_data'),
+]
+
+
+def upgrade() -> None:
+    # Texto que no es JSON válido se conserva como string JSON en lugar de abortar la migración
+    op.execute("""
+        CREATE OR REPLACE FUNCTION pg_temp.text_to_jsonb(value text) RETURNS jsonb AS $$
+        BEGIN
+            IF value IS NULL OR btrim(value) = '' THEN
+                RETURN NULL;
+            END IF;
+            RETURN value::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN to_jsonb(value);
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE
+    """)
+    for table, column in PAYLOAD_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE JSONB '
+            f'USING pg_temp.text_to_jsonb("{column}")'
+        )
+
+    # Filtros por contenido del payload (operador @>) y por el sensor de origen
+    op.create_index(
+        'ix_events_event_data', 'events', ['event_data'],
+        postgresql_using='gin', postgresql_ops={'event_data': 'jsonb_path_ops'},
+    )
+    op.create_index('ix_events_event_data_sensor', 'events', [sa.text("(event_data ->> 'sensor')")])
+    op.create_index(
+        'ix_alerts_alert_data', 'alerts', ['alert_data'],
+        postgresql_using='gin', postgresql_ops={'alert_data': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'ix_device_configs_config_data', 'device_configs', ['config_data'],
+        postgresql_using='gin', postgresql_ops={'config_data': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_device_configs_config_data', table_name='device_configs')
+    op.drop_index('ix_alerts_alert_data', table_name='alerts')
+    op.drop_index('ix_events_event_data_sensor', table_name='events')
+    op.drop_index('ix_events_event_data', table_name='events')
+    for table, column in PAYLOAD_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE TEXT USING "{column}"::text')
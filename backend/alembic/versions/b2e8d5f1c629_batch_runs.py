@@ -0,0 +1,54 @@
+"""batch_runs
+
+Revision ID: b2e8d5f1c629
+Revises: a7c3e9d2b418
+Create Date: 2025-08-15 09:12:37.604112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e8d5f1c629'
+down_revision: Union[str, None] = 'a7c3e9d2b418'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'batch_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('run_key', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('stats', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'run_key', name='uq_batch_runs_kind_run_key'),
+    )
+    op.create_index(op.f('ix_batch_runs_id'), 'batch_runs', ['id'], unique=False)
+    op.create_index(op.f('ix_batch_runs_kind'), 'batch_runs', ['kind'], unique=False)
+    # Candidatos de los lotes de referidos: pendientes por antigüedad y suscripciones con código sin comisión
+    op.create_index('ix_referrals_status_created_at', 'referrals', ['status_type_id', 'created_at'], unique=False)
+    op.create_index(
+        'ix_user_packages_referral_pending', 'user_packages', ['referral_code_used'], unique=False,
+        postgresql_where=sa.text('referral_code_used IS NOT NULL AND NOT referral_commission_applied'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_packages_referral_pending', table_name='user_packages')
+    op.drop_index('ix_referrals_status_created_at', table_name='referrals')
+    op.drop_index(op.f('ix_batch_runs_kind'), table_name='batch_runs')
+    op.drop_index(op.f('ix_batch_runs_id'), table_name='batch_runs')
+    op.drop_table('batch_runs')
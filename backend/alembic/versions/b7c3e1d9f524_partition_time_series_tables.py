@@ -0,0 +1,132 @@
+"""partition_time_series_tables
+
+Revision ID: b7c3e1d9f524
+Revises: a4d8e2f6c913
+Create Date: 2025-08-06 11:03:17.582940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c3e1d9f524'
+down_revision: Union[str, None] = 'a4d8e2f6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Particiones mensuales creadas por adelantado; el resto lo mantiene PartitionManager
+PREMAKE_MONTHS = 3
+# Filas más antiguas que esto quedan en la partición DEFAULT en lugar de crear cientos de meses
+BACKFILL_MONTHS = 24
+
+# tabla -> (columna de partición, ¿id entero con secuencia?, FKs, índices)
+TABLES = {
+    'events': (
+        'event_time', False,
+        [('event_type_id', 'event_types'), ('user_id', 'users'), ('cared_person_id', 'cared_persons'), ('device_id', 'devices')],
+        [
+            ('ix_events_id', ['id'], {}),
+            ('ix_events_event_type_id', ['event_type_id'], {}),
+            ('ix_events_event_subtype', ['event_subtype'], {}),
+            ('ix_events_event_data', ['event_data'], {'postgresql_using': 'gin', 'postgresql_ops': {'event_data': 'jsonb_path_ops'}}),
+            ('ix_events_event_data_sensor', [sa.text("(event_data ->> 'sensor')")], {}),
+        ],
+    ),
+    'location_tracking': (
+        'recorded_at', True,
+        [('user_id', 'users'), ('cared_person_id', 'cared_persons'), ('device_id', 'devices')],
+        [
+            ('ix_location_tracking_id', ['id'], {}),
+            ('ix_location_tracking_cared_person_recorded', ['cared_person_id', 'recorded_at'], {}),
+        ],
+    ),
+    'debug_events': (
+        'event_time', True,
+        [('user_id', 'users'), ('cared_person_id', 'cared_persons'), ('device_id', 'devices')],
+        [
+            ('ix_debug_events_id', ['id'], {}),
+            ('ix_debug_events_event_type', ['event_type'], {}),
+            ('ix_debug_events_event_subtype', ['event_subtype'], {}),
+        ],
+    ),
+}
+
+
+def _create_monthly_partitions(table: str, column: str, source: str) -> None:
+    op.execute(f"""
+        DO $$
+        DECLARE
+            current_month date := date_trunc('month', now() AT TIME ZONE 'UTC')::date;
+            last_month date := (current_month + interval '{PREMAKE_MONTHS} months')::date;
+            first_month date;
+            part_month date;
+        BEGIN
+            SELECT date_trunc('month', min({column}) AT TIME ZONE 'UTC')::date INTO first_month FROM {source};
+            first_month := greatest(
+                coalesce(first_month, current_month),
+                (current_month - interval '{BACKFILL_MONTHS} months')::date
+            );
+            part_month := least(first_month, current_month);
+            WHILE part_month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_p' || to_char(part_month, 'YYYYMM'),
+                    part_month::timestamp AT TIME ZONE 'UTC',
+                    (part_month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+                );
+                part_month := (part_month + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    column, serial_id, foreign_keys, indexes = TABLES[table]
+    old = f"{table}_old"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    if partitioned:
+        op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE ({column})")
+        _create_monthly_partitions(table, column, old)
+    else:
+        op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+
+    if serial_id:
+        # La secuencia del id pertenece a la tabla vieja: se transfiere antes de borrarla
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.execute(f"DROP TABLE {old}")
+    if serial_id:
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+    # La clave primaria de una tabla particionada debe incluir la columna de partición
+    primary_key = ['id', column] if partitioned else ['id']
+    op.create_primary_key(f'{table}_pkey', table, primary_key)
+    for local_column, referred in foreign_keys:
+        op.create_foreign_key(f'{table}_{local_column}_fkey', table, referred, [local_column], ['id'])
+    for name, columns, kwargs in indexes:
+        op.create_index(name, table, columns, unique=False, **kwargs)
+
+
+def upgrade() -> None:
+    # Sin unicidad de events.id no puede haber FK hacia events; alerts.event_id queda como referencia lógica
+    op.drop_constraint('alerts_event_id_fkey', 'alerts', type_='foreignkey')
+    op.create_index('ix_alerts_event_id', 'alerts', ['event_id'], unique=False)
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_alerts_event_id', table_name='alerts')
+    for table in TABLES:
+        _rebuild(table, partitioned=False)
+    # NOT VALID: la retención pudo haber borrado eventos todavía referenciados por alertas
+    op.execute(
+        "ALTER TABLE alerts ADD CONSTRAINT alerts_event_id_fkey "
+        "FOREIGN KEY (event_id) REFERENCES events (id) NOT VALID"
+    )
@@ -0,0 +1,38 @@
+"""add_alert_occurrence_tracking
+
+Revision ID: c41e8a9d27b3
+Revises: 5ff2719edb57
+Create Date: 2025-07-29 09:03:17.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e8a9d27b3'
+down_revision: Union[str, None] = '5ff2719edb57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Contador de repeticiones colapsadas y última vez que se vieron
+    op.add_column('alerts', sa.Column('occurrence_count', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('alerts', sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True))
+    # Búsqueda de la alerta abierta con la misma huella cuando el índice en memoria no la tiene
+    op.create_index(
+        'ix_alerts_open_device_fingerprint',
+        'alerts',
+        ['device_id', 'alert_type_id', 'cared_person_id'],
+        unique=False,
+        postgresql_where=sa.text('resolved_at IS NULL AND device_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_alerts_open_device_fingerprint', table_name='alerts')
+    op.drop_column('alerts', 'last_seen_at')
+    op.drop_column('alerts', 'occurrence_count')
@@ -0,0 +1,31 @@
+"""add_user_base_location
+
+Revision ID: c5e8a3f1d276
+Revises: b7c3e1d9f524
+Create Date: 2025-08-07 09:41:52.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a3f1d276'
+down_revision: Union[str, None] = 'b7c3e1d9f524'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Ubicación base de cuidadores (freelance) para el emparejamiento por distancia
+    op.add_column('users', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('users', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('users', sa.Column('service_radius_km', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'service_radius_km')
+    op.drop_column('users', 'longitude')
+    op.drop_column('users', 'latitude')
@@ -0,0 +1,32 @@
+"""billing_runs
+
+Revision ID: c8f1a4e7d352
+Revises: b2e8d5f1c629
+Create Date: 2025-08-18 11:40:06.281945
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f1a4e7d352'
+down_revision: Union[str, None] = 'b2e8d5f1c629'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cada nextval reserva un bloque de 1000 números de factura (INVOICE_BLOCK_SIZE)
+    op.execute("CREATE SEQUENCE IF NOT EXISTS billing_invoice_seq INCREMENT BY 1000 START WITH 1")
+    op.create_index(
+        'uq_billing_records_package_period', 'billing_records', ['user_package_id', 'billing_type', 'billing_date'],
+        unique=True, postgresql_where=sa.text('user_package_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_billing_records_package_period', table_name='billing_records')
+    op.execute("DROP SEQUENCE IF EXISTS billing_invoice_seq")
@@ -0,0 +1,65 @@
+"""clinical_search_vectors
+
+Revision ID: d1a6f4b8c392
+Revises: c5e8a3f1d276
+Create Date: 2025-08-08 10:17:36.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1a6f4b8c392'
+down_revision: Union[str, None] = 'c5e8a3f1d276'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# tabla -> (columna, peso); copia congelada de SEARCH_COLUMNS de cada modelo
+SEARCH_COLUMNS = {
+    'shift_observations': [
+        ('incident_details', 'A'), ('safety_concerns', 'A'),
+        ('behavior_notes', 'B'), ('handover_notes', 'B'), ('doctor_notes', 'B'), ('medication_notes', 'B'),
+        ('side_effects_observed', 'B'), ('restraint_details', 'B'),
+        ('skin_condition', 'C'), ('special_diet_notes', 'C'), ('exercise_details', 'C'), ('family_notes', 'C'),
+    ],
+    'diagnoses': [('diagnosis_name', 'A'), ('cie10_code', 'A'), ('description', 'B'), ('medical_notes', 'C')],
+    'restraint_protocols': [('title', 'A'), ('justification', 'B'), ('description', 'B'), ('risk_assessment', 'C'), ('notes', 'C')],
+    'medication_logs': [('side_effects', 'B'), ('notes', 'B')],
+    'reports': [('title', 'A'), ('description', 'B')],
+}
+
+
+def _expression(columns) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('spanish'::regconfig, coalesce({column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+
+
+def upgrade() -> None:
+    # La columna generada se calcula para las filas existentes al agregarla (reescribe la tabla)
+    for table, columns in SEARCH_COLUMNS.items():
+        op.add_column(table, sa.Column(
+            'search_vector', postgresql.TSVECTOR(), sa.Computed(_expression(columns), persisted=True)
+        ))
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin')
+    # Filtros de alcance de la búsqueda (los medication_logs se acotan por su cronograma)
+    op.create_index('ix_shift_observations_cared_person_id', 'shift_observations', ['cared_person_id'], unique=False)
+    op.create_index('ix_diagnoses_cared_person_id', 'diagnoses', ['cared_person_id'], unique=False)
+    op.create_index('ix_reports_cared_person_id', 'reports', ['cared_person_id'], unique=False)
+    op.create_index('ix_medication_logs_medication_schedule_id', 'medication_logs', ['medication_schedule_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_medication_logs_medication_schedule_id', table_name='medication_logs')
+    op.drop_index('ix_reports_cared_person_id', table_name='reports')
+    op.drop_index('ix_diagnoses_cared_person_id', table_name='diagnoses')
+    op.drop_index('ix_shift_observations_cared_person_id', table_name='shift_observations')
+    for table in reversed(list(SEARCH_COLUMNS)):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
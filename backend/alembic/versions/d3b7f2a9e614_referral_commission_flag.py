@@ -0,0 +1,41 @@
+"""referral_commission_flag
+
+Revision ID: d3b7f2a9e614
+Revises: c8f1a4e7d352
+Create Date: 2025-09-03 10:21:48.337915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3b7f2a9e614'
+down_revision: Union[str, None] = 'c8f1a4e7d352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Antes, referral_commission_applied marcaba un código válido (descuento
+    # aplicado) y los códigos rechazados quedaban guardados sin marcar. Ahora
+    # solo se guarda un código válido y el flag indica que la comisión existe.
+    op.execute("""
+        UPDATE user_packages SET referral_code_used = NULL
+        WHERE referral_code_used IS NOT NULL AND NOT referral_commission_applied
+    """)
+    op.execute("""
+        UPDATE user_packages up SET referral_commission_applied = false
+        WHERE up.referral_commission_applied
+          AND NOT EXISTS (
+              SELECT 1 FROM referral_commissions c
+              JOIN referrals r ON r.id = c.referral_id
+              WHERE r.referral_code = up.referral_code_used AND c.commission_type = 'first_month'
+          )
+    """)
+
+
+def downgrade() -> None:
+    # Los códigos rechazados que se descartaron no se pueden recuperar
+    pass
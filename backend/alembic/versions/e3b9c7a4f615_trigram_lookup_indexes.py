@@ -0,0 +1,41 @@
+"""trigram_lookup_indexes
+
+Revision ID: e3b9c7a4f615
+Revises: d1a6f4b8c392
+Create Date: 2025-08-11 09:42:18.311870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9c7a4f615'
+down_revision: Union[str, None] = 'd1a6f4b8c392'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_COLUMNS = {
+    'users': ['first_name', 'last_name', 'email', 'username'],
+    'cared_persons': ['first_name', 'last_name'],
+    'institutions': ['name'],
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            op.create_index(
+                f'ix_{table}_{column}_trgm', table, [column],
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+            )
+
+
+def downgrade() -> None:
+    for table, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
+    # La extensión se deja instalada: otras bases del cluster pueden usarla
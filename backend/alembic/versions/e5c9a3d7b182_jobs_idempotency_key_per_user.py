@@ -0,0 +1,32 @@
+"""jobs_idempotency_key_per_user
+
+Revision ID: e5c9a3d7b182
+Revises: d3b7f2a9e614
+Create Date: 2025-09-05 09:12:37.604219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c9a3d7b182'
+down_revision: Union[str, None] = 'd3b7f2a9e614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # La clave global dejaba que otro usuario recuperara el trabajo (payload y
+    # resultado) reenviando la misma Idempotency-Key: ahora es por usuario
+    op.drop_constraint('jobs_idempotency_key_key', 'jobs', type_='unique')
+    op.create_index(
+        'uq_jobs_owner_idempotency_key', 'jobs', ['created_by', 'idempotency_key'], unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_jobs_owner_idempotency_key', table_name='jobs')
+    op.create_unique_constraint('jobs_idempotency_key_key', 'jobs', ['idempotency_key'])
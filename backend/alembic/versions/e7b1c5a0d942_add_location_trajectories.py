@@ -0,0 +1,55 @@
+"""add_location_trajectories
+
+Revision ID: e7b1c5a0d942
+Revises: c41e8a9d27b3
+Create Date: 2025-07-30 10:12:44.318402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b1c5a0d942'
+down_revision: Union[str, None] = 'c41e8a9d27b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trayectoria de un día y compactación recorren los fixes por persona y tiempo
+    op.create_index(
+        'ix_location_tracking_cared_person_recorded',
+        'location_tracking',
+        ['cared_person_id', 'recorded_at'],
+        unique=False,
+    )
+    op.create_table('location_trajectories',
+    sa.Column('cared_person_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('points', sa.Text(), nullable=False),
+    sa.Column('point_count', sa.Integer(), nullable=False),
+    sa.Column('raw_point_count', sa.Integer(), nullable=False),
+    sa.Column('distance_meters', sa.Float(), nullable=True),
+    sa.Column('tolerance_meters', sa.Float(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('ended_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['cared_person_id'], ['cared_persons.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cared_person_id', 'day', name='uq_location_trajectories_cared_person_day')
+    )
+    op.create_index(op.f('ix_location_trajectories_id'), 'location_trajectories', ['id'], unique=False)
+    op.create_index(op.f('ix_location_trajectories_cared_person_id'), 'location_trajectories', ['cared_person_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_location_trajectories_cared_person_id'), table_name='location_trajectories')
+    op.drop_index(op.f('ix_location_trajectories_id'), table_name='location_trajectories')
+    op.drop_table('location_trajectories')
+    op.drop_index('ix_location_tracking_cared_person_recorded', table_name='location_tracking')
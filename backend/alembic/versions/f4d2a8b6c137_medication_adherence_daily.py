@@ -0,0 +1,58 @@
+"""medication_adherence_daily
+
+Revision ID: f4d2a8b6c137
+Revises: e3b9c7a4f615
+Create Date: 2025-08-13 16:05:42.527190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4d2a8b6c137'
+down_revision: Union[str, None] = 'e3b9c7a4f615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'medication_adherence_daily',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('medication_schedule_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('cared_person_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('institution_id', sa.Integer(), nullable=True),
+        sa.Column('doses_logged', sa.Integer(), nullable=False),
+        sa.Column('doses_taken', sa.Integer(), nullable=False),
+        sa.Column('doses_missed', sa.Integer(), nullable=False),
+        sa.Column('doses_timed', sa.Integer(), nullable=False),
+        sa.Column('doses_on_time', sa.Integer(), nullable=False),
+        sa.Column('side_effect_reports', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['medication_schedule_id'], ['medication_schedules.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['cared_person_id'], ['cared_persons.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['institution_id'], ['institutions.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('medication_schedule_id', 'day', name='uq_medication_adherence_daily_schedule_day'),
+    )
+    op.create_index(op.f('ix_medication_adherence_daily_id'), 'medication_adherence_daily', ['id'], unique=False)
+    op.create_index(op.f('ix_medication_adherence_daily_day'), 'medication_adherence_daily', ['day'], unique=False)
+    op.create_index(op.f('ix_medication_adherence_daily_cared_person_id'), 'medication_adherence_daily', ['cared_person_id'], unique=False)
+    op.create_index(op.f('ix_medication_adherence_daily_institution_id'), 'medication_adherence_daily', ['institution_id'], unique=False)
+    op.create_index('ix_medication_logs_updated_at', 'medication_logs', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_medication_logs_updated_at', table_name='medication_logs')
+    op.drop_index(op.f('ix_medication_adherence_daily_institution_id'), table_name='medication_adherence_daily')
+    op.drop_index(op.f('ix_medication_adherence_daily_cared_person_id'), table_name='medication_adherence_daily')
+    op.drop_index(op.f('ix_medication_adherence_daily_day'), table_name='medication_adherence_daily')
+    op.drop_index(op.f('ix_medication_adherence_daily_id'), table_name='medication_adherence_daily')
+    op.drop_table('medication_adherence_daily')
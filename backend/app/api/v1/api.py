@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users, debug, health, cared_persons, devices, alerts, events, reminders, reports, referrals, packages, diagnoses_router, medical_profile, medication_schedule, medication_log, restraint_protocols, shift_observations, status_types_router, caregiver_assignments, service_subscriptions, relationship_types, report_types, reminder_types, shift_observation_types, referral_types, caregiver_assignment_types, service_types, alert_types, event_types, device_types, catalogs, dashboard_router, institutions
+from app.api.v1.endpoints import auth, users, debug, health, cared_persons, devices, alerts, events, reminders, reports, referrals, packages, diagnoses_router, medical_profile, medication_schedule, medication_log, restraint_protocols, shift_observations, status_types_router, caregiver_assignments, service_subscriptions, relationship_types, report_types, reminder_types, shift_observation_types, referral_types, caregiver_assignment_types, service_types, alert_types, event_types, device_types, catalogs, dashboard_router, institutions, live, location_tracking, archive, caregiver_matching, search, medication_adherence, handover_reports, jobs, billing_runs
 
 api_router = APIRouter()
 
@@ -21,8 +21,10 @@ api_router.include_router(diagnoses_router, prefix="/diagnoses", tags=["diagnose
 api_router.include_router(medical_profile.router, prefix="/medical-profiles", tags=["medical-profiles"])
 api_router.include_router(medication_schedule.router, prefix="/medication-schedules", tags=["medication-schedules"])
 api_router.include_router(medication_log.router, prefix="/medication-logs", tags=["medication-logs"])
+api_router.include_router(medication_adherence.router, prefix="/medication-adherence", tags=["medication-adherence"])
 api_router.include_router(restraint_protocols.router, prefix="/restraint-protocols", tags=["restraint-protocols"])
 api_router.include_router(shift_observations.router, prefix="/shift-observations", tags=["shift-observations"])
+api_router.include_router(handover_reports.router, prefix="/handover-reports", tags=["handover-reports"])
 api_router.include_router(status_types_router, prefix="/status-types", tags=["status-types"])
 api_router.include_router(caregiver_assignments.router, prefix="/caregiver-assignments", tags=["caregiver-assignments"])
 api_router.include_router(service_subscriptions.router, prefix="/service-subscriptions", tags=["service-subscriptions"])
@@ -40,6 +42,15 @@ api_router.include_router(caregiver_assignment_types.router, prefix="/caregiver-
 api_router.include_router(service_types.router, prefix="/service-types", tags=["service-types"])
 api_router.include_router(catalogs.router, prefix="/catalogs", tags=["catalogs"])
 api_router.include_router(institutions.router, prefix="/institutions", tags=["institutions"])
+api_router.include_router(location_tracking.router, prefix="/locations", tags=["locations"])
+api_router.include_router(archive.router, prefix="/archive", tags=["archive"])
+api_router.include_router(caregiver_matching.router, prefix="/caregiver-matching", tags=["caregiver-matching"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(billing_runs.router, prefix="/billing-runs", tags=["billing"])
 
 # Dashboard summary endpoint
 api_router.include_router(dashboard_router, prefix="/dashboard", tags=["dashboard"])
+
+# Canal en vivo (SSE) del panel web
+api_router.include_router(live.router, prefix="/live", tags=["live"])
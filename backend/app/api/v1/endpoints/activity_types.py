@@ -3,6 +3,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.services.activity_type import ActivityTypeService
 from app.schemas.activity_type import ActivityType, ActivityTypeCreate, ActivityTypeUpdate
@@ -18,11 +19,13 @@ def create_activity_type(
     return ActivityTypeService.create(db, activity_type)
 
 @router.get("/", response_model=List[ActivityType])
+@cached_response(List[ActivityType], ("activity_types",))
 def get_activity_types(db: Session = Depends(get_db)):
     """Get all activity types"""
     return ActivityTypeService.get_all(db)
 
 @router.get("/{activity_type_id}", response_model=ActivityType)
+@cached_response(ActivityType, ("activity_types",))
 def get_activity_type(
     activity_type_id: UUID,
     db: Session = Depends(get_db)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.schemas.alert_type import AlertType, AlertTypeCreate, AlertTypeUpdate
 from app.services.alert_type import AlertTypeService
@@ -16,6 +17,7 @@ def create_alert_type(
     return AlertTypeService.create_alert_type(db=db, alert_type=alert_type)
 
 @router.get("/", response_model=List[AlertType])
+@cached_response(List[AlertType], ("alert_types",))
 def get_alert_types(
     skip: int = 0,
     limit: int = 100,
@@ -25,6 +27,7 @@ def get_alert_types(
     return AlertTypeService.get_alert_types(db=db, skip=skip, limit=limit)
 
 @router.get("/{alert_type_id}", response_model=AlertType)
+@cached_response(AlertType, ("alert_types",))
 def get_alert_type(
     alert_type_id: int,
     db: Session = Depends(get_db)
@@ -1,17 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
+from datetime import datetime, timezone
 
 from app.core.database import get_db
+from app.core.serialization import list_response, response_columns
 from app.services.auth import AuthService
 from app.schemas.alert import AlertCreate, AlertUpdate, AlertResponse
 from app.models.alert import Alert
-from app.models.user import User
 from app.models.status_type import StatusType
+from app.models.user import User
+from app.services.alert import AlertService
+from app.services.alert_escalation import alert_escalation_engine
+from app.services.payload_query import PayloadQuery
 
 router = APIRouter()
 
+# Alert.is_active e is_critical son propiedades: se calculan en SQL
+ALERT_LIST_COLUMNS = response_columns(
+    Alert, AlertResponse,
+    is_active=func.coalesce(Alert.status_type_id.in_(select(StatusType.id).where(StatusType.name == "active")), False),
+    is_critical=Alert.severity == "critical",
+)
+
 @router.post("/", response_model=AlertResponse, status_code=status.HTTP_201_CREATED)
 def create_alert(
     alert_data: AlertCreate,
@@ -20,24 +33,9 @@ def create_alert(
 ):
     """Create a new alert"""
     try:
-        # Create alert - exclude user_id from schema data
-        data_dict = alert_data.model_dump()
-        data_dict.pop('user_id', None)  # Remove user_id if present
-        
-        # Asignar status_type_id por defecto si no se proporciona
-        if not data_dict.get('status_type_id'):
-            active_status = db.query(StatusType).filter_by(name="active").first()
-            if active_status:
-                data_dict['status_type_id'] = active_status.id
-        
-        alert = Alert(
-            **data_dict,
-            user_id=current_user.id
-        )
-        
-        db.add(alert)
-        db.commit()
-        db.refresh(alert)
+        # Las repeticiones de un mismo dispositivo se colapsan en la alerta abierta
+        alert = AlertService.create_alert(db, alert_data, user_id=current_user.id)
+        alert_escalation_engine.track(alert)
         return alert
     except Exception as e:
         db.rollback()
@@ -50,14 +48,18 @@ def create_alert(
 def get_alerts(
     skip: int = 0,
     limit: int = 100,
+    data: Optional[str] = Query(None, description='Filtrar por contenido de alert_data, p. ej. {"threshold_exceeded": true}'),
     db: Session = Depends(get_db),
     current_user: User = Depends(AuthService.get_current_active_user)
 ):
     """Get all alerts for the current user"""
-    alerts = db.query(Alert).filter(
+    query = db.query(*ALERT_LIST_COLUMNS).filter(
         Alert.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    return alerts
+    )
+    fragment = PayloadQuery.parse_filter(data)
+    if fragment:
+        query = query.filter(PayloadQuery.contains(Alert.alert_data, fragment))
+    return list_response(AlertResponse, query.offset(skip).limit(limit))
 
 @router.get("/{alert_id}", response_model=AlertResponse)
 def get_alert(
@@ -100,6 +102,30 @@ def update_alert(
         setattr(alert, field, value)
     db.commit()
     db.refresh(alert)
+    alert_escalation_engine.track(alert)
+    return alert
+
+@router.post("/{alert_id}/acknowledge", response_model=AlertResponse)
+def acknowledge_alert(
+    alert_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Reconocer una alerta y detener su escalamiento"""
+    alert = db.query(Alert).filter(
+        Alert.id == alert_id,
+        Alert.user_id == current_user.id
+    ).first()
+    if not alert:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert not found"
+        )
+    if alert.acknowledged_at is None:
+        alert.acknowledged_at = datetime.now(timezone.utc)
+        db.commit()
+        db.refresh(alert)
+    alert_escalation_engine.untrack(alert.id)
     return alert
 
 @router.delete("/{alert_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -123,6 +149,7 @@ def delete_alert(
     try:
         db.delete(alert)
         db.commit()
+        alert_escalation_engine.untrack(alert_id)
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+
+from app.core.database import get_db
+from app.services.archiver import ColdStorageArchiver
+from app.services.auth import AuthService
+from app.models.cared_person import CaredPerson
+from app.models.user import User
+
+router = APIRouter()
+
+@router.post("/run")
+def run_archive(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Archive rows outside the retention window to cold storage and delete them"""
+    if not current_user.has_role("admin"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    try:
+        return {"archived": ColdStorageArchiver.archive_expired(db)}
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc))
+
+@router.get("/cared-persons/{cared_person_id}/{table}", response_model=List[dict])
+def get_archived_history(
+    cared_person_id: UUID,
+    table: str,
+    start: Optional[datetime] = Query(None, description="Desde (inclusive)"),
+    end: Optional[datetime] = Query(None, description="Hasta (exclusive)"),
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Read the archived history of a cared person (events, location_tracking, debug_events)"""
+    cared_person = db.query(CaredPerson).filter(CaredPerson.id == cared_person_id).first()
+    if not cared_person:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cared person not found")
+    is_admin = current_user.has_role("admin")
+    same_institution = current_user.institution_id is not None and cared_person.institution_id == current_user.institution_id
+    if not (is_admin or same_institution or cared_person.user_id == current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    try:
+        return ColdStorageArchiver.read_history(
+            table, cared_person_id, start=start, end=end, limit=limit,
+            # Fuera de admin solo se leen los archivos de la institución del usuario
+            institution_id=None if is_admin or not same_institution else current_user.institution_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc))
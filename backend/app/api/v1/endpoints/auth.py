@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.services.auth import AuthService
+from app.services.auth import AuthService, security
 from app.schemas.user import UserCreate, UserLogin, UserToken, UserResponse, UserWithRoles
 
 router = APIRouter()
@@ -25,13 +26,13 @@ def register_user(
         )
 
 @router.post("/login", response_model=UserToken)
-def login_user(
+async def login_user(
     user_data: UserLogin,
     db: Session = Depends(get_db)
 ):
     """Login user and return access token"""
     try:
-        return AuthService.login_user(db, user_data)
+        return await AuthService.login_user_async(db, user_data)
     except HTTPException:
         raise
     except Exception as e:
@@ -40,6 +41,18 @@ def login_user(
             detail=f"Login failed: {str(e)}"
         )
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """Revoke the current access token until it expires"""
+    if not AuthService.revoke_token(credentials.credentials):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
 @router.get("/me", response_model=UserWithRoles)
 def get_current_user(
     db: Session = Depends(get_db),
@@ -66,6 +79,9 @@ def get_current_user(
         is_freelance=current_user.is_freelance,
         hourly_rate=current_user.hourly_rate,
         availability=current_user.availability,
+        latitude=current_user.latitude,
+        longitude=current_user.longitude,
+        service_radius_km=current_user.service_radius_km,
         is_verified=current_user.is_verified,
         institution_id=current_user.institution_id,
         created_at=current_user.created_at,
@@ -0,0 +1,48 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.exceptions import ValidationException
+from app.schemas.batch_run import BatchRunResponse
+from app.schemas.job import JobResponse
+from app.services.auth import AuthService
+from app.services.batch_runs import BatchRunService
+from app.services.billing_run import BATCH_KIND, BillingRunService
+from app.models.user import User
+
+router = APIRouter()
+
+@router.post("/")
+def start_billing_run(
+    period: Optional[str] = Query(None, description="Período YYYY-MM (por defecto el mes en curso)"),
+    force: bool = Query(False, description="Repetir las instituciones ya facturadas en el período"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Enqueue the monthly billing run, one job per institution (admin only)"""
+    if not current_user.has_role("admin"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Solo administradores pueden ejecutar la facturación")
+
+    try:
+        jobs = BillingRunService.enqueue(db, period, force, created_by=current_user.id)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder([JobResponse.model_validate(job) for job in jobs]),
+    )
+
+@router.get("/", response_model=List[BatchRunResponse])
+def list_billing_runs(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Billing run log, one row per period and institution (admin only)"""
+    if not current_user.has_role("admin"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Solo administradores pueden ver la facturación")
+
+    return BatchRunService.list(db, BATCH_KIND, limit)
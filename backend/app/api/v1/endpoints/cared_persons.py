@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from app.core.database import get_db
+from app.core.exceptions import ValidationException
 from app.services.auth import AuthService
-from app.schemas.cared_person import CaredPersonCreate, CaredPersonUpdate, CaredPersonResponse
+from app.services.cared_person_overview import CaredPersonOverviewService
+from app.schemas.cared_person import CaredPersonCreate, CaredPersonUpdate, CaredPersonResponse, CaredPersonOverview
 from app.models.cared_person import CaredPerson
 from app.models.user import User
 
@@ -98,6 +100,38 @@ def get_cared_person(
         care_type=cared_person.care_type_name
     )
 
+@router.get("/{cared_person_id}/overview", response_model=CaredPersonOverview, response_model_exclude_unset=True)
+def get_cared_person_overview(
+    cared_person_id: UUID,
+    sections: Optional[List[str]] = Query(None, description="Secciones a incluir (repetido o separado por comas); todas por defecto"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Get a cared person with medical profile, medications, reminders, alerts, devices, assignments and observations in one call"""
+    cared_person = db.query(CaredPerson).filter(CaredPerson.id == cared_person_id).first()
+    if not cared_person:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cared person not found"
+        )
+    same_institution = current_user.institution_id is not None and cared_person.institution_id == current_user.institution_id
+    if not (current_user.has_role("admin") or same_institution or cared_person.user_id == current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    try:
+        selected = CaredPersonOverviewService.resolve_sections(sections)
+    except ValidationException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    
+    return CaredPersonOverview(
+        cared_person=CaredPersonResponse(
+            **cared_person.__dict__,
+            age=cared_person.age,
+            full_name=cared_person.full_name,
+            care_type=cared_person.care_type_name
+        ),
+        **CaredPersonOverviewService.build(db, cared_person_id, selected)
+    )
+
 @router.put("/{cared_person_id}", response_model=CaredPersonResponse)
 def update_cared_person(
     cared_person_id: UUID,
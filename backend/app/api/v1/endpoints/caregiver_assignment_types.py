@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.schemas.caregiver_assignment_type import CaregiverAssignmentType, CaregiverAssignmentTypeCreate, CaregiverAssignmentTypeUpdate
 from app.services.caregiver_assignment_type import CaregiverAssignmentTypeService
@@ -8,6 +9,7 @@ from app.services.caregiver_assignment_type import CaregiverAssignmentTypeServic
 router = APIRouter()
 
 @router.get("/", response_model=List[CaregiverAssignmentType])
+@cached_response(List[CaregiverAssignmentType], ("caregiver_assignment_types",))
 def get_caregiver_assignment_types(
     skip: int = 0,
     limit: int = 100,
@@ -18,6 +20,7 @@ def get_caregiver_assignment_types(
     return service.get_caregiver_assignment_types(skip=skip, limit=limit)
 
 @router.get("/{caregiver_assignment_type_id}", response_model=CaregiverAssignmentType)
+@cached_response(CaregiverAssignmentType, ("caregiver_assignment_types",))
 def get_caregiver_assignment_type(
     caregiver_assignment_type_id: int,
     db: Session = Depends(get_db)
@@ -2,14 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime, timezone
 
 from app.core.database import get_db
+from app.core.exceptions import ValidationException
 from app.services.auth import AuthService
 from app.services.caregiver_assignment import CaregiverAssignmentService
 from app.schemas.caregiver_assignment import (
     CaregiverAssignmentCreate, 
     CaregiverAssignmentUpdate, 
-    CaregiverAssignmentResponse
+    CaregiverAssignmentResponse,
+    ShiftCoverageEntry,
+    ShiftCoverageGap,
+    ShiftCoverageOverlap
 )
 from app.models.user import User
 
@@ -222,4 +227,61 @@ def get_active_assignments(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get active assignments: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+def _coverage_institution(current_user: User, institution_id: Optional[int]) -> Optional[int]:
+    """Institución consultada: la del usuario, o cualquiera para un admin"""
+    if current_user.has_role("admin"):
+        return institution_id if institution_id is not None else current_user.institution_id
+    if institution_id is not None and institution_id != current_user.institution_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return current_user.institution_id
+
+@router.get("/coverage/now", response_model=List[ShiftCoverageEntry])
+def get_current_coverage(
+    at: Optional[datetime] = Query(None, description="Instante consultado (por defecto, ahora)"),
+    cared_person_id: Optional[UUID] = None,
+    institution_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Get the caregivers on shift at a point in time for a cared person or an institution"""
+    if cared_person_id is None:
+        institution_id = _coverage_institution(current_user, institution_id)
+    return CaregiverAssignmentService.get_coverage_at(
+        db, at or datetime.now(timezone.utc), cared_person_id, institution_id
+    )
+
+@router.get("/coverage/gaps", response_model=List[ShiftCoverageGap])
+def get_coverage_gaps(
+    start: datetime,
+    end: datetime,
+    cared_person_id: Optional[UUID] = None,
+    institution_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Get the periods without any caregiver on shift"""
+    if cared_person_id is None:
+        institution_id = _coverage_institution(current_user, institution_id)
+    try:
+        return CaregiverAssignmentService.get_coverage_gaps(db, start, end, cared_person_id, institution_id)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/coverage/overlaps", response_model=List[ShiftCoverageOverlap])
+def get_coverage_overlaps(
+    start: datetime,
+    end: datetime,
+    caregiver_id: Optional[UUID] = None,
+    institution_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Get double bookings: caregivers on shift with two cared persons at once"""
+    if caregiver_id is None:
+        institution_id = _coverage_institution(current_user, institution_id)
+    try:
+        return CaregiverAssignmentService.get_coverage_overlaps(db, start, end, caregiver_id, institution_id)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+
+from app.core.database import get_db
+from app.services.auth import AuthService
+from app.services.caregiver_matching import MatchCriteria, caregiver_matcher
+from app.schemas.caregiver_matching import CaregiverMatch, CaregiverMatchRequest
+from app.models.cared_person import CaredPerson
+from app.models.user import User
+
+router = APIRouter()
+
+@router.post("/search", response_model=List[CaregiverMatch])
+def search_caregivers(
+    request: CaregiverMatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Rank caregivers for the given care needs and location"""
+    return caregiver_matcher.match(db, MatchCriteria(**request.model_dump()))
+
+@router.get("/cared-persons/{cared_person_id}", response_model=List[CaregiverMatch])
+def match_caregivers_for_cared_person(
+    cared_person_id: UUID,
+    radius_km: Optional[float] = Query(None, gt=0, le=500),
+    max_hourly_rate: Optional[int] = Query(None, ge=0),
+    freelance_only: bool = True,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Rank caregivers for a cared person using their care level, mobility, needs and location"""
+    cared_person = db.query(CaredPerson).filter(CaredPerson.id == cared_person_id).first()
+    if not cared_person:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cared person not found")
+    same_institution = current_user.institution_id is not None and cared_person.institution_id == current_user.institution_id
+    if not (current_user.has_role("admin") or same_institution or cared_person.user_id == current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    criteria = MatchCriteria(
+        latitude=cared_person.latitude,
+        longitude=cared_person.longitude,
+        care_level=cared_person.care_level,
+        mobility_level=cared_person.mobility_level,
+        special_needs=cared_person.special_needs,
+        radius_km=radius_km,
+        max_hourly_rate=max_hourly_rate,
+        freelance_only=freelance_only,
+        limit=limit,
+    )
+    return caregiver_matcher.match(db, criteria)
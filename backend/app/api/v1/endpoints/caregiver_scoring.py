@@ -1,6 +1,7 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from sqlalchemy.orm import Session
+from app.api.v1.endpoints.jobs import enqueue_job
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
@@ -69,10 +70,14 @@ def update_caregiver_score(
 @router.post("/caregivers/{caregiver_id}/calculate-score", response_model=CaregiverScore)
 def calculate_caregiver_score(
     caregiver_id: UUID,
+    background: bool = Query(False, description="Encolar como trabajo y devolver su id (202)"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Calculate caregiver score from reviews"""
+    if background:
+        return enqueue_job(db, "caregiver_scores.calculate", {"caregiver_id": caregiver_id}, current_user, idempotency_key)
     score = CaregiverScoreService.calculate_score_from_reviews(db, caregiver_id)
     if not score:
         raise HTTPException(status_code=404, detail="No reviews found for caregiver")
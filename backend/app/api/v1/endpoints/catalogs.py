@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.api.v1.endpoints.jobs import enqueue_job
+from app.core.cache import cached_response
 from app.core.database import get_db
+from app.services.jobs import JobService
 from app.services.status_type import StatusTypeService
 from app.services.reminder_type import ReminderTypeService
 from app.services.alert_type import AlertTypeService
@@ -11,33 +14,20 @@ from app.services.device_type import DeviceTypeService
 router = APIRouter()
 
 @router.post("/initialize-all-catalogs")
-def initialize_all_catalogs(db: Session = Depends(get_db)) -> Dict[str, Any]:
+def initialize_all_catalogs(
+    background: bool = Query(False, description="Encolar como trabajo y devolver su id (202)"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
     """
     Initialize all normalized catalogs with default data.
     This endpoint ensures all catalogs are populated for testing and development.
+    With `background=true` it runs as a job (see /jobs).
     """
+    if background:
+        return enqueue_job(db, "catalogs.initialize", {}, None, idempotency_key)
     try:
-        results = {}
-        
-        # Initialize status_types
-        status_result = StatusTypeService.create_default_status_types(db)
-        results["status_types"] = len(status_result)
-        
-        # Initialize reminder_types
-        reminder_result = ReminderTypeService.create_default_reminder_types(db)
-        results["reminder_types"] = len(reminder_result)
-        
-        # Initialize alert_types
-        alert_result = AlertTypeService.create_default_alert_types(db)
-        results["alert_types"] = len(alert_result)
-        
-        # Initialize event_types
-        event_result = EventTypeService.create_default_event_types(db)
-        results["event_types"] = len(event_result)
-        
-        # Initialize device_types
-        device_result = DeviceTypeService.create_default_device_types(db)
-        results["device_types"] = len(device_result)
+        results = JobService.run_inline(db, "catalogs.initialize")
         
         return {
             "message": "All catalogs initialized successfully",
@@ -48,6 +38,7 @@ def initialize_all_catalogs(db: Session = Depends(get_db)) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Error initializing catalogs: {str(e)}")
 
 @router.get("/catalog-status")
+@cached_response(None, ("status_types", "reminder_types", "alert_types", "event_types", "device_types"))
 def get_catalog_status(db: Session = Depends(get_db)) -> Dict[str, Any]:
     """
     Get the current status of all normalized catalogs.
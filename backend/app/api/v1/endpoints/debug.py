@@ -1,10 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from sqlalchemy.orm import Session
 
+from app.api.v1.endpoints.jobs import enqueue_job
 from app.core.database import get_db
 from app.services.auth import AuthService
 from app.services.debug import DebugService
+from app.services.jobs import JobService
 from app.schemas.debug import DebugEventCreate, DebugEventResponse, DebugSummary
 
 router = APIRouter()
@@ -42,12 +44,16 @@ def get_debug_events(
 @router.post("/generate-test-data")
 def generate_test_data(
     count: int = Query(10, ge=1, le=100),
+    background: bool = Query(False, description="Encolar como trabajo y devolver su id (202)"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_user = Depends(AuthService.get_current_active_user)
 ):
     """Generate test data for development"""
+    if background:
+        return enqueue_job(db, "debug.generate_test_data", {"count": count}, current_user, idempotency_key)
     try:
-        results = DebugService.generate_test_data(db, count)
+        results = JobService.run_inline(db, "debug.generate_test_data", {"count": count})
         return {
             "message": "Test data generated successfully",
             "results": results
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.schemas.device_type import DeviceType, DeviceTypeCreate, DeviceTypeUpdate
 from app.services.device_type import DeviceTypeService
@@ -16,6 +17,7 @@ def create_device_type(
     return DeviceTypeService.create_device_type(db=db, device_type=device_type)
 
 @router.get("/", response_model=List[DeviceType])
+@cached_response(List[DeviceType], ("device_types",))
 def get_device_types(
     skip: int = 0,
     limit: int = 100,
@@ -25,6 +27,7 @@ def get_device_types(
     return DeviceTypeService.get_device_types(db=db, skip=skip, limit=limit)
 
 @router.get("/{device_type_id}", response_model=DeviceType)
+@cached_response(DeviceType, ("device_types",))
 def get_device_type(
     device_type_id: int,
     db: Session = Depends(get_db)
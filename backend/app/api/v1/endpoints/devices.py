@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
+from datetime import datetime, timedelta, timezone
 
 from app.core.database import get_db
+from app.core.serialization import list_response, response_columns
 from app.services.auth import AuthService
-from app.schemas.device import DeviceCreate, DeviceUpdate, DeviceResponse
+from app.schemas.device import DeviceCreate, DeviceUpdate, DeviceResponse, DeviceHeartbeat
 from app.models.device import Device
 from app.models.user import User
+from app.services.device_heartbeat import device_heartbeat_monitor
 
 router = APIRouter()
 
@@ -47,10 +50,16 @@ def get_devices(
     current_user: User = Depends(AuthService.get_current_active_user)
 ):
     """Get all devices for the current user"""
-    devices = db.query(Device).filter(
+    # Device.is_online calculado en SQL con la misma ventana de 5 minutos
+    online_since = datetime.now(timezone.utc) - timedelta(minutes=5)
+    columns = response_columns(
+        Device, DeviceResponse,
+        is_online=Device.last_seen.isnot(None) & (Device.last_seen > online_since)
+    )
+    rows = db.query(*columns).filter(
         Device.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    return devices
+    ).offset(skip).limit(limit)
+    return list_response(DeviceResponse, rows)
 
 @router.get("/{device_id}", response_model=DeviceResponse)
 def get_device(
@@ -72,6 +81,35 @@ def get_device(
     
     return device
 
+@router.post("/{device_id}/heartbeat", response_model=DeviceResponse)
+def device_heartbeat(
+    device_id: UUID,
+    heartbeat: Optional[DeviceHeartbeat] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Register a device heartbeat and publish online transitions to the live feed"""
+    device = db.query(Device).filter(
+        Device.id == device_id,
+        Device.user_id == current_user.id
+    ).first()
+    
+    if not device:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Device not found"
+        )
+    
+    if heartbeat:
+        for field, value in heartbeat.model_dump(exclude_unset=True).items():
+            setattr(device, field, value)
+    device.last_seen = datetime.now(timezone.utc)
+    db.commit()
+    db.refresh(device)
+    
+    device_heartbeat_monitor.beat(device, device.last_seen)
+    return device
+
 @router.put("/{device_id}", response_model=DeviceResponse)
 def update_device(
     device_id: UUID,
@@ -126,6 +164,7 @@ def delete_device(
     try:
         db.delete(device)
         db.commit()
+        device_heartbeat_monitor.forget(device_id)
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -3,6 +3,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.services.enumeration_type import EnumerationTypeService
 from app.schemas.enumeration_type import EnumerationType, EnumerationTypeCreate, EnumerationTypeUpdate
@@ -18,11 +19,13 @@ def create_enumeration_type(
     return EnumerationTypeService.create(db, enumeration_type)
 
 @router.get("/", response_model=List[EnumerationType])
+@cached_response(List[EnumerationType], ("enumeration_types",))
 def get_enumeration_types(db: Session = Depends(get_db)):
     """Get all enumeration types"""
     return EnumerationTypeService.get_all(db)
 
 @router.get("/{enumeration_type_id}", response_model=EnumerationType)
+@cached_response(EnumerationType, ("enumeration_types",))
 def get_enumeration_type(
     enumeration_type_id: UUID,
     db: Session = Depends(get_db)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.schemas.event_type import EventType, EventTypeCreate, EventTypeUpdate
 from app.services.event_type import EventTypeService
@@ -8,6 +9,7 @@ from app.services.event_type import EventTypeService
 router = APIRouter()
 
 @router.get("/", response_model=List[EventType])
+@cached_response(List[EventType], ("event_types",))
 def get_event_types(db: Session = Depends(get_db)):
     """Obtener todos los tipos de evento"""
     return EventTypeService.get_all_event_types(db=db)
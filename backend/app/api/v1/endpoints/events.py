@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
 
 from app.core.database import get_db
+from app.core.serialization import list_response, response_columns
 from app.services.auth import AuthService
+from app.services.payload_query import PayloadQuery
+from app.services.event import in_time_range
 from app.schemas.event import EventCreate, EventUpdate, EventResponse
 from app.models.event import Event
 from app.models.user import User
 
 router = APIRouter()
 
+EVENT_LIST_COLUMNS = response_columns(Event, EventResponse)
+
 @router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
 def create_event(
     event_data: EventCreate,
@@ -43,14 +49,23 @@ def create_event(
 def get_events(
     skip: int = 0,
     limit: int = 100,
+    sensor: Optional[str] = Query(None, description="Filtrar por event_data.sensor"),
+    data: Optional[str] = Query(None, description='Filtrar por contenido de event_data, p. ej. {"location": "Cocina"}'),
+    start: Optional[datetime] = Query(None, description="Desde (event_time >= start); acota las particiones leídas"),
+    end: Optional[datetime] = Query(None, description="Hasta (event_time < end)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(AuthService.get_current_active_user)
 ):
     """Get all events for the current user"""
-    events = db.query(Event).filter(
+    query = in_time_range(db.query(*EVENT_LIST_COLUMNS).filter(
         Event.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    return events
+    ), start, end)
+    if sensor is not None:
+        query = query.filter(PayloadQuery.equals(Event.event_data, "sensor", sensor))
+    fragment = PayloadQuery.parse_filter(data)
+    if fragment:
+        query = query.filter(PayloadQuery.contains(Event.event_data, fragment))
+    return list_response(EventResponse, query.offset(skip).limit(limit))
 
 @router.get("/{event_id}", response_model=EventResponse)
 def get_event(
@@ -0,0 +1,107 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from pathlib import Path
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+
+from app.api.v1.endpoints.jobs import enqueue_job
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.exceptions import ValidationException
+from app.schemas.handover_report import HandoverReportJob, HandoverReportRequest
+from app.services.auth import AuthService
+from app.services.handover_report import JOB_KIND, MEDIA_TYPES, HandoverReportService
+from app.services.jobs import JobService
+from app.models.job import Job
+from app.models.user import User
+
+router = APIRouter()
+
+def _check_institution(institution_id: int, current_user: User) -> None:
+    if not (current_user.has_role("admin") or current_user.institution_id == institution_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+
+def _get_job(db: Session, job_id: UUID, current_user: User) -> Job:
+    job = JobService.get(db, job_id)
+    if job is None or job.kind != JOB_KIND:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report job not found")
+    _check_institution(job.payload["institution_id"], current_user)
+    return job
+
+def _job_response(job: Job) -> HandoverReportJob:
+    result = job.result or {}
+    return HandoverReportJob(
+        id=job.id,
+        institution_id=job.payload["institution_id"],
+        format=job.payload.get("format", "html"),
+        status=job.status,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        residents=result.get("residents"),
+        error=job.error,
+        download_url=f"/api/v1/handover-reports/jobs/{job.id}/download" if job.status == "completed" else None,
+    )
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+def create_handover_report(
+    request: HandoverReportRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Queue a shift handover report; poll the job until it is completed"""
+    _check_institution(request.institution_id, current_user)
+    try:
+        HandoverReportService.check_format(request.format)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    return enqueue_job(db, JOB_KIND, request.model_dump(), current_user, idempotency_key)
+
+@router.get("/jobs/{job_id}", response_model=HandoverReportJob)
+def get_handover_report_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Status of a handover report job"""
+    return _job_response(_get_job(db, job_id, current_user))
+
+@router.get("/jobs/{job_id}/download")
+def download_handover_report(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Download a completed handover report"""
+    job = _get_job(db, job_id, current_user)
+    if job.status != "completed" or not job.result:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Report is {job.status}")
+    path = Path(settings.handover_report_path) / job.result["file"]
+    if not path.exists():
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Report file expired")
+    report_format = job.result["format"]
+    return FileResponse(
+        path, media_type=MEDIA_TYPES[report_format],
+        filename=f"traspaso-{job.result['institution_id']}-{job.created_at:%Y%m%d-%H%M}.{report_format}",
+    )
+
+@router.get("/institutions/{institution_id}")
+def stream_handover_report(
+    institution_id: int,
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    cared_person_ids: Optional[List[UUID]] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Stream the HTML handover report of an institution while it renders"""
+    _check_institution(institution_id, current_user)
+    try:
+        report = HandoverReportService.collect(db, institution_id, start, end, cared_person_ids)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return StreamingResponse(HandoverReportService.render_html(report), media_type=MEDIA_TYPES["html"])
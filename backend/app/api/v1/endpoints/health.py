@@ -13,6 +13,7 @@ from app.models.device import Device
 from app.models.alert import Alert
 from app.models.reminder import Reminder
 from app.models.event import Event
+from app.services.password_hasher import password_hasher
 
 router = APIRouter()
 
@@ -96,6 +97,7 @@ async def system_health_check():
     - Uso de CPU y memoria
     - Espacio en disco
     - Información del proceso
+    - Pool de hash de contraseñas (profundidad de cola)
     """
     try:
         # Información del sistema
@@ -128,7 +130,8 @@ async def system_health_check():
                     "memory_mb": round(process_memory.rss / (1024**2), 2),
                     "cpu_percent": process.cpu_percent(),
                     "threads": process.num_threads()
-                }
+                },
+                "password_hasher": password_hasher.stats()
             },
             "timestamp": datetime.utcnow().isoformat()
         }
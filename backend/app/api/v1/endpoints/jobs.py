@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from app.core.database import get_db
+from app.core.exceptions import ValidationException
+from app.schemas.job import JobResponse
+from app.services.auth import AuthService
+from app.services.jobs import JOB_STATUSES, JobService
+from app.models.job import Job
+from app.models.user import User
+
+router = APIRouter()
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: Dict[str, Any],
+    current_user: Optional[User],
+    idempotency_key: Optional[str] = None,
+) -> JSONResponse:
+    """202 Accepted con el trabajo encolado; el cliente consulta GET /jobs/{id}"""
+    try:
+        job = JobService.enqueue(db, kind, payload, idempotency_key=idempotency_key, created_by=current_user.id if current_user else None)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(JobResponse.model_validate(job)),
+        headers={"Location": f"/api/v1/jobs/{job.id}"},
+    )
+
+def _check_job(job: Optional[Job], current_user: User) -> Job:
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if not (current_user.has_role("admin") or job.created_by == current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return job
+
+@router.get("/", response_model=List[JobResponse])
+def list_jobs(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    kind: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """List jobs (admins see every job, other users their own)"""
+    if status_filter is not None and status_filter not in JOB_STATUSES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown status: {status_filter}")
+    created_by = None if current_user.has_role("admin") else current_user.id
+    return JobService.list(db, status_filter, kind, created_by, skip, limit)
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Job status, progress and result"""
+    return _check_job(JobService.get(db, job_id), current_user)
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+def cancel_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Cancel a job that has not started yet"""
+    job = _check_job(JobService.get(db, job_id), current_user)
+    if not JobService.cancel(db, job_id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job.status}")
+    db.refresh(job)
+    return job
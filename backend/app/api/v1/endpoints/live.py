@@ -0,0 +1,117 @@
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+from typing import Optional, Set, Tuple
+from uuid import UUID
+import asyncio
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.cared_person import CaredPerson
+from app.models.user import User
+from app.services.auth import AuthService
+from app.services.live_feed import live_feed
+
+router = APIRouter()
+
+# EventSource no permite enviar cabeceras: se acepta también ?token=
+optional_bearer = HTTPBearer(auto_error=False)
+
+
+def get_stream_user(
+    token: Optional[str] = Query(None, description="JWT para clientes EventSource"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
+    db: Session = Depends(get_db)
+) -> User:
+    """Autenticar al cliente del stream por cabecera Authorization o por query"""
+    raw_token = credentials.credentials if credentials else token
+    user = AuthService.get_current_user_from_token(db, raw_token) if raw_token else None
+    if user is None or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+def resolve_stream_scope(
+    institution_id: Optional[int] = None,
+    cared_person_id: Optional[UUID] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_stream_user)
+) -> Tuple[Optional[Set[int]], Optional[Set[UUID]]]:
+    """
+    Determinar qué eventos puede recibir el usuario
+
+    Returns:
+        tuple: (instituciones, personas bajo cuidado); None significa sin filtro
+    """
+    is_admin = current_user.has_role("admin")
+
+    if cared_person_id:
+        cared_person = db.query(CaredPerson).filter(CaredPerson.id == cared_person_id).first()
+        if not cared_person:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cared person not found")
+        same_institution = current_user.institution_id is not None and cared_person.institution_id == current_user.institution_id
+        if not (is_admin or same_institution or cared_person.user_id == current_user.id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        return None, {cared_person.id}
+
+    if institution_id is not None:
+        if not is_admin and current_user.institution_id != institution_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        return {institution_id}, None
+
+    if is_admin:
+        return None, None
+
+    # Sin filtro explícito: la institución del usuario y las personas a su cargo
+    own_cared_persons = {row.id for row in db.query(CaredPerson.id).filter(CaredPerson.user_id == current_user.id)}
+    institutions = {current_user.institution_id} if current_user.institution_id is not None else set()
+    return institutions, own_cared_persons
+
+
+@router.get("/stream")
+async def stream_live_events(
+    request: Request,
+    last_event_id: Optional[int] = Query(None, description="Reanudar después de este ID"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    scope: Tuple[Optional[Set[int]], Optional[Set[UUID]]] = Depends(resolve_stream_scope)
+):
+    """
+    Stream SSE de alertas, estado de dispositivos y eventos de geocercas
+
+    Los clientes que se reconectan envían `Last-Event-ID` (EventSource lo hace
+    automáticamente) y reciben los eventos que se perdieron mientras sigan en el
+    buffer del servidor.
+    """
+    resume_from = last_event_id
+    if resume_from is None and last_event_id_header and last_event_id_header.isdigit():
+        resume_from = int(last_event_id_header)
+
+    institution_ids, cared_person_ids = scope
+    subscription = live_feed.subscribe(institution_ids, cared_person_ids, resume_from)
+
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(),
+                        timeout=settings.live_feed_keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield event.to_sse()
+        finally:
+            live_feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
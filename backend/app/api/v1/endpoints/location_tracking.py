@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+from datetime import date, datetime, timezone
+
+from app.core.database import get_db
+from app.core.exceptions import ValidationException
+from app.services.auth import AuthService
+from app.services.location_tracking import LocationTrackingService
+from app.schemas.location_tracking import LocationBatch, LocationBatchResult, TrajectoryResponse
+from app.models.cared_person import CaredPerson
+from app.models.device import Device
+from app.models.user import User
+
+router = APIRouter()
+
+def _get_accessible_cared_person(db: Session, cared_person_id: UUID, current_user: User) -> CaredPerson:
+    cared_person = db.query(CaredPerson).filter(CaredPerson.id == cared_person_id).first()
+    if not cared_person:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cared person not found")
+    same_institution = current_user.institution_id is not None and cared_person.institution_id == current_user.institution_id
+    if not (current_user.has_role("admin") or same_institution or cared_person.user_id == current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return cared_person
+
+@router.post("/batch", response_model=LocationBatchResult, status_code=status.HTTP_201_CREATED)
+def ingest_location_batch(
+    batch: LocationBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Ingest a batch of location fixes reported by a device"""
+    device = db.query(Device).filter(Device.id == batch.device_id).first()
+    if not device or not (device.user_id == current_user.id or current_user.has_role("admin")):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Device not found"
+        )
+    if batch.cared_person_id and batch.cared_person_id != device.cared_person_id:
+        _get_accessible_cared_person(db, batch.cared_person_id, current_user)
+
+    try:
+        return LocationTrackingService.ingest_batch(
+            db, device, batch.fixes, cared_person_id=batch.cared_person_id, user_id=current_user.id
+        )
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+@router.get("/cared-persons/{cared_person_id}/trajectory", response_model=TrajectoryResponse)
+def get_trajectory(
+    cared_person_id: UUID,
+    day: Optional[date] = Query(None, description="Día UTC (por defecto, hoy)"),
+    tolerance_meters: Optional[float] = Query(None, ge=0, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Get the simplified trajectory of a cared person for one day"""
+    _get_accessible_cared_person(db, cared_person_id, current_user)
+    return LocationTrackingService.get_trajectory(
+        db, cared_person_id, day or datetime.now(timezone.utc).date(), tolerance_meters
+    )
+
+@router.post("/compact")
+def compact_location_history(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Compact raw fixes older than the retention window into daily trajectories"""
+    if not current_user.has_role("admin"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return {"compacted_days": LocationTrackingService.compact_history(db)}
@@ -0,0 +1,102 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+from datetime import date, timedelta
+
+from app.core.database import get_db
+from app.schemas.medication_adherence import AdherenceTrendPoint, CaredPersonAdherence, InstitutionAdherence
+from app.services.auth import AuthService
+from app.services.medication_adherence import MedicationAdherenceService, adherence_refresher, local_today
+from app.models.cared_person import CaredPerson
+from app.models.user import User
+
+router = APIRouter()
+
+def _date_range(start: Optional[date], end: Optional[date], days: int):
+    end = end or local_today()
+    start = start or end - timedelta(days=days - 1)
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    return start, end
+
+def _check_cared_person(db: Session, cared_person_id: UUID, current_user: User) -> CaredPerson:
+    cared_person = db.query(CaredPerson).filter(CaredPerson.id == cared_person_id).first()
+    if not cared_person:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cared person not found")
+    same_institution = current_user.institution_id is not None and cared_person.institution_id == current_user.institution_id
+    if not (current_user.has_role("admin") or same_institution or cared_person.user_id == current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return cared_person
+
+def _check_institution(institution_id: int, current_user: User) -> None:
+    if not (current_user.has_role("admin") or current_user.institution_id == institution_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+
+@router.get("/cared-persons/{cared_person_id}", response_model=CaredPersonAdherence)
+def get_cared_person_adherence(
+    cared_person_id: UUID,
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    days: int = Query(30, ge=1, le=366, description="Días hasta `end` cuando no se indica `start`"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Medication adherence of a cared person, total and per schedule"""
+    _check_cared_person(db, cared_person_id, current_user)
+    start, end = _date_range(start, end, days)
+    return MedicationAdherenceService.for_cared_person(db, cared_person_id, start, end)
+
+@router.get("/cared-persons/{cared_person_id}/trend", response_model=List[AdherenceTrendPoint])
+def get_cared_person_adherence_trend(
+    cared_person_id: UUID,
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    days: int = Query(30, ge=1, le=366),
+    window: int = Query(7, ge=1, le=90, description="Días de la ventana móvil"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Daily rolling-window adherence of a cared person"""
+    _check_cared_person(db, cared_person_id, current_user)
+    start, end = _date_range(start, end, days)
+    return MedicationAdherenceService.trend(db, "cared_person_id", cared_person_id, start, end, window)
+
+@router.get("/institutions/{institution_id}", response_model=InstitutionAdherence)
+def get_institution_adherence(
+    institution_id: int,
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Institution-wide medication adherence, total and per cared person (lowest first)"""
+    _check_institution(institution_id, current_user)
+    start, end = _date_range(start, end, days)
+    return MedicationAdherenceService.for_institution(db, institution_id, start, end)
+
+@router.get("/institutions/{institution_id}/trend", response_model=List[AdherenceTrendPoint])
+def get_institution_adherence_trend(
+    institution_id: int,
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    days: int = Query(30, ge=1, le=366),
+    window: int = Query(7, ge=1, le=90),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Daily rolling-window adherence of an institution"""
+    _check_institution(institution_id, current_user)
+    start, end = _date_range(start, end, days)
+    return MedicationAdherenceService.trend(db, "institution_id", institution_id, start, end, window)
+
+@router.post("/refresh")
+def refresh_adherence(
+    full: bool = Query(False, description="Recalcular todas las tomas"),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Refresh the adherence summary now (admin)"""
+    if not current_user.has_role("admin"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return {"refreshed": adherence_refresher.run_once(full=full)}
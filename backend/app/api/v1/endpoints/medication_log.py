@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.serialization import list_response, response_columns
+from app.models.medication_log import MedicationLog
 from app.models.user import User
 from app.schemas.medication_log import (
     MedicationLogCreate, MedicationLogUpdate, MedicationLogResponse
@@ -13,6 +15,8 @@ from app.services.medication_log import MedicationLogService
 
 router = APIRouter()
 
+MEDICATION_LOG_LIST_COLUMNS = response_columns(MedicationLog, MedicationLogResponse)
+
 @router.post("/", response_model=MedicationLogResponse, status_code=status.HTTP_201_CREATED)
 def create_medication_log(
     medication_log: MedicationLogCreate,
@@ -54,7 +58,8 @@ def get_medication_logs_by_cared_person(
     current_user: User = Depends(get_current_user)
 ):
     """Get medication logs for a cared person"""
-    return MedicationLogService.get_by_cared_person_id(db, cared_person_id, limit=limit)
+    rows = MedicationLogService.get_by_cared_person_id(db, cared_person_id, limit=limit, columns=MEDICATION_LOG_LIST_COLUMNS)
+    return list_response(MedicationLogResponse, rows)
 
 @router.get("/cared-person/{cared_person_id}/recent", response_model=List[MedicationLogResponse])
 def get_recent_medication_logs(
@@ -74,7 +79,8 @@ def get_all_medication_logs(
     current_user: User = Depends(get_current_user)
 ):
     """Get all medication logs"""
-    return MedicationLogService.get_all(db, skip=skip, limit=limit)
+    rows = MedicationLogService.get_all(db, skip=skip, limit=limit, columns=MEDICATION_LOG_LIST_COLUMNS)
+    return list_response(MedicationLogResponse, rows)
 
 @router.put("/{log_id}", response_model=MedicationLogResponse)
 def update_medication_log(
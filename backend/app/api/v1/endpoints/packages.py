@@ -3,6 +3,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
@@ -31,6 +32,7 @@ async def get_package_statistics(
     return PackageService.get_package_statistics(db)
 
 @router.get("/", response_model=List[PackageResponse])
+@cached_response(List[PackageResponse], ("packages",))
 def get_packages(
     package_type: Optional[str] = Query(None, description="Filter by package type"),
     is_featured: Optional[bool] = Query(None, description="Filter by featured status"),
@@ -44,6 +46,7 @@ def get_packages(
     return packages
 
 @router.get("/{package_id}", response_model=PackageResponse)
+@cached_response(PackageResponse, ("packages",))
 def get_package(
     package_id: UUID,
     db: Session = Depends(get_db),
@@ -189,6 +192,7 @@ def get_user_subscriptions_by_id(
 
 # Add-on management endpoints
 @router.get("/add-ons/", response_model=List[PackageAddOnResponse])
+@cached_response(List[PackageAddOnResponse], ("package_add_ons",))
 def get_add_ons(
     add_on_type: Optional[str] = Query(None, description="Filter by add-on type"),
     db: Session = Depends(get_db),
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.schemas.referral_type import ReferralType, ReferralTypeCreate, ReferralTypeUpdate
 from app.services.referral_type import ReferralTypeService
@@ -8,6 +9,7 @@ from app.services.referral_type import ReferralTypeService
 router = APIRouter()
 
 @router.get("/", response_model=List[ReferralType])
+@cached_response(List[ReferralType], ("referral_types",))
 def get_referral_types(
     skip: int = 0,
     limit: int = 100,
@@ -18,6 +20,7 @@ def get_referral_types(
     return service.get_referral_types(skip=skip, limit=limit)
 
 @router.get("/{referral_type_id}", response_model=ReferralType)
+@cached_response(ReferralType, ("referral_types",))
 def get_referral_type(
     referral_type_id: int,
     db: Session = Depends(get_db)
@@ -1,10 +1,15 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from sqlalchemy.orm import Session
 
+from app.api.v1.endpoints.jobs import enqueue_job
 from app.core.database import get_db
 from app.services.auth import AuthService
+from app.services.batch_runs import BatchRunService
+from app.services.jobs import JobService
+from app.services.referral_batch import BATCH_KIND
+from app.schemas.batch_run import BatchRunResponse
 from app.models.user import User
 from app.services.referral import ReferralService
 from app.schemas.referral import (
@@ -199,6 +204,8 @@ def pay_commission(
 
 @router.post("/expire-old")
 def expire_old_referrals(
+    background: bool = Query(False, description="Encolar como trabajo y devolver su id (202)"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_user: User = Depends(AuthService.get_current_active_user)
 ):
@@ -206,13 +213,46 @@ def expire_old_referrals(
     if not current_user.has_role("admin"):
         raise HTTPException(status_code=403, detail="Solo administradores pueden expirar referidos")
     
-    expired_count = ReferralService.expire_old_referrals(db)
+    if background:
+        return enqueue_job(db, "referrals.expire_old", {}, current_user, idempotency_key)
+    
+    expired_count = JobService.run_inline(db, "referrals.expire_old")["expired_count"]
     
     return {
         "message": f"{expired_count} referidos expirados",
         "expired_count": expired_count
     }
 
+@router.post("/batch-runs")
+def run_referral_batch(
+    run_key: Optional[str] = Query(None, description="Clave de la ejecución (por defecto la fecha UTC)"),
+    force: bool = Query(False, description="Repetir aunque ya se haya completado"),
+    background: bool = Query(False, description="Encolar como trabajo y devolver su id (202)"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Expire referrals and generate pending commissions now (admin only)"""
+    if not current_user.has_role("admin"):
+        raise HTTPException(status_code=403, detail="Solo administradores pueden ejecutar el lote de referidos")
+    
+    payload = {"run_key": run_key, "force": force}
+    if background:
+        return enqueue_job(db, "referrals.batch", payload, current_user, idempotency_key)
+    return JobService.run_inline(db, "referrals.batch", payload)
+
+@router.get("/batch-runs", response_model=List[BatchRunResponse])
+def list_referral_batch_runs(
+    limit: int = Query(30, ge=1, le=365),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Referral batch run log (admin only)"""
+    if not current_user.has_role("admin"):
+        raise HTTPException(status_code=403, detail="Solo administradores pueden ver el lote de referidos")
+    
+    return BatchRunService.list(db, BATCH_KIND, limit)
+
 @router.get("/bonus-eligibility")
 def check_bonus_eligibility(
     db: Session = Depends(get_db),
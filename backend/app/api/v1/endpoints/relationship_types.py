@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.services.relationship_type import RelationshipTypeService
 from app.schemas.relationship_type import RelationshipTypeCreate, RelationshipTypeUpdate, RelationshipTypeResponse
@@ -12,10 +13,12 @@ def create_relationship_type(relationship_type: RelationshipTypeCreate, db: Sess
     return RelationshipTypeService.create_relationship_type(db, relationship_type)
 
 @router.get('/', response_model=List[RelationshipTypeResponse])
+@cached_response(List[RelationshipTypeResponse], ("relationship_types",))
 def get_relationship_types(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     return RelationshipTypeService.get_relationship_types(db, skip, limit)
 
 @router.get('/{relationship_type_id}', response_model=RelationshipTypeResponse)
+@cached_response(RelationshipTypeResponse, ("relationship_types",))
 def get_relationship_type(relationship_type_id: int, db: Session = Depends(get_db)):
     relationship_type = RelationshipTypeService.get_relationship_type(db, relationship_type_id)
     if not relationship_type:
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.schemas.reminder_type import ReminderType, ReminderTypeCreate, ReminderTypeUpdate
 from app.services.reminder_type import ReminderTypeService
@@ -8,6 +9,7 @@ from app.services.reminder_type import ReminderTypeService
 router = APIRouter()
 
 @router.get("/", response_model=List[ReminderType])
+@cached_response(List[ReminderType], ("reminder_types",))
 def get_reminder_types(
     skip: int = 0,
     limit: int = 100,
@@ -18,6 +20,7 @@ def get_reminder_types(
     return service.get_reminder_types(skip=skip, limit=limit)
 
 @router.get("/{reminder_type_id}", response_model=ReminderType)
+@cached_response(ReminderType, ("reminder_types",))
 def get_reminder_type(
     reminder_type_id: int,
     db: Session = Depends(get_db)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.services.report_type import ReportTypeService
 from app.schemas.report_type import ReportTypeCreate, ReportTypeUpdate, ReportTypeResponse
@@ -12,10 +13,12 @@ def create_report_type(report_type: ReportTypeCreate, db: Session = Depends(get_
     return ReportTypeService.create_report_type(db, report_type)
 
 @router.get('/', response_model=List[ReportTypeResponse])
+@cached_response(List[ReportTypeResponse], ("report_types",))
 def get_report_types(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     return ReportTypeService.get_report_types(db, skip, limit)
 
 @router.get('/{report_type_id}', response_model=ReportTypeResponse)
+@cached_response(ReportTypeResponse, ("report_types",))
 def get_report_type(report_type_id: int, db: Session = Depends(get_db)):
     report_type = ReportTypeService.get_report_type(db, report_type_id)
     if not report_type:
@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+
+from app.core.cache import cached_response
+from app.core.database import get_db
+from app.core.exceptions import ValidationException
+from app.schemas.clinical_search import ClinicalSearchResult
+from app.schemas.search_suggest import SearchSuggestion
+from app.services.auth import AuthService
+from app.services.clinical_search import ClinicalSearchService
+from app.services.search_suggest import SearchSuggestService
+from app.models.cared_person import CaredPerson
+from app.models.user import User
+
+router = APIRouter()
+
+@router.get("/clinical", response_model=List[ClinicalSearchResult])
+def search_clinical_notes(
+    q: str = Query(..., min_length=1, max_length=200, description="Términos de búsqueda"),
+    cared_person_id: Optional[UUID] = Query(None),
+    institution_id: Optional[int] = Query(None, description="Solo admin: institución a consultar"),
+    types: Optional[List[str]] = Query(None, description="shift_observation, diagnosis, restraint_protocol, medication_log, report"),
+    start: Optional[datetime] = Query(None, description="Desde (inclusive)"),
+    end: Optional[datetime] = Query(None, description="Hasta (exclusive)"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Full-text search over shift observations, diagnoses, restraint protocols, medication logs and reports"""
+    is_admin = current_user.has_role("admin")
+    if cared_person_id is not None:
+        cared_person = db.query(CaredPerson).filter(CaredPerson.id == cared_person_id).first()
+        if not cared_person:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cared person not found")
+        same_institution = current_user.institution_id is not None and cared_person.institution_id == current_user.institution_id
+        if not (is_admin or same_institution or cared_person.user_id == current_user.id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        institution_id = None
+    elif not is_admin:
+        if current_user.institution_id is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="cared_person_id is required for users without institution")
+        institution_id = current_user.institution_id
+    try:
+        return ClinicalSearchService.search(
+            db, q, cared_person_id=cared_person_id, institution_id=institution_id,
+            kinds=types, start=start, end=end, limit=limit, offset=skip,
+        )
+    except ValidationException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+def _suggest_scope(kwargs) -> str:
+    """Alcance de la caché de sugerencias: compartida entre admins, por usuario si no"""
+    current_user = kwargs["current_user"]
+    return "admin" if current_user.has_role("admin") else str(current_user.id)
+
+@router.get("/suggest", response_model=List[SearchSuggestion])
+@cached_response(List[SearchSuggestion], ("users", "cared_persons", "institutions"), vary=_suggest_scope)
+def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Texto escrito hasta el momento"),
+    types: Optional[List[str]] = Query(None, description="user, cared_person, institution"),
+    mode: str = Query("prefix", description="prefix o contains (mínimo 3 caracteres)"),
+    limit: int = Query(8, ge=1, le=25, description="Máximo de resultados por tipo"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_active_user)
+):
+    """Type-ahead suggestions (id, label, kind) for users, cared persons and institutions"""
+    is_admin = current_user.has_role("admin")
+    try:
+        return SearchSuggestService.suggest(
+            db, q, kinds=types, mode=mode, limit=limit,
+            institution_id=None if is_admin else current_user.institution_id,
+            user_id=None if is_admin else current_user.id,
+        )
+    except ValidationException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.schemas.service_type import ServiceType, ServiceTypeCreate, ServiceTypeUpdate
 from app.services.service_type import ServiceTypeService
@@ -8,6 +9,7 @@ from app.services.service_type import ServiceTypeService
 router = APIRouter()
 
 @router.get("/", response_model=List[ServiceType])
+@cached_response(List[ServiceType], ("service_types",))
 def get_service_types(
     skip: int = 0,
     limit: int = 100,
@@ -18,6 +20,7 @@ def get_service_types(
     return service.get_service_types(skip=skip, limit=limit)
 
 @router.get("/{service_type_id}", response_model=ServiceType)
+@cached_response(ServiceType, ("service_types",))
 def get_service_type(
     service_type_id: int,
     db: Session = Depends(get_db)
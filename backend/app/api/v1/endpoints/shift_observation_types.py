@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.schemas.shift_observation_type import ShiftObservationType, ShiftObservationTypeCreate, ShiftObservationTypeUpdate
 from app.services.shift_observation_type import ShiftObservationTypeService
@@ -8,6 +9,7 @@ from app.services.shift_observation_type import ShiftObservationTypeService
 router = APIRouter()
 
 @router.get("/", response_model=List[ShiftObservationType])
+@cached_response(List[ShiftObservationType], ("shift_observation_types",))
 def get_shift_observation_types(
     skip: int = 0,
     limit: int = 100,
@@ -18,6 +20,7 @@ def get_shift_observation_types(
     return service.get_shift_observation_types(skip=skip, limit=limit)
 
 @router.get("/{shift_observation_type_id}", response_model=ShiftObservationType)
+@cached_response(ShiftObservationType, ("shift_observation_types",))
 def get_shift_observation_type(
     shift_observation_type_id: int,
     db: Session = Depends(get_db)
@@ -1,6 +1,7 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from app.core.cache import cached_response
 from app.core.database import get_db
 from app.schemas.status_type import StatusType, StatusTypeCreate, StatusTypeUpdate
 from app.services.status_type import StatusTypeService
@@ -18,6 +19,7 @@ def create_status_type(
 
 
 @router.get("/", response_model=List[StatusType])
+@cached_response(List[StatusType], ("status_types",))
 def get_status_types(
     skip: int = 0,
     limit: int = 100,
@@ -28,6 +30,7 @@ def get_status_types(
 
 
 @router.get("/{status_type_id}", response_model=StatusType)
+@cached_response(StatusType, ("status_types",))
 def get_status_type(
     status_type_id: int,
     db: Session = Depends(get_db)
@@ -43,6 +46,7 @@ def get_status_type(
 
 
 @router.get("/category/{category}", response_model=List[StatusType])
+@cached_response(List[StatusType], ("status_types",))
 def get_status_types_by_category(
     category: str,
     db: Session = Depends(get_db)
@@ -1,13 +1,15 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request, Header
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from uuid import UUID
 from fastapi.security import HTTPAuthorizationCredentials
 from fastapi.responses import JSONResponse
 
+from app.api.v1.endpoints.jobs import enqueue_job
 from app.core.database import get_db
 from app.services.auth import AuthService, security
+from app.services.jobs import JobFailed, JobService
 from app.services.user import UserService
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserWithRoles
 from app.schemas.role import RoleAssign, RoleBase, RoleUpdate
@@ -313,10 +315,12 @@ def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_user(
     user_id: UUID,
+    background: bool = Query(False, description="Encolar como trabajo y devolver su id (202)"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     db: Session = Depends(get_db),
     current_user = Depends(AuthService.require_permission("users.delete"))
 ):
-    """Delete a user"""
+    """Delete a user (with `background=true`, as a job)"""
     # Prevenir auto-eliminación
     if current_user.id == user_id:
         raise HTTPException(
@@ -324,7 +328,12 @@ def delete_user(
             detail="No puedes eliminar tu propia cuenta"
         )
     
-    UserService.delete_user(db, user_id)
+    if background:
+        return enqueue_job(db, "users.delete", {"user_id": user_id}, current_user, idempotency_key)
+    try:
+        JobService.run_inline(db, "users.delete", {"user_id": str(user_id)})
+    except JobFailed as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 @router.post("/{user_id}/assign-role")
 async def assign_role(
@@ -2,7 +2,6 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from typing import Optional
-from uuid import UUID
 
 from app.core.database import get_db
 from app.models.user import User
@@ -11,12 +10,15 @@ from app.services.auth import AuthService
 # Configurar OAuth2 scheme para JWT
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> User:
     """
     Obtener el usuario actual basado en el token JWT
+
+    Delega en `AuthService.user_from_token`, la misma verificación (con caché
+    de claims y lista de revocación) que usan las dependencias de AuthService.
     
     Args:
         token: Token JWT del header Authorization
@@ -28,32 +30,7 @@ async def get_current_user(
     Raises:
         HTTPException: Si el token es inválido o el usuario no existe
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="No se pudieron validar las credenciales",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    # Verificar token
-    payload = AuthService.verify_token(token)
-    if payload is None:
-        raise credentials_exception
-    
-    # Obtener usuario
-    user_id = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
-    
-    try:
-        user_uuid = UUID(user_id)
-        user = db.query(User).filter(User.id == user_uuid).first()
-    except ValueError:
-        raise credentials_exception
-    
-    if user is None:
-        raise credentials_exception
-    
-    return user
+    return AuthService.user_from_token(db, token)
 
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
@@ -97,13 +74,12 @@ def require_admin(
     from app.models.role import Role
     from app.models.user_role import UserRole
     
-    # Obtener los roles del usuario
-    user_roles = db.query(UserRole).filter(UserRole.user_id == current_user.id, UserRole.is_active == True).all()
-    role_names = []
-    for ur in user_roles:
-        role = db.query(Role).filter(Role.id == ur.role_id).first()
-        if role:
-            role_names.append(role.name)
+    # Obtener los roles activos del usuario en una sola consulta
+    role_names = {
+        name for (name,) in db.query(Role.name)
+        .join(UserRole, UserRole.role_id == Role.id)
+        .filter(UserRole.user_id == current_user.id, UserRole.is_active == True)
+    }
             
     if "admin" not in role_names:
         raise HTTPException(
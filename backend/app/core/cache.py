@@ -0,0 +1,254 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Set, Tuple
+import functools
+import hashlib
+import inspect
+import logging
+import threading
+import time
+
+import orjson
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """Cuerpo JSON ya serializado y su ETag"""
+    body: bytes
+    etag: str
+    expires_at: float
+
+    @classmethod
+    def build(cls, body: bytes, ttl: int) -> "CachedResponse":
+        return cls(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"', time.monotonic() + ttl)
+
+
+class ResponseCache:
+    """
+    Caché de respuestas de endpoints de solo lectura (catálogos, paquetes)
+
+    Las entradas se indexan por ruta, query y la versión de cada tabla de la que
+    depende el endpoint; escribir en una de esas tablas incrementa su versión y
+    deja obsoletas las entradas sin tener que recorrerlas. El primer nivel es un
+    LRU en memoria; con `response_cache_backend = "redis"` las versiones y los
+    cuerpos se comparten entre procesos del API.
+    """
+
+    REDIS_PREFIX = "response_cache"
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.max_entries = max_entries or settings.response_cache_max_entries
+        self.ttl_seconds = ttl_seconds or settings.response_cache_ttl_seconds
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._redis = None
+        # Tablas de las que depende algún endpoint cacheado
+        self.watched_tables: Set[str] = set()
+
+    # --- Versiones ---
+
+    def _table_versions(self, tables: Sequence[str]) -> Tuple[int, ...]:
+        if self._redis is not None:
+            values = self._redis.hmget(f"{self.REDIS_PREFIX}:versions", list(tables))
+            return tuple(int(value or 0) for value in values)
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def invalidate(self, *tables: str) -> None:
+        """Invalidar todas las respuestas que dependen de las tablas indicadas"""
+        tables = [table for table in tables if table in self.watched_tables]
+        if not tables:
+            return
+        try:
+            if self._redis is not None:
+                pipeline = self._redis.pipeline()
+                for table in tables:
+                    pipeline.hincrby(f"{self.REDIS_PREFIX}:versions", table, 1)
+                pipeline.execute()
+        except Exception:
+            logger.exception("Failed to invalidate response cache in Redis")
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    # --- Entradas ---
+
+    def key(self, path: str, query: str, tables: Sequence[str]) -> str:
+        versions = ".".join(str(v) for v in self._table_versions(tables))
+        return f"{path}?{query}@{versions}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    return entry
+                del self._entries[key]
+        if self._redis is None:
+            return None
+        try:
+            body = self._redis.get(f"{self.REDIS_PREFIX}:body:{key}")
+        except Exception:
+            logger.exception("Failed to read response cache from Redis")
+            return None
+        if body is None:
+            return None
+        entry = CachedResponse.build(body, self.ttl_seconds)
+        self._store_local(key, entry)
+        return entry
+
+    def set(self, key: str, body: bytes) -> CachedResponse:
+        entry = CachedResponse.build(body, self.ttl_seconds)
+        self._store_local(key, entry)
+        if self._redis is not None:
+            try:
+                self._redis.set(f"{self.REDIS_PREFIX}:body:{key}", body, ex=self.ttl_seconds)
+            except Exception:
+                logger.exception("Failed to write response cache to Redis")
+        return entry
+
+    def _store_local(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @property
+    def is_remote(self) -> bool:
+        return self._redis is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def start(self) -> None:
+        """Conectar con Redis si el backend configurado lo requiere"""
+        if settings.response_cache_backend != "redis" or self._redis is not None:
+            return
+        import redis
+
+        self._redis = redis.Redis.from_url(settings.redis_url)
+
+
+# Instancia global usada por la API
+response_cache = ResponseCache()
+
+
+# --- Invalidación automática al confirmar escrituras del ORM ---
+
+_PENDING_TABLES = "response_cache_tables"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_tables(session: Session, flush_context) -> None:
+    tables = session.info.setdefault(_PENDING_TABLES, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            tables.add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_tables(session: Session) -> None:
+    tables = session.info.pop(_PENDING_TABLES, None)
+    if tables:
+        response_cache.invalidate(*tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_tables(session: Session) -> None:
+    session.info.pop(_PENDING_TABLES, None)
+
+
+# --- Decorador para endpoints ---
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    candidates = request.headers.get("if-none-match", "")
+    return any(tag.strip() in (entry.etag, "*") for tag in candidates.split(","))
+
+
+def _respond(request: Request, entry: CachedResponse, hit: bool) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache", "X-Cache": "HIT" if hit else "MISS"}
+    if _not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def cached_response(
+    response_model: Any,
+    tables: Iterable[str],
+    vary: Optional[Callable[[Dict[str, Any]], str]] = None,
+) -> Callable:
+    """
+    Cachear la respuesta de un endpoint GET que depende de pocas tablas
+
+    Las dependencias del endpoint (autenticación incluida) se siguen ejecutando;
+    solo se evita el cuerpo del endpoint y la serialización. Las respuestas
+    llevan ETag y se responde 304 a `If-None-Match`. Cualquier commit del ORM
+    que escriba en `tables` invalida las entradas.
+
+    Args:
+        response_model: Tipo de la respuesta (el mismo `response_model` de la ruta),
+            o None para respuestas que ya son JSON-serializables
+        tables: Tablas de las que depende la respuesta
+        vary: Para respuestas que dependen del usuario, función que recibe los
+            argumentos del endpoint y devuelve el alcance a agregar a la clave
+    """
+    tables = tuple(tables)
+    response_cache.watched_tables.update(tables)
+    adapter = TypeAdapter(response_model) if response_model is not None else None
+
+    def serialize(result: Any) -> bytes:
+        if adapter is None:
+            return orjson.dumps(jsonable_encoder(result))
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        request_param = inspect.Parameter("_cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+        wrapped_signature = signature.replace(parameters=[*signature.parameters.values(), request_param])
+        is_async = inspect.iscoroutinefunction(func)
+
+        async def call(fn: Callable, *args) -> Any:
+            # Con Redis las operaciones de caché son E/S bloqueante
+            return await run_in_threadpool(fn, *args) if response_cache.is_remote else fn(*args)
+
+        async def lookup(request: Request, kwargs: Dict[str, Any]) -> Response:
+            if not settings.response_cache_enabled:
+                result = await func(**kwargs) if is_async else await run_in_threadpool(func, **kwargs)
+                return _respond(request, CachedResponse.build(serialize(result), 0), hit=False)
+            query = str(request.query_params)
+            if vary is not None:
+                query = f"{query}#{vary(kwargs)}"
+            key = await call(response_cache.key, request.url.path, query, tables)
+            entry = await call(response_cache.get, key)
+            if entry is not None:
+                return _respond(request, entry, hit=True)
+            result = await func(**kwargs) if is_async else await run_in_threadpool(func, **kwargs)
+            entry = await call(response_cache.set, key, serialize(result))
+            return _respond(request, entry, hit=False)
+
+        @functools.wraps(func)
+        async def wrapper(*args, _cache_request: Request, **kwargs):
+            return await lookup(_cache_request, kwargs)
+
+        wrapper.__signature__ = wrapped_signature
+        return wrapper
+
+    return decorator
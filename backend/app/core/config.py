@@ -29,6 +29,12 @@ class Settings(BaseSettings):
     secret_key: str = "viejos_trapos_secret_key_dev"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 480  # 8 horas para desarrollo
+    auth_token_cache_enabled: bool = True  # Claims verificados en LRU hasta su exp
+    auth_token_cache_backend: str = "memory"  # memory, redis (revocación compartida)
+    auth_token_cache_size: int = 4096
+    password_bcrypt_rounds: int = 12  # Factor de trabajo; los hashes se regeneran al iniciar sesión
+    password_hash_workers: int = 4  # Hilos dedicados a bcrypt
+    password_hash_max_queue: int = 64  # Con la cola llena se responde 503
     
     # MQTT
     mqtt_broker: str = "mqtt"
@@ -44,6 +50,106 @@ class Settings(BaseSettings):
     enable_email_notifications: bool = False
     enable_push_notifications: bool = True
     
+    # Despachador de recordatorios
+    reminder_dispatcher_enabled: bool = True
+    reminder_dispatch_grace_minutes: int = 5  # Ocurrencias vencidas hace menos de esto aún se disparan
+    
+    # Escalamiento de alertas
+    alert_escalation_enabled: bool = True
+    alert_escalation_retry_seconds: int = 30  # Primer reintento tras un fallo; se duplica hasta 10 minutos
+    emergency_protocol_cache_ttl_seconds: int = 300
+    
+    # Deduplicación de alertas de dispositivos
+    alert_dedup_enabled: bool = True
+    alert_dedup_backend: str = "memory"  # memory, redis
+    alert_dedup_window_seconds: int = 300  # Ventana deslizante para colapsar repeticiones
+    alert_device_rate_limit_per_minute: int = 30  # Alertas nuevas por dispositivo antes de avisar de una tormenta
+    
+    # Canal en vivo (SSE) para el panel web
+    live_feed_backend: str = "memory"  # memory, redis
+    live_feed_buffer_size: int = 1000  # Eventos recientes disponibles para reanudar con Last-Event-ID
+    live_feed_queue_size: int = 500  # Eventos pendientes por cliente antes de descartar
+    live_feed_keepalive_seconds: int = 15
+    
+    # Seguimiento de ubicación
+    location_ingest_max_batch: int = 1000  # Fixes por petición de ingesta
+    location_raw_retention_hours: int = 48  # Fixes crudos antes de compactar; con archive_enabled se archivan al compactar
+    location_simplify_tolerance_meters: float = 10.0  # Tolerancia de Douglas-Peucker
+    location_compaction_enabled: bool = True
+    location_compaction_interval_minutes: int = 60
+    
+    # Cobertura de turnos de cuidadores
+    shift_schedule_timezone: str = "America/Argentina/Buenos_Aires"  # Zona de los horarios sin "timezone"
+    shift_coverage_reload_seconds: int = 300  # Reconstrucción completa del índice (cambios de otros procesos)
+    shift_coverage_max_window_days: int = 31
+    
+    # Emparejamiento de cuidadores
+    matching_default_radius_km: float = 25.0
+    matching_grid_cell_km: float = 10.0  # Tamaño de celda de la grilla geográfica
+    matching_refresh_seconds: int = 600  # Reconstrucción de la matriz de características
+    
+    # Adherencia a la medicación
+    medication_timezone: str = "America/Argentina/Buenos_Aires"  # Zona de los horarios de toma (schedule_details.times)
+    medication_on_time_tolerance_minutes: int = 60  # Diferencia máxima con el horario para contar "a tiempo"
+    adherence_refresh_enabled: bool = True
+    adherence_refresh_interval_minutes: int = 15
+    adherence_refresh_lookback_days: int = 2  # Días recientes que se recalculan siempre (tomas borradas)
+
+    # Resumen de persona bajo cuidado (/cared-persons/{id}/overview)
+    overview_workers: int = 4  # Secciones cargadas en paralelo (cada una usa una conexión)
+    overview_cache_ttl_seconds: int = 30
+
+    # Informes de traspaso de turno (/handover-reports, los generan los workers de trabajos)
+    handover_report_path: str = "reports/handover"
+    handover_report_retention_minutes: int = 120  # Tiempo que se conserva cada archivo generado
+    handover_report_window_hours: int = 12  # Ventana por defecto (un turno)
+
+    # Trabajos en segundo plano (tabla jobs, cola con FOR UPDATE SKIP LOCKED)
+    job_workers_enabled: bool = True  # False si los trabajos los ejecuta scripts/run_job_worker.py
+    job_workers: int = 2  # Hilos que toman trabajos dentro del proceso de la API
+    job_poll_seconds: float = 2.0  # Espera con la cola vacía
+    job_retry_backoff_seconds: int = 30  # Primer reintento; se duplica en cada intento
+    job_heartbeat_seconds: float = 30.0  # El worker renueva el heartbeat del trabajo en curso
+    job_stale_after_minutes: int = 15  # Sin heartbeat en este tiempo el trabajo vuelve a la cola
+    job_retention_days: int = 30  # Trabajos terminados que se conservan
+
+    # Lote de referidos: vencimientos y comisiones (una ejecución por día)
+    referral_batch_enabled: bool = True
+    referral_batch_interval_minutes: int = 60  # Frecuencia de chequeo; el run log evita repetir el día
+    referral_batch_size: int = 5000  # Filas por transacción
+
+    # Facturación mensual (un lote por institución, ejecutado por los workers de trabajos)
+    billing_run_enabled: bool = True
+    billing_run_interval_minutes: int = 60  # Chequeo del período en curso; los lotes ya encolados no se repiten
+    billing_currency: str = "ARS"
+    billing_tax_rate: float = 0.21  # IVA
+    billing_due_days: int = 15  # Vencimiento desde el primer día del período
+
+    # Particionado mensual de series de tiempo (events, location_tracking, debug_events)
+    partition_maintenance_enabled: bool = True
+    partition_maintenance_interval_hours: int = 6
+    partition_premake_months: int = 3  # Meses futuros con partición ya creada
+    partition_retention_action: str = "drop"  # drop, detach (la partición queda como tabla suelta)
+    events_retention_months: int = 24  # 0 = sin retención
+    location_tracking_retention_months: int = 12  # Solo alcanza a los fixes no compactados (sin persona)
+    debug_events_retention_months: int = 3
+    
+    # Archivo en frío (Parquet) de filas vencidas; requiere pyarrow
+    archive_enabled: bool = False  # Archiva antes de aplicar la retención de particiones
+    archive_path: str = "archive"
+    archive_chunk_size: int = 5000  # Filas por bloque leído, escrito y borrado
+    archive_compression: str = "zstd"
+    audit_logs_retention_months: int = 36  # Solo se aplica con archive_enabled
+    
+    # Caché de respuestas de catálogos y paquetes
+    response_cache_enabled: bool = True
+    response_cache_backend: str = "memory"  # memory, redis
+    response_cache_max_entries: int = 512
+    response_cache_ttl_seconds: int = 300
+    
+    # Diagnóstico
+    query_count_header_enabled: bool = False  # Devuelve X-DB-Query-Count en cada respuesta
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
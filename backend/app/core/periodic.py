@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Any, Optional
+import logging
+import threading
+
+
+class PeriodicWorker(ABC):
+    """
+    Hilo en segundo plano que llama a `run_once` cada `interval`
+
+    Los errores de una pasada se registran con `failure_message` y el ciclo
+    sigue en la siguiente. `stop` despierta la espera en curso, así que el
+    hilo termina sin esperar a que venza el intervalo.
+    """
+
+    thread_name = "periodic-worker"
+    failure_message = "Periodic work failed"
+
+    def __init__(self, interval: timedelta):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def run_once(self) -> Any:
+        """Ejecutar una pasada del trabajo"""
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logging.getLogger(type(self).__module__).exception(self.failure_message)
+            self._stop.wait(self.interval.total_seconds())
@@ -0,0 +1,38 @@
+from contextvars import ContextVar
+from typing import List, Optional
+
+from fastapi import FastAPI, Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+# Lista mutable compartida con los hilos del threadpool (que copian el contexto)
+_current_count: ContextVar[Optional[List[int]]] = ContextVar("db_query_count", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def install_query_counter(app: FastAPI, engine: Engine) -> None:
+    """
+    Contar las consultas SQL de cada petición y devolverlas en `X-DB-Query-Count`
+
+    Pensado para benchmarks y diagnóstico (detectar N+1); se activa con
+    `query_count_header_enabled`.
+    """
+    event.listen(engine, "before_cursor_execute", _count_query)
+
+    @app.middleware("http")
+    async def query_count_middleware(request: Request, call_next):
+        counter = [0]
+        token = _current_count.set(counter)
+        try:
+            response = await call_next(request)
+        finally:
+            _current_count.reset(token)
+        response.headers[QUERY_COUNT_HEADER] = str(counter[0])
+        return response
@@ -0,0 +1,164 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional
+import heapq
+import itertools
+import logging
+import threading
+
+from app.core.timeutils import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineScheduler:
+    """
+    Heap de plazos por clave con un hilo que duerme hasta el más cercano
+
+    Cada clave tiene como máximo una entrada vigente: reprogramarla o quitarla
+    deja obsoleta la anterior, que se descarta al llegar a la cima del heap.
+    El hilo se despierta antes de tiempo si entra un plazo más cercano o al
+    detenerse, y llama a `on_due` cuando vence el primero. Los motores en
+    memoria (recordatorios, escalamiento de alertas, heartbeats) delegan aquí
+    el índice y el ciclo de vida del hilo.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        on_due: Callable[[], Any],
+        on_start: Optional[Callable[[], Any]] = None,
+        clock: Callable[[], datetime] = utc_now,
+    ):
+        self.name = name
+        self.on_due = on_due
+        self.on_start = on_start
+        self.clock = clock
+        self._heap: List[tuple] = []
+        self._entries: Dict[Hashable, Any] = {}
+        self._tokens: Dict[Hashable, int] = {}
+        self._counter = itertools.count(1)
+        # Reentrante: los motores agrupan get + schedule bajo `lock`
+        self.lock = threading.Condition(threading.RLock())
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    # --- Índice ---
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self._entries.get(key)
+
+    @property
+    def next_due_at(self) -> Optional[datetime]:
+        """Plazo vigente más cercano"""
+        with self.lock:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def _discard_stale(self) -> None:
+        while self._heap:
+            _, _, token, key = self._heap[0]
+            if self._tokens.get(key) == token:
+                return
+            heapq.heappop(self._heap)
+
+    def schedule(self, key: Hashable, entry: Any, due: datetime, rank: int = 0) -> None:
+        """Programar (o reprogramar) `key`; a igual plazo sale antes el menor `rank`"""
+        with self.lock:
+            token = next(self._counter)
+            self._entries[key] = entry
+            self._tokens[key] = token
+            heapq.heappush(self._heap, (due, rank, token, key))
+            self.lock.notify_all()
+
+    def reschedule(self, key: Hashable, entry: Any, due: datetime, rank: int = 0) -> bool:
+        """Reprogramar solo si `entry` sigue siendo la entrada de `key` (no se reemplazó ni quitó)"""
+        with self.lock:
+            if self._entries.get(key) is not entry:
+                return False
+            self.schedule(key, entry, due, rank)
+            return True
+
+    def unschedule(self, key: Hashable) -> Optional[Any]:
+        """Quitar `key` del índice; su entrada del heap se descarta al salir"""
+        with self.lock:
+            self._tokens.pop(key, None)
+            entry = self._entries.pop(key, None)
+            self.lock.notify_all()
+            return entry
+
+    def clear(self) -> None:
+        with self.lock:
+            self._heap.clear()
+            self._entries.clear()
+            self._tokens.clear()
+            self.lock.notify_all()
+
+    def pop_due(self, now: Optional[datetime] = None, keep: bool = False) -> List[Any]:
+        """
+        Extraer las entradas vencidas en orden de plazo
+
+        Args:
+            now: Instante de corte (por defecto el reloj)
+            keep: Dejar las entradas en el índice sin plazo; el llamador debe
+                reprogramarlas (`reschedule`) o quitarlas
+
+        Returns:
+            List: Entradas vencidas
+        """
+        now = now or self.clock()
+        due = []
+        with self.lock:
+            while True:
+                self._discard_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, _, _, key = heapq.heappop(self._heap)
+                # Sin token vigente una entrada conservada no vence hasta que se reprograme
+                self._tokens.pop(key, None)
+                due.append(self._entries[key] if keep else self._entries.pop(key))
+        return due
+
+    # --- Ciclo de vida ---
+
+    def start(self) -> None:
+        """Arrancar el hilo (ejecuta `on_start` en el propio hilo)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self.lock:
+            self._stopping = True
+            self.lock.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        if self.on_start is not None:
+            try:
+                self.on_start()
+            except Exception:
+                logger.exception("Scheduler %s failed to load its index", self.name)
+
+        while True:
+            with self.lock:
+                if self._stopping:
+                    return
+                self._discard_stale()
+                wait = (self._heap[0][0] - self.clock()).total_seconds() if self._heap else None
+                if wait is None or wait > 0:
+                    self.lock.wait(timeout=wait)
+                    continue
+            try:
+                self.on_due()
+            except Exception:
+                logger.exception("Scheduler %s failed to process due entries", self.name)
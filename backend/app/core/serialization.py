@@ -0,0 +1,82 @@
+from decimal import Decimal
+from typing import Any, Iterable, List, Type
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Query
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class RowsJSONResponse(ORJSONResponse):
+    """ORJSONResponse para datos sin pasar por jsonable_encoder (UTC como "Z", igual que Pydantic)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def response_columns(model, schema: Type[BaseModel], **computed) -> List[Any]:
+    """
+    Columnas del modelo ORM que necesita un schema de respuesta
+
+    Permite consultar solo esas columnas como tuplas en lugar de hidratar
+    objetos ORM completos en los listados grandes.
+
+    Args:
+        model: Modelo ORM
+        schema: Schema Pydantic de la respuesta
+        **computed: Expresiones SQL para campos calculados (propiedades del modelo)
+
+    Returns:
+        list: Columnas y expresiones etiquetadas con el nombre del campo
+
+    Raises:
+        ValueError: Si un campo obligatorio del schema no tiene columna ni expresión
+    """
+    column_names = set(model.__table__.columns.keys())
+    columns = []
+    for name, field in schema.model_fields.items():
+        if name in computed:
+            columns.append(computed[name].label(name))
+        elif name in column_names:
+            columns.append(getattr(model, name))
+        elif field.is_required():
+            raise ValueError(f"{schema.__name__}.{name} has no column in {model.__name__}")
+    return columns
+
+
+def list_response(schema: Type[BaseModel], rows: Iterable[Any]) -> RowsJSONResponse:
+    """
+    Respuesta de un listado construida desde filas de columnas
+
+    Las filas vienen de `response_columns`, con los nombres y tipos del schema,
+    así que no se construyen modelos: cada fila se serializa directamente con
+    orjson y los campos opcionales sin columna toman su valor por defecto.
+    FastAPI no vuelve a validar una `Response` devuelta por el endpoint; el
+    `response_model` del decorador se mantiene para la documentación OpenAPI.
+
+    Args:
+        schema: Schema Pydantic de cada elemento
+        rows: Filas con nombre (resultado de consultar `response_columns`)
+
+    Returns:
+        RowsJSONResponse: Lista serializada
+    """
+    if isinstance(rows, Query):
+        rows = rows.all()
+    items = [dict(row._mapping) for row in rows]
+    if items:
+        defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in schema.model_fields.items()
+            if name not in items[0]
+        }
+        if defaults:
+            for item in items:
+                item.update(defaults)
+    return RowsJSONResponse(items)
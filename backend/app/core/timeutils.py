@@ -0,0 +1,13 @@
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """Instante actual en UTC (con zona)"""
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Normalizar un datetime a UTC con zona (los naive se asumen en UTC)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
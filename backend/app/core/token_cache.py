@@ -0,0 +1,122 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import logging
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def token_digest(token: str) -> str:
+    """Huella del token usada como clave (el token en claro no se guarda)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenCache:
+    """
+    Caché de claims de tokens JWT ya verificados y lista de revocación
+
+    Verificar la firma de un JWT en cada request es el costo fijo más alto de
+    la autenticación. Los claims verificados se guardan en un LRU acotado,
+    indexado por el sha256 del token, hasta su `exp`: un token vencido nunca
+    se sirve desde la caché. Los tokens revocados (logout) se recuerdan hasta
+    su `exp`; con `auth_token_cache_backend = "redis"` la revocación se
+    comparte entre procesos del API.
+    """
+
+    REDIS_PREFIX = "auth_revoked"
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.auth_token_cache_size
+        self._claims: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._redis = None
+
+    # --- Claims verificados ---
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Claims de un token verificado y no vencido, o None"""
+        now = time.time()
+        with self._lock:
+            entry = self._claims.get(digest)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at <= now:
+                del self._claims[digest]
+                return None
+            self._claims.move_to_end(digest)
+            return claims
+
+    def set(self, digest: str, claims: Dict[str, Any]) -> None:
+        """Guardar claims verificados; los tokens sin `exp` no se cachean"""
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._claims[digest] = (claims, float(expires_at))
+            self._claims.move_to_end(digest)
+            while len(self._claims) > self.max_entries:
+                self._claims.popitem(last=False)
+
+    # --- Revocación ---
+
+    def revoke(self, digest: str, expires_at: float) -> None:
+        """
+        Revocar un token hasta su vencimiento
+
+        Args:
+            digest: Huella del token (`token_digest`)
+            expires_at: `exp` del token (epoch en segundos)
+        """
+        ttl = int(expires_at - time.time()) + 1
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._claims.pop(digest, None)
+            self._revoked[digest] = float(expires_at)
+            self._purge_revoked()
+        if self._redis is not None:
+            try:
+                self._redis.set(f"{self.REDIS_PREFIX}:{digest}", 1, ex=ttl)
+            except Exception:
+                logger.exception("Failed to store token revocation in Redis")
+
+    def is_revoked(self, digest: str) -> bool:
+        with self._lock:
+            expires_at = self._revoked.get(digest)
+        if expires_at is not None:
+            return expires_at > time.time()
+        if self._redis is None:
+            return False
+        try:
+            return bool(self._redis.exists(f"{self.REDIS_PREFIX}:{digest}"))
+        except Exception:
+            logger.exception("Failed to read token revocation from Redis")
+            return False
+
+    def _purge_revoked(self) -> None:
+        now = time.time()
+        for digest in [d for d, expires_at in self._revoked.items() if expires_at <= now]:
+            del self._revoked[digest]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._claims.clear()
+            self._revoked.clear()
+
+    def start(self) -> None:
+        """Conectar con Redis si el backend configurado lo requiere"""
+        if settings.auth_token_cache_backend != "redis" or self._redis is not None:
+            return
+        import redis
+
+        self._redis = redis.Redis.from_url(settings.redis_url)
+
+
+# Instancia global usada por la autenticación
+token_cache = TokenCache()
@@ -19,6 +19,7 @@ from app.models.emergency_protocol import EmergencyProtocol
 from app.models.service_subscription import ServiceSubscription
 from app.models.billing_record import BillingRecord
 from app.models.location_tracking import LocationTracking
+from app.models.location_trajectory import LocationTrajectory
 from app.models.geofence import Geofence
 from app.models.debug_event import DebugEvent
 from app.models.report import Report
@@ -26,6 +27,9 @@ from .diagnosis import Diagnosis
 from .medical_profile import MedicalProfile
 from .medication_schedule import MedicationSchedule
 from .medication_log import MedicationLog
+from .medication_adherence import MedicationAdherenceDaily
+from .job import Job
+from .batch_run import BatchRun
 from .restraint_protocol import RestraintProtocol
 from .shift_observation import ShiftObservation
 from .vital_sign import VitalSign
@@ -63,9 +67,13 @@ __all__ = [
     "ServiceSubscription",
     "BillingRecord",
     "LocationTracking",
+    "LocationTrajectory",
     "Geofence",
     "DebugEvent",
     "Report",
+    "MedicationAdherenceDaily",
+    "Job",
+    "BatchRun",
     "VitalSign",
     # Package models
     "Package",
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 from app.models.alert_type import AlertType
@@ -8,6 +8,9 @@ import uuid
 class Alert(BaseModel):
     """Alert model for notifications and alerts"""
     __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_alert_data", "alert_data", postgresql_using="gin", postgresql_ops={"alert_data": "jsonb_path_ops"}),
+    )
     
     # Override id to use UUID
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -20,7 +23,7 @@ class Alert(BaseModel):
     # Alert content
     title = Column(String(200), nullable=False)
     message = Column(Text, nullable=True)
-    alert_data = Column(Text, nullable=True)  # JSON string with alert details
+    alert_data = Column(JSONB, nullable=True)  # Alert details
     
     # Alert status (normalized)
     status_type_id = Column(Integer, ForeignKey("status_types.id"), nullable=True, index=True)
@@ -30,18 +33,23 @@ class Alert(BaseModel):
     # Priority and escalation
     priority = Column(Integer, default=5, nullable=False)  # 1-10, higher is more important
     escalation_level = Column(Integer, default=0, nullable=False)  # 0-5, escalation steps
+    escalated_at = Column(DateTime(timezone=True), nullable=True)  # Last escalation step
+    
+    # Deduplication of repeated device alerts
+    occurrence_count = Column(Integer, default=1, server_default="1", nullable=False)
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
     cared_person_id = Column(UUID(as_uuid=True), ForeignKey("cared_persons.id"), nullable=True)
     device_id = Column(UUID(as_uuid=True), ForeignKey("devices.id"), nullable=True)
-    event_id = Column(UUID(as_uuid=True), ForeignKey("events.id"), nullable=True)
+    event_id = Column(UUID(as_uuid=True), nullable=True, index=True)  # Sin FK: events está particionada
     
     # Relationships
     user = relationship("User", back_populates="alerts")
     cared_person = relationship("CaredPerson", back_populates="alerts")
     device = relationship("Device", back_populates="alerts")
-    event = relationship("Event", back_populates="alerts")
+    event = relationship("Event", primaryjoin="foreign(Alert.event_id) == Event.id", back_populates="alerts")
     status_type = relationship("StatusType")
     alert_type = relationship("AlertType")
     
@@ -2,7 +2,7 @@ from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.base import Base
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 class AuditLog(Base):
     __tablename__ = 'audit_logs'
@@ -12,8 +12,8 @@ class AuditLog(Base):
     action = Column(String(20), nullable=False)  # create, update, delete
     changed_by_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    old_data = Column(Text, nullable=True)  # JSON string
-    new_data = Column(Text, nullable=True)  # JSON string
+    old_data = Column(JSONB, nullable=True)
+    new_data = Column(JSONB, nullable=True)
     description = Column(Text, nullable=True)
 
     changed_by = relationship('User') 
\ No newline at end of file
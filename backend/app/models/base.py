@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, DateTime, Boolean
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import Column, Computed, Index, Integer, DateTime, Boolean
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import declarative_base, deferred
 from sqlalchemy.sql import func
 from datetime import datetime
 
@@ -16,4 +17,38 @@ class BaseModel(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     
     def __repr__(self):
-        return f"<{self.__class__.__name__}(id={self.id})>" 
\ No newline at end of file
+        return f"<{self.__class__.__name__}(id={self.id})>"
+
+
+# Configuración de texto de las búsquedas clínicas (stemming en español)
+SEARCH_CONFIG = "spanish"
+
+
+def search_vector_expression(*weighted_columns) -> str:
+    """SQL del tsvector de una fila a partir de pares (columna, peso A-D)"""
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted_columns
+    )
+
+
+def search_vector_column(*weighted_columns):
+    """
+    Columna `search_vector` generada por PostgreSQL (STORED)
+
+    No se carga con la fila (deferred): solo se usa en los filtros `@@` de la
+    búsqueda clínica, con su índice GIN (ver `search_vector_index`).
+    """
+    return deferred(Column(TSVECTOR, Computed(search_vector_expression(*weighted_columns), persisted=True)))
+
+
+def search_vector_index(table_name: str) -> Index:
+    return Index(f"ix_{table_name}_search_vector", "search_vector", postgresql_using="gin")
+
+
+def trigram_index(table_name: str, column: str) -> Index:
+    """Índice GIN pg_trgm: sirve a ILIKE '%x%' y 'x%' sin recorrer la tabla"""
+    return Index(
+        f"ix_{table_name}_{column}_trgm", column,
+        postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+    )
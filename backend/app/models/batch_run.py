@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from app.models.base import BaseModel
+
+class BatchRun(BaseModel):
+    """Registro de ejecución de un proceso por lotes (una fila por proceso y período)"""
+    __tablename__ = "batch_runs"
+    __table_args__ = (
+        UniqueConstraint("kind", "run_key", name="uq_batch_runs_kind_run_key"),
+    )
+    
+    kind = Column(String(50), nullable=False, index=True)  # referrals, billing, ...
+    run_key = Column(String(100), nullable=False)  # Período o clave de la ejecución (p. ej. "2025-08-14")
+    status = Column(String(20), nullable=False, default="running")  # running, completed, failed
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    stats = Column(JSONB, nullable=True)  # Filas procesadas por etapa
+    error = Column(Text, nullable=True)
+    
+    def __repr__(self):
+        return f"<BatchRun(kind='{self.kind}', run_key='{self.run_key}', status='{self.status}')>"
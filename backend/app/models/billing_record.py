@@ -1,11 +1,22 @@
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Date
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Date, Index, Sequence, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import BaseModel
 
+# Números de factura de la facturación mensual: cada nextval reserva un bloque
+INVOICE_BLOCK_SIZE = 1000
+invoice_number_sequence = Sequence("billing_invoice_seq", increment=INVOICE_BLOCK_SIZE, metadata=BaseModel.metadata)
+
 class BillingRecord(BaseModel):
     """BillingRecord model for billing and payment records"""
     __tablename__ = "billing_records"
+    __table_args__ = (
+        # Una factura por suscripción, tipo y período: la facturación se puede repetir sin duplicar
+        Index(
+            "uq_billing_records_package_period", "user_package_id", "billing_type", "billing_date",
+            unique=True, postgresql_where=text("user_package_id IS NOT NULL"),
+        ),
+    )
     
     # Billing identification
     invoice_number = Column(String(50), unique=True, nullable=False, index=True)
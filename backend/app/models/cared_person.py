@@ -1,7 +1,7 @@
 from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, Date, Float
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, trigram_index
 from app.models.diagnosis import Diagnosis
 from app.models.allergy import Allergy
 from app.models.medical_condition import MedicalCondition
@@ -11,6 +11,8 @@ import uuid
 class CaredPerson(BaseModel):
     """CaredPerson model for people under care (replaces elderly_person)"""
     __tablename__ = "cared_persons"
+    # Búsquedas por texto parcial (listados y /search/suggest)
+    __table_args__ = (trigram_index("cared_persons", "first_name"), trigram_index("cared_persons", "last_name"))
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
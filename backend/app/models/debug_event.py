@@ -6,6 +6,12 @@ from sqlalchemy.dialects.postgresql import UUID
 class DebugEvent(BaseModel):
     """DebugEvent model for testing and debugging purposes"""
     __tablename__ = "debug_events"
+    __table_args__ = (
+        # Particiones mensuales por event_time (ver app/services/partitioning.py)
+        {"postgresql_partition_by": "RANGE (event_time)"},
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     
     # Debug event identification
     event_type = Column(String(50), nullable=False, index=True)  # test_event, debug_event, simulation, etc.
@@ -23,7 +29,7 @@ class DebugEvent(BaseModel):
     environment = Column(String(50), nullable=True)  # development, testing, staging, production
     
     # Timestamps
-    event_time = Column(DateTime(timezone=True), nullable=False)
+    event_time = Column(DateTime(timezone=True), primary_key=True, nullable=False)  # Clave de partición
     processed_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
@@ -36,6 +42,8 @@ class DebugEvent(BaseModel):
     cared_person = relationship("CaredPerson", back_populates="debug_events")
     device = relationship("Device", back_populates="debug_events")
     
+    __mapper_args__ = {"primary_key": [id]}
+    
     def __repr__(self):
         return f"<DebugEvent(type='{self.event_type}', subtype='{self.event_subtype}', severity='{self.severity}')>"
     
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Float
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 from app.models.device_type import DeviceType
@@ -35,7 +35,7 @@ class Device(BaseModel):
     altitude = Column(Float, nullable=True)
     
     # Configuration
-    settings = Column(Text, nullable=True)  # JSON string with device settings
+    settings = Column(JSONB, nullable=True)  # Device settings
     firmware_version = Column(String(50), nullable=True)
     hardware_version = Column(String(50), nullable=True)
     
@@ -1,12 +1,15 @@
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 
 class DeviceConfig(BaseModel):
     """DeviceConfig model for device configuration and settings"""
     __tablename__ = "device_configs"
+    __table_args__ = (
+        Index("ix_device_configs_config_data", "config_data", postgresql_using="gin", postgresql_ops={"config_data": "jsonb_path_ops"}),
+    )
     
     # Configuration identification
     device_id = Column(UUID(as_uuid=True), ForeignKey("devices.id"), nullable=False, index=True)
@@ -14,7 +17,7 @@ class DeviceConfig(BaseModel):
     config_name = Column(String(100), nullable=False)
     
     # Configuration data
-    config_data = Column(Text, nullable=True)  # JSON string with configuration
+    config_data = Column(JSONB, nullable=True)  # Configuration values
     description = Column(Text, nullable=True)
     
     # Configuration status
@@ -1,14 +1,18 @@
 from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Boolean
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, search_vector_column, search_vector_index
 import uuid
 from datetime import datetime
 
 class Diagnosis(BaseModel):
     __tablename__ = 'diagnoses'
+    # Búsqueda clínica: tsvector generado (spanish) con índice GIN
+    SEARCH_COLUMNS = (("diagnosis_name", "A"), ("cie10_code", "A"), ("description", "B"), ("medical_notes", "C"))
+    __table_args__ = (search_vector_index("diagnoses"),)
+    search_vector = search_vector_column(*SEARCH_COLUMNS)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    cared_person_id = Column(UUID(as_uuid=True), ForeignKey('cared_persons.id'), nullable=False)
+    cared_person_id = Column(UUID(as_uuid=True), ForeignKey('cared_persons.id'), nullable=False, index=True)
     diagnosis_name = Column(String(255), nullable=False, doc="Nombre estandarizado del diagnóstico")
     description = Column(Text, nullable=True, doc="Descripción clínica detallada")
     severity_level = Column(String(50), nullable=True, doc="Gravedad: leve, moderada, severa")
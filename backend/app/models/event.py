@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Float
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Float, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 from app.models.event_type import EventType
@@ -8,6 +8,13 @@ import uuid
 class Event(BaseModel):
     """Event model for sensor events, system events, and user activities"""
     __tablename__ = "events"
+    __table_args__ = (
+        # Filtros por contenido del payload (@>) y por sensor
+        Index("ix_events_event_data", "event_data", postgresql_using="gin", postgresql_ops={"event_data": "jsonb_path_ops"}),
+        Index("ix_events_event_data_sensor", text("(event_data ->> 'sensor')")),
+        # Particiones mensuales por event_time (ver app/services/partitioning.py)
+        {"postgresql_partition_by": "RANGE (event_time)"},
+    )
     
     # Override id to use UUID
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -18,7 +25,7 @@ class Event(BaseModel):
     severity = Column(String(20), default="info", nullable=False)  # info, warning, error, critical
     
     # Event data
-    event_data = Column(Text, nullable=True)  # JSON string with event details
+    event_data = Column(JSONB, nullable=True)  # Event details (sensor readings, context)
     message = Column(Text, nullable=True)
     source = Column(String(100), nullable=True)  # device_id, system, user, etc.
     
@@ -28,7 +35,7 @@ class Event(BaseModel):
     altitude = Column(Float, nullable=True)
     
     # Timestamps
-    event_time = Column(DateTime(timezone=True), nullable=False)
+    event_time = Column(DateTime(timezone=True), primary_key=True, nullable=False)  # Clave de partición
     processed_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
@@ -40,9 +47,12 @@ class Event(BaseModel):
     user = relationship("User", back_populates="events")
     cared_person = relationship("CaredPerson", back_populates="events")
     device = relationship("Device", back_populates="events")
-    alerts = relationship("Alert", back_populates="event")
+    alerts = relationship("Alert", primaryjoin="Event.id == foreign(Alert.event_id)", back_populates="event")
     event_type = relationship("EventType")
     
+    # La PK de la tabla incluye event_time (requisito del particionado); el id sigue siendo único
+    __mapper_args__ = {"primary_key": [id]}
+    
     def __repr__(self):
         return f"<Event(type='{self.event_type}', subtype='{self.event_subtype}', severity='{self.severity}')>"
     
@@ -1,10 +1,12 @@
 from sqlalchemy import Column, String, Text, Boolean, Integer, Float
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, trigram_index
 
 class Institution(BaseModel):
     """Institution model for care centers, clinics, homes, etc."""
     __tablename__ = "institutions"
+    # Búsquedas por texto parcial (listados y /search/suggest)
+    __table_args__ = (trigram_index("institutions", "name"),)
     
     name = Column(String(200), nullable=False, index=True)
     description = Column(Text, nullable=True)
@@ -0,0 +1,49 @@
+from sqlalchemy import Column, String, Text, Integer, Float, ForeignKey, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+from app.models.base import BaseModel
+import uuid
+
+class Job(BaseModel):
+    """Operación larga encolada (la ejecutan los workers de app.services.jobs)"""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Cola: solo las filas pendientes, en el orden en que se toman
+        Index(
+            "ix_jobs_queue", text("priority DESC"), "run_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        # La clave de idempotencia es por usuario (NULL = procesos del sistema)
+        Index(
+            "uq_jobs_owner_idempotency_key", "created_by", "idempotency_key",
+            unique=True, postgresql_nulls_not_distinct=True,
+        ),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(100), nullable=False, index=True)  # Handler registrado (p. ej. "referrals.expire_old")
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, completed, failed, cancelled
+    priority = Column(Integer, nullable=False, default=0)  # Mayor se toma antes
+    
+    # Reintentos
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # No antes de (backoff)
+    
+    # Ejecución
+    locked_by = Column(String(100), nullable=True)  # Worker que la tiene tomada
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Último aviso del worker (lo renueva mientras corre)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    progress = Column(Float, nullable=False, default=0.0)  # 0 a 1
+    progress_message = Column(String(255), nullable=True)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    
+    # Un mismo pedido repetido (Idempotency-Key) del mismo usuario devuelve el trabajo existente
+    idempotency_key = Column(String(255), nullable=True)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind='{self.kind}', status='{self.status}', attempts={self.attempts})>"
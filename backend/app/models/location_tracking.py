@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Float
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 from sqlalchemy.dialects.postgresql import UUID
@@ -6,6 +6,14 @@ from sqlalchemy.dialects.postgresql import UUID
 class LocationTracking(BaseModel):
     """LocationTracking model for GPS and location data"""
     __tablename__ = "location_tracking"
+    __table_args__ = (
+        # Consultas de trayectoria y compactación recorren los fixes por persona y tiempo
+        Index("ix_location_tracking_cared_person_recorded", "cared_person_id", "recorded_at"),
+        # Particiones mensuales por recorded_at (ver app/services/partitioning.py)
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     
     # Location data
     latitude = Column(Float, nullable=False)
@@ -26,7 +34,7 @@ class LocationTracking(BaseModel):
     signal_strength = Column(Integer, nullable=True)
     
     # Timestamps
-    recorded_at = Column(DateTime(timezone=True), nullable=False)
+    recorded_at = Column(DateTime(timezone=True), primary_key=True, nullable=False)  # Clave de partición
     received_at = Column(DateTime(timezone=True), nullable=False)
     
     # Relationships
@@ -39,6 +47,8 @@ class LocationTracking(BaseModel):
     cared_person = relationship("CaredPerson", back_populates="location_tracking")
     device = relationship("Device", back_populates="location_tracking")
     
+    __mapper_args__ = {"primary_key": [id]}
+    
     def __repr__(self):
         return f"<LocationTracking(lat={self.latitude}, lng={self.longitude}, recorded_at='{self.recorded_at}')>"
     
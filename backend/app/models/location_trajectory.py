@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Date, Float, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import BaseModel
+
+class LocationTrajectory(BaseModel):
+    """Trayectoria diaria simplificada que reemplaza a los fixes crudos ya compactados"""
+    __tablename__ = "location_trajectories"
+    __table_args__ = (
+        UniqueConstraint("cared_person_id", "day", name="uq_location_trajectories_cared_person_day"),
+    )
+    
+    cared_person_id = Column(UUID(as_uuid=True), ForeignKey("cared_persons.id", ondelete="CASCADE"), nullable=False, index=True)
+    day = Column(Date, nullable=False)  # Día UTC
+    
+    # Polilínea simplificada: JSON [[lat, lng, epoch_segundos], ...]
+    points = Column(Text, nullable=False)
+    point_count = Column(Integer, nullable=False)
+    raw_point_count = Column(Integer, nullable=False)  # Fixes crudos que resumió
+    distance_meters = Column(Float, nullable=True)
+    tolerance_meters = Column(Float, nullable=False)
+    
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    ended_at = Column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self):
+        return f"<LocationTrajectory(cared_person_id='{self.cared_person_id}', day='{self.day}', points={self.point_count})>"
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import BaseModel
+
+class MedicationAdherenceDaily(BaseModel):
+    """Resumen diario de tomas por pauta de medicación (se recalcula de forma incremental)"""
+    __tablename__ = "medication_adherence_daily"
+    __table_args__ = (
+        UniqueConstraint("medication_schedule_id", "day", name="uq_medication_adherence_daily_schedule_day"),
+    )
+    
+    medication_schedule_id = Column(UUID(as_uuid=True), ForeignKey("medication_schedules.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False, index=True)  # Día local (medication_timezone)
+    cared_person_id = Column(UUID(as_uuid=True), ForeignKey("cared_persons.id", ondelete="CASCADE"), nullable=False, index=True)
+    institution_id = Column(Integer, ForeignKey("institutions.id", ondelete="SET NULL"), nullable=True, index=True)
+    
+    doses_logged = Column(Integer, nullable=False, default=0)  # Tomadas + omitidas
+    doses_taken = Column(Integer, nullable=False, default=0)
+    doses_missed = Column(Integer, nullable=False, default=0)
+    doses_timed = Column(Integer, nullable=False, default=0)  # Tomadas con horario de la pauta conocido
+    doses_on_time = Column(Integer, nullable=False, default=0)  # Dentro de la tolerancia del horario
+    side_effect_reports = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<MedicationAdherenceDaily(schedule='{self.medication_schedule_id}', day='{self.day}', taken={self.doses_taken}/{self.doses_logged})>"
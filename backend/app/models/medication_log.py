@@ -1,13 +1,21 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, search_vector_column, search_vector_index
 import uuid
 
 class MedicationLog(BaseModel):
     __tablename__ = 'medication_logs'
+    # Búsqueda clínica: tsvector generado (spanish) con índice GIN
+    SEARCH_COLUMNS = (("side_effects", "B"), ("notes", "B"))
+    __table_args__ = (
+        search_vector_index("medication_logs"),
+        # Refresco incremental de la adherencia (filas cambiadas desde el último)
+        Index("ix_medication_logs_updated_at", "updated_at"),
+    )
+    search_vector = search_vector_column(*SEARCH_COLUMNS)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    medication_schedule_id = Column(UUID(as_uuid=True), ForeignKey('medication_schedules.id'), nullable=False)
+    medication_schedule_id = Column(UUID(as_uuid=True), ForeignKey('medication_schedules.id'), nullable=False, index=True)
     taken_at = Column(DateTime(timezone=True), nullable=False)
     confirmed_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=True)
     confirmation_method = Column(String(50), nullable=True)  # app, caregiver, auto, etc.
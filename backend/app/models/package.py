@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Date, Float
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Date, Float, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.models.base import BaseModel
@@ -146,6 +146,13 @@ class PackageAddOn(BaseModel):
 class UserPackage(BaseModel):
     """UserPackage model - User subscriptions to packages"""
     __tablename__ = "user_packages"
+    __table_args__ = (
+        # Suscripciones con código de referido cuya comisión no se generó (lote de referidos)
+        Index(
+            "ix_user_packages_referral_pending", "referral_code_used",
+            postgresql_where=text("referral_code_used IS NOT NULL AND NOT referral_commission_applied"),
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
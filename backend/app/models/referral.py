@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, Date, Float, DateTime
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, Date, Float, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
@@ -9,6 +9,9 @@ from datetime import datetime
 class Referral(BaseModel):
     """Referral model for tracking referrals and commissions"""
     __tablename__ = "referrals"
+    __table_args__ = (
+        Index("ix_referrals_status_created_at", "status_type_id", "created_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Date
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 from app.models.reminder_type import ReminderType
@@ -33,7 +33,7 @@ class Reminder(BaseModel):
     is_important = Column(Boolean, default=False, nullable=False)
     
     # Additional data
-    reminder_data = Column(Text, nullable=True)  # JSON string with reminder details
+    reminder_data = Column(JSONB, nullable=True)  # Reminder details
     notes = Column(Text, nullable=True)
     
     # Relationships
@@ -2,12 +2,16 @@ from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, T
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from app.models.base import Base
+from app.models.base import Base, search_vector_column, search_vector_index
 from app.models.report_type import ReportType
 import uuid
 
 class Report(Base):
     __tablename__ = 'reports'
+    # Búsqueda clínica: tsvector generado (spanish) con índice GIN
+    SEARCH_COLUMNS = (("title", "A"), ("description", "B"))
+    __table_args__ = (search_vector_index("reports"),)
+    search_vector = search_vector_column(*SEARCH_COLUMNS)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
@@ -15,7 +19,7 @@ class Report(Base):
     attached_files = Column(JSONB, default=list)  # List of file metadata dicts
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    cared_person_id = Column(UUID(as_uuid=True), ForeignKey('cared_persons.id'), nullable=True)
+    cared_person_id = Column(UUID(as_uuid=True), ForeignKey('cared_persons.id'), nullable=True, index=True)
     created_by_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     is_autocuidado = Column(Boolean, default=False)
 
@@ -2,12 +2,16 @@ from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Date
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from app.models.base import BaseModel
+from app.models.base import BaseModel, search_vector_column, search_vector_index
 import uuid
 
 class RestraintProtocol(BaseModel):
     """RestraintProtocol model for safety protocols and incident prevention"""
     __tablename__ = "restraint_protocols"
+    # Búsqueda clínica: tsvector generado (spanish) con índice GIN
+    SEARCH_COLUMNS = (("title", "A"), ("justification", "B"), ("description", "B"), ("risk_assessment", "C"), ("notes", "C"))
+    __table_args__ = (search_vector_index("restraint_protocols"),)
+    search_vector = search_vector_column(*SEARCH_COLUMNS)
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
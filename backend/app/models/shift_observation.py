@@ -2,7 +2,7 @@ from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, Float,
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from app.models.base import Base
+from app.models.base import Base, search_vector_column, search_vector_index
 from app.models.shift_observation_type import ShiftObservationType
 import uuid
 
@@ -16,6 +16,15 @@ class ShiftObservation(Base):
     """
     
     __tablename__ = "shift_observations"
+    # Búsqueda clínica: tsvector generado (spanish) con índice GIN
+    SEARCH_COLUMNS = (
+        ("incident_details", "A"), ("safety_concerns", "A"),
+        ("behavior_notes", "B"), ("handover_notes", "B"), ("doctor_notes", "B"), ("medication_notes", "B"),
+        ("side_effects_observed", "B"), ("restraint_details", "B"),
+        ("skin_condition", "C"), ("special_diet_notes", "C"), ("exercise_details", "C"), ("family_notes", "C"),
+    )
+    __table_args__ = (search_vector_index("shift_observations"),)
+    search_vector = search_vector_column(*SEARCH_COLUMNS)
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
@@ -93,7 +102,7 @@ class ShiftObservation(Base):
     verified_at = Column(DateTime, comment="Fecha de verificación")
     
     # Relaciones
-    cared_person_id = Column(UUID(as_uuid=True), ForeignKey("cared_persons.id"), nullable=False)
+    cared_person_id = Column(UUID(as_uuid=True), ForeignKey("cared_persons.id"), nullable=False, index=True)
     caregiver_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     institution_id = Column(Integer, ForeignKey("institutions.id", ondelete="SET NULL"), comment="Institución asociada")
     
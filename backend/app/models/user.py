@@ -1,7 +1,7 @@
 from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, DateTime, Float
 from sqlalchemy.orm import relationship, joinedload
 from sqlalchemy.sql import func
-from app.models.base import BaseModel
+from app.models.base import BaseModel, trigram_index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from app.core.database import get_db
@@ -10,6 +10,13 @@ from app.models.user_role import UserRole
 class User(BaseModel):
     """User model with roles, institution, and freelance support"""
     __tablename__ = "users"
+    # Búsquedas por texto parcial (listados y /search/suggest)
+    __table_args__ = (
+        trigram_index("users", "first_name"),
+        trigram_index("users", "last_name"),
+        trigram_index("users", "email"),
+        trigram_index("users", "username"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     # Authentication
@@ -33,6 +40,9 @@ class User(BaseModel):
     is_freelance = Column(Boolean, default=False, nullable=False)
     hourly_rate = Column(Integer, nullable=True)  # Rate in cents
     availability = Column(Text, nullable=True)  # JSON string
+    latitude = Column(Float, nullable=True)  # Ubicación base para emparejamiento
+    longitude = Column(Float, nullable=True)
+    service_radius_km = Column(Float, nullable=True)  # Distancia máxima que acepta recorrer
     
     # Status
     is_verified = Column(Boolean, default=False, nullable=False)
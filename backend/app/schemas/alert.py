@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
-from .base import BaseResponse, BaseCreate, BaseUpdate
+from .base import BaseResponse, BaseCreate, BaseUpdate, JSONPayload
 
 class AlertBase(BaseModel):
     alert_type_id: int = Field(..., description="ID del tipo de alerta")
@@ -10,7 +10,7 @@ class AlertBase(BaseModel):
     severity: str = Field(default="medium", max_length=20)
     title: str = Field(..., min_length=1, max_length=200)
     message: Optional[str] = None
-    alert_data: Optional[str] = None  # JSON string
+    alert_data: JSONPayload = None
     status_type_id: Optional[int] = Field(None, description="ID del tipo de estado")
     acknowledged_at: Optional[datetime] = None
     resolved_at: Optional[datetime] = None
@@ -36,6 +36,9 @@ class AlertUpdate(AlertBase, BaseUpdate):
 class AlertResponse(AlertBase, BaseResponse):
     is_active: bool
     is_critical: bool
+    escalated_at: Optional[datetime] = None
+    occurrence_count: int = 1
+    last_seen_at: Optional[datetime] = None
 
 class AlertInDB(AlertBase, BaseResponse):
     pass
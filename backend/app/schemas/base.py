@@ -1,7 +1,22 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, BeforeValidator, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Any, Optional
 from uuid import UUID
+import json
+
+
+def _parse_json_text(value: Any) -> Any:
+    """Aceptar payloads enviados como string JSON (formato anterior a JSONB)"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+# Payload libre guardado en una columna JSONB
+JSONPayload = Annotated[Optional[Any], BeforeValidator(_parse_json_text)]
 
 class BaseSchema(BaseModel):
     """Base schema with common configuration"""
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+class BatchRunResponse(BaseModel):
+    id: int
+    kind: str
+    run_key: str
+    status: str  # running, completed, failed
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    stats: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import date
 from uuid import UUID
 from .base import BaseResponse, BaseCreate, BaseUpdate
@@ -45,3 +45,18 @@ class CaredPersonResponse(CaredPersonBase, BaseResponse):
 
 class CaredPersonInDB(CaredPersonBase, BaseResponse):
     pass
+
+class CaredPersonOverview(BaseModel):
+    """Resumen de una persona bajo cuidado; solo incluye las secciones pedidas"""
+    cared_person: CaredPersonResponse
+    medical_profile: Optional[Dict[str, Any]] = None
+    diagnoses: Optional[List[Dict[str, Any]]] = None
+    allergies: Optional[List[Dict[str, Any]]] = None
+    medication_schedules: Optional[List[Dict[str, Any]]] = None
+    medication_logs: Optional[List[Dict[str, Any]]] = None  # Últimos 7 días
+    reminders: Optional[List[Dict[str, Any]]] = None
+    alerts: Optional[List[Dict[str, Any]]] = None  # Sin resolver
+    devices: Optional[List[Dict[str, Any]]] = None
+    assignments: Optional[List[Dict[str, Any]]] = None
+    shift_observations: Optional[Dict[str, Any]] = None  # Conteos de 7 días y últimas observaciones
+    restraint_protocols: Optional[List[Dict[str, Any]]] = None  # En curso
@@ -1,8 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
 from uuid import UUID
-from .base import BaseResponse, BaseCreate, BaseUpdate
+from .base import BaseSchema, BaseResponse, BaseCreate, BaseUpdate
 
 class CaregiverAssignmentBase(BaseModel):
     caregiver_id: UUID
@@ -52,4 +52,22 @@ class CaregiverAssignmentResponse(CaregiverAssignmentBase, BaseResponse):
     estimated_total_cost: float
 
 class CaregiverAssignmentInDB(CaregiverAssignmentBase, BaseResponse):
-    pass 
\ No newline at end of file
+    pass 
+class ShiftCoverageEntry(BaseSchema):
+    assignment_id: int
+    caregiver_id: UUID
+    cared_person_id: UUID
+    institution_id: Optional[int] = None
+    is_primary: bool
+
+class ShiftCoverageGap(BaseModel):
+    cared_person_id: UUID
+    start: datetime
+    end: datetime
+
+class ShiftCoverageOverlap(BaseModel):
+    caregiver_id: UUID
+    start: datetime
+    end: datetime
+    assignment_ids: List[int]
+    cared_person_ids: List[UUID]
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+
+class CaregiverMatchRequest(BaseModel):
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    care_level: Optional[str] = Field(None, max_length=50)  # low, medium, high, critical
+    mobility_level: Optional[str] = Field(None, max_length=50)  # independent, assisted, wheelchair, bedridden
+    special_needs: Optional[str] = None
+    radius_km: Optional[float] = Field(None, gt=0, le=500)
+    max_hourly_rate: Optional[int] = Field(None, ge=0)  # Rate in cents
+    institution_id: Optional[int] = None
+    freelance_only: bool = True
+    limit: int = Field(20, ge=1, le=100)
+
+class CaregiverMatch(BaseModel):
+    caregiver_id: UUID
+    name: str
+    specialization: Optional[str] = None
+    score: float
+    distance_km: Optional[float] = None
+    hourly_rate: Optional[int] = None
+    experience_years: int
+    matched_skills: List[str]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+
+class ClinicalSearchResult(BaseModel):
+    kind: str  # shift_observation, diagnosis, restraint_protocol, medication_log, report
+    id: UUID
+    cared_person_id: Optional[UUID] = None
+    occurred_at: Optional[datetime] = None
+    title: Optional[str] = None
+    snippet: Optional[str] = None  # Fragmento con los términos entre <mark></mark>
+    rank: float
@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
-from .base import BaseResponse, BaseCreate, BaseUpdate
+from .base import BaseResponse, BaseCreate, BaseUpdate, JSONPayload
 
 class DeviceBase(BaseModel):
     device_id: str = Field(..., min_length=1, max_length=100)
@@ -19,12 +19,12 @@ class DeviceBase(BaseModel):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     altitude: Optional[float] = None
-    settings: Optional[str] = None  # JSON string
+    settings: JSONPayload = None
     firmware_version: Optional[str] = Field(None, max_length=50)
     hardware_version: Optional[str] = Field(None, max_length=50)
     user_id: Optional[UUID] = None
     cared_person_id: Optional[UUID] = None
-    institution_id: Optional[UUID] = None
+    institution_id: Optional[int] = None
 
 class DeviceCreate(DeviceBase, BaseCreate):
     pass
@@ -44,12 +44,16 @@ class DeviceUpdate(BaseUpdate):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     altitude: Optional[float] = None
-    settings: Optional[str] = None  # JSON string
+    settings: JSONPayload = None
     firmware_version: Optional[str] = Field(None, max_length=50)
     hardware_version: Optional[str] = Field(None, max_length=50)
     user_id: Optional[UUID] = None
     cared_person_id: Optional[UUID] = None
-    institution_id: Optional[UUID] = None
+    institution_id: Optional[int] = None
+
+class DeviceHeartbeat(BaseModel):
+    battery_level: Optional[int] = Field(None, ge=0, le=100)
+    signal_strength: Optional[int] = Field(None, ge=0, le=100)
 
 class DeviceResponse(DeviceBase, BaseResponse):
     is_online: bool
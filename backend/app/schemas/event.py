@@ -2,13 +2,13 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
-from .base import BaseResponse, BaseCreate, BaseUpdate
+from .base import BaseResponse, BaseCreate, BaseUpdate, JSONPayload
 
 class EventBase(BaseModel):
     event_type_id: int = Field(..., description="ID del tipo de evento")
     event_subtype: Optional[str] = Field(None, max_length=50)
     severity: str = Field(default="info", max_length=20)
-    event_data: Optional[str] = None  # JSON string
+    event_data: JSONPayload = None
     message: Optional[str] = None
     source: Optional[str] = Field(None, max_length=100)
     latitude: Optional[float] = None
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+
+class HandoverReportRequest(BaseModel):
+    institution_id: int
+    format: str = Field("html", pattern="^(html|pdf)$")
+    start: Optional[datetime] = None  # Por defecto, las últimas `handover_report_window_hours`
+    end: Optional[datetime] = None
+    cared_person_ids: Optional[List[UUID]] = None  # Acotar a un sector
+
+class HandoverReportJob(BaseModel):
+    id: UUID  # Trabajo de la cola (también visible en /jobs/{id})
+    institution_id: int
+    format: str
+    status: str  # queued, running, completed, failed, cancelled
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    residents: Optional[int] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from uuid import UUID
+from datetime import datetime
+
+class JobResponse(BaseModel):
+    id: UUID
+    kind: str
+    status: str  # queued, running, completed, failed, cancelled
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    progress: float
+    progress_message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_by: Optional[UUID] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
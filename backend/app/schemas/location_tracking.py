@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date, datetime
+from uuid import UUID
+
+class LocationFix(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    recorded_at: datetime
+    altitude: Optional[float] = None
+    accuracy: Optional[float] = Field(None, ge=0)
+    speed: Optional[float] = Field(None, ge=0)
+    heading: Optional[float] = Field(None, ge=0, lt=360)
+    tracking_method: Optional[str] = Field(None, max_length=50)
+    battery_level: Optional[int] = Field(None, ge=0, le=100)
+    signal_strength: Optional[int] = Field(None, ge=0, le=100)
+
+class LocationBatch(BaseModel):
+    device_id: UUID
+    cared_person_id: Optional[UUID] = Field(None, description="Por defecto, la persona asignada al dispositivo")
+    fixes: List[LocationFix] = Field(..., min_length=1)
+
+class GeofenceTransition(BaseModel):
+    geofence_id: int
+    name: str
+    transition: str  # enter, exit
+    recorded_at: datetime
+
+class LocationBatchResult(BaseModel):
+    accepted: int
+    geofence_transitions: List[GeofenceTransition] = []
+
+class TrajectoryPoint(BaseModel):
+    latitude: float
+    longitude: float
+    recorded_at: datetime
+
+class TrajectoryResponse(BaseModel):
+    cared_person_id: UUID
+    day: date
+    compacted: bool  # True si proviene de la trayectoria ya compactada
+    raw_point_count: int
+    point_count: int
+    distance_meters: float
+    tolerance_meters: float
+    points: List[TrajectoryPoint]
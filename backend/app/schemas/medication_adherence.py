@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from uuid import UUID
+from datetime import date
+
+class AdherenceMetrics(BaseModel):
+    doses_logged: int
+    doses_taken: int
+    doses_missed: int
+    doses_timed: int  # Tomadas con horario de la pauta conocido
+    doses_on_time: int
+    side_effect_reports: int
+    taken_ratio: Optional[float] = None  # None sin tomas registradas
+    on_time_ratio: Optional[float] = None
+    side_effect_rate: Optional[float] = None
+
+class ScheduleAdherence(AdherenceMetrics):
+    medication_schedule_id: UUID
+    medication_name: str
+
+class CaredPersonAdherenceEntry(AdherenceMetrics):
+    cared_person_id: UUID
+    name: str
+
+class CaredPersonAdherence(BaseModel):
+    start: date
+    end: date
+    totals: AdherenceMetrics
+    schedules: List[ScheduleAdherence]
+
+class InstitutionAdherence(BaseModel):
+    start: date
+    end: date
+    totals: AdherenceMetrics
+    cared_persons: List[CaredPersonAdherenceEntry]
+
+class AdherenceTrendPoint(AdherenceMetrics):
+    day: date
@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime, date
 from uuid import UUID
-from .base import BaseResponse, BaseCreate, BaseUpdate
+from .base import BaseResponse, BaseCreate, BaseUpdate, JSONPayload
 
 class ReminderBase(BaseModel):
     reminder_type_id: int = Field(..., description="ID del tipo de recordatorio normalizado")
@@ -16,7 +16,7 @@ class ReminderBase(BaseModel):
     completed_by: Optional[UUID] = None
     priority: int = Field(default=5, ge=1, le=10)
     is_important: bool = False
-    reminder_data: Optional[str] = None  # JSON string
+    reminder_data: JSONPayload = None
     notes: Optional[str] = None
     user_id: Optional[UUID] = None
     cared_person_id: Optional[UUID] = None
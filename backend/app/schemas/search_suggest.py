@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from typing import Union
+from uuid import UUID
+
+class SearchSuggestion(BaseModel):
+    kind: str  # user, cared_person, institution
+    id: Union[UUID, int]
+    label: str
@@ -17,6 +17,9 @@ class UserBase(BaseModel):
     is_freelance: bool = False
     hourly_rate: Optional[int] = Field(None, ge=0)  # Rate in cents
     availability: Optional[str] = None  # JSON string
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    service_radius_km: Optional[float] = Field(None, gt=0)
     is_verified: bool = False
     institution_id: Optional[int] = None
 
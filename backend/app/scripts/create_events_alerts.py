@@ -16,7 +16,6 @@ from app.models.user import User
 from datetime import datetime, timedelta
 import random
 import uuid
-import json
 
 def get_status_type_id(db: Session, name: str, category: str) -> int:
     status_type = db.query(StatusType).filter_by(name=name, category=category).first()
@@ -118,7 +117,7 @@ def create_events(db: Session, cared_persons: list, devices: list) -> list:
                     event_type_id=event_type_id,
                     event_subtype=event_type_name,
                     severity=random.choice(['low', 'medium', 'high']),
-                    event_data=json.dumps(event_data),
+                    event_data=event_data,
                     message=message,
                     source='device' if device else 'system',
                     latitude=random.uniform(-34.6, -34.5) if event_type_name == 'location_update' else None,
@@ -245,7 +244,7 @@ def create_alerts(db: Session, cared_persons: list, devices: list) -> list:
                     severity=severity,
                     title=title,
                     message=message,
-                    alert_data=json.dumps(alert_data),
+                    alert_data=alert_data,
                     status_type_id=status_type_id,
                     priority=random.randint(1, 10),
                     escalation_level=random.randint(1, 3),
@@ -2,55 +2,120 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, desc
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 
+from app.core.config import settings
 from app.models.alert import Alert
-from app.models.elderly_person import ElderlyPerson
+from app.models.status_type import StatusType
 from app.schemas.alert import AlertCreate, AlertUpdate
 from app.core.exceptions import NotFoundException, ValidationException
+from app.services.alert_dedup import alert_deduplicator
+from app.services.live_feed import live_feed
+from app.models.cared_person import CaredPerson
 
 class AlertService:
     """Servicio para gestión de alertas del sistema"""
     
     @staticmethod
-    def create_alert(db: Session, alert_data: AlertCreate) -> Alert:
+    def create_alert(db: Session, alert_data: AlertCreate, user_id: Optional[UUID] = None) -> Alert:
         """
         Crear una nueva alerta
         
+        Las repeticiones de una alerta de dispositivo dentro de la ventana de
+        deduplicación se colapsan en la alerta abierta existente, incrementando
+        su contador de ocurrencias.
+        
         Args:
             db: Sesión de base de datos
             alert_data: Datos de la alerta a crear
+            user_id: Usuario propietario de la alerta
             
         Returns:
-            Alert: Alerta creada
-            
-        Raises:
-            NotFoundException: Si el adulto mayor no existe
+            Alert: Alerta creada o alerta existente en la que se colapsó
         """
-        # Verificar que el adulto mayor existe
-        elderly_person = db.query(ElderlyPerson).filter(
-            ElderlyPerson.id == alert_data.elderly_person_id
-        ).first()
-        
-        if not elderly_person:
-            raise NotFoundException(f"Adulto mayor con ID {alert_data.elderly_person_id} no encontrado")
+        data = alert_data.model_dump()
+        data.pop('user_id', None)
+        
+        # Asignar status_type_id por defecto si no se proporciona
+        if not data.get('status_type_id'):
+            active_status = db.query(StatusType).filter_by(name="active").first()
+            if active_status:
+                data['status_type_id'] = active_status.id
+        
+        if settings.alert_dedup_enabled:
+            duplicate_id = alert_deduplicator.find_duplicate(db, data)
+            if duplicate_id:
+                collapsed = AlertService.record_occurrence(db, duplicate_id)
+                if collapsed:
+                    AlertService.publish(db, "alert.repeated", collapsed)
+                    return collapsed
+                alert_deduplicator.forget(data)
         
-        # Crear la alerta
         db_alert = Alert(
-            elderly_person_id=alert_data.elderly_person_id,
-            alert_type=alert_data.alert_type,
-            message=alert_data.message,
-            severity=alert_data.severity,
-            created_by_id=alert_data.created_by_id,
-            received_by_id=alert_data.received_by_id
+            **data,
+            user_id=user_id,
+            last_seen_at=datetime.now(timezone.utc)
         )
         
         db.add(db_alert)
         db.commit()
         db.refresh(db_alert)
+        alert_deduplicator.remember(db_alert)
+        AlertService.publish(db, "alert.created", db_alert)
         
         return db_alert
     
+    @staticmethod
+    def publish(db: Session, topic: str, alert: Alert) -> None:
+        """
+        Publicar una alerta en el canal en vivo del panel web
+        
+        Args:
+            db: Sesión de base de datos
+            topic: Tipo de evento (alert.created, alert.repeated)
+            alert: Alerta a publicar
+        """
+        institution_id = None
+        if alert.cared_person_id:
+            institution_id = db.query(CaredPerson.institution_id).filter(
+                CaredPerson.id == alert.cared_person_id
+            ).scalar()
+        live_feed.publish(topic, {
+            "alert_id": str(alert.id),
+            "title": alert.title,
+            "severity": alert.severity,
+            "alert_type_id": alert.alert_type_id,
+            "alert_subtype": alert.alert_subtype,
+            "device_id": str(alert.device_id) if alert.device_id else None,
+            "occurrence_count": alert.occurrence_count,
+            "created_at": alert.created_at.isoformat() if alert.created_at else None,
+        }, institution_id=institution_id, cared_person_id=alert.cared_person_id)
+    
+    @staticmethod
+    def record_occurrence(db: Session, alert_id: UUID) -> Optional[Alert]:
+        """
+        Registrar una repetición sobre una alerta abierta
+        
+        Args:
+            db: Sesión de base de datos
+            alert_id: ID de la alerta abierta
+            
+        Returns:
+            Alert: Alerta actualizada o None si ya no está abierta
+        """
+        updated = db.query(Alert).filter(
+            Alert.id == alert_id,
+            Alert.resolved_at.is_(None)
+        ).update({
+            "occurrence_count": Alert.occurrence_count + 1,
+            "last_seen_at": datetime.now(timezone.utc)
+        }, synchronize_session=False)
+        db.commit()
+        
+        if not updated:
+            return None
+        return AlertService.get_alert(db, alert_id)
+    
     @staticmethod
     def get_alert(db: Session, alert_id: UUID) -> Optional[Alert]:
         """
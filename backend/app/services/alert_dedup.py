@@ -0,0 +1,195 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+import logging
+import threading
+import time
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.alert import Alert
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryDedupIndex:
+    """Índice de huellas con ventana deslizante y token bucket por dispositivo, en memoria"""
+
+    def __init__(self, window_seconds: int, rate_limit_per_minute: int, clock=time.monotonic):
+        self.window_seconds = window_seconds
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.clock = clock
+        self._fingerprints: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        # Las huellas están ordenadas por última vez vista: se purgan desde el frente
+        while self._fingerprints:
+            key, (_, seen) = next(iter(self._fingerprints.items()))
+            if now - seen <= self.window_seconds:
+                break
+            self._fingerprints.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = self.clock()
+        with self._lock:
+            self._prune(now)
+            hit = self._fingerprints.get(key)
+            if hit is None:
+                return None
+            self._fingerprints[key] = (hit[0], now)
+            self._fingerprints.move_to_end(key)
+            return hit[0]
+
+    def put(self, key: str, alert_id: str) -> None:
+        now = self.clock()
+        with self._lock:
+            self._fingerprints[key] = (alert_id, now)
+            self._fingerprints.move_to_end(key)
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._fingerprints.pop(key, None)
+
+    def allow(self, device_key: str) -> bool:
+        """Consumir un token del bucket del dispositivo; False si está agotado"""
+        capacity = float(self.rate_limit_per_minute)
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(device_key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * capacity / 60.0)
+            if tokens < 1:
+                self._buckets[device_key] = (tokens, now)
+                return False
+            self._buckets[device_key] = (tokens - 1, now)
+            return True
+
+
+class RedisDedupIndex:
+    """Misma interfaz que MemoryDedupIndex, compartida entre procesos vía Redis"""
+
+    PREFIX = "alert_dedup"
+
+    def __init__(self, window_seconds: int, rate_limit_per_minute: int, redis_url: str):
+        import redis
+
+        self.window_seconds = window_seconds
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.client = redis.Redis.from_url(redis_url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        fp_key = f"{self.PREFIX}:fp:{key}"
+        pipe = self.client.pipeline()
+        pipe.get(fp_key)
+        pipe.expire(fp_key, self.window_seconds)
+        alert_id, _ = pipe.execute()
+        return alert_id
+
+    def put(self, key: str, alert_id: str) -> None:
+        self.client.set(f"{self.PREFIX}:fp:{key}", alert_id, ex=self.window_seconds)
+
+    def forget(self, key: str) -> None:
+        self.client.delete(f"{self.PREFIX}:fp:{key}")
+
+    def allow(self, device_key: str) -> bool:
+        # Ventana fija por minuto: suficiente para detectar tormentas entre procesos
+        rate_key = f"{self.PREFIX}:rate:{device_key}:{int(time.time() // 60)}"
+        pipe = self.client.pipeline()
+        pipe.incr(rate_key)
+        pipe.expire(rate_key, 60)
+        count, _ = pipe.execute()
+        return count <= self.rate_limit_per_minute
+
+
+class AlertDeduplicator:
+    """
+    Colapsa alertas repetidas de un mismo dispositivo en una sola alerta abierta
+
+    La huella es (dispositivo, tipo, persona bajo cuidado, subtipo). Mientras la
+    huella se siga viendo dentro de la ventana, las repeticiones incrementan
+    `occurrence_count` de la alerta abierta en lugar de crear filas nuevas. Solo
+    se colapsan alertas con la misma huella: si un dispositivo supera su límite
+    de alertas nuevas por minuto, una huella distinta (p. ej. una caída durante
+    una tormenta de batería baja) igual crea su alerta y la tormenta queda en
+    el log, para no perder su tipo, severidad ni escalamiento.
+    """
+
+    def __init__(self, index=None):
+        self._index = index
+
+    @property
+    def index(self):
+        if self._index is None:
+            window = settings.alert_dedup_window_seconds
+            limit = settings.alert_device_rate_limit_per_minute
+            if settings.alert_dedup_backend == "redis":
+                self._index = RedisDedupIndex(window, limit, settings.redis_url)
+            else:
+                self._index = MemoryDedupIndex(window, limit)
+        return self._index
+
+    @staticmethod
+    def fingerprint(data: Dict[str, Any]) -> str:
+        return ":".join(str(data.get(field) or "") for field in (
+            "device_id", "alert_type_id", "cared_person_id", "alert_subtype"
+        ))
+
+    def find_duplicate(self, db: Session, data: Dict[str, Any]) -> Optional[UUID]:
+        """
+        Buscar la alerta abierta en la que colapsar una alerta nueva
+
+        Args:
+            db: Sesión de base de datos
+            data: Campos de la alerta a crear
+
+        Returns:
+            UUID: ID de la alerta existente, o None si hay que crear una nueva
+        """
+        device_id = data.get("device_id")
+        if not device_id:
+            return None
+        key = self.fingerprint(data)
+        alert_id = self.index.get(key)
+        if alert_id:
+            return UUID(alert_id)
+
+        # El índice se pierde al reiniciar: se consulta la base una sola vez por huella
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.alert_dedup_window_seconds)
+        query = db.query(Alert.id).filter(
+            Alert.device_id == device_id,
+            Alert.alert_type_id == data.get("alert_type_id"),
+            Alert.resolved_at.is_(None),
+            func.coalesce(Alert.last_seen_at, Alert.created_at) >= cutoff,
+        )
+        for column in ("cared_person_id", "alert_subtype"):
+            value = data.get(column)
+            attr = getattr(Alert, column)
+            query = query.filter(attr == value if value is not None else attr.is_(None))
+        row = query.order_by(Alert.created_at.desc()).first()
+        if row:
+            self.index.put(key, str(row.id))
+            return row.id
+
+        if not self.index.allow(str(device_id)):
+            logger.warning("Alert storm from device %s: creating alert for new fingerprint %s", device_id, key)
+        return None
+
+    def remember(self, alert: Alert) -> None:
+        """Registrar la huella de una alerta recién creada"""
+        if alert.device_id:
+            data = {column: getattr(alert, column) for column in (
+                "device_id", "alert_type_id", "cared_person_id", "alert_subtype"
+            )}
+            self.index.put(self.fingerprint(data), str(alert.id))
+
+    def forget(self, data: Dict[str, Any]) -> None:
+        """Olvidar una huella cuya alerta ya no está abierta"""
+        self.index.forget(self.fingerprint(data))
+
+
+# Instancia global usada por AlertService
+alert_deduplicator = AlertDeduplicator()
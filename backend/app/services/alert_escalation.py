@@ -0,0 +1,417 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+import json
+import logging
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.scheduler import DeadlineScheduler
+from app.core.timeutils import as_utc, utc_now
+from app.models.alert import Alert
+from app.models.alert_type import AlertType
+from app.models.cared_person import CaredPerson
+from app.models.emergency_protocol import EmergencyProtocol
+from app.services.live_feed import LiveFeedNotifier, live_feed
+from app.services.notifications import CompositeNotifier, LoggingNotifier, Notifier
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+# Segundos que una alerta sin reconocer permanece en cada nivel antes de escalar.
+# El índice i es la espera para pasar del nivel i al i + 1; las críticas escalan
+# al nivel 1 en cuanto se crean.
+ESCALATION_SCHEDULE: Dict[str, Tuple[int, ...]] = {
+    "critical": (0, 120, 300, 600, 900),
+    "high": (300, 600, 900, 1800, 3600),
+    "medium": (900, 1800, 3600, 7200, 14400),
+    "low": (3600, 7200, 14400, 28800, 86400),
+}
+
+# Tope del backoff entre reintentos de una alerta cuyo escalamiento falló
+MAX_RETRY_DELAY = timedelta(minutes=10)
+
+
+def escalation_deadline(severity: Optional[str], level: int, anchor: datetime) -> Optional[datetime]:
+    """
+    Calcular cuándo debe escalar una alerta desde su nivel actual
+
+    Args:
+        severity: Severidad de la alerta
+        level: Nivel de escalamiento actual
+        anchor: Creación de la alerta o momento del último escalamiento
+
+    Returns:
+        datetime: Plazo del próximo escalamiento, o None si ya está en el nivel máximo
+    """
+    schedule = ESCALATION_SCHEDULE.get(severity or "medium", ESCALATION_SCHEDULE["medium"])
+    if level >= len(schedule):
+        return None
+    return as_utc(anchor) + timedelta(seconds=schedule[level])
+
+
+def _parse_json_list(raw: Optional[str], keep_text: bool = False) -> List[Any]:
+    """Interpretar una columna Text con JSON; tolera texto plano y valores sueltos"""
+    if not raw:
+        return []
+    try:
+        value = json.loads(raw)
+    except (TypeError, ValueError):
+        return [raw] if keep_text else []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+@dataclass
+class ParsedProtocol:
+    """Protocolo de emergencia con pasos y contactos ya deserializados"""
+    id: int
+    name: str
+    crisis_type: str
+    severity_threshold: str
+    institution_id: Optional[int]
+    is_default: bool
+    steps: List[Any] = field(default_factory=list)
+    contacts: List[Any] = field(default_factory=list)
+
+    def applies_to(self, severity: Optional[str]) -> bool:
+        return SEVERITY_RANK.get(severity or "medium", 1) >= SEVERITY_RANK.get(self.severity_threshold, 1)
+
+    def contacts_for_level(self, level: int) -> List[Any]:
+        """Contactos a avisar en un nivel: con `level` explícito, o los primeros `level`"""
+        leveled = [c for c in self.contacts if isinstance(c, dict) and "level" in c]
+        if leveled:
+            return [c for c in leveled if int(c["level"]) <= level]
+        return self.contacts[:level]
+
+    def step_for_level(self, level: int) -> Optional[Any]:
+        if 0 < level <= len(self.steps):
+            return self.steps[level - 1]
+        return None
+
+
+class EmergencyProtocolCache:
+    """Índice en memoria de protocolos activos por (institución, tipo de crisis)"""
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.emergency_protocol_cache_ttl_seconds
+        self._index: Dict[Tuple[Optional[int], str], List[ParsedProtocol]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Forzar la recarga en el próximo uso"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _load(self, db: Session) -> None:
+        index: Dict[Tuple[Optional[int], str], List[ParsedProtocol]] = {}
+        for protocol in db.query(EmergencyProtocol).filter(EmergencyProtocol.is_active == True).all():
+            parsed = ParsedProtocol(
+                id=protocol.id,
+                name=protocol.name,
+                crisis_type=protocol.crisis_type,
+                severity_threshold=protocol.severity_threshold or "medium",
+                institution_id=protocol.institution_id,
+                is_default=bool(protocol.is_default),
+                steps=_parse_json_list(protocol.steps, keep_text=True),
+                contacts=_parse_json_list(protocol.contacts),
+            )
+            index.setdefault((parsed.institution_id, parsed.crisis_type), []).append(parsed)
+        for candidates in index.values():
+            candidates.sort(key=lambda p: (not p.is_default, SEVERITY_RANK.get(p.severity_threshold, 1)))
+        self._index = index
+        self._loaded_at = time.monotonic()
+
+    def match(
+        self,
+        db: Session,
+        institution_id: Optional[int],
+        crisis_keys: Sequence[Optional[str]],
+        severity: Optional[str],
+    ) -> Optional[ParsedProtocol]:
+        """
+        Buscar el protocolo aplicable a una alerta
+
+        Se prefiere el protocolo de la institución sobre el global, y dentro de
+        cada uno el marcado como predeterminado.
+        """
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+                self._load(db)
+            index = self._index
+        keys = [key for key in crisis_keys if key]
+        for owner in (institution_id, None):
+            for key in keys:
+                for protocol in index.get((owner, key), []):
+                    if protocol.applies_to(severity):
+                        return protocol
+        return None
+
+
+@dataclass
+class TrackedAlert:
+    """Estado mínimo de una alerta abierta dentro del índice de plazos"""
+    alert_id: UUID
+    title: str
+    severity: str
+    priority: int
+    level: int
+    anchor: datetime
+    deadline: datetime
+    alert_subtype: Optional[str] = None
+    alert_type_name: Optional[str] = None
+    cared_person_id: Optional[UUID] = None
+    institution_id: Optional[int] = None
+    failures: int = 0
+
+
+class AlertEscalationEngine:
+    """
+    Motor de escalamiento de alertas sin reconocer
+
+    Las alertas abiertas se indexan en un heap por su próximo plazo de
+    escalamiento. El hilo del motor duerme hasta el plazo más cercano y se
+    despierta en cuanto llega una alerta con un plazo anterior, de modo que una
+    alerta crítica escala al nivel 1 inmediatamente después de crearse. Los
+    plazos se derivan de `created_at`/`escalated_at`, por lo que sobreviven a un
+    reinicio: basta con volver a cargar las alertas abiertas.
+    """
+
+    def __init__(
+        self,
+        notifier: Optional[Notifier] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        protocols: Optional[EmergencyProtocolCache] = None,
+        clock: Callable[[], datetime] = utc_now,
+    ):
+        self.notifier = notifier or LoggingNotifier()
+        self.session_factory = session_factory
+        self.protocols = protocols or EmergencyProtocolCache()
+        self.clock = clock
+        self._scheduler = DeadlineScheduler(
+            "alert-escalation", on_due=self.escalate_due, on_start=self._load_on_start, clock=clock,
+        )
+
+    def __len__(self) -> int:
+        return len(self._scheduler)
+
+    # --- Índice ---
+
+    def _open_alerts_query(self, db: Session):
+        return (
+            db.query(
+                Alert.id,
+                Alert.title,
+                Alert.severity,
+                Alert.priority,
+                Alert.escalation_level,
+                Alert.created_at,
+                Alert.escalated_at,
+                Alert.alert_subtype,
+                AlertType.name,
+                Alert.cared_person_id,
+                CaredPerson.institution_id,
+            )
+            .outerjoin(AlertType, Alert.alert_type_id == AlertType.id)
+            .outerjoin(CaredPerson, Alert.cared_person_id == CaredPerson.id)
+            .filter(Alert.acknowledged_at.is_(None), Alert.resolved_at.is_(None))
+        )
+
+    @staticmethod
+    def _build_entry(row) -> Optional[TrackedAlert]:
+        (alert_id, title, severity, priority, level, created_at, escalated_at,
+         subtype, type_name, cared_person_id, institution_id) = row
+        level = level or 0
+        anchor = escalated_at or created_at
+        if anchor is None:
+            return None
+        deadline = escalation_deadline(severity, level, anchor)
+        if deadline is None:
+            return None
+        return TrackedAlert(
+            alert_id=alert_id,
+            title=title,
+            severity=severity or "medium",
+            priority=priority or 5,
+            level=level,
+            anchor=as_utc(anchor),
+            deadline=deadline,
+            alert_subtype=subtype,
+            alert_type_name=type_name,
+            cared_person_id=cared_person_id,
+            institution_id=institution_id,
+        )
+
+    def _schedule(self, entry: TrackedAlert) -> None:
+        self._scheduler.schedule(entry.alert_id, entry, entry.deadline, -entry.priority)
+
+    def _reschedule(self, entry: TrackedAlert) -> bool:
+        """Reprogramar si la alerta no se volvió a registrar ni se quitó entretanto"""
+        return self._scheduler.reschedule(entry.alert_id, entry, entry.deadline, -entry.priority)
+
+    def load(self, db: Session) -> int:
+        """Reconstruir el índice con todas las alertas abiertas sin reconocer"""
+        entries = [self._build_entry(row) for row in self._open_alerts_query(db).all()]
+        with self._scheduler.lock:
+            self._scheduler.clear()
+            for entry in entries:
+                if entry is not None:
+                    self._schedule(entry)
+        logger.info("Alert escalation engine tracking %s alerts", len(self._scheduler))
+        return len(self._scheduler)
+
+    def track(self, alert: Alert) -> None:
+        """Registrar o reprogramar una alerta tras crearla o actualizarla"""
+        if alert.acknowledged_at is not None or alert.resolved_at is not None:
+            self.untrack(alert.id)
+            return
+        entry = self._build_entry((
+            alert.id,
+            alert.title,
+            alert.severity,
+            alert.priority,
+            alert.escalation_level,
+            alert.created_at,
+            alert.escalated_at,
+            alert.alert_subtype,
+            alert.alert_type.name if alert.alert_type else None,
+            alert.cared_person_id,
+            alert.cared_person.institution_id if alert.cared_person else None,
+        ))
+        if entry is None:
+            self._scheduler.unschedule(alert.id)
+        else:
+            self._schedule(entry)
+
+    def untrack(self, alert_id: UUID) -> None:
+        """Dejar de seguir una alerta reconocida, resuelta o eliminada"""
+        self._scheduler.unschedule(alert_id)
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[TrackedAlert]:
+        """
+        Extraer las alertas cuyo plazo de escalamiento ya venció
+
+        Siguen registradas sin plazo: `_escalate` las reprograma al nivel
+        siguiente o, si falla, `escalate_due` las reintenta con backoff.
+        """
+        return self._scheduler.pop_due(now, keep=True)
+
+    # --- Escalamiento ---
+
+    def escalate_due(self, now: Optional[datetime] = None) -> int:
+        """
+        Escalar las alertas vencidas
+
+        Returns:
+            int: Cantidad de alertas escaladas
+        """
+        due = self.pop_due(now)
+        if not due:
+            return 0
+        escalated = 0
+        db = self.session_factory()
+        try:
+            for entry in due:
+                try:
+                    escalated += self._escalate(db, entry)
+                except Exception:
+                    db.rollback()
+                    logger.exception("Failed to escalate alert %s", entry.alert_id)
+                    self._retry_later(entry)
+        finally:
+            db.close()
+        return escalated
+
+    def _retry_later(self, entry: TrackedAlert) -> None:
+        """Volver a poner la alerta en el heap con backoff exponencial"""
+        entry.failures += 1
+        delay = timedelta(seconds=settings.alert_escalation_retry_seconds * 2 ** (entry.failures - 1))
+        entry.deadline = self.clock() + min(delay, MAX_RETRY_DELAY)
+        self._reschedule(entry)
+
+    def _escalate(self, db: Session, entry: TrackedAlert) -> int:
+        now = self.clock()
+        new_level = entry.level + 1
+        # Actualización condicional: si la alerta se reconoció o alguien más la
+        # escaló entretanto, no se toca y se resincroniza desde la base
+        updated = db.query(Alert).filter(
+            Alert.id == entry.alert_id,
+            Alert.escalation_level == entry.level,
+            Alert.acknowledged_at.is_(None),
+            Alert.resolved_at.is_(None),
+        ).update({"escalation_level": new_level, "escalated_at": now}, synchronize_session=False)
+        db.commit()
+
+        if not updated:
+            row = self._open_alerts_query(db).filter(Alert.id == entry.alert_id).first()
+            refreshed = self._build_entry(row) if row else None
+            with self._scheduler.lock:
+                if self._scheduler.get(entry.alert_id) is entry:
+                    if refreshed is None:
+                        self._scheduler.unschedule(entry.alert_id)
+                    else:
+                        self._schedule(refreshed)
+            return 0
+
+        protocol = self.protocols.match(
+            db,
+            entry.institution_id,
+            (entry.alert_subtype, entry.alert_type_name),
+            entry.severity,
+        )
+        self.notifier.send("alert.escalated", {
+            "alert_id": str(entry.alert_id),
+            "title": entry.title,
+            "severity": entry.severity,
+            "escalation_level": new_level,
+            "escalated_at": now.isoformat(),
+            "cared_person_id": str(entry.cared_person_id) if entry.cared_person_id else None,
+            "institution_id": entry.institution_id,
+            "protocol_id": protocol.id if protocol else None,
+            "protocol_step": protocol.step_for_level(new_level) if protocol else None,
+            "contacts": protocol.contacts_for_level(new_level) if protocol else [],
+        })
+
+        entry.level = new_level
+        entry.anchor = now
+        entry.failures = 0
+        deadline = escalation_deadline(entry.severity, new_level, now)
+        with self._scheduler.lock:
+            if self._scheduler.get(entry.alert_id) is entry:
+                if deadline is None:
+                    self._scheduler.unschedule(entry.alert_id)
+                else:
+                    entry.deadline = deadline
+                    self._reschedule(entry)
+        return 1
+
+    # --- Ciclo de vida ---
+
+    def start(self) -> None:
+        """Arrancar el hilo del motor (carga las alertas abiertas en el propio hilo)"""
+        self._scheduler.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Detener el hilo del motor"""
+        self._scheduler.stop(timeout)
+
+    def _load_on_start(self) -> None:
+        db = self.session_factory()
+        try:
+            self.load(db)
+        finally:
+            db.close()
+
+
+# Instancia global usada por la API
+alert_escalation_engine = AlertEscalationEngine(
+    notifier=CompositeNotifier([LoggingNotifier(), LiveFeedNotifier(live_feed)])
+)
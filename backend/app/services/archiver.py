@@ -0,0 +1,298 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+import json
+import logging
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timeutils import as_utc
+from app.models.audit_log import AuditLog
+from app.models.cared_person import CaredPerson
+from app.models.debug_event import DebugEvent
+from app.models.event import Event
+from app.models.location_tracking import LocationTracking
+from app.models.user import User
+from app.services.partitioning import add_months, month_bounds, month_start
+
+logger = logging.getLogger(__name__)
+
+# Valor del directorio institution= para filas sin institución
+NO_INSTITUTION = "none"
+
+
+@dataclass(frozen=True)
+class ArchivedTable:
+    """Tabla cuyas filas vencidas se archivan en frío antes de borrarlas"""
+    model: Any
+    column: str
+    retention_setting: str
+
+    @property
+    def name(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def retention_months(self) -> int:
+        return getattr(settings, self.retention_setting)
+
+    @property
+    def time_column(self):
+        return getattr(self.model, self.column)
+
+
+ARCHIVED_TABLES = (
+    ArchivedTable(Event, "event_time", "events_retention_months"),
+    ArchivedTable(LocationTracking, "recorded_at", "location_tracking_retention_months"),
+    ArchivedTable(DebugEvent, "event_time", "debug_events_retention_months"),
+    ArchivedTable(AuditLog, "timestamp", "audit_logs_retention_months"),
+)
+ARCHIVED_TABLES_BY_NAME = {table.name: table for table in ARCHIVED_TABLES}
+
+
+def _require_pyarrow():
+    """pyarrow es opcional: solo lo necesitan los despliegues con archivo en frío"""
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise RuntimeError("El archivo en frío requiere pyarrow (pip install pyarrow)") from exc
+    return pyarrow
+
+
+def arrow_schema(table: ArchivedTable):
+    """
+    Esquema Arrow de los archivos de una tabla
+
+    Se fija a partir de las columnas del modelo para que todos los archivos de
+    una tabla tengan el mismo esquema aunque un bloque traiga columnas vacías.
+    Los UUID se guardan como texto y los payload JSON serializados.
+    """
+    pa = _require_pyarrow()
+    fields = []
+    for column in table.model.__table__.columns:
+        if isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC")
+        elif isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def archive_value(value: Any, column_type: Any) -> Any:
+    """Valor de una columna tal como se escribe en el archivo"""
+    if value is None:
+        return None
+    if isinstance(column_type, JSONB):
+        return json.dumps(value, default=str, ensure_ascii=False)
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def archive_directory(root: Path, table: str, month: date, institution_id: Optional[int]) -> Path:
+    """Directorio con particionado tipo Hive: <tabla>/month=YYYY-MM/institution=<id>"""
+    institution = NO_INSTITUTION if institution_id is None else str(institution_id)
+    return root / table / f"month={month:%Y-%m}" / f"institution={institution}"
+
+
+def group_rows(rows: Iterable[Tuple[Dict[str, Any], Optional[int]]], column: str) -> Dict[Tuple[date, Optional[int]], List[Dict[str, Any]]]:
+    """Agrupar filas (valores, institución) por mes de la columna de tiempo e institución"""
+    groups: Dict[Tuple[date, Optional[int]], List[Dict[str, Any]]] = {}
+    for values, institution_id in rows:
+        groups.setdefault((month_start(values[column]), institution_id), []).append(values)
+    return groups
+
+
+def retention_cutoff(table: ArchivedTable, today: date) -> Optional[datetime]:
+    """Inicio del mes más antiguo que se conserva; None si la tabla no tiene retención"""
+    if table.retention_months <= 0:
+        return None
+    return month_bounds(add_months(month_start(today), -table.retention_months))[0]
+
+
+class ColdStorageArchiver:
+    """
+    Archivo en frío de series de tiempo y auditoría en Parquet
+
+    Las filas fuera de la ventana de retención se leen por bloques en orden de
+    tiempo, se escriben en archivos Parquet particionados por mes e institución
+    y recién entonces se borran del bloque. Cada archivo se nombra por la
+    primera fila del bloque, así que repetir un bloque interrumpido entre la
+    escritura y el borrado reescribe el mismo archivo en lugar de duplicarlo.
+    Al terminar, las particiones vencidas quedan vacías y la retención de
+    PartitionManager las suelta sin pérdida de datos.
+    """
+
+    @staticmethod
+    def _institution(table: ArchivedTable):
+        """Institución de la fila: la de la persona bajo cuidado o, si no, la del usuario"""
+        if table.model is AuditLog:
+            return User.institution_id, [(User, User.id == AuditLog.changed_by_id)]
+        return (
+            func.coalesce(CaredPerson.institution_id, User.institution_id),
+            [
+                (CaredPerson, CaredPerson.id == table.model.cared_person_id),
+                (User, User.id == table.model.user_id),
+            ],
+        )
+
+    @staticmethod
+    def _fetch_chunk(db: Session, table: ArchivedTable, criteria: List[Any], limit: Optional[int]) -> Tuple[List[Tuple[Dict[str, Any], Optional[int]]], List[Any]]:
+        """Bloque de filas que cumplen `criteria` (valores, institución) y sus ids en orden de tiempo"""
+        columns = list(table.model.__table__.columns)
+        institution, joins = ColdStorageArchiver._institution(table)
+        query = select(*columns, institution.label("archive_institution_id")).select_from(table.model.__table__)
+        for target, onclause in joins:
+            query = query.outerjoin(target, onclause)
+        query = query.where(*criteria).order_by(table.time_column, table.model.id).limit(limit)
+        rows, ids = [], []
+        for row in db.execute(query):
+            values = {column.name: archive_value(row._mapping[column], column.type) for column in columns}
+            rows.append((values, row.archive_institution_id))
+            ids.append(row._mapping[table.model.__table__.c.id])
+        return rows, ids
+
+    @staticmethod
+    def _write_group(root: Path, table: ArchivedTable, month: date, institution_id: Optional[int], rows: List[Dict[str, Any]]) -> Path:
+        pa = _require_pyarrow()
+        directory = archive_directory(root, table.name, month, institution_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        first = rows[0]
+        path = directory / f"part-{first[table.column]:%Y%m%dT%H%M%S%f}-{first['id']}.parquet"
+        temporary = path.with_suffix(".tmp")
+        pa.parquet.write_table(
+            pa.Table.from_pylist(rows, schema=arrow_schema(table)),
+            temporary,
+            compression=settings.archive_compression,
+        )
+        temporary.replace(path)
+        return path
+
+    @staticmethod
+    def _write_groups(root: Path, table: ArchivedTable, rows: List[Tuple[Dict[str, Any], Optional[int]]]) -> None:
+        for (month, institution_id), group in group_rows(rows, table.column).items():
+            ColdStorageArchiver._write_group(root, table, month, institution_id, group)
+
+    @staticmethod
+    def archive_rows(db: Session, table: ArchivedTable, *criteria: Any, root: Optional[Path] = None) -> int:
+        """
+        Archivar sin borrar las filas de una tabla que cumplen `criteria`
+
+        Para procesos que borran filas antes de su retención (la compactación
+        de ubicaciones): copian al archivo y borran ellos mismos. El conjunto
+        debe ser acotado, se lee de una sola vez.
+
+        Returns:
+            Cantidad de filas archivadas
+        """
+        rows, _ = ColdStorageArchiver._fetch_chunk(db, table, list(criteria), None)
+        if rows:
+            ColdStorageArchiver._write_groups(Path(root or settings.archive_path), table, rows)
+        return len(rows)
+
+    @staticmethod
+    def archive_table(db: Session, table: ArchivedTable, cutoff: datetime, root: Optional[Path] = None) -> int:
+        """
+        Archivar y borrar las filas de una tabla anteriores a `cutoff`
+
+        Returns:
+            Cantidad de filas archivadas
+        """
+        root = Path(root or settings.archive_path)
+        chunk_size = settings.archive_chunk_size
+        archived = 0
+        while True:
+            rows, ids = ColdStorageArchiver._fetch_chunk(db, table, [table.time_column < cutoff], chunk_size)
+            if not rows:
+                break
+            ColdStorageArchiver._write_groups(root, table, rows)
+            # El filtro por tiempo mantiene el borrado dentro de las particiones vencidas
+            db.query(table.model).filter(
+                table.model.id.in_(ids), table.time_column < cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+            archived += len(rows)
+            if len(rows) < chunk_size:
+                break
+        if archived:
+            logger.info("Archived %s rows from %s older than %s", archived, table.name, cutoff.date())
+        return archived
+
+    @staticmethod
+    def archive_expired(db: Session, now: Optional[datetime] = None, root: Optional[Path] = None) -> Dict[str, int]:
+        """Archivar las filas vencidas de todas las tablas según su retención"""
+        _require_pyarrow()
+        today = (now or datetime.now(timezone.utc)).date()
+        results = {}
+        for table in ARCHIVED_TABLES:
+            cutoff = retention_cutoff(table, today)
+            if cutoff is not None:
+                results[table.name] = ColdStorageArchiver.archive_table(db, table, cutoff, root)
+        return results
+
+    @staticmethod
+    def read_history(
+        table_name: str,
+        cared_person_id: UUID,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        institution_id: Optional[int] = None,
+        limit: int = 1000,
+        root: Optional[Path] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Leer del archivo el historial de una persona bajo cuidado sin reimportarlo
+
+        Los filtros por mes e institución descartan directorios enteros y el
+        filtro por persona se evalúa sobre las estadísticas de cada archivo.
+        Las fechas sin zona se toman como UTC. Solo se leen los archivos
+        .parquet terminados, no los .tmp de una escritura en curso.
+
+        Raises:
+            ValueError: Si la tabla no se archiva o no tiene cared_person_id
+        """
+        table = ARCHIVED_TABLES_BY_NAME.get(table_name)
+        if table is None or "cared_person_id" not in table.model.__table__.columns:
+            raise ValueError(f"Tabla sin historial archivado por persona: {table_name}")
+        pa = _require_pyarrow()
+        directory = Path(root or settings.archive_path) / table.name
+        files = sorted(str(path) for path in directory.rglob("*.parquet"))
+        if not files:
+            return []
+
+        ds = pa.dataset
+        partitioning = ds.partitioning(pa.schema([("month", pa.string()), ("institution", pa.string())]), flavor="hive")
+        schema = arrow_schema(table).append(pa.field("month", pa.string())).append(pa.field("institution", pa.string()))
+        dataset = ds.dataset(files, format="parquet", partitioning=partitioning, partition_base_dir=str(directory), schema=schema)
+
+        condition = ds.field("cared_person_id") == str(cared_person_id)
+        if institution_id is not None:
+            condition &= ds.field("institution") == str(institution_id)
+        if start is not None:
+            start = as_utc(start)
+            condition &= (ds.field("month") >= f"{month_start(start):%Y-%m}") & (ds.field(table.column) >= start)
+        if end is not None:
+            end = as_utc(end)
+            condition &= (ds.field("month") <= f"{month_start(end):%Y-%m}") & (ds.field(table.column) < end)
+
+        result = dataset.to_table(filter=condition).sort_by([(table.column, "descending")]).slice(0, limit)
+        json_columns = [column.name for column in table.model.__table__.columns if isinstance(column.type, JSONB)]
+        rows = result.drop(["month", "institution"]).to_pylist()
+        for row in rows:
+            for name in json_columns:
+                if row[name] is not None:
+                    row[name] = json.loads(row[name])
+        return rows
@@ -1,15 +1,25 @@
 import json
 from app.models.audit_log import AuditLog
 
+
+def _snapshot(data):
+    """Copia JSON-compatible de los datos (sin atributos internos del ORM)"""
+    if not data:
+        return None
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if not key.startswith("_")}
+    return json.loads(json.dumps(data, default=str))
+
+
 def log_change(db, entity_type, entity_id, action, changed_by_id, old_data=None, new_data=None, description=None):
     log = AuditLog(
         entity_type=entity_type,
         entity_id=entity_id,
         action=action,
         changed_by_id=changed_by_id,
-        old_data=json.dumps(old_data) if old_data else None,
-        new_data=json.dumps(new_data) if new_data else None,
+        old_data=_snapshot(old_data),
+        new_data=_snapshot(new_data),
         description=description
     )
     db.add(log)
-    db.commit() 
\ No newline at end of file
+    db.commit()
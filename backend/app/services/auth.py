@@ -2,10 +2,10 @@ from datetime import datetime, timedelta
 from typing import Optional, Union
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from uuid import UUID
 
 from app.models.user import User
@@ -14,9 +14,11 @@ from app.models.user_role import UserRole
 from app.schemas.user import UserCreate, UserLogin, UserToken
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.token_cache import token_cache, token_digest
+from app.services.password_hasher import password_hasher
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (bcrypt runs on the bounded password_hasher pool)
+pwd_context = password_hasher.context
 
 # JWT token security
 security = HTTPBearer()
@@ -27,12 +29,12 @@ class AuthService:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash"""
-        return pwd_context.verify(plain_password, hashed_password)
+        return password_hasher.verify(plain_password, hashed_password)
     
     @staticmethod
     def get_password_hash(password: str) -> str:
         """Hash a password"""
-        return pwd_context.hash(password)
+        return password_hasher.hash(password)
     
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -49,21 +51,87 @@ class AuthService:
     
     @staticmethod
     def verify_token(token: str) -> Optional[dict]:
-        """Verify and decode a JWT token"""
+        """
+        Verify and decode a JWT token
+
+        Verified claims are cached by token hash until `exp`, so repeated
+        requests with the same token skip the signature check. Revoked tokens
+        are rejected on both paths.
+        """
+        digest = token_digest(token)
+        if token_cache.is_revoked(digest):
+            return None
+        if settings.auth_token_cache_enabled:
+            payload = token_cache.get(digest)
+            if payload is not None:
+                return payload
         try:
             payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-            return payload
         except JWTError:
             return None
+        if settings.auth_token_cache_enabled:
+            token_cache.set(digest, payload)
+        return payload
+
+    @staticmethod
+    def revoke_token(token: str) -> bool:
+        """Revoke a token until it expires (logout). Returns False if the token is not valid"""
+        payload = AuthService.verify_token(token)
+        if payload is None or payload.get("exp") is None:
+            return False
+        token_cache.revoke(token_digest(token), payload["exp"])
+        return True
+
+    @staticmethod
+    def user_from_token(db: Session, token: str) -> User:
+        """
+        Resolve the user of a bearer token
+
+        Single implementation behind every authentication dependency.
+
+        Raises:
+            HTTPException: 401 if the token is invalid or revoked, or the user does not exist
+        """
+        credentials_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        payload = AuthService.verify_token(token)
+        if payload is None:
+            raise credentials_exception
+        user_id = payload.get("sub")
+        if user_id is None:
+            raise credentials_exception
+        try:
+            user_uuid = UUID(user_id)
+        except ValueError:
+            raise credentials_exception
+        user = db.query(User).filter(User.id == user_uuid).first()
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return user
     
     @staticmethod
     def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-        """Authenticate a user with email and password"""
+        """
+        Authenticate a user with email and password
+
+        If the stored hash uses a different bcrypt work factor it is replaced
+        in the session; the caller commits it with the login.
+        """
         user = db.query(User).filter(User.email == email).first()
         if not user:
             return None
-        if not AuthService.verify_password(password, user.password_hash):
+        valid, new_hash = password_hasher.verify_and_update(password, user.password_hash)
+        if not valid:
             return None
+        if new_hash:
+            user.password_hash = new_hash
         return user
     
     @staticmethod
@@ -96,6 +164,9 @@ class AuthService:
             is_freelance=user_data.is_freelance,
             hourly_rate=user_data.hourly_rate,
             availability=user_data.availability,
+            latitude=user_data.latitude,
+            longitude=user_data.longitude,
+            service_radius_km=user_data.service_radius_km,
             is_verified=user_data.is_verified,
             institution_id=user_data.institution_id
         )
@@ -117,19 +188,47 @@ class AuthService:
         """Login a user and return access token"""
         user = AuthService.authenticate_user(db, user_data.email, user_data.password)
         if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
+            raise AuthService._login_failed()
+        return AuthService._complete_login(db, user)
+
+    @staticmethod
+    async def login_user_async(db: Session, user_data: UserLogin) -> UserToken:
+        """
+        Login a user without holding a request thread during bcrypt
+
+        Database work runs in the threadpool and password verification is
+        awaited on the password_hasher pool.
+        """
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.email == user_data.email).first()
+        )
+        if not user:
+            raise AuthService._login_failed()
+        valid, new_hash = await password_hasher.verify_and_update_async(user_data.password, user.password_hash)
+        if not valid:
+            raise AuthService._login_failed()
+        if new_hash:
+            user.password_hash = new_hash
+        return await run_in_threadpool(AuthService._complete_login, db, user)
+
+    @staticmethod
+    def _login_failed() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    @staticmethod
+    def _complete_login(db: Session, user: User) -> UserToken:
+        """Check the account state, record the login and issue the token"""
         if not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Inactive user"
             )
         
-        # Update last login
+        # Update last login (and the rehashed password, if any)
         user.last_login = datetime.utcnow()
         db.commit()
         
@@ -150,29 +249,7 @@ class AuthService:
         credentials: HTTPAuthorizationCredentials = Depends(security)
     ) -> User:
         """Get current authenticated user"""
-        token = credentials.credentials
-        payload = AuthService.verify_token(token)
-        if payload is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        user = db.query(User).filter(User.id == UUID(user_id)).first()
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return user
+        return AuthService.user_from_token(db, credentials.credentials)
     
     @staticmethod
     def get_current_active_user(
@@ -213,25 +290,17 @@ class AuthService:
         """Get current active user if token is present, else return None"""
         if credentials is None:
             return None
-        token = credentials.credentials
-        payload = AuthService.verify_token(token)
-        if payload is None:
-            return None
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        try:
+            user = AuthService.user_from_token(db, credentials.credentials)
+        except HTTPException:
             return None
-        user = db.query(User).filter(User.id == UUID(user_id)).first()
-        if user is None or not user.is_active:
+        if not user.is_active:
             return None
         return user
     
     @staticmethod
     def get_current_user_from_token(db: Session, token: str) -> Optional[User]:
-        payload = AuthService.verify_token(token)
-        if payload is None:
-            return None
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        try:
+            return AuthService.user_from_token(db, token)
+        except HTTPException:
             return None
-        user = db.query(User).filter(User.id == UUID(user_id)).first()
-        return user
@@ -0,0 +1,82 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.batch_run import BatchRun
+
+# Una ejecución "running" más vieja que esto se considera abandonada (proceso caído)
+STALE_RUN_AFTER = timedelta(hours=6)
+
+
+class BatchRunService:
+    """
+    Registro idempotente de los procesos por lotes (tabla `batch_runs`)
+
+    Cada proceso reclama su clave de período con un INSERT … ON CONFLICT: la
+    misma clave no se vuelve a ejecutar una vez completada, y dos procesos que
+    arrancan a la vez no la ejecutan los dos.
+    """
+
+    @staticmethod
+    def begin(db: Session, kind: str, run_key: str, force: bool = False) -> Optional[int]:
+        """
+        Reclamar la ejecución `kind`/`run_key`
+
+        Args:
+            db: Sesión de base de datos
+            kind: Proceso (referrals, billing, ...)
+            run_key: Período o clave de la ejecución
+            force: Volver a ejecutar aunque ya se haya completado
+
+        Returns:
+            Optional[int]: Id del registro, o None si ya está completa o en curso
+        """
+        retake = or_(
+            BatchRun.status == "failed",
+            and_(BatchRun.status == "running", BatchRun.started_at < func.now() - STALE_RUN_AFTER),
+        )
+        if force:
+            retake = or_(retake, BatchRun.status == "completed")
+        statement = insert(BatchRun).values(
+            kind=kind, run_key=run_key, status="running", started_at=func.now(), is_active=True,
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="uq_batch_runs_kind_run_key",
+            set_={
+                "status": "running", "started_at": func.now(), "finished_at": None,
+                "stats": None, "error": None, "updated_at": func.now(),
+            },
+            where=retake,
+        ).returning(BatchRun.id)
+        run_id = db.execute(statement).scalar()
+        db.commit()
+        return run_id
+
+    @staticmethod
+    def finish(db: Session, run_id: int, stats: Dict[str, Any]) -> None:
+        db.execute(update(BatchRun).where(BatchRun.id == run_id).values(
+            status="completed", finished_at=func.now(), stats=jsonable_encoder(stats),
+        ))
+        db.commit()
+
+    @staticmethod
+    def fail(db: Session, run_id: int, error: str, stats: Optional[Dict[str, Any]] = None) -> None:
+        db.execute(update(BatchRun).where(BatchRun.id == run_id).values(
+            status="failed", finished_at=func.now(), error=error, stats=jsonable_encoder(stats),
+        ))
+        db.commit()
+
+    @staticmethod
+    def get(db: Session, kind: str, run_key: str) -> Optional[BatchRun]:
+        return db.query(BatchRun).filter(BatchRun.kind == kind, BatchRun.run_key == run_key).first()
+
+    @staticmethod
+    def list(db: Session, kind: Optional[str] = None, limit: int = 50) -> List[BatchRun]:
+        query = db.query(BatchRun)
+        if kind is not None:
+            query = query.filter(BatchRun.kind == kind)
+        return query.order_by(BatchRun.started_at.desc()).limit(limit).all()
@@ -0,0 +1,275 @@
+from calendar import monthrange
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.exceptions import ValidationException
+from app.core.periodic import PeriodicWorker
+from app.models.billing_record import INVOICE_BLOCK_SIZE, invoice_number_sequence
+from app.models.job import Job
+from app.models.status_type import StatusType
+from app.services.batch_runs import BatchRunService
+from app.services.jobs import JobService
+
+logger = logging.getLogger(__name__)
+
+BATCH_KIND = "billing"
+# Estados de suscripciones y adicionales que no se facturan
+INACTIVE_STATUSES = ("cancelled", "expired", "suspended", "inactive")
+
+# Instituciones (lotes) con suscripciones vigentes en el período; NULL = usuarios sin institución
+SHARDS_SQL = """
+SELECT DISTINCT u.institution_id
+FROM user_packages up
+JOIN users u ON u.id = up.user_id
+WHERE up.is_active
+  AND up.start_date <= :period_end
+  AND (up.end_date IS NULL OR up.end_date >= :period_start)
+ORDER BY u.institution_id NULLS LAST
+"""
+
+# Un bloque de suscripciones de una institución (paginado por id): cargo de la
+# suscripción si vence en el período más los adicionales que vencen según su
+# propio ciclo (un adicional mensual de un plan anual se cobra todos los meses),
+# numerado con el bloque reservado de la secuencia
+CHARGES_SQL = """
+WITH subscriptions AS (
+    SELECT up.id AS user_package_id, up.user_id, u.institution_id, p.name AS package_name,
+           (up.billing_cycle = 'monthly' OR extract(month FROM up.start_date) = :period_month) AS package_due,
+           up.current_amount AS package_amount, coalesce(add_ons.amount, 0) AS add_on_amount
+    FROM user_packages up
+    JOIN users u ON u.id = up.user_id
+    JOIN packages p ON p.id = up.package_id
+    LEFT JOIN LATERAL (
+        SELECT sum(a.current_amount * a.quantity) AS amount
+        FROM user_package_add_ons a
+        WHERE a.user_package_id = up.id
+          AND (a.status_type_id IS NULL OR a.status_type_id <> ALL(CAST(:inactive_ids AS integer[])))
+          AND (a.billing_cycle = 'monthly' OR extract(month FROM a.added_at) = :period_month)
+    ) add_ons ON true
+    WHERE up.id > :after
+      AND u.institution_id IS NOT DISTINCT FROM CAST(:institution_id AS integer)
+      AND up.is_active
+      AND (up.status_type_id IS NULL OR up.status_type_id <> ALL(CAST(:inactive_ids AS integer[])))
+      AND up.start_date <= :period_end
+      AND (up.end_date IS NULL OR up.end_date >= :period_start)
+    ORDER BY up.id
+    LIMIT :batch_size
+), charges AS (
+    SELECT user_package_id, user_id, institution_id,
+           CASE WHEN package_due THEN 'Suscripción ' ELSE 'Adicionales ' END || package_name AS description,
+           CASE WHEN package_due THEN package_amount ELSE 0 END + add_on_amount AS amount
+    FROM subscriptions
+    WHERE package_due OR add_on_amount > 0
+), inserted AS (
+    INSERT INTO billing_records (
+        invoice_number, billing_type, description, amount, currency, tax_amount, total_amount,
+        billing_date, due_date, status_type_id, user_id, institution_id, user_package_id,
+        is_active, created_at, updated_at
+    )
+    SELECT :invoice_prefix || lpad((:block_start + row_number() OVER (ORDER BY user_package_id) - 1)::text, 9, '0'),
+           'subscription', description || ' ' || :period_label,
+           amount, :currency, round(amount * :tax_rate)::integer, amount + round(amount * :tax_rate)::integer,
+           :period_start, :due_date, :pending_id, user_id, institution_id, user_package_id,
+           true, now(), now()
+    FROM charges
+    ON CONFLICT DO NOTHING
+    RETURNING total_amount
+)
+SELECT (SELECT count(*) FROM subscriptions) AS subscriptions,
+       (SELECT user_package_id FROM subscriptions ORDER BY user_package_id DESC LIMIT 1) AS last_id,
+       (SELECT count(*) FROM inserted) AS invoices,
+       (SELECT coalesce(sum(total_amount), 0) FROM inserted) AS total_amount
+"""
+
+
+def _status_ids(db: Session) -> Dict[str, int]:
+    rows = db.query(StatusType.name, StatusType.id).filter(
+        StatusType.name.in_(("pending",) + INACTIVE_STATUSES)
+    ).all()
+    return dict(rows)
+
+
+def parse_period(period: Optional[str]) -> date:
+    """Primer día del período "YYYY-MM" (por defecto el mes en curso, UTC)"""
+    if period is None:
+        return datetime.now(timezone.utc).date().replace(day=1)
+    try:
+        return datetime.strptime(period, "%Y-%m").date()
+    except ValueError:
+        raise ValidationException(f"Período inválido (se espera YYYY-MM): {period}")
+
+
+def shard_key(period_start: date, institution_id: Optional[int]) -> str:
+    """Clave del lote en batch_runs: período e institución"""
+    return f"{period_start:%Y-%m}:{institution_id if institution_id is not None else 'none'}"
+
+
+class BillingRunService:
+    """
+    Facturación mensual de suscripciones y adicionales
+
+    Cada institución es un lote independiente (registrado en `batch_runs`),
+    así los lotes se reparten entre los workers de trabajos y corren en
+    paralelo. Dentro del lote las facturas se calculan e insertan en SQL, de a
+    bloques de INVOICE_BLOCK_SIZE suscripciones con un único nextval por
+    bloque para numerarlas. El índice único por suscripción, tipo y período
+    hace que repetir la facturación no duplique facturas.
+    """
+
+    @staticmethod
+    def shards(db: Session, period_start: date) -> List[Optional[int]]:
+        period_end = period_start.replace(day=monthrange(period_start.year, period_start.month)[1])
+        rows = db.execute(text(SHARDS_SQL), {"period_start": period_start, "period_end": period_end})
+        return [institution_id for (institution_id,) in rows]
+
+    @staticmethod
+    def bill_shard(
+        db: Session,
+        period_start: date,
+        institution_id: Optional[int],
+        batch_size: int = INVOICE_BLOCK_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Facturar las suscripciones de una institución en el período
+
+        Args:
+            db: Sesión de base de datos
+            period_start: Primer día del período
+            institution_id: Institución del lote (None = usuarios sin institución)
+            batch_size: Suscripciones por bloque (como máximo INVOICE_BLOCK_SIZE)
+
+        Returns:
+            dict: Suscripciones recorridas, facturas creadas y total facturado (centavos)
+        """
+        statuses = _status_ids(db)
+        params = {
+            "institution_id": institution_id,
+            "inactive_ids": [statuses[name] for name in INACTIVE_STATUSES if name in statuses],
+            "pending_id": statuses.get("pending"),
+            "period_start": period_start,
+            "period_end": period_start.replace(day=monthrange(period_start.year, period_start.month)[1]),
+            "period_month": period_start.month,
+            "period_label": f"{period_start:%m/%Y}",
+            "due_date": period_start + timedelta(days=settings.billing_due_days),
+            "invoice_prefix": f"INV-{period_start:%Y%m}-",
+            "currency": settings.billing_currency,
+            "tax_rate": settings.billing_tax_rate,
+            "batch_size": min(batch_size, INVOICE_BLOCK_SIZE),
+            "after": UUID(int=0),
+        }
+        stats = {"subscriptions": 0, "invoices": 0, "total_amount": 0}
+        while True:
+            params["block_start"] = db.execute(invoice_number_sequence.next_value()).scalar()
+            row = db.execute(text(CHARGES_SQL), params).one()
+            db.commit()
+            stats["subscriptions"] += row.subscriptions
+            stats["invoices"] += row.invoices
+            stats["total_amount"] += int(row.total_amount)
+            if row.subscriptions < params["batch_size"]:
+                return stats
+            params["after"] = row.last_id
+
+    @staticmethod
+    def run_shard(db: Session, period: Optional[str], institution_id: Optional[int], force: bool = False) -> Dict[str, Any]:
+        """Ejecutar un lote una sola vez (salvo `force`), registrándolo en batch_runs"""
+        period_start = parse_period(period)
+        run_key = shard_key(period_start, institution_id)
+        run_id = BatchRunService.begin(db, BATCH_KIND, run_key, force)
+        if run_id is None:
+            return {"run_key": run_key, "skipped": True}
+        try:
+            stats = BillingRunService.bill_shard(db, period_start, institution_id)
+        except Exception as exc:
+            db.rollback()
+            BatchRunService.fail(db, run_id, str(exc))
+            raise
+        BatchRunService.finish(db, run_id, stats)
+        logger.info("Billing run %s: %s", run_key, stats)
+        return {"run_key": run_key, "skipped": False, **stats}
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        period: Optional[str] = None,
+        force: bool = False,
+        created_by: Optional[UUID] = None,
+        tick: Optional[str] = None,
+    ) -> List[Job]:
+        """
+        Encolar un trabajo por institución para el período
+
+        Sin `force`, la clave de idempotencia por lote hace que volver a
+        encolar el mismo período devuelva los trabajos ya creados. Con `tick`
+        (cada pasada del scheduler) los lotes se vuelven a ejecutar aunque ya
+        estén completos, una vez por tick: así se facturan las suscripciones
+        dadas de alta después de la primera pasada del período.
+        """
+        period_start = parse_period(period)
+        force = force or tick is not None
+        jobs = []
+        for institution_id in BillingRunService.shards(db, period_start):
+            key = f"{BATCH_KIND}:{shard_key(period_start, institution_id)}"
+            if tick is not None:
+                idempotency_key = f"{key}@{tick}"
+            else:
+                idempotency_key = None if force else key
+            jobs.append(JobService.enqueue(
+                db, "billing.shard",
+                {"period": f"{period_start:%Y-%m}", "institution_id": institution_id, "force": force},
+                idempotency_key=idempotency_key,
+                created_by=created_by,
+            ))
+        return jobs
+
+    @staticmethod
+    def run(db: Session, period: Optional[str] = None, force: bool = False) -> List[Dict[str, Any]]:
+        """Facturar todas las instituciones en este proceso, una tras otra"""
+        period_start = parse_period(period)
+        return [
+            BillingRunService.run_shard(db, f"{period_start:%Y-%m}", institution_id, force)
+            for institution_id in BillingRunService.shards(db, period_start)
+        ]
+
+
+class BillingRunScheduler(PeriodicWorker):
+    """
+    Encola la facturación del mes en curso; los lotes los ejecutan los workers de trabajos
+
+    Cada pasada vuelve a ejecutar todos los lotes del período (el SQL no
+    duplica facturas), así una suscripción nueva se factura en la pasada
+    siguiente a su alta. La clave del tick es la misma en todos los procesos
+    de la API, que no encolan la misma pasada dos veces.
+    """
+
+    thread_name = "billing-run-scheduler"
+    failure_message = "Billing run scheduling failed"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval: Optional[timedelta] = None,
+    ):
+        self.session_factory = session_factory
+        super().__init__(interval or timedelta(minutes=settings.billing_run_interval_minutes))
+
+    def run_once(self) -> List[Job]:
+        db = self.session_factory()
+        try:
+            tick = int(datetime.now(timezone.utc).timestamp() // self.interval.total_seconds())
+            return BillingRunService.enqueue(db, tick=str(tick))
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+# Instancia global usada por la API
+billing_run_scheduler = BillingRunScheduler()
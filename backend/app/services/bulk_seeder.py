@@ -0,0 +1,242 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+from uuid import UUID
+import io
+import json
+import logging
+import os
+import random
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.core.database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+RowFactory = Callable[[int], Dict[str, Any]]
+
+
+def _table(model) -> Table:
+    return model if isinstance(model, Table) else model.__table__
+
+
+class CatalogCache:
+    """
+    Catálogos normalizados (status_types, device_types, event_types...) precargados
+
+    Cada catálogo se consulta una sola vez por siembra en lugar de buscar el
+    tipo "active" o el tipo de dispositivo dentro del bucle de filas.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._ids: Dict[Any, Dict[str, Any]] = {}
+
+    def ids(self, model) -> Dict[str, Any]:
+        """Mapa nombre -> id del catálogo, en orden de id"""
+        if model not in self._ids:
+            rows = self.db.query(model.id, model.name).order_by(model.id).all()
+            self._ids[model] = {name: id_ for id_, name in rows}
+        return self._ids[model]
+
+    def id(self, model, name: str, fallback: bool = True) -> Optional[Any]:
+        """
+        ID de un valor del catálogo
+
+        Args:
+            model: Modelo del catálogo
+            name: Nombre del valor
+            fallback: Usar el primer valor del catálogo si el nombre no existe
+
+        Returns:
+            ID encontrado o None
+        """
+        ids = self.ids(model)
+        if name in ids:
+            return ids[name]
+        if fallback and ids:
+            return next(iter(ids.values()))
+        return None
+
+    def ensure(self, model, names: Iterable[str], **defaults) -> Dict[str, Any]:
+        """Crear en un solo INSERT los valores que falten y devolver el catálogo"""
+        existing = self.ids(model)
+        missing = [name for name in names if name not in existing]
+        if missing:
+            BulkSeeder(self.db, method="insert").insert(model, (
+                {"name": name, "description": f"{model.__name__} {name}", **defaults}
+                for name in missing
+            ))
+            self._ids.pop(model)
+        return self.ids(model)
+
+
+class BulkSeeder:
+    """
+    Escritura masiva de filas generadas como diccionarios
+
+    Las filas se agrupan en lotes y se escriben con `COPY ... FROM STDIN` cuando
+    el driver es psycopg2 o con INSERT multi-fila en otro caso. Los valores por
+    defecto definidos en Python (UUIDs, is_active...) se aplican igual que con
+    el ORM; los definidos en el servidor los pone la base.
+    """
+
+    def __init__(self, db: Session, batch_size: int = 5000, method: str = "auto"):
+        self.db = db
+        self.batch_size = batch_size
+        if method == "auto":
+            method = "copy" if db.get_bind().dialect.driver == "psycopg2" else "insert"
+        self.method = method
+
+    def insert(self, model, rows: Iterable[Dict[str, Any]], commit: bool = True) -> int:
+        """
+        Insertar filas por lotes
+
+        Args:
+            model: Modelo ORM o tabla
+            rows: Filas como diccionarios columna -> valor (puede ser un generador)
+            commit: Confirmar la transacción al final
+
+        Returns:
+            int: Filas insertadas
+        """
+        table = _table(model)
+        written = 0
+        batch: List[Dict[str, Any]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                written += self._write(table, batch)
+                batch = []
+        if batch:
+            written += self._write(table, batch)
+        if commit:
+            self.db.commit()
+            # Las escrituras por COPY/INSERT de core no pasan por los eventos del ORM
+            response_cache.invalidate(table.name)
+        return written
+
+    def _write(self, table: Table, batch: List[Dict[str, Any]]) -> int:
+        # Filas con distintas columnas no pueden compartir sentencia
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for row in batch:
+            groups.setdefault(frozenset(row), []).append(row)
+        for keys, rows in groups.items():
+            if self.method == "copy":
+                self._copy(table, keys, rows)
+            else:
+                self.db.execute(insert(table), rows)
+        return len(batch)
+
+    def _copy(self, table: Table, keys: frozenset, rows: List[Dict[str, Any]]) -> None:
+        defaults = {
+            column.name: column.default
+            for column in table.columns
+            if column.name not in keys and column.default is not None and column.server_default is None
+        }
+        columns = [column.name for column in table.columns if column.name in keys or column.name in defaults]
+
+        buffer = io.StringIO()
+        for row in rows:
+            values = []
+            for name in columns:
+                value = row[name] if name in row else _python_default(defaults[name])
+                values.append(_copy_text(value))
+            buffer.write("\t".join(values))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        column_list = ", ".join(f'"{name}"' for name in columns)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f'COPY "{table.name}" ({column_list}) FROM STDIN', buffer)
+        finally:
+            cursor.close()
+
+
+def _python_default(default) -> Any:
+    if default.is_scalar:
+        return default.arg
+    if default.is_callable:
+        return default.arg(None)
+    # Defaults SQL (p. ej. func.now()) evaluados del lado de Python
+    return datetime.now(timezone.utc)
+
+
+def _copy_text(value: Any) -> str:
+    """Serializar un valor al formato de texto de COPY"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (dict, list)):
+        text = json.dumps(value, default=str)
+    elif isinstance(value, (datetime, date)):
+        text = value.isoformat()
+    elif isinstance(value, UUID):
+        return str(value)
+    else:
+        text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _seed_shard(table_name: str, factory: RowFactory, start: int, stop: int, batch_size: int, seed: Optional[int]) -> int:
+    import app.models  # noqa: F401  registra todas las tablas en el proceso hijo
+    from app.models.base import Base
+
+    if seed is not None:
+        random.seed(seed)
+    # Las conexiones heredadas del proceso padre no se pueden compartir
+    engine.dispose(close=False)
+    db = SessionLocal()
+    try:
+        return BulkSeeder(db, batch_size).insert(
+            Base.metadata.tables[table_name],
+            (factory(index) for index in range(start, stop)),
+        )
+    finally:
+        db.close()
+
+
+def parallel_seed(
+    model: Union[Table, Any],
+    factory: RowFactory,
+    total: int,
+    workers: Optional[int] = None,
+    batch_size: int = 5000,
+    seed: Optional[int] = None,
+) -> int:
+    """
+    Generar e insertar filas en varios procesos
+
+    El rango [0, total) se reparte en tramos contiguos; cada proceso genera sus
+    filas con `factory(indice)` y las escribe con su propia conexión. La fábrica
+    debe poder serializarse con pickle (función de módulo o functools.partial).
+
+    Args:
+        model: Modelo ORM o tabla destino
+        factory: Función índice -> fila
+        total: Filas a generar
+        workers: Procesos (por defecto, uno por CPU)
+        batch_size: Filas por lote de escritura
+        seed: Semilla base para datos reproducibles
+
+    Returns:
+        int: Filas insertadas
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, total))
+    if total <= 0:
+        return 0
+    table_name = _table(model).name
+    step = -(-total // workers)
+    shards = [(start, min(start + step, total)) for start in range(0, total, step)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_seed_shard, table_name, factory, start, stop, batch_size,
+                        None if seed is None else seed + i)
+            for i, (start, stop) in enumerate(shards)
+        ]
+        return sum(future.result() for future in futures)
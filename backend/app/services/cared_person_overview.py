@@ -0,0 +1,369 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+from uuid import UUID
+import logging
+import threading
+import time
+
+from pydantic import BaseModel
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.exceptions import ValidationException
+from app.models.alert import Alert
+from app.models.allergy import Allergy
+from app.models.caregiver_assignment import CaregiverAssignment
+from app.models.device import Device
+from app.models.diagnosis import Diagnosis
+from app.models.medical_profile import MedicalProfile
+from app.models.medication_log import MedicationLog
+from app.models.medication_schedule import MedicationSchedule
+from app.models.reminder import Reminder
+from app.models.restraint_protocol import RestraintProtocol
+from app.models.shift_observation import ShiftObservation
+from app.models.user import User
+from app.schemas.alert import AlertResponse
+from app.schemas.allergy import Allergy as AllergySchema
+from app.schemas.caregiver_assignment import CaregiverAssignmentResponse
+from app.schemas.device import DeviceResponse
+from app.schemas.diagnosis import Diagnosis as DiagnosisSchema
+from app.schemas.medical_profile import MedicalProfileResponse
+from app.schemas.medication_log import MedicationLogResponse
+from app.schemas.medication_schedule import MedicationSchedule as MedicationScheduleSchema
+from app.schemas.reminder import ReminderResponse
+from app.schemas.restraint_protocol import RestraintProtocolResponse
+
+logger = logging.getLogger(__name__)
+
+# Elementos por sección de listado
+SECTION_LIMIT = 50
+RECENT_LOG_DAYS = 7
+RECENT_OBSERVATIONS = 10
+
+
+def dump(schema: Type[BaseModel], obj: Any) -> Dict[str, Any]:
+    """
+    Serializar un objeto ORM con su schema de respuesta
+
+    Las propiedades booleanas de los modelos que dependen del tipo de estado
+    devuelven None cuando la fila no tiene estado; se informan como False.
+    """
+    data = {}
+    for name, field in schema.model_fields.items():
+        if not hasattr(obj, name):
+            continue
+        value = getattr(obj, name)
+        if value is None and field.annotation is bool:
+            value = False
+        data[name] = value
+    return schema.model_validate(data).model_dump(mode="json")
+
+
+def _medical_profile(db: Session, cared_person_id: UUID):
+    profile = db.query(MedicalProfile).filter(MedicalProfile.cared_person_id == cared_person_id).first()
+    return dump(MedicalProfileResponse, profile) if profile else None
+
+
+def _diagnoses(db: Session, cared_person_id: UUID):
+    rows = db.query(Diagnosis).filter(
+        Diagnosis.cared_person_id == cared_person_id, Diagnosis.is_active == True
+    ).order_by(Diagnosis.diagnosis_date.desc().nulls_last()).limit(SECTION_LIMIT)
+    return [dump(DiagnosisSchema, row) for row in rows]
+
+
+def _allergies(db: Session, cared_person_id: UUID):
+    rows = db.query(Allergy).filter(Allergy.cared_person_id == cared_person_id, Allergy.is_active == True)
+    return [dump(AllergySchema, row) for row in rows.limit(SECTION_LIMIT)]
+
+
+def _medication_schedules(db: Session, cared_person_id: UUID):
+    rows = db.query(MedicationSchedule).filter(
+        MedicationSchedule.cared_person_id == cared_person_id, MedicationSchedule.is_active == True
+    ).order_by(MedicationSchedule.medication_name).limit(SECTION_LIMIT)
+    return [dump(MedicationScheduleSchema, row) for row in rows]
+
+
+def _medication_logs(db: Session, cared_person_id: UUID):
+    since = datetime.now(timezone.utc) - timedelta(days=RECENT_LOG_DAYS)
+    rows = db.query(MedicationLog).join(
+        MedicationSchedule, MedicationSchedule.id == MedicationLog.medication_schedule_id
+    ).filter(
+        MedicationSchedule.cared_person_id == cared_person_id, MedicationLog.taken_at >= since
+    ).order_by(MedicationLog.taken_at.desc()).limit(SECTION_LIMIT)
+    return [dump(MedicationLogResponse, row) for row in rows]
+
+
+def _reminders(db: Session, cared_person_id: UUID):
+    rows = db.query(Reminder).options(joinedload(Reminder.status_type)).filter(
+        Reminder.cared_person_id == cared_person_id, Reminder.is_active == True
+    ).order_by(Reminder.scheduled_time).limit(SECTION_LIMIT)
+    return [dump(ReminderResponse, row) for row in rows]
+
+
+def _alerts(db: Session, cared_person_id: UUID):
+    rows = db.query(Alert).options(joinedload(Alert.status_type)).filter(
+        Alert.cared_person_id == cared_person_id, Alert.resolved_at.is_(None)
+    ).order_by(Alert.created_at.desc()).limit(SECTION_LIMIT)
+    return [dump(AlertResponse, row) for row in rows]
+
+
+def _devices(db: Session, cared_person_id: UUID):
+    rows = db.query(Device).options(joinedload(Device.status_type)).filter(Device.cared_person_id == cared_person_id)
+    return [dump(DeviceResponse, row) for row in rows.limit(SECTION_LIMIT)]
+
+
+def _assignments(db: Session, cared_person_id: UUID):
+    rows = db.query(CaregiverAssignment).options(joinedload(CaregiverAssignment.status_type)).filter(
+        CaregiverAssignment.cared_person_id == cared_person_id
+    ).order_by(CaregiverAssignment.start_date.desc()).limit(SECTION_LIMIT)
+    return [dump(CaregiverAssignmentResponse, row) for row in rows]
+
+
+def _shift_observations(db: Session, cared_person_id: UUID):
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
+    counts = db.query(
+        func.count(ShiftObservation.id).label("observations"),
+        func.count(ShiftObservation.id).filter(ShiftObservation.incidents_occurred == True).label("incidents"),
+    ).filter(
+        ShiftObservation.cared_person_id == cared_person_id,
+        ShiftObservation.is_active == True,
+        ShiftObservation.observation_date >= since,
+    ).one()
+    recent = db.query(
+        ShiftObservation.id, ShiftObservation.shift_type, ShiftObservation.observation_date,
+        ShiftObservation.shift_start, ShiftObservation.shift_end,
+        ShiftObservation.physical_condition, ShiftObservation.mental_state, ShiftObservation.incidents_occurred,
+        func.concat_ws(" ", User.first_name, User.last_name).label("caregiver_name"),
+    ).outerjoin(User, User.id == ShiftObservation.caregiver_id).filter(
+        ShiftObservation.cared_person_id == cared_person_id, ShiftObservation.is_active == True
+    ).order_by(ShiftObservation.observation_date.desc()).limit(RECENT_OBSERVATIONS)
+    return {
+        "last_7_days": {"observations": counts.observations, "incidents": counts.incidents},
+        "recent": [
+            {
+                **row._asdict(),
+                "id": str(row.id),
+                "observation_date": row.observation_date.isoformat(),
+                "shift_start": row.shift_start.isoformat(),
+                "shift_end": row.shift_end.isoformat(),
+            }
+            for row in recent
+        ],
+    }
+
+
+def _restraint_protocols(db: Session, cared_person_id: UUID):
+    rows = db.query(RestraintProtocol).options(joinedload(RestraintProtocol.status_type)).filter(
+        RestraintProtocol.cared_person_id == cared_person_id, RestraintProtocol.end_date.is_(None)
+    ).order_by(RestraintProtocol.start_date.desc()).limit(SECTION_LIMIT)
+    return [dump(RestraintProtocolResponse, row) for row in rows]
+
+
+@dataclass(frozen=True)
+class OverviewSection:
+    """Sección del resumen y tablas cuyas escrituras la invalidan"""
+    name: str
+    loader: Callable[[Session, UUID], Any]
+    tables: Tuple[str, ...]
+
+
+OVERVIEW_SECTIONS = (
+    OverviewSection("medical_profile", _medical_profile, ("medical_profiles",)),
+    OverviewSection("diagnoses", _diagnoses, ("diagnoses",)),
+    OverviewSection("allergies", _allergies, ("allergies",)),
+    OverviewSection("medication_schedules", _medication_schedules, ("medication_schedules",)),
+    OverviewSection("medication_logs", _medication_logs, ("medication_logs", "medication_schedules")),
+    OverviewSection("reminders", _reminders, ("reminders",)),
+    OverviewSection("alerts", _alerts, ("alerts",)),
+    OverviewSection("devices", _devices, ("devices",)),
+    OverviewSection("assignments", _assignments, ("caregiver_assignments",)),
+    OverviewSection("shift_observations", _shift_observations, ("shift_observations",)),
+    OverviewSection("restraint_protocols", _restraint_protocols, ("restraint_protocols",)),
+)
+OVERVIEW_SECTIONS_BY_NAME = {section.name: section for section in OVERVIEW_SECTIONS}
+SECTIONS_BY_TABLE: Dict[str, List[str]] = {}
+for _section in OVERVIEW_SECTIONS:
+    for _table in _section.tables:
+        SECTIONS_BY_TABLE.setdefault(_table, []).append(_section.name)
+
+
+class OverviewCache:
+    """
+    Caché breve de secciones del resumen por persona bajo cuidado
+
+    Las entradas se indexan por (persona, sección) y vencen a los
+    `overview_cache_ttl_seconds`. Un commit del ORM que escribe filas de una
+    persona invalida solo sus secciones afectadas.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[UUID, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Aumenta con cada invalidación: una carga que empezó antes no se guarda
+        self.generation = 0
+
+    def get(self, cared_person_id: UUID, section: str) -> Tuple[bool, Any]:
+        key = (cared_person_id, section)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def set(self, cared_person_id: UUID, section: str, value: Any, generation: Optional[int] = None) -> None:
+        key = (cared_person_id, section)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + settings.overview_cache_ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, cared_person_id: Optional[UUID], sections: Iterable[str]) -> None:
+        """Invalidar secciones de una persona (o de todas si cared_person_id es None)"""
+        sections = set(sections)
+        with self._lock:
+            self.generation += 1
+            for key in [key for key in self._entries if key[1] in sections and cared_person_id in (None, key[0])]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+overview_cache = OverviewCache()
+
+
+# --- Invalidación al confirmar escrituras del ORM ---
+
+_PENDING = "overview_cache_pending"
+
+
+def _owner(obj: Any) -> Optional[UUID]:
+    """Persona bajo cuidado de una fila escrita, sin consultar la base"""
+    cared_person_id = getattr(obj, "cared_person_id", None)
+    if cared_person_id is not None or not isinstance(obj, MedicationLog):
+        return cared_person_id
+    schedule = inspect(obj).attrs.medication_schedule.loaded_value
+    return getattr(schedule, "cared_person_id", None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_overview_writes(session: Session, flush_context) -> None:
+    pending: Set[Tuple[Optional[UUID], str]] = session.info.setdefault(_PENDING, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is None or table.name not in SECTIONS_BY_TABLE:
+            continue
+        # Sin persona conocida (p. ej. una toma sin su pauta cargada) se invalida la sección entera
+        owner = _owner(obj)
+        for section in SECTIONS_BY_TABLE[table.name]:
+            pending.add((owner, section))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_overview_writes(session: Session) -> None:
+    for owner, section in session.info.pop(_PENDING, ()):
+        overview_cache.invalidate(owner, (section,))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_overview_writes(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+class CaredPersonOverviewService:
+    """
+    Resumen completo de una persona bajo cuidado en una sola respuesta
+
+    Cada sección se carga con su propia sesión en un pool acotado de
+    `overview_workers` hilos, así que el tiempo total es el de la sección más
+    lenta y no la suma. Las secciones cacheadas no se vuelven a consultar.
+    """
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def _pool(cls) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=settings.overview_workers, thread_name_prefix="cared-person-overview"
+                )
+            return cls._executor
+
+    @staticmethod
+    def resolve_sections(names: Optional[Iterable[str]]) -> List[OverviewSection]:
+        """
+        Secciones pedidas (todas si no se indica ninguna)
+
+        Raises:
+            ValidationException: Si una sección no existe
+        """
+        if not names:
+            return list(OVERVIEW_SECTIONS)
+        names = [name.strip() for value in names for name in value.split(",") if name.strip()]
+        unknown = [name for name in names if name not in OVERVIEW_SECTIONS_BY_NAME]
+        if unknown:
+            raise ValidationException(f"Secciones desconocidas: {', '.join(unknown)}")
+        return [section for section in OVERVIEW_SECTIONS if section.name in names]
+
+    @staticmethod
+    def _load_isolated(section: OverviewSection, cared_person_id: UUID) -> Any:
+        db = SessionLocal()
+        try:
+            return section.loader(db, cared_person_id)
+        finally:
+            db.close()
+
+    @staticmethod
+    def build(db: Session, cared_person_id: UUID, sections: List[OverviewSection]) -> Dict[str, Any]:
+        """
+        Cargar las secciones pedidas de una persona bajo cuidado
+
+        Args:
+            db: Sesión del request (se usa sola cuando no hay pool de hilos)
+            cared_person_id: Persona bajo cuidado (ya validado el acceso)
+            sections: Secciones a incluir
+
+        Returns:
+            dict: Sección -> contenido serializado
+        """
+        result: Dict[str, Any] = {}
+        generation = overview_cache.generation
+        missing = []
+        for section in sections:
+            hit, value = overview_cache.get(cared_person_id, section.name)
+            if hit:
+                result[section.name] = value
+            else:
+                missing.append(section)
+
+        # En tests las sesiones comparten una conexión: no se cargan en paralelo
+        if settings.overview_workers > 1 and settings.environment != "test" and len(missing) > 1:
+            pool = CaredPersonOverviewService._pool()
+            futures = [
+                (section, pool.submit(CaredPersonOverviewService._load_isolated, section, cared_person_id))
+                for section in missing
+            ]
+            loaded = [(section, future.result()) for section, future in futures]
+        else:
+            loaded = [(section, section.loader(db, cared_person_id)) for section in missing]
+
+        for section, value in loaded:
+            overview_cache.set(cared_person_id, section.name, value, generation)
+            result[section.name] = value
+        return result
@@ -1,8 +1,8 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, desc
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime, timedelta
 
 from app.models.caregiver_assignment import CaregiverAssignment
 from app.models.user import User
@@ -10,6 +10,9 @@ from app.models.cared_person import CaredPerson
 from app.models.status_type import StatusType
 from app.schemas.caregiver_assignment import CaregiverAssignmentCreate, CaregiverAssignmentUpdate
 from app.core.exceptions import NotFoundException, ValidationException
+from app.core.config import settings
+from app.core.timeutils import as_utc
+from app.services.shift_coverage import CompiledAssignment, shift_coverage_index
 
 class CaregiverAssignmentService:
     """Servicio para gestión de asignaciones de cuidadores"""
@@ -52,7 +55,7 @@ class CaregiverAssignmentService:
             start_date=assignment_data.start_date,
             end_date=assignment_data.end_date,
             schedule=assignment_data.schedule,
-            assignment_type=assignment_data.assignment_type,
+            caregiver_assignment_type_id=assignment_data.caregiver_assignment_type_id,
             responsibilities=assignment_data.responsibilities,
             special_requirements=assignment_data.special_requirements,
             hourly_rate=assignment_data.hourly_rate,
@@ -75,6 +78,7 @@ class CaregiverAssignmentService:
         db.add(db_assignment)
         db.commit()
         db.refresh(db_assignment)
+        shift_coverage_index.upsert(db_assignment, cared_person.institution_id)
         
         return db_assignment
     
@@ -228,6 +232,7 @@ class CaregiverAssignmentService:
         
         db.commit()
         db.refresh(db_assignment)
+        shift_coverage_index.upsert(db_assignment)
         
         return db_assignment
     
@@ -250,6 +255,7 @@ class CaregiverAssignmentService:
         
         db.delete(db_assignment)
         db.commit()
+        shift_coverage_index.remove(assignment_id)
         
         return True
     
@@ -290,4 +296,91 @@ class CaregiverAssignmentService:
                 CaregiverAssignment.is_primary == True,
                 CaregiverAssignment.is_active == True
             )
-        ).first() 
\ No newline at end of file
+        ).first()
+    
+    @staticmethod
+    def _coverage_window(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+        """Ventana normalizada a UTC con zona (los límites naive se asumen en UTC)"""
+        start, end = as_utc(start), as_utc(end)
+        if end <= start:
+            raise ValidationException("El fin de la ventana debe ser posterior al inicio")
+        if end - start > timedelta(days=settings.shift_coverage_max_window_days):
+            raise ValidationException(
+                f"La ventana no puede superar {settings.shift_coverage_max_window_days} días"
+            )
+        return start, end
+    
+    @staticmethod
+    def get_coverage_at(
+        db: Session,
+        at: datetime,
+        cared_person_id: Optional[UUID] = None,
+        institution_id: Optional[int] = None
+    ) -> List[CompiledAssignment]:
+        """
+        Obtener los cuidadores de turno en un instante
+        
+        Args:
+            db: Sesión de base de datos
+            at: Instante consultado
+            cared_person_id: Persona bajo cuidado (si no, toda la institución)
+            institution_id: Institución consultada
+            
+        Returns:
+            List[CompiledAssignment]: Asignaciones que cubren el instante
+        """
+        shift_coverage_index.ensure_loaded(db)
+        return shift_coverage_index.covering(at, cared_person_id, institution_id)
+    
+    @staticmethod
+    def get_coverage_gaps(
+        db: Session,
+        start: datetime,
+        end: datetime,
+        cared_person_id: Optional[UUID] = None,
+        institution_id: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Obtener los huecos sin cuidador de turno en una ventana
+        
+        Con institución se revisan todas sus personas bajo cuidado activas,
+        incluidas las que no tienen ninguna asignación.
+        
+        Raises:
+            ValidationException: Si la ventana es inválida o demasiado larga
+        """
+        start, end = CaregiverAssignmentService._coverage_window(start, end)
+        shift_coverage_index.ensure_loaded(db)
+        if cared_person_id is not None:
+            cared_person_ids = [cared_person_id]
+        else:
+            cared_person_ids = [
+                row.id for row in db.query(CaredPerson.id).filter(
+                    CaredPerson.institution_id == institution_id,
+                    CaredPerson.is_active == True
+                )
+            ]
+        gaps = shift_coverage_index.gaps(cared_person_ids, start, end)
+        return [
+            {"cared_person_id": person_id, "start": lower, "end": upper}
+            for person_id, intervals in gaps.items()
+            for lower, upper in intervals
+        ]
+    
+    @staticmethod
+    def get_coverage_overlaps(
+        db: Session,
+        start: datetime,
+        end: datetime,
+        caregiver_id: Optional[UUID] = None,
+        institution_id: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Obtener dobles asignaciones (un cuidador con dos personas a la vez)
+        
+        Raises:
+            ValidationException: Si la ventana es inválida o demasiado larga
+        """
+        start, end = CaregiverAssignmentService._coverage_window(start, end)
+        shift_coverage_index.ensure_loaded(db)
+        return shift_coverage_index.overlaps(start, end, caregiver_id, institution_id)
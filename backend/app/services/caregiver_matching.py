@@ -0,0 +1,294 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import logging
+import math
+import threading
+
+import numpy as np
+from sqlalchemy import and_, exists, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.caregiver_score import CaregiverScore
+from app.models.institution import Institution
+from app.models.role import Role
+from app.models.user import User
+from app.models.user_role import UserRole
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+# Habilidad -> fragmentos que la delatan en `specialization` o `special_needs`
+CARE_SKILLS: Dict[str, Tuple[str, ...]] = {
+    "nursing": ("enfermer", "nurse", "cuidados intensivos"),
+    "dementia": ("demencia", "alzheimer", "dementia", "cognitiv"),
+    "mobility": ("movilidad", "kinesi", "fisioterap", "rehabilit", "traslado"),
+    "palliative": ("paliativ",),
+    "geriatrics": ("geriatr", "adulto mayor", "tercera edad"),
+    "diabetes": ("diabet", "insulin"),
+    "pediatrics": ("pediatr", "niño", "nino"),
+    "disability": ("discapacidad", "autis"),
+}
+SKILL_NAMES = tuple(CARE_SKILLS)
+
+# Requisitos implícitos del nivel de cuidado y de movilidad de la persona
+CARE_LEVEL_EXPERIENCE_YEARS = {"low": 0, "medium": 1, "high": 3, "critical": 5}
+CARE_LEVEL_SKILLS = {"critical": ("nursing",)}
+MOBILITY_SKILLS = {"assisted": ("mobility",), "wheelchair": ("mobility",), "bedridden": ("mobility", "nursing")}
+
+# Pesos de cada componente del puntaje (suman 1) y bono por verificación completa
+MATCH_WEIGHTS = {"proximity": 0.30, "skills": 0.25, "rating": 0.20, "experience": 0.15, "reliability": 0.10}
+VERIFIED_BONUS = 0.05
+# Valor neutro para cuidadores sin puntaje ni métricas todavía
+UNRATED = 0.5
+
+
+def skill_vector(text: Optional[str]) -> np.ndarray:
+    """Habilidades (en el orden de SKILL_NAMES) mencionadas en un texto libre"""
+    lowered = (text or "").lower()
+    return np.array([any(token in lowered for token in CARE_SKILLS[name]) for name in SKILL_NAMES], dtype=bool)
+
+
+@dataclass
+class MatchCriteria:
+    """Necesidades de una persona bajo cuidado y restricciones de la búsqueda"""
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    care_level: Optional[str] = None
+    mobility_level: Optional[str] = None
+    special_needs: Optional[str] = None
+    radius_km: Optional[float] = None
+    max_hourly_rate: Optional[int] = None
+    institution_id: Optional[int] = None
+    freelance_only: bool = True
+    limit: int = 20
+
+    @property
+    def required_skills(self) -> np.ndarray:
+        needed = skill_vector(self.special_needs)
+        for name in CARE_LEVEL_SKILLS.get(self.care_level or "", ()) + MOBILITY_SKILLS.get(self.mobility_level or "", ()):
+            needed[SKILL_NAMES.index(name)] = True
+        return needed
+
+    @property
+    def required_experience(self) -> int:
+        return CARE_LEVEL_EXPERIENCE_YEARS.get(self.care_level or "", 0)
+
+
+class CaregiverMatrix:
+    """
+    Vectores de características de todos los cuidadores, precalculados
+
+    Una fila por cuidador en arreglos columnares de numpy más una grilla
+    geográfica (celdas de `matching_grid_cell_km`) con los índices de fila de
+    cada celda. Es inmutable: se reconstruye entera y se reemplaza.
+    """
+
+    def __init__(self, records: Sequence[Dict[str, Any]], cell_km: float):
+        count = len(records)
+        self.built_at = datetime.now(timezone.utc)
+        self.cell_degrees = cell_km / KM_PER_DEGREE
+        self.ids = [record["id"] for record in records]
+        self.names = [record.get("name") or "" for record in records]
+        self.specializations = [record.get("specialization") for record in records]
+
+        def column(key: str, default: float = np.nan, dtype=np.float64) -> np.ndarray:
+            values = (record.get(key) for record in records)
+            return np.fromiter((default if value is None else value for value in values), dtype=dtype, count=count)
+
+        self.latitude = column("latitude")
+        self.longitude = column("longitude")
+        self.lat_radians = np.radians(self.latitude)
+        self.lon_radians = np.radians(self.longitude)
+        self.service_radius = column("service_radius_km", np.inf)
+        self.hourly_rate = column("hourly_rate")
+        self.experience = column("experience_years", 0.0)
+        self.is_freelance = column("is_freelance", False, bool)
+        self.institution = column("institution_id", -1, np.int64)
+        self.verified = column("is_verified", False, bool)
+        # Componentes estáticos del puntaje normalizados a [0, 1]
+        self.rating = np.clip(column("overall_score", UNRATED * 5) / 5.0, 0.0, 1.0)
+        self.reliability = np.clip(column("completion_rate", UNRATED * 100) / 100.0, 0.0, 1.0)
+        self.skills = (
+            np.vstack([skill_vector(specialization) for specialization in self.specializations])
+            if count else np.zeros((0, len(SKILL_NAMES)), dtype=bool)
+        )
+        self.grid = self._build_grid()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _cell(self, latitude, longitude):
+        return np.floor(latitude / self.cell_degrees).astype(np.int64), np.floor(longitude / self.cell_degrees).astype(np.int64)
+
+    def _build_grid(self) -> Dict[Tuple[int, int], np.ndarray]:
+        located = np.flatnonzero(~np.isnan(self.latitude) & ~np.isnan(self.longitude))
+        if not located.size:
+            return {}
+        rows, cols = self._cell(self.latitude[located], self.longitude[located])
+        order = np.lexsort((cols, rows))
+        rows, cols, located = rows[order], cols[order], located[order]
+        boundaries = np.flatnonzero((np.diff(rows) != 0) | (np.diff(cols) != 0)) + 1
+        grid = {}
+        for chunk, row, col in zip(np.split(located, boundaries), rows[np.r_[0, boundaries]], cols[np.r_[0, boundaries]]):
+            grid[(int(row), int(col))] = chunk
+        return grid
+
+    def nearby(self, latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+        """Índices de las filas en las celdas que tocan el rectángulo del radio"""
+        lat_span = radius_km / KM_PER_DEGREE
+        lon_span = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+        row_low, col_low = self._cell(np.array(latitude - lat_span), np.array(longitude - lon_span))
+        row_high, col_high = self._cell(np.array(latitude + lat_span), np.array(longitude + lon_span))
+        cells = [
+            self.grid[(row, col)]
+            for row in range(int(row_low), int(row_high) + 1)
+            for col in range(int(col_low), int(col_high) + 1)
+            if (row, col) in self.grid
+        ]
+        return np.concatenate(cells) if cells else np.zeros(0, dtype=np.int64)
+
+    def distances_km(self, candidates: np.ndarray, latitude: float, longitude: float) -> np.ndarray:
+        """Distancia haversine vectorizada desde un punto a las filas candidatas"""
+        lat, lon = math.radians(latitude), math.radians(longitude)
+        dlat = self.lat_radians[candidates] - lat
+        dlon = self.lon_radians[candidates] - lon
+        a = np.sin(dlat / 2) ** 2 + math.cos(lat) * np.cos(self.lat_radians[candidates]) * np.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def match(self, criteria: MatchCriteria) -> List[Dict[str, Any]]:
+        """
+        Rankear cuidadores para unas necesidades de cuidado
+
+        Prefiltra por celdas de la grilla, descarta por distancia (radio de la
+        búsqueda y radio de servicio del cuidador), tarifa, institución y
+        modalidad, y puntúa los candidatos restantes en bloque.
+        """
+        radius = criteria.radius_km or settings.matching_default_radius_km
+        located = criteria.latitude is not None and criteria.longitude is not None
+        if located:
+            candidates = self.nearby(criteria.latitude, criteria.longitude, radius)
+        else:
+            candidates = np.arange(len(self))
+
+        keep = np.ones(candidates.size, dtype=bool)
+        if criteria.freelance_only:
+            keep &= self.is_freelance[candidates]
+        if criteria.institution_id is not None:
+            keep &= self.institution[candidates] == criteria.institution_id
+        if criteria.max_hourly_rate is not None:
+            rates = self.hourly_rate[candidates]
+            keep &= np.isnan(rates) | (rates <= criteria.max_hourly_rate)
+        candidates = candidates[keep]
+
+        if located:
+            distance = self.distances_km(candidates, criteria.latitude, criteria.longitude)
+            within = distance <= np.minimum(radius, self.service_radius[candidates])
+            candidates, distance = candidates[within], distance[within]
+            proximity = 1.0 - distance / radius
+        else:
+            distance = np.full(candidates.size, np.nan)
+            proximity = np.full(candidates.size, UNRATED)
+        if not candidates.size:
+            return []
+
+        needed = criteria.required_skills
+        skills = self.skills[candidates]
+        skill_fit = skills[:, needed].mean(axis=1) if needed.any() else np.ones(candidates.size)
+        experience_fit = np.clip(self.experience[candidates] / max(criteria.required_experience, 1), 0.0, 1.0)
+        score = (
+            MATCH_WEIGHTS["proximity"] * proximity
+            + MATCH_WEIGHTS["skills"] * skill_fit
+            + MATCH_WEIGHTS["rating"] * self.rating[candidates]
+            + MATCH_WEIGHTS["experience"] * experience_fit
+            + MATCH_WEIGHTS["reliability"] * self.reliability[candidates]
+            + VERIFIED_BONUS * self.verified[candidates]
+        )
+
+        limit = min(criteria.limit, candidates.size)
+        top = np.argpartition(-score, limit - 1)[:limit]
+        top = top[np.argsort(-score[top], kind="stable")]
+        matches = []
+        for position in top:
+            row = candidates[position]
+            matches.append({
+                "caregiver_id": self.ids[row],
+                "name": self.names[row],
+                "specialization": self.specializations[row],
+                "score": round(float(score[position]), 4),
+                "distance_km": None if np.isnan(distance[position]) else round(float(distance[position]), 2),
+                "hourly_rate": None if np.isnan(self.hourly_rate[row]) else int(self.hourly_rate[row]),
+                "experience_years": int(self.experience[row]),
+                "matched_skills": [name for name, has, wanted in zip(SKILL_NAMES, skills[position], needed) if has and wanted],
+            })
+        return matches
+
+
+class CaregiverMatcher:
+    """
+    Motor de emparejamiento de cuidadores para colocación freelance
+
+    Mantiene la matriz de características en memoria y la reconstruye desde la
+    base cada `matching_refresh_seconds`; las consultas nunca leen la base.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self.clock = clock
+        self._matrix: Optional[CaregiverMatrix] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._matrix = None
+
+    @staticmethod
+    def load_records(db: Session) -> List[Dict[str, Any]]:
+        """Cuidadores activos (freelance o con rol caregiver) con su puntaje y ubicación"""
+        has_caregiver_role = exists().where(and_(
+            UserRole.user_id == User.id,
+            UserRole.is_active == True,
+            UserRole.role_id == Role.id,
+            Role.name == "caregiver",
+        ))
+        rows = db.query(
+            User.id, User.first_name, User.last_name, User.specialization, User.experience_years,
+            User.hourly_rate, User.is_freelance, User.institution_id, User.service_radius_km,
+            # Sin ubicación propia se usa la de su institución
+            func.coalesce(User.latitude, Institution.latitude).label("latitude"),
+            func.coalesce(User.longitude, Institution.longitude).label("longitude"),
+            CaregiverScore.overall_score, CaregiverScore.completion_rate,
+            and_(
+                CaregiverScore.is_identity_verified,
+                CaregiverScore.is_background_checked,
+                CaregiverScore.is_references_verified,
+            ).label("is_verified"),
+        ).outerjoin(Institution, Institution.id == User.institution_id).outerjoin(
+            CaregiverScore, CaregiverScore.caregiver_id == User.id
+        ).filter(User.is_active == True, or_(User.is_freelance == True, has_caregiver_role)).all()
+        records = []
+        for row in rows:
+            record = dict(row._mapping)
+            record["name"] = " ".join(part for part in (row.first_name, row.last_name) if part)
+            records.append(record)
+        return records
+
+    def matrix(self, db: Session) -> CaregiverMatrix:
+        matrix = self._matrix
+        max_age = timedelta(seconds=settings.matching_refresh_seconds)
+        if matrix is not None and self.clock() - matrix.built_at <= max_age:
+            return matrix
+        with self._lock:
+            if self._matrix is None or self.clock() - self._matrix.built_at > max_age:
+                records = self.load_records(db)
+                self._matrix = CaregiverMatrix(records, settings.matching_grid_cell_km)
+                logger.info("Caregiver matching matrix rebuilt with %s caregivers", len(records))
+            return self._matrix
+
+    def match(self, db: Session, criteria: MatchCriteria) -> List[Dict[str, Any]]:
+        return self.matrix(db).match(criteria)
+
+
+# Instancia global usada por la API
+caregiver_matcher = CaregiverMatcher()
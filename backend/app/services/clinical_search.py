@@ -0,0 +1,194 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import DateTime, String, cast, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ValidationException
+from app.models.base import SEARCH_CONFIG
+from app.models.cared_person import CaredPerson
+from app.models.diagnosis import Diagnosis
+from app.models.medication_log import MedicationLog
+from app.models.medication_schedule import MedicationSchedule
+from app.models.report import Report
+from app.models.restraint_protocol import RestraintProtocol
+from app.models.shift_observation import ShiftObservation
+
+# Opciones de ts_headline: fragmentos cortos con el término resaltado
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=18, MinWords=6, FragmentDelimiter= … "
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """Tabla con notas clínicas indexadas y cómo se presenta cada resultado"""
+    kind: str
+    model: Any
+    title: Callable[[], Any]
+    occurred_at: Callable[[], Any]
+    # Persona bajo cuidado e institución de la fila (columna propia o vía join)
+    cared_person_id: Callable[[], Any]
+    institution_id: Callable[[], Any]
+    joins: Callable[[], list] = lambda: []
+
+
+SEARCH_SOURCES = (
+    SearchSource(
+        "shift_observation", ShiftObservation,
+        title=lambda: func.concat("Observación de turno (", ShiftObservation.shift_type, ")"),
+        occurred_at=lambda: ShiftObservation.observation_date,
+        cared_person_id=lambda: ShiftObservation.cared_person_id,
+        institution_id=lambda: ShiftObservation.institution_id,
+    ),
+    SearchSource(
+        "diagnosis", Diagnosis,
+        title=lambda: Diagnosis.diagnosis_name,
+        occurred_at=lambda: func.coalesce(Diagnosis.diagnosis_date, Diagnosis.created_at),
+        cared_person_id=lambda: Diagnosis.cared_person_id,
+        institution_id=lambda: CaredPerson.institution_id,
+        joins=lambda: [(CaredPerson, CaredPerson.id == Diagnosis.cared_person_id)],
+    ),
+    SearchSource(
+        "restraint_protocol", RestraintProtocol,
+        title=lambda: RestraintProtocol.title,
+        occurred_at=lambda: RestraintProtocol.start_date,
+        cared_person_id=lambda: RestraintProtocol.cared_person_id,
+        institution_id=lambda: RestraintProtocol.institution_id,
+    ),
+    SearchSource(
+        "medication_log", MedicationLog,
+        title=lambda: MedicationSchedule.medication_name,
+        occurred_at=lambda: MedicationLog.taken_at,
+        cared_person_id=lambda: MedicationSchedule.cared_person_id,
+        institution_id=lambda: CaredPerson.institution_id,
+        joins=lambda: [
+            (MedicationSchedule, MedicationSchedule.id == MedicationLog.medication_schedule_id),
+            (CaredPerson, CaredPerson.id == MedicationSchedule.cared_person_id),
+        ],
+    ),
+    SearchSource(
+        "report", Report,
+        title=lambda: Report.title,
+        occurred_at=lambda: Report.created_at,
+        cared_person_id=lambda: Report.cared_person_id,
+        institution_id=lambda: CaredPerson.institution_id,
+        joins=lambda: [(CaredPerson, CaredPerson.id == Report.cared_person_id)],
+    ),
+)
+SEARCH_KINDS = tuple(source.kind for source in SEARCH_SOURCES)
+
+
+def search_query(text: str):
+    """tsquery de la búsqueda (sintaxis web: "frase exacta", -excluir, or)"""
+    return func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), text)
+
+
+class ClinicalSearchService:
+    """
+    Búsqueda de texto completo sobre notas clínicas
+
+    Cada tabla tiene una columna `search_vector` generada por PostgreSQL con
+    índice GIN; la consulta filtra con `@@` en cada tabla, une los candidatos,
+    ordena por relevancia y solo genera los fragmentos resaltados
+    (ts_headline, que relee el texto) para la página devuelta.
+    """
+
+    @staticmethod
+    def _source_query(source: SearchSource, tsquery, cared_person_id, institution_id, start, end):
+        model = source.model
+        document = func.concat_ws(" ", *(getattr(model, column) for column, _ in model.SEARCH_COLUMNS))
+        occurred_at = cast(source.occurred_at(), DateTime(timezone=True))
+        query = select(
+            literal(source.kind).label("kind"),
+            model.id.label("id"),
+            source.cared_person_id().label("cared_person_id"),
+            occurred_at.label("occurred_at"),
+            cast(source.title(), String).label("title"),
+            document.label("document"),
+            func.ts_rank_cd(model.search_vector, tsquery).label("rank"),
+        ).select_from(model)
+        for target, onclause in source.joins():
+            query = query.outerjoin(target, onclause)
+        query = query.where(model.search_vector.op("@@")(tsquery))
+        if "is_active" in model.__table__.columns:
+            query = query.where(model.is_active == True)
+        if cared_person_id is not None:
+            query = query.where(source.cared_person_id() == cared_person_id)
+        if institution_id is not None:
+            query = query.where(source.institution_id() == institution_id)
+        if start is not None:
+            query = query.where(occurred_at >= start)
+        if end is not None:
+            query = query.where(occurred_at < end)
+        return query
+
+    @staticmethod
+    def build_query(
+        text: str,
+        cared_person_id: Optional[UUID] = None,
+        institution_id: Optional[int] = None,
+        kinds: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ):
+        """Consulta unificada: candidatos por tabla, ranking y fragmentos resaltados"""
+        tsquery = search_query(text)
+        sources = [source for source in SEARCH_SOURCES if kinds is None or source.kind in kinds]
+        candidates = union_all(*(
+            ClinicalSearchService._source_query(source, tsquery, cared_person_id, institution_id, start, end)
+            for source in sources
+        )).subquery("candidates")
+        page = (
+            select(candidates)
+            .order_by(candidates.c.rank.desc(), candidates.c.occurred_at.desc().nulls_last())
+            .limit(limit)
+            .offset(offset)
+            .subquery("page")
+        )
+        return select(
+            page.c.kind, page.c.id, page.c.cared_person_id, page.c.occurred_at, page.c.title, page.c.rank,
+            func.ts_headline(cast(SEARCH_CONFIG, REGCONFIG), page.c.document, tsquery, HEADLINE_OPTIONS).label("snippet"),
+        ).order_by(page.c.rank.desc(), page.c.occurred_at.desc().nulls_last())
+
+    @staticmethod
+    def search(
+        db: Session,
+        text: str,
+        cared_person_id: Optional[UUID] = None,
+        institution_id: Optional[int] = None,
+        kinds: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Buscar en las notas clínicas
+
+        Args:
+            db: Sesión de base de datos
+            text: Términos de búsqueda (sintaxis de websearch_to_tsquery)
+            cared_person_id: Acotar a una persona bajo cuidado
+            institution_id: Acotar a una institución
+            kinds: Tipos de nota a incluir (por defecto todos)
+
+        Returns:
+            List[dict]: Resultados ordenados por relevancia con fragmento resaltado
+
+        Raises:
+            ValidationException: Si la búsqueda está vacía o un tipo no existe
+        """
+        if not text or not text.strip():
+            raise ValidationException("La búsqueda no puede estar vacía")
+        if kinds is not None:
+            unknown = set(kinds) - set(SEARCH_KINDS)
+            if unknown:
+                raise ValidationException(f"Tipos de nota desconocidos: {', '.join(sorted(unknown))}")
+        query = ClinicalSearchService.build_query(
+            text.strip(), cared_person_id, institution_id, kinds, start, end, limit, offset
+        )
+        return [dict(row._mapping) for row in db.execute(query)]
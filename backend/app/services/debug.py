@@ -104,146 +104,94 @@ class DebugService:
             except Exception as e:
                 print(f"Error creating test cared person {i}: {e}")
         
+        # Catálogos precargados una sola vez para todos los bucles
+        from app.models.status_type import StatusType
+        from app.models.device_type import DeviceType
+        from app.models.event_type import EventType
+        from app.models.alert_type import AlertType
+        from app.models.device import Device
+        from app.models.event import Event
+        from app.models.alert import Alert
+        from app.services.bulk_seeder import BulkSeeder, CatalogCache
+        
+        catalogs = CatalogCache(db)
+        active_status_id = catalogs.id(StatusType, "active")
+        event_type_names = ["sensor_event", "system_event", "user_action"]
+        alert_type_names = ["health_alert", "security_alert", "device_alert"]
+        # Asegurar que existan los EventType y AlertType requeridos
+        catalogs.ensure(EventType, event_type_names)
+        catalogs.ensure(AlertType, alert_type_names)
+        
         # Create test devices
+        device_type_names = ["sensor", "tracker", "camera", "wearable"]
         for i in range(min(count, 4)):
             try:
                 unique_id = str(uuid.uuid4())[:8]
-                
-                # Buscar el ID del status_type "active"
-                from app.models.status_type import StatusType
-                active_status = db.query(StatusType).filter(StatusType.name == "active").first()
-                if not active_status:
-                    # Fallback: usar el primer status_type disponible
-                    active_status = db.query(StatusType).first()
-                
-                # Buscar el ID del device_type correspondiente
-                from app.models.device_type import DeviceType
-                device_type_names = ["sensor", "tracker", "camera", "wearable"]
                 device_type_name = device_type_names[i % 4]
-                device_type = db.query(DeviceType).filter(DeviceType.name == device_type_name).first()
-                if not device_type:
-                    device_type = db.query(DeviceType).first()
                 
                 device_data = {
                     "device_id": f"TEST_DEVICE_{unique_id}_{i:03d}",
                     "name": f"Test Device {i}",
                     "type": device_type_name,
-                    "device_type_id": device_type.id if device_type else None,
+                    "device_type_id": catalogs.id(DeviceType, device_type_name),
                     "model": f"Test Model {i}",
                     "manufacturer": "Test Manufacturer",
-                    "status_type_id": active_status.id if active_status else None,
+                    "status_type_id": active_status_id,
                     "battery_level": 80 + (i * 5) % 20,
                     "signal_strength": 90 + (i * 3) % 10
                 }
                 
-                from app.models.device import Device
                 device = Device(**device_data)
                 db.add(device)
                 results["devices_created"] += 1
                 
             except Exception as e:
                 print(f"Error creating test device {i}: {e}")
+        db.flush()
         
-        # Asegurar que existan los EventType requeridos
-        from app.models.event_type import EventType
-        event_type_names = ["sensor_event", "system_event", "user_action"]
-        for et_name in event_type_names:
-            if not db.query(EventType).filter(EventType.name == et_name).first():
-                db.add(EventType(name=et_name, description=f"Tipo de evento {et_name}"))
-        db.commit()
-        
-        # Asegurar que existan los AlertType requeridos
-        from app.models.alert_type import AlertType
-        alert_type_names = ["health_alert", "security_alert", "device_alert"]
-        for at_name in alert_type_names:
-            if not db.query(AlertType).filter(AlertType.name == at_name).first():
-                db.add(AlertType(name=at_name, description=f"Tipo de alerta {at_name}"))
-        db.commit()
+        seeder = BulkSeeder(db)
         
         # Create test events
-        for i in range(min(count, 8)):
-            try:
-                # Buscar el ID del event_type correspondiente
-                from app.models.event_type import EventType
-                event_type_names = ["sensor_event", "system_event", "user_action"]
-                event_type_name = event_type_names[i % 3]
-                event_type = db.query(EventType).filter(EventType.name == event_type_name).first()
-                if not event_type:
-                    event_type = db.query(EventType).first()
-                
-                event_data = {
-                    "event_type_id": event_type.id if event_type else None,
-                    "event_subtype": f"test_subtype_{i}",
-                    "severity": ["info", "warning", "error"][i % 3],
-                    "message": f"Test event message {i}",
-                    "event_time": datetime.utcnow() - timedelta(hours=i)
-                }
-                
-                from app.models.event import Event
-                event = Event(**event_data)
-                db.add(event)
-                results["events_created"] += 1
-                
-            except Exception as e:
-                print(f"Error creating test event {i}: {e}")
+        results["events_created"] = seeder.insert(Event, (
+            {
+                "event_type_id": catalogs.id(EventType, event_type_names[i % 3]),
+                "event_subtype": f"test_subtype_{i}",
+                "severity": ["info", "warning", "error"][i % 3],
+                "message": f"Test event message {i}",
+                "event_time": datetime.utcnow() - timedelta(hours=i)
+            }
+            for i in range(min(count, 8))
+        ), commit=False)
         
         # Create test alerts
-        for i in range(min(count, 6)):
-            try:
-                # Buscar el ID del status_type "active"
-                from app.models.status_type import StatusType
-                active_status = db.query(StatusType).filter(StatusType.name == "active").first()
-                if not active_status:
-                    # Fallback: usar el primer status_type disponible
-                    active_status = db.query(StatusType).first()
-                
-                # Buscar el ID del alert_type correspondiente
-                from app.models.alert_type import AlertType
-                alert_type_names = ["health_alert", "security_alert", "device_alert"]
-                alert_type_name = alert_type_names[i % 3]
-                alert_type = db.query(AlertType).filter(AlertType.name == alert_type_name).first()
-                if not alert_type:
-                    # Fallback: usar el primer alert_type disponible
-                    alert_type = db.query(AlertType).first()
-                
-                alert_data = {
-                    "alert_type_id": alert_type.id if alert_type else None,
-                    "alert_subtype": f"test_alert_{i}",
-                    "severity": ["low", "medium", "high"][i % 3],
-                    "title": f"Test Alert {i}",
-                    "message": f"Test alert message {i}",
-                    "status_type_id": active_status.id if active_status else None,
-                    "priority": 5 + (i % 5)
-                }
-                
-                from app.models.alert import Alert
-                alert = Alert(**alert_data)
-                db.add(alert)
-                results["alerts_created"] += 1
-                
-            except Exception as e:
-                print(f"Error creating test alert {i}: {e}")
+        results["alerts_created"] = seeder.insert(Alert, (
+            {
+                "alert_type_id": catalogs.id(AlertType, alert_type_names[i % 3]),
+                "alert_subtype": f"test_alert_{i}",
+                "severity": ["low", "medium", "high"][i % 3],
+                "title": f"Test Alert {i}",
+                "message": f"Test alert message {i}",
+                "status_type_id": active_status_id,
+                "priority": 5 + (i % 5)
+            }
+            for i in range(min(count, 6))
+        ), commit=False)
         
         # Create test debug events
-        for i in range(min(count, 10)):
-            try:
-                debug_data = {
-                    "event_type": ["test_event", "debug_event", "simulation"][i % 3],
-                    "event_subtype": f"test_debug_{i}",
-                    "severity": ["debug", "info", "warning"][i % 3],
-                    "message": f"Test debug message {i}",
-                    "source": "test_suite",
-                    "test_session": f"session_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-                    "environment": "development",
-                    "event_time": datetime.utcnow() - timedelta(minutes=i)
-                }
-                
-                debug_event = DebugEvent(**debug_data)
-                db.add(debug_event)
-                results["debug_events_created"] += 1
-                
-            except Exception as e:
-                print(f"Error creating test debug event {i}: {e}")
+        test_session = f"session_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+        results["debug_events_created"] = seeder.insert(DebugEvent, (
+            {
+                "event_type": ["test_event", "debug_event", "simulation"][i % 3],
+                "event_subtype": f"test_debug_{i}",
+                "severity": ["debug", "info", "warning"][i % 3],
+                "message": f"Test debug message {i}",
+                "source": "test_suite",
+                "test_session": test_session,
+                "environment": "development",
+                "event_time": datetime.utcnow() - timedelta(minutes=i)
+            }
+            for i in range(min(count, 10))
+        ), commit=False)
         
         db.commit()
         return results
@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from uuid import UUID
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.scheduler import DeadlineScheduler
+from app.core.timeutils import as_utc, utc_now
+from app.models.device import Device
+from app.services.live_feed import LiveFeedBroker, live_feed
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OnlineDevice:
+    """Dispositivo considerado en línea y su plazo para pasar a offline"""
+    device_id: UUID
+    name: str
+    institution_id: Optional[int]
+    cared_person_id: Optional[UUID]
+    last_seen: datetime
+    offline_at: datetime
+
+    def payload(self) -> dict:
+        return {
+            "device_id": str(self.device_id),
+            "name": self.name,
+            "last_seen": self.last_seen.isoformat(),
+            "institution_id": self.institution_id,
+            "cared_person_id": str(self.cared_person_id) if self.cared_person_id else None,
+        }
+
+
+class DeviceHeartbeatMonitor:
+    """
+    Detecta transiciones online/offline de dispositivos a partir de sus heartbeats
+
+    Cada heartbeat reprograma el plazo de offline del dispositivo en un heap; solo
+    se publica en el canal en vivo cuando el estado cambia, no en cada latido.
+    """
+
+    def __init__(
+        self,
+        broker: LiveFeedBroker = live_feed,
+        session_factory: Callable[[], Session] = SessionLocal,
+        timeout: Optional[timedelta] = None,
+        clock: Callable[[], datetime] = utc_now,
+    ):
+        self.broker = broker
+        self.session_factory = session_factory
+        self.timeout = timeout or timedelta(minutes=settings.heartbeat_timeout_minutes)
+        self.clock = clock
+        # Los dispositivos en línea son las claves vigentes; su plazo es el paso a offline
+        self._scheduler = DeadlineScheduler(
+            "device-heartbeat", on_due=self.expire, on_start=self._load_on_start, clock=clock,
+        )
+
+    def is_online(self, device_id: UUID) -> bool:
+        return device_id in self._scheduler
+
+    def _schedule(self, entry: OnlineDevice) -> None:
+        self._scheduler.schedule(entry.device_id, entry, entry.offline_at)
+
+    def load(self, db: Session) -> int:
+        """Marcar en línea los dispositivos vistos dentro del timeout"""
+        cutoff = self.clock() - self.timeout
+        rows = db.query(
+            Device.id, Device.name, Device.institution_id, Device.cared_person_id, Device.last_seen
+        ).filter(Device.is_active == True, Device.last_seen >= cutoff).all()
+        with self._scheduler.lock:
+            for device_id, name, institution_id, cared_person_id, last_seen in rows:
+                last_seen = as_utc(last_seen)
+                self._schedule(OnlineDevice(device_id, name, institution_id, cared_person_id, last_seen, last_seen + self.timeout))
+        return len(rows)
+
+    def beat(self, device: Device, seen_at: Optional[datetime] = None) -> bool:
+        """
+        Registrar un heartbeat
+
+        Returns:
+            bool: True si el dispositivo pasó de offline a online
+        """
+        seen_at = as_utc(seen_at or self.clock())
+        entry = OnlineDevice(
+            device.id, device.name, device.institution_id, device.cared_person_id,
+            seen_at, seen_at + self.timeout,
+        )
+        with self._scheduler.lock:
+            came_online = device.id not in self._scheduler
+            self._schedule(entry)
+        if came_online:
+            self.broker.publish("device.online", entry.payload(), entry.institution_id, entry.cared_person_id)
+        return came_online
+
+    def forget(self, device_id: UUID) -> None:
+        self._scheduler.unschedule(device_id)
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """Publicar `device.offline` para los dispositivos cuyo plazo venció"""
+        expired = self._scheduler.pop_due(now)
+        for entry in expired:
+            self.broker.publish("device.offline", entry.payload(), entry.institution_id, entry.cared_person_id)
+        return len(expired)
+
+    def start(self) -> None:
+        self._scheduler.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._scheduler.stop(timeout)
+
+    def _load_on_start(self) -> None:
+        db = self.session_factory()
+        try:
+            self.load(db)
+        finally:
+            db.close()
+
+
+# Instancia global usada por la API
+device_heartbeat_monitor = DeviceHeartbeatMonitor()
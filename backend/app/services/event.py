@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
@@ -6,76 +6,68 @@ from datetime import datetime
 from app.models.event import Event
 from app.schemas.event import EventCreate, EventUpdate
 
+# La tabla events está particionada por mes sobre event_time: las consultas que
+# acotan event_time solo leen las particiones del rango (partition pruning).
+
+def in_time_range(query: Query, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Query:
+    """Acotar una consulta de eventos a [start, end) sobre la clave de partición"""
+    if start:
+        query = query.filter(Event.event_time >= start)
+    if end:
+        query = query.filter(Event.event_time < end)
+    return query
+
 # --- Listar eventos activos, con filtros ---
-def get_events(db: Session, skip: int = 0, limit: int = 100, event_type: Optional[str] = None, elderly_person_id: Optional[UUID] = None, device_id: Optional[UUID] = None, start: Optional[datetime] = None, end: Optional[datetime] = None, created_by_id: Optional[UUID] = None, received_by_id: Optional[UUID] = None) -> List[Event]:
-    """Obtener lista de eventos activos, con filtros opcionales"""
-    query = db.query(Event).filter(Event.is_active == True)
-    if event_type:
-        query = query.filter(Event.event_type == event_type)
-    if elderly_person_id:
-        query = query.filter(Event.elderly_person_id == elderly_person_id)
+def get_events(db: Session, skip: int = 0, limit: int = 100, event_type_id: Optional[int] = None, cared_person_id: Optional[UUID] = None, device_id: Optional[UUID] = None, user_id: Optional[UUID] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Event]:
+    """Obtener lista de eventos activos, con filtros opcionales (más recientes primero)"""
+    query = in_time_range(db.query(Event).filter(Event.is_active == True), start, end)
+    if event_type_id:
+        query = query.filter(Event.event_type_id == event_type_id)
+    if cared_person_id:
+        query = query.filter(Event.cared_person_id == cared_person_id)
     if device_id:
         query = query.filter(Event.device_id == device_id)
-    if start:
-        query = query.filter(Event.start_datetime >= start)
-    if end:
-        query = query.filter(Event.end_datetime <= end)
-    if created_by_id:
-        query = query.filter(Event.created_by_id == created_by_id)
-    if received_by_id:
-        query = query.filter(Event.received_by_id == received_by_id)
-    return query.order_by(Event.start_datetime.desc()).offset(skip).limit(limit).all()
+    if user_id:
+        query = query.filter(Event.user_id == user_id)
+    return query.order_by(Event.event_time.desc()).offset(skip).limit(limit).all()
+
+def get_event_by_id(db: Session, event_id: UUID, event_time: Optional[datetime] = None) -> Optional[Event]:
+    """
+    Obtener evento por ID (solo si está activo)
 
-def get_event_by_id(db: Session, event_id: UUID) -> Optional[Event]:
-    """Obtener evento por ID (solo si está activo)"""
-    return db.query(Event).filter(Event.id == event_id, Event.is_active == True).first()
+    Con `event_time` la búsqueda va directo a la partición del evento; sin él
+    se consulta el índice de id de cada partición.
+    """
+    query = db.query(Event).filter(Event.id == event_id, Event.is_active == True)
+    if event_time:
+        query = query.filter(Event.event_time == event_time)
+    return query.first()
 
-def get_events_by_device(db: Session, device_id: UUID, skip: int = 0, limit: int = 100) -> List[Event]:
+def get_events_by_device(db: Session, device_id: UUID, skip: int = 0, limit: int = 100, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Event]:
     """Obtener eventos por dispositivo (solo activos)"""
-    return db.query(Event).filter(Event.device_id == device_id, Event.is_active == True).offset(skip).limit(limit).all()
+    return get_events(db, skip=skip, limit=limit, device_id=device_id, start=start, end=end)
 
-def get_events_by_elderly_person(db: Session, elderly_person_id: UUID, skip: int = 0, limit: int = 100) -> List[Event]:
-    """Obtener eventos por adulto mayor (solo activos)"""
-    return db.query(Event).filter(Event.elderly_person_id == elderly_person_id, Event.is_active == True).offset(skip).limit(limit).all()
+def get_events_by_cared_person(db: Session, cared_person_id: UUID, skip: int = 0, limit: int = 100, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Event]:
+    """Obtener eventos por persona bajo cuidado (solo activos)"""
+    return get_events(db, skip=skip, limit=limit, cared_person_id=cared_person_id, start=start, end=end)
 
-def get_events_by_user(db: Session, user_id: UUID, skip: int = 0, limit: int = 100, created_only: bool = False, received_only: bool = False) -> List[Event]:
-    """Obtener eventos por usuario (creados o recibidos)"""
-    query = db.query(Event).filter(Event.is_active == True)
-    
-    if created_only:
-        query = query.filter(Event.created_by_id == user_id)
-    elif received_only:
-        query = query.filter(Event.received_by_id == user_id)
-    else:
-        # Ambos: creados o recibidos
-        query = query.filter(
-            (Event.created_by_id == user_id) | (Event.received_by_id == user_id)
-        )
-    
-    return query.order_by(Event.start_datetime.desc()).offset(skip).limit(limit).all()
+def get_events_by_user(db: Session, user_id: UUID, skip: int = 0, limit: int = 100, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Event]:
+    """Obtener eventos registrados por un usuario (solo activos)"""
+    return get_events(db, skip=skip, limit=limit, user_id=user_id, start=start, end=end)
 
-def create_event(db: Session, event: EventCreate) -> Event:
-    """Crear nuevo evento (sensor o calendario)"""
-    db_event = Event(
-        elderly_person_id=event.elderly_person_id,
-        device_id=event.device_id,
-        title=event.title,
-        description=event.description,
-        event_type=event.event_type,
-        value=event.value,
-        location=event.location,
-        start_datetime=event.start_datetime,
-        end_datetime=event.end_datetime,
-        created_by_id=event.created_by_id,
-        received_by_id=event.received_by_id
-    )
+def create_event(db: Session, event: EventCreate, user_id: Optional[UUID] = None) -> Event:
+    """Crear nuevo evento"""
+    data = event.model_dump()
+    if user_id is not None:
+        data["user_id"] = user_id
+    db_event = Event(**data)
     db.add(db_event)
     db.commit()
     db.refresh(db_event)
     return db_event
 
 def update_event(db: Session, event_id: UUID, event_update: EventUpdate) -> Optional[Event]:
-    """Actualizar evento (solo si está activo)"""
+    """Actualizar evento (solo si está activo); cambiar event_time puede moverlo de partición"""
     db_event = get_event_by_id(db, event_id)
     if not db_event:
         return None
@@ -106,4 +98,4 @@ def get_event_types() -> List[dict]:
         {"key": "nutrition", "label": "Nutrición", "color": "#f43f5e"},
         {"key": "sensor", "label": "Evento de sensor", "color": "#64748b"},
         {"key": "other", "label": "Otro", "color": "#6b7280"},
-    ] 
\ No newline at end of file
+    ]
@@ -0,0 +1,341 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+import time
+import uuid
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import ValidationException
+from app.core.timeutils import as_utc, utc_now
+from app.models.cared_person import CaredPerson
+from app.models.institution import Institution
+from app.models.medication_log import MedicationLog
+from app.models.medication_schedule import MedicationSchedule
+from app.models.shift_observation import ShiftObservation
+from app.models.user import User
+from app.models.vital_sign import VitalSign
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND = "handover_reports.render"
+REPORT_FORMATS = ("html", "pdf")
+MEDIA_TYPES = {"html": "text/html; charset=utf-8", "pdf": "application/pdf"}
+VITAL_FIELDS = (
+    ("blood_pressure_systolic", "PA sist."), ("blood_pressure_diastolic", "PA diast."), ("heart_rate", "FC"),
+    ("temperature", "T°"), ("oxygen_saturation", "SpO2"), ("respiratory_rate", "FR"),
+)
+
+
+def _require_reportlab():
+    """reportlab es opcional: solo lo necesitan los despliegues que generan PDF"""
+    try:
+        import reportlab  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError("Los informes en PDF requieren reportlab (pip install reportlab)") from exc
+
+
+@dataclass
+class ResidentHandover:
+    """Datos del traspaso de turno de una persona bajo cuidado"""
+    cared_person_id: Any
+    name: str
+    observations: List[Dict[str, Any]] = field(default_factory=list)
+    missed_medications: List[Dict[str, Any]] = field(default_factory=list)
+    vitals: Optional[Dict[str, Any]] = None  # Última medición de la ventana
+
+    @property
+    def incidents(self) -> List[Dict[str, Any]]:
+        return [observation for observation in self.observations if observation["incidents_occurred"]]
+
+
+@dataclass
+class HandoverReport:
+    institution_name: str
+    start: datetime
+    end: datetime
+    residents: List[ResidentHandover]
+    generated_at: datetime = field(default_factory=utc_now)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Las fechas de observaciones y signos vitales se guardan en UTC sin zona"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class HandoverReportService:
+    """
+    Informes de traspaso de turno por institución
+
+    Los datos de todas las personas se leen en una sola pasada de cuatro
+    consultas (personas, observaciones, tomas omitidas y signos vitales), sin
+    consultas por persona, y el documento se genera por partes para poder
+    enviarlo mientras se renderiza.
+    """
+
+    @staticmethod
+    def collect(
+        db: Session,
+        institution_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        cared_person_ids: Optional[List[Any]] = None,
+    ) -> HandoverReport:
+        """
+        Reunir los datos del traspaso
+
+        Args:
+            db: Sesión de base de datos
+            institution_id: Institución (sector) del informe
+            start: Inicio de la ventana (por defecto `handover_report_window_hours` antes de `end`; sin zona = UTC)
+            end: Fin de la ventana (por defecto ahora; sin zona = UTC)
+            cared_person_ids: Acotar a estas personas (p. ej. las de un sector)
+
+        Raises:
+            ValidationException: Si la institución no existe o la ventana es inválida
+        """
+        institution = db.query(Institution).filter(Institution.id == institution_id).first()
+        if not institution:
+            raise ValidationException(f"Institución {institution_id} no encontrada")
+        # Fechas sin zona se toman como UTC, así se comparan con las que traen zona
+        end = as_utc(end) if end is not None else utc_now()
+        start = as_utc(start) if start is not None else end - timedelta(hours=settings.handover_report_window_hours)
+        if start >= end:
+            raise ValidationException("El inicio de la ventana debe ser anterior al fin")
+
+        query = db.query(CaredPerson.id, CaredPerson.first_name, CaredPerson.last_name).filter(
+            CaredPerson.institution_id == institution_id, CaredPerson.is_active == True
+        )
+        if cared_person_ids:
+            query = query.filter(CaredPerson.id.in_(cared_person_ids))
+        residents = {
+            row.id: ResidentHandover(row.id, f"{row.first_name} {row.last_name}")
+            for row in query.order_by(CaredPerson.last_name, CaredPerson.first_name)
+        }
+        if not residents:
+            return HandoverReport(institution.name, start, end, [])
+        ids = list(residents)
+        naive_start, naive_end = _naive_utc(start), _naive_utc(end)
+
+        observations = db.query(
+            ShiftObservation.id, ShiftObservation.cared_person_id, ShiftObservation.shift_type,
+            ShiftObservation.observation_date, ShiftObservation.handover_notes,
+            ShiftObservation.incidents_occurred, ShiftObservation.incident_details,
+            ShiftObservation.safety_concerns, ShiftObservation.medications_missed, ShiftObservation.vital_signs,
+            func.concat_ws(" ", User.first_name, User.last_name).label("caregiver_name"),
+        ).outerjoin(User, User.id == ShiftObservation.caregiver_id).filter(
+            ShiftObservation.cared_person_id.in_(ids),
+            ShiftObservation.is_active == True,
+            ShiftObservation.observation_date >= naive_start,
+            ShiftObservation.observation_date < naive_end,
+        ).order_by(ShiftObservation.observation_date)
+        for row in observations:
+            resident = residents[row.cared_person_id]
+            resident.observations.append(row._asdict())
+            for item in row.medications_missed or []:
+                if isinstance(item, dict):
+                    resident.missed_medications.append({
+                        "medication_name": item.get("name") or item.get("medication_name") or "",
+                        "reason": item.get("reason"),
+                        "at": row.observation_date,
+                    })
+            if row.vital_signs:
+                resident.vitals = {**row.vital_signs, "measured_at": row.observation_date}
+
+        missed_logs = db.query(
+            MedicationSchedule.cared_person_id, MedicationSchedule.medication_name,
+            MedicationLog.taken_at, MedicationLog.notes,
+        ).select_from(MedicationLog).join(MedicationSchedule, MedicationSchedule.id == MedicationLog.medication_schedule_id).filter(
+            MedicationSchedule.cared_person_id.in_(ids),
+            MedicationLog.is_missed == True,
+            MedicationLog.taken_at >= start,
+            MedicationLog.taken_at < end,
+        ).order_by(MedicationLog.taken_at)
+        for row in missed_logs:
+            residents[row.cared_person_id].missed_medications.append(
+                {"medication_name": row.medication_name, "reason": row.notes, "at": row.taken_at}
+            )
+
+        # Última medición de cada persona en la ventana (DISTINCT ON)
+        vitals = db.query(
+            ShiftObservation.cared_person_id, VitalSign.measured_at,
+            *(getattr(VitalSign, name) for name, _ in VITAL_FIELDS),
+        ).select_from(VitalSign).join(ShiftObservation, ShiftObservation.id == VitalSign.shift_observation_id).filter(
+            ShiftObservation.cared_person_id.in_(ids),
+            VitalSign.measured_at >= naive_start,
+            VitalSign.measured_at < naive_end,
+        ).distinct(ShiftObservation.cared_person_id).order_by(
+            ShiftObservation.cared_person_id, VitalSign.measured_at.desc()
+        )
+        for row in vitals:
+            values = row._asdict()
+            resident = residents[values.pop("cared_person_id")]
+            if resident.vitals is None or _naive_utc(resident.vitals["measured_at"]) <= row.measured_at:
+                resident.vitals = values
+
+        return HandoverReport(institution.name, start, end, list(residents.values()))
+
+    # --- Renderizado ---
+
+    @staticmethod
+    def resident_blocks(resident: ResidentHandover) -> List[Tuple[str, str]]:
+        """
+        Párrafos de una persona como (clase, texto con marcado mínimo)
+
+        El marcado (<b>, <i>, <br/>) es válido tanto en HTML como en los
+        Paragraph de reportlab, así que ambos formatos comparten el contenido.
+        """
+        blocks = []
+        if resident.vitals:
+            vitals = " · ".join(
+                f"{label} {escape(str(resident.vitals[name]))}"
+                for name, label in VITAL_FIELDS if resident.vitals.get(name) is not None
+            )
+            if vitals:
+                blocks.append(("", f"<b>Signos vitales:</b> {vitals}"))
+        for incident in resident.incidents:
+            details = incident["incident_details"] or incident["safety_concerns"] or "Sin detalle"
+            blocks.append(("incident", f"<b>Incidente ({incident['observation_date']:%H:%M}):</b> {escape(details)}"))
+        if resident.missed_medications:
+            items = "".join(
+                f"<br/>• {escape(item['medication_name'])}"
+                + (f" — {escape(str(item['reason']))}" if item.get("reason") else "")
+                for item in resident.missed_medications
+            )
+            blocks.append(("", f"<b>Medicación omitida:</b>{items}"))
+        for observation in resident.observations:
+            if observation["handover_notes"]:
+                author = escape(observation["caregiver_name"] or "")
+                blocks.append((
+                    "",
+                    f"<b>{escape(observation['shift_type'])} {observation['observation_date']:%H:%M}</b> "
+                    f"<i>{author}</i><br/>{escape(observation['handover_notes'])}",
+                ))
+        if not resident.observations and not resident.missed_medications:
+            blocks.append(("muted", "Sin observaciones en el turno."))
+        return blocks
+
+    @staticmethod
+    def _summary(report: HandoverReport) -> str:
+        return (
+            f"{report.start:%d/%m/%Y %H:%M} – {report.end:%d/%m/%Y %H:%M} UTC · {len(report.residents)} personas · "
+            f"generado {report.generated_at:%d/%m/%Y %H:%M} UTC"
+        )
+
+    @staticmethod
+    def render_html(report: HandoverReport) -> Iterator[str]:
+        """Documento HTML por partes: encabezado, una sección por persona y cierre"""
+        title = f"Traspaso de turno — {escape(report.institution_name)}"
+        yield (
+            "<!DOCTYPE html><html lang=\"es\"><head><meta charset=\"utf-8\">"
+            f"<title>{title}</title><style>"
+            "body{font-family:sans-serif;font-size:13px;margin:24px}"
+            "section{border-top:1px solid #ccc;padding:8px 0;page-break-inside:avoid}"
+            "h2{font-size:15px;margin:4px 0}.incident{color:#b00020}.muted{color:#777}"
+            "</style></head><body>"
+            f"<h1>{title}</h1><p class=\"muted\">{HandoverReportService._summary(report)}</p>"
+        )
+        for resident in report.residents:
+            paragraphs = "".join(
+                f"<p class=\"{css}\">{text}</p>" if css else f"<p>{text}</p>"
+                for css, text in HandoverReportService.resident_blocks(resident)
+            )
+            yield f"<section><h2>{escape(resident.name)}</h2>{paragraphs}</section>"
+        yield "</body></html>"
+
+    @staticmethod
+    def render_pdf(report: HandoverReport, path: Path) -> Path:
+        """Escribir el informe en PDF (requiere reportlab)"""
+        _require_reportlab()
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import KeepTogether, Paragraph, SimpleDocTemplate, Spacer
+
+        styles = getSampleStyleSheet()
+        story = [
+            Paragraph(escape(f"Traspaso de turno — {report.institution_name}"), styles["Title"]),
+            Paragraph(HandoverReportService._summary(report), styles["Normal"]),
+            Spacer(1, 12),
+        ]
+        for resident in report.residents:
+            block = [Paragraph(escape(resident.name), styles["Heading2"])]
+            block.extend(
+                Paragraph(f"<font color=\"#b00020\">{text}</font>" if css == "incident" else text, styles["Normal"])
+                for css, text in HandoverReportService.resident_blocks(resident)
+            )
+            story.extend([KeepTogether(block), Spacer(1, 8)])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        SimpleDocTemplate(str(path), pagesize=A4, title="Traspaso de turno").build(story)
+        return path
+
+    @staticmethod
+    def check_format(report_format: str) -> None:
+        """
+        Validar el formato antes de encolar el informe
+
+        Raises:
+            ValidationException: Si el formato no existe
+            RuntimeError: Si es PDF y falta reportlab
+        """
+        if report_format not in REPORT_FORMATS:
+            raise ValidationException(f"Formato desconocido: {report_format}")
+        if report_format == "pdf":
+            _require_reportlab()
+
+    @staticmethod
+    def prune_files(directory: Path, now: Optional[float] = None) -> int:
+        """Borrar los informes generados hace más de `handover_report_retention_minutes`"""
+        if not directory.exists():
+            return 0
+        cutoff = (now or time.time()) - settings.handover_report_retention_minutes * 60
+        pruned = 0
+        for path in directory.iterdir():
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                pruned += 1
+        return pruned
+
+    @staticmethod
+    def generate(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generar el archivo de un informe encolado (handler `handover_reports.render`)
+
+        El payload es el del pedido serializado a JSON; el archivo queda en
+        `handover_report_path` y el resultado del trabajo guarda solo su nombre.
+        """
+        report_format = payload.get("format", "html")
+        HandoverReportService.check_format(report_format)
+        start, end = (
+            datetime.fromisoformat(payload[name]) if payload.get(name) else None
+            for name in ("start", "end")
+        )
+        report = HandoverReportService.collect(
+            db, payload["institution_id"], start, end, payload.get("cared_person_ids") or None
+        )
+        directory = Path(settings.handover_report_path)
+        HandoverReportService.prune_files(directory)
+        path = HandoverReportService.write(report, report_format, directory / f"{uuid.uuid4().hex}.{report_format}")
+        return {
+            "institution_id": payload["institution_id"],
+            "format": report_format,
+            "residents": len(report.residents),
+            "file": path.name,
+        }
+
+    @staticmethod
+    def write(report: HandoverReport, report_format: str, path: Path) -> Path:
+        """Escribir el informe completo en un archivo"""
+        if report_format == "pdf":
+            return HandoverReportService.render_pdf(report, path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            for chunk in HandoverReportService.render_html(report):
+                handle.write(chunk)
+        return path
@@ -0,0 +1,96 @@
+"""
+Handlers de los trabajos en segundo plano
+
+Cada función recibe la sesión del worker, el payload del trabajo y un
+`JobProgress`, y devuelve el resultado que queda guardado en `jobs.result`.
+Los endpoints que ejecutan estas operaciones en el request usan las mismas
+funciones (`JobService.run_inline`).
+"""
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.services.alert_type import AlertTypeService
+from app.services.billing_run import BillingRunService
+from app.services.caregiver_score import CaregiverScoreService
+from app.services.debug import DebugService
+from app.services.device_type import DeviceTypeService
+from app.services.event_type import EventTypeService
+from app.services.handover_report import JOB_KIND as HANDOVER_REPORT_KIND, HandoverReportService
+from app.services.jobs import JobFailed, JobProgress, job_handler
+from app.services.referral import ReferralService
+from app.services.referral_batch import ReferralBatchService
+from app.services.reminder_type import ReminderTypeService
+from app.services.status_type import StatusTypeService
+from app.services.user import UserService
+
+
+@job_handler("catalogs.initialize")
+def initialize_catalogs(db: Session, payload: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """Crear los catálogos normalizados que falten"""
+    initializers = (
+        ("status_types", StatusTypeService.create_default_status_types),
+        ("reminder_types", ReminderTypeService.create_default_reminder_types),
+        ("alert_types", AlertTypeService.create_default_alert_types),
+        ("event_types", EventTypeService.create_default_event_types),
+        ("device_types", DeviceTypeService.create_default_device_types),
+    )
+    results = {}
+    for index, (name, initialize) in enumerate(initializers):
+        progress(index / len(initializers), name)
+        results[name] = len(initialize(db))
+    return results
+
+
+@job_handler("debug.generate_test_data", max_attempts=1)
+def generate_test_data(db: Session, payload: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """Datos de prueba (sin reintentos: un intento parcial dejaría duplicados)"""
+    return DebugService.generate_test_data(db, payload.get("count", 10))
+
+
+@job_handler("referrals.expire_old")
+def expire_old_referrals(db: Session, payload: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    return {"expired_count": ReferralService.expire_old_referrals(db)}
+
+
+@job_handler("referrals.batch")
+def run_referral_batch(db: Session, payload: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """Vencimientos y comisiones del día (idempotente por run_key)"""
+    return ReferralBatchService.run(db, payload.get("run_key"), payload.get("force", False))
+
+
+@job_handler("billing.shard")
+def run_billing_shard(db: Session, payload: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """Facturación de una institución en el período (idempotente por lote)"""
+    return BillingRunService.run_shard(
+        db, payload.get("period"), payload.get("institution_id"), payload.get("force", False)
+    )
+
+
+@job_handler(HANDOVER_REPORT_KIND)
+def render_handover_report(db: Session, payload: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """Informe de traspaso de turno; el archivo se descarga desde /handover-reports"""
+    return HandoverReportService.generate(db, payload)
+
+
+@job_handler("caregiver_scores.calculate")
+def calculate_caregiver_score(db: Session, payload: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    score = CaregiverScoreService.calculate_score_from_reviews(db, UUID(payload["caregiver_id"]))
+    if not score:
+        raise JobFailed("No reviews found for caregiver")
+    return {
+        "caregiver_id": str(score.caregiver_id),
+        "overall_score": score.overall_score,
+        "total_reviews": score.total_reviews,
+    }
+
+
+@job_handler("users.delete")
+def delete_user(db: Session, payload: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """Baja lógica de un usuario y sus datos relacionados"""
+    user_id = UUID(payload["user_id"])
+    if not UserService.get_user_by_id(db, user_id):
+        raise JobFailed("User not found")
+    UserService.delete_user(db, user_id)
+    return {"user_id": str(user_id), "deleted": True}
@@ -0,0 +1,453 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+import logging
+import os
+import socket
+import threading
+import time
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.exceptions import ValidationException
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "completed", "failed", "cancelled")
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+
+class JobFailed(Exception):
+    """Error definitivo de un trabajo: se marca como fallido sin reintentos"""
+
+
+class JobProgress:
+    """
+    Avance de un trabajo, informado por su handler
+
+    Se escribe en una sesión propia (y confirmada) para que se vea mientras la
+    transacción del handler sigue abierta. Solo escribe mientras el trabajo
+    siga tomado por el mismo worker.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        job_id: Optional[UUID] = None,
+        min_interval: float = 1.0,
+        worker_id: Optional[str] = None,
+    ):
+        self.session_factory = session_factory
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.min_interval = min_interval
+        self._last_write = 0.0
+
+    def __call__(self, fraction: float, message: Optional[str] = None) -> None:
+        if self.session_factory is None or self.job_id is None:
+            return
+        now = time.monotonic()
+        if fraction < 1 and now - self._last_write < self.min_interval:
+            return
+        self._last_write = now
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(Job).where(*JobService.owned_by(self.job_id, self.worker_id)).values(
+                    progress=max(0.0, min(1.0, fraction)),
+                    progress_message=message[:255] if message else None,
+                    heartbeat_at=func.now(),
+                )
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("Could not record progress of job %s", self.job_id, exc_info=True)
+        finally:
+            db.close()
+
+
+# Handler: (db, payload, progress) -> resultado serializable a JSON (o None)
+JobFunction = Callable[[Session, Dict[str, Any], JobProgress], Optional[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    kind: str
+    run: JobFunction
+    max_attempts: int = 3
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str, max_attempts: int = 3):
+    """Registrar la función que ejecuta los trabajos de un tipo"""
+    def register(function: JobFunction) -> JobFunction:
+        JOB_HANDLERS[kind] = JobHandler(kind, function, max_attempts)
+        return function
+    return register
+
+
+def load_handlers() -> Dict[str, JobHandler]:
+    """Los handlers viven junto a los servicios que usan; se importan al primer uso"""
+    import app.services.job_handlers  # noqa: F401
+    return JOB_HANDLERS
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff exponencial desde `job_retry_backoff_seconds`, con tope de una hora"""
+    delay = timedelta(seconds=settings.job_retry_backoff_seconds * 2 ** max(attempts - 1, 0))
+    return min(delay, MAX_RETRY_DELAY)
+
+
+class JobService:
+    """
+    Cola de trabajos persistente sobre la tabla `jobs`
+
+    Los workers toman el siguiente trabajo con `FOR UPDATE SKIP LOCKED`, así
+    varios hilos o procesos comparten la cola sin bloquearse entre sí ni tomar
+    dos veces la misma fila.
+    """
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+        created_by: Optional[UUID] = None,
+        priority: int = 0,
+    ) -> Job:
+        """
+        Encolar un trabajo
+
+        Args:
+            db: Sesión de base de datos
+            kind: Tipo de trabajo (handler registrado)
+            payload: Parámetros del handler
+            idempotency_key: Con la misma clave (del mismo usuario) se devuelve el trabajo ya creado
+            created_by: Usuario que lo pidió
+            priority: Mayor se ejecuta antes
+
+        Returns:
+            Job: El trabajo encolado (o el existente con la misma clave)
+
+        Raises:
+            ValidationException: Si el tipo no existe o la clave ya se usó para otro tipo
+        """
+        handler = load_handlers().get(kind)
+        if handler is None:
+            raise ValidationException(f"Tipo de trabajo desconocido: {kind}")
+        statement = insert(Job).values(
+            kind=kind,
+            payload=jsonable_encoder(payload or {}),
+            status="queued",
+            priority=priority,
+            attempts=0,
+            max_attempts=handler.max_attempts,
+            progress=0.0,
+            idempotency_key=idempotency_key,
+            created_by=created_by,
+            is_active=True,
+        ).on_conflict_do_nothing(index_elements=["created_by", "idempotency_key"]).returning(Job.id)
+        job_id = db.execute(statement).scalar()
+        db.commit()
+        if job_id is None:
+            job = db.query(Job).filter(
+                Job.idempotency_key == idempotency_key,
+                Job.created_by.is_(None) if created_by is None else Job.created_by == created_by,
+            ).first()
+            if job.kind != kind:
+                raise ValidationException("La clave de idempotencia ya se usó para otro tipo de trabajo")
+            return job
+        return db.get(Job, job_id)
+
+    @staticmethod
+    def get(db: Session, job_id: UUID) -> Optional[Job]:
+        return db.get(Job, job_id)
+
+    @staticmethod
+    def list(
+        db: Session,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        created_by: Optional[UUID] = None,
+        skip: int = 0,
+        limit: int = 50,
+    ) -> List[Job]:
+        query = db.query(Job)
+        if status is not None:
+            query = query.filter(Job.status == status)
+        if kind is not None:
+            query = query.filter(Job.kind == kind)
+        if created_by is not None:
+            query = query.filter(Job.created_by == created_by)
+        return query.order_by(Job.created_at.desc()).offset(skip).limit(limit).all()
+
+    @staticmethod
+    def cancel(db: Session, job_id: UUID) -> bool:
+        """Cancelar un trabajo que todavía no empezó"""
+        cancelled = db.execute(
+            update(Job).where(Job.id == job_id, Job.status == "queued")
+            .values(status="cancelled", finished_at=func.now())
+            .returning(Job.id)
+        ).scalar()
+        db.commit()
+        return cancelled is not None
+
+    @staticmethod
+    def run_inline(db: Session, kind: str, payload: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Ejecutar el handler en el request, sin pasar por la cola"""
+        return load_handlers()[kind].run(db, payload or {}, JobProgress())
+
+    # --- Workers ---
+
+    @staticmethod
+    def claim_statement(worker_id: str):
+        """UPDATE … RETURNING del siguiente trabajo disponible (SKIP LOCKED)"""
+        candidate = (
+            select(Job.id)
+            .where(Job.status == "queued", Job.run_at <= func.now())
+            .order_by(Job.priority.desc(), Job.run_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        return update(Job).where(Job.id == candidate).values(
+            status="running",
+            attempts=Job.attempts + 1,
+            locked_by=worker_id,
+            started_at=func.now(),
+            heartbeat_at=func.now(),
+            progress=0.0,
+            progress_message=None,
+        ).returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+
+    @staticmethod
+    def claim(db: Session, worker_id: str):
+        row = db.execute(JobService.claim_statement(worker_id)).first()
+        db.commit()
+        return row
+
+    @staticmethod
+    def owned_by(job_id: UUID, worker_id: Optional[str]) -> List[Any]:
+        """
+        Condición de las escrituras de un worker sobre su trabajo
+
+        Si el trabajo se dio por perdido y lo tomó otro worker (o volvió a la
+        cola), las escrituras del worker anterior no afectan ninguna fila.
+        """
+        criteria = [Job.id == job_id, Job.status == "running"]
+        if worker_id is not None:
+            criteria.append(Job.locked_by == worker_id)
+        return criteria
+
+    @staticmethod
+    def heartbeat(db: Session, job_id: UUID, worker_id: Optional[str]) -> bool:
+        """Renovar el heartbeat de un trabajo en curso; False si ya no es del worker"""
+        updated = db.execute(
+            update(Job).where(*JobService.owned_by(job_id, worker_id)).values(heartbeat_at=func.now())
+        ).rowcount
+        db.commit()
+        return updated > 0
+
+    @staticmethod
+    def complete(db: Session, job_id: UUID, result: Optional[Dict[str, Any]], worker_id: Optional[str] = None) -> bool:
+        """Marcar el trabajo como completado; False si el worker ya no lo tenía"""
+        updated = db.execute(update(Job).where(*JobService.owned_by(job_id, worker_id)).values(
+            status="completed", result=jsonable_encoder(result), error=None,
+            progress=1.0, locked_by=None, finished_at=func.now(),
+        )).rowcount
+        db.commit()
+        return updated > 0
+
+    @staticmethod
+    def fail(
+        db: Session,
+        job_id: UUID,
+        error: str,
+        retry_in: Optional[timedelta] = None,
+        worker_id: Optional[str] = None,
+    ) -> bool:
+        """Registrar un error: vuelve a la cola tras `retry_in` o queda fallido"""
+        values = {"error": error, "locked_by": None}
+        if retry_in is None:
+            values.update(status="failed", finished_at=func.now())
+        else:
+            values.update(status="queued", run_at=func.now() + retry_in)
+        updated = db.execute(update(Job).where(*JobService.owned_by(job_id, worker_id)).values(**values)).rowcount
+        db.commit()
+        return updated > 0
+
+    @staticmethod
+    def requeue_stale(db: Session, stale_after: timedelta) -> int:
+        """
+        Devolver a la cola los trabajos de workers caídos (sin heartbeat)
+
+        El worker renueva el heartbeat desde un hilo propio mientras el handler
+        corre, así que solo vencen los trabajos de workers que dejaron de
+        responder. Si uno de ellos vuelve, sus escrituras quedan descartadas
+        porque el trabajo ya no está tomado a su nombre (`owned_by`).
+        """
+        exhausted = Job.attempts >= Job.max_attempts
+        result = db.execute(
+            update(Job)
+            .where(Job.status == "running", Job.heartbeat_at < func.now() - stale_after)
+            .values(
+                status=case((exhausted, "failed"), else_="queued"),
+                finished_at=case((exhausted, func.now()), else_=None),
+                locked_by=None,
+                error="El worker dejó de responder",
+            )
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def purge(db: Session, older_than: timedelta) -> int:
+        result = db.execute(
+            delete(Job).where(Job.status.in_(FINISHED_STATUSES), Job.finished_at < func.now() - older_than)
+        )
+        db.commit()
+        return result.rowcount
+
+
+class JobWorker:
+    """
+    Hilos que ejecutan los trabajos de la cola
+
+    Corre dentro de la API o en procesos dedicados (scripts/run_job_worker.py);
+    cada trabajo se ejecuta con una sesión propia y, mientras corre, un hilo
+    renueva su heartbeat cada `job_heartbeat_seconds`. Un error de un handler
+    se reintenta con backoff hasta `max_attempts`, salvo `JobFailed` y
+    `ValidationException`, que son definitivos.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers or settings.job_workers
+        self.poll_interval = poll_interval or settings.job_poll_seconds
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._last_maintenance = 0.0
+
+    def run_once(self, worker_id: Optional[str] = None) -> bool:
+        """Tomar y ejecutar un trabajo; False con la cola vacía"""
+        handlers = load_handlers()
+        db = self.session_factory()
+        try:
+            claimed = JobService.claim(db, worker_id or self.name)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        if claimed is None:
+            return False
+
+        worker_id = worker_id or self.name
+        finished = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(claimed.id, worker_id, finished),
+            name=f"job-heartbeat-{claimed.id}", daemon=True,
+        )
+        heartbeat.start()
+        db = self.session_factory()
+        try:
+            handler = handlers.get(claimed.kind)
+            if handler is None:
+                raise JobFailed(f"Tipo de trabajo desconocido: {claimed.kind}")
+            result = handler.run(db, claimed.payload or {}, JobProgress(self.session_factory, claimed.id, worker_id=worker_id))
+            db.commit()
+            recorded = JobService.complete(db, claimed.id, result, worker_id)
+        except (JobFailed, ValidationException) as exc:
+            db.rollback()
+            logger.warning("Job %s (%s) failed: %s", claimed.id, claimed.kind, exc)
+            recorded = JobService.fail(db, claimed.id, str(exc), worker_id=worker_id)
+        except Exception as exc:
+            db.rollback()
+            retry_in = retry_delay(claimed.attempts) if claimed.attempts < claimed.max_attempts else None
+            logger.exception("Job %s (%s) attempt %s failed", claimed.id, claimed.kind, claimed.attempts)
+            recorded = JobService.fail(db, claimed.id, f"{type(exc).__name__}: {exc}", retry_in, worker_id)
+        finally:
+            finished.set()
+            heartbeat.join()
+            db.close()
+        if not recorded:
+            logger.warning("Job %s (%s) is no longer held by %s; outcome discarded", claimed.id, claimed.kind, worker_id)
+        return True
+
+    def _heartbeat(self, job_id: UUID, worker_id: str, finished: threading.Event) -> None:
+        """Renovar el heartbeat del trabajo hasta que el handler termine"""
+        while not finished.wait(settings.job_heartbeat_seconds):
+            db = self.session_factory()
+            try:
+                if not JobService.heartbeat(db, job_id, worker_id):
+                    return
+            except Exception:
+                db.rollback()
+                logger.warning("Could not renew heartbeat of job %s", job_id, exc_info=True)
+            finally:
+                db.close()
+
+    def maintain(self) -> None:
+        """Recuperar trabajos de workers caídos y borrar los terminados viejos"""
+        db = self.session_factory()
+        try:
+            requeued = JobService.requeue_stale(db, timedelta(minutes=settings.job_stale_after_minutes))
+            purged = JobService.purge(db, timedelta(days=settings.job_retention_days))
+            if requeued or purged:
+                logger.info("Jobs: %s requeued, %s purged", requeued, purged)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if any(thread.is_alive() for thread in self._threads):
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, args=(f"{self.name}/{index}", index == 0), name=f"job-worker-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self, worker_id: str, maintenance: bool) -> None:
+        while not self._stop.is_set():
+            try:
+                if maintenance and time.monotonic() - self._last_maintenance > 60:
+                    self._last_maintenance = time.monotonic()
+                    self.maintain()
+                if self.run_once(worker_id):
+                    continue
+            except Exception:
+                logger.exception("Job worker %s failed", worker_id)
+            self._stop.wait(self.poll_interval)
+
+
+# Instancia global usada por la API
+job_worker = JobWorker()
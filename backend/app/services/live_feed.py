@@ -0,0 +1,210 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.services.notifications import Notifier
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LiveEvent:
+    """Evento publicado en el canal en vivo"""
+    id: int
+    topic: str
+    data: Dict[str, Any]
+    institution_id: Optional[int] = None
+    cared_person_id: Optional[str] = None
+
+    def to_sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.topic}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+    def to_message(self) -> str:
+        return json.dumps({
+            "id": self.id,
+            "topic": self.topic,
+            "data": self.data,
+            "institution_id": self.institution_id,
+            "cared_person_id": self.cared_person_id,
+        }, default=str)
+
+    @classmethod
+    def from_message(cls, message: str) -> "LiveEvent":
+        return cls(**json.loads(message))
+
+
+@dataclass(eq=False)
+class Subscription:
+    """Suscriptor conectado: cola asyncio alimentada desde cualquier hilo"""
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue
+    institution_ids: Optional[Set[int]] = None
+    cared_person_ids: Optional[Set[str]] = None
+    dropped: int = field(default=0)
+
+    def matches(self, event: LiveEvent) -> bool:
+        # Sin filtros (administradores) se recibe todo
+        if self.institution_ids is None and self.cared_person_ids is None:
+            return True
+        if self.cared_person_ids is not None and event.cared_person_id in self.cared_person_ids:
+            return True
+        return self.institution_ids is not None and event.institution_id in self.institution_ids
+
+    def offer(self, event: LiveEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Un cliente lento no debe frenar al resto; reanudará con Last-Event-ID
+            self.dropped += 1
+
+
+class LiveFeedBroker:
+    """
+    Pub/sub en proceso para el canal en vivo del panel web
+
+    Los eventos se numeran de forma creciente y los últimos se conservan en un
+    buffer circular para que un cliente que se reconecta con `Last-Event-ID`
+    reciba lo que se perdió. Con `live_feed_backend = "redis"` la publicación
+    pasa por Redis y cada proceso del API reparte los eventos a sus propios
+    suscriptores.
+    """
+
+    CHANNEL = "live_feed"
+    SEQUENCE_KEY = "live_feed:sequence"
+
+    def __init__(self, buffer_size: Optional[int] = None, queue_size: Optional[int] = None):
+        self.buffer_size = buffer_size or settings.live_feed_buffer_size
+        self.queue_size = queue_size or settings.live_feed_queue_size
+        self._buffer: Deque[LiveEvent] = deque(maxlen=self.buffer_size)
+        self._subscriptions: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        # Sembrar con la hora actual mantiene los IDs crecientes entre reinicios
+        self._sequence = itertools.count(int(time.time() * 1000))
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+
+    # --- Publicación ---
+
+    def publish(
+        self,
+        topic: str,
+        data: Dict[str, Any],
+        institution_id: Optional[int] = None,
+        cared_person_id: Optional[Any] = None,
+    ) -> None:
+        """
+        Publicar un evento (seguro desde hilos del threadpool y desde el event loop)
+
+        Args:
+            topic: Tipo de evento (alert.created, device.offline, geofence.exit...)
+            data: Datos serializables del evento
+            institution_id: Institución a la que pertenece el evento
+            cared_person_id: Persona bajo cuidado a la que pertenece el evento
+        """
+        cared_person = str(cared_person_id) if cared_person_id else None
+        try:
+            if self._redis is not None:
+                event = LiveEvent(int(self._redis.incr(self.SEQUENCE_KEY)), topic, data, institution_id, cared_person)
+                self._redis.publish(self.CHANNEL, event.to_message())
+                return
+            self._deliver(LiveEvent(next(self._sequence), topic, data, institution_id, cared_person))
+        except Exception:
+            # El canal en vivo es complementario: nunca debe romper la operación que publica
+            logger.exception("Failed to publish live event %s", topic)
+
+    def _deliver(self, event: LiveEvent) -> None:
+        with self._lock:
+            self._buffer.append(event)
+            subscriptions = [s for s in self._subscriptions if s.matches(event)]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # El loop del suscriptor ya se cerró
+                self.unsubscribe(subscription)
+
+    # --- Suscripción ---
+
+    def subscribe(
+        self,
+        institution_ids: Optional[Set[int]] = None,
+        cared_person_ids: Optional[Set[Any]] = None,
+        last_event_id: Optional[int] = None,
+    ) -> Subscription:
+        """
+        Registrar un suscriptor; si trae `last_event_id` se le reenvían los eventos
+        del buffer posteriores a ese ID
+        """
+        subscription = Subscription(
+            loop=asyncio.get_running_loop(),
+            queue=asyncio.Queue(maxsize=self.queue_size),
+            institution_ids=institution_ids,
+            cared_person_ids={str(c) for c in cared_person_ids} if cared_person_ids is not None else None,
+        )
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._buffer:
+                    if event.id > last_event_id and subscription.matches(event):
+                        subscription.offer(event)
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def recent(self, after_id: Optional[int] = None) -> List[LiveEvent]:
+        """Eventos del buffer posteriores a un ID"""
+        with self._lock:
+            return [e for e in self._buffer if after_id is None or e.id > after_id]
+
+    # --- Redis ---
+
+    def start(self) -> None:
+        """Conectar con Redis si el backend configurado lo requiere"""
+        if settings.live_feed_backend != "redis" or self._listener is not None:
+            return
+        import redis
+
+        self._redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.CHANNEL)
+        self._listener = threading.Thread(target=self._listen, args=(pubsub,), name="live-feed-redis", daemon=True)
+        self._listener.start()
+
+    def _listen(self, pubsub) -> None:
+        for message in pubsub.listen():
+            try:
+                self._deliver(LiveEvent.from_message(message["data"]))
+            except Exception:
+                logger.exception("Invalid live feed message")
+
+
+class LiveFeedNotifier(Notifier):
+    """Reenvía notificaciones de los procesos en segundo plano al canal en vivo"""
+
+    def __init__(self, broker: LiveFeedBroker):
+        self.broker = broker
+
+    def send(self, topic: str, payload: Dict[str, Any]) -> None:
+        self.broker.publish(
+            topic,
+            payload,
+            institution_id=payload.get("institution_id"),
+            cared_person_id=payload.get("cared_person_id"),
+        )
+
+
+# Instancia global usada por la API
+live_feed = LiveFeedBroker()
@@ -0,0 +1,475 @@
+from datetime import date, datetime, time, timedelta, timezone
+from math import asin, cos, radians, sin, sqrt
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+import json
+import logging
+
+from sqlalchemy import func, insert, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.exceptions import ValidationException
+from app.core.periodic import PeriodicWorker
+from app.core.timeutils import as_utc
+from app.models.cared_person import CaredPerson
+from app.models.device import Device
+from app.models.geofence import Geofence
+from app.models.location_tracking import LocationTracking
+from app.models.location_trajectory import LocationTrajectory
+from app.schemas.location_tracking import LocationFix
+from app.services.archiver import ARCHIVED_TABLES_BY_NAME, ColdStorageArchiver
+from app.services.device_heartbeat import device_heartbeat_monitor
+from app.services.live_feed import live_feed
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_METERS = 6371008.8
+
+# (latitud, longitud, epoch en segundos)
+TrackPoint = Tuple[float, float, float]
+
+
+def haversine_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distancia en metros entre dos coordenadas"""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * asin(sqrt(a))
+
+
+def track_length_meters(points: Sequence[TrackPoint]) -> float:
+    return sum(
+        haversine_meters(a[0], a[1], b[0], b[1])
+        for a, b in zip(points, points[1:])
+    )
+
+
+def simplify_track(points: Sequence[TrackPoint], tolerance_meters: float) -> List[TrackPoint]:
+    """
+    Simplificar una trayectoria con Douglas-Peucker
+
+    Las coordenadas se proyectan a metros con una equirectangular centrada en la
+    latitud media (error despreciable a escala de un día de recorridos) y se usa
+    la distancia al segmento, no a la recta, para que las vueltas al punto de
+    partida no se pierdan. Iterativo para no depender del límite de recursión.
+
+    Args:
+        points: Puntos ordenados por tiempo
+        tolerance_meters: Desviación máxima permitida respecto a la original
+
+    Returns:
+        List: Subconjunto de puntos que conserva la forma del recorrido
+    """
+    n = len(points)
+    if n <= 2 or tolerance_meters <= 0:
+        return list(points)
+
+    lat0 = radians(sum(p[0] for p in points) / n)
+    scale_x = EARTH_RADIUS_METERS * cos(lat0)
+    xs = [radians(p[1]) * scale_x for p in points]
+    ys = [radians(p[0]) * EARTH_RADIUS_METERS for p in points]
+
+    tolerance_sq = tolerance_meters * tolerance_meters
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        ax, ay = xs[first], ys[first]
+        dx, dy = xs[last] - ax, ys[last] - ay
+        segment_sq = dx * dx + dy * dy
+        farthest, farthest_sq = first, -1.0
+        for i in range(first + 1, last):
+            px, py = xs[i] - ax, ys[i] - ay
+            if segment_sq > 0:
+                t = max(0.0, min(1.0, (px * dx + py * dy) / segment_sq))
+                px, py = px - t * dx, py - t * dy
+            distance_sq = px * px + py * py
+            if distance_sq > farthest_sq:
+                farthest, farthest_sq = i, distance_sq
+        if farthest_sq > tolerance_sq:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def _polygon_vertices(raw: str) -> List[Tuple[float, float]]:
+    vertices = []
+    for vertex in json.loads(raw):
+        if isinstance(vertex, dict):
+            vertices.append((
+                float(vertex.get("latitude", vertex.get("lat"))),
+                float(vertex.get("longitude", vertex.get("lng", vertex.get("lon")))),
+            ))
+        else:
+            vertices.append((float(vertex[0]), float(vertex[1])))
+    return vertices
+
+
+def geofence_contains(geofence: Geofence, latitude: float, longitude: float) -> bool:
+    """Determinar si un punto está dentro de una geocerca circular o poligonal"""
+    if geofence.polygon_coordinates:
+        try:
+            vertices = _polygon_vertices(geofence.polygon_coordinates)
+        except (ValueError, TypeError, KeyError):
+            logger.warning("Invalid polygon for geofence %s", geofence.id)
+            vertices = []
+        if len(vertices) >= 3:
+            # Ray casting sobre (lng, lat)
+            inside = False
+            j = len(vertices) - 1
+            for i, (lat_i, lng_i) in enumerate(vertices):
+                lat_j, lng_j = vertices[j]
+                if (lat_i > latitude) != (lat_j > latitude):
+                    crossing = lng_i + (latitude - lat_i) * (lng_j - lng_i) / (lat_j - lat_i)
+                    if longitude < crossing:
+                        inside = not inside
+                j = i
+            return inside
+    if geofence.radius:
+        distance = haversine_meters(geofence.center_latitude, geofence.center_longitude, latitude, longitude)
+        return distance <= geofence.radius
+    return False
+
+
+def _geofence_applies(geofence: Geofence, moment: datetime) -> bool:
+    if geofence.days_of_week:
+        days = {d.strip() for d in geofence.days_of_week.split(",")}
+        if str(moment.isoweekday()) not in days:
+            return False
+    if geofence.start_time and moment < geofence.start_time:
+        return False
+    if geofence.end_time and moment > geofence.end_time:
+        return False
+    return True
+
+
+# Acciones configuradas que disparan cada tipo de transición
+TRIGGERS = {
+    "enter": {"enter", "both", "inside"},
+    "exit": {"exit", "both", "outside"},
+}
+
+
+def _day_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def _epoch(moment: datetime) -> float:
+    return as_utc(moment).timestamp()
+
+
+class LocationTrackingService:
+    """Servicio para ingesta de ubicaciones y trayectorias simplificadas"""
+
+    @staticmethod
+    def ingest_batch(
+        db: Session,
+        device: Device,
+        fixes: List[LocationFix],
+        cared_person_id: Optional[UUID] = None,
+        user_id: Optional[UUID] = None,
+    ) -> Dict[str, Any]:
+        """
+        Insertar un lote de fixes de un dispositivo
+
+        Los fixes se insertan con un único INSERT multi-fila y, si el dispositivo
+        está asignado a una persona, se evalúan sus geocercas para publicar las
+        transiciones de entrada y salida en el canal en vivo.
+
+        Args:
+            db: Sesión de base de datos
+            device: Dispositivo que reporta
+            fixes: Fixes del lote (en cualquier orden)
+            cared_person_id: Persona bajo cuidado; por defecto, la del dispositivo
+            user_id: Usuario que envía el lote
+
+        Returns:
+            dict: Fixes aceptados y transiciones de geocercas detectadas
+        """
+        if len(fixes) > settings.location_ingest_max_batch:
+            raise ValidationException(
+                f"Batch too large: {len(fixes)} fixes (max {settings.location_ingest_max_batch})"
+            )
+
+        cared_person_id = cared_person_id or device.cared_person_id
+        fixes = sorted(
+            (fix.model_copy(update={"recorded_at": as_utc(fix.recorded_at)}) for fix in fixes),
+            key=lambda fix: fix.recorded_at,
+        )
+        received_at = datetime.now(timezone.utc)
+        rows = [
+            {
+                **fix.model_dump(),
+                "received_at": received_at,
+                "user_id": user_id,
+                "cared_person_id": cared_person_id,
+                "device_id": device.id,
+                "is_active": True,
+            }
+            for fix in fixes
+        ]
+
+        transitions = []
+        if cared_person_id:
+            # Se calcula antes de insertar para que el fix previo no sea del propio lote
+            transitions = LocationTrackingService._geofence_transitions(db, cared_person_id, fixes)
+
+        db.execute(insert(LocationTracking), rows)
+
+        latest = fixes[-1]
+        if device.last_seen is None or _epoch(device.last_seen) < _epoch(latest.recorded_at):
+            device.latitude = latest.latitude
+            device.longitude = latest.longitude
+            device.last_seen = latest.recorded_at
+        db.commit()
+
+        device_heartbeat_monitor.beat(device, received_at)
+
+        if transitions:
+            institution_id = db.query(CaredPerson.institution_id).filter(
+                CaredPerson.id == cared_person_id
+            ).scalar()
+            for transition in transitions:
+                live_feed.publish(
+                    f"geofence.{transition['transition']}",
+                    {
+                        **transition,
+                        "recorded_at": transition["recorded_at"].isoformat(),
+                        "device_id": str(device.id),
+                        "cared_person_id": str(cared_person_id),
+                    },
+                    institution_id=institution_id,
+                    cared_person_id=cared_person_id,
+                )
+
+        return {"accepted": len(rows), "geofence_transitions": transitions}
+
+    @staticmethod
+    def _geofence_transitions(
+        db: Session,
+        cared_person_id: UUID,
+        fixes: List[LocationFix],
+    ) -> List[Dict[str, Any]]:
+        institution_id = db.query(CaredPerson.institution_id).filter(
+            CaredPerson.id == cared_person_id
+        ).scalar()
+        scope = Geofence.cared_person_id == cared_person_id
+        if institution_id is not None:
+            scope = or_(scope, (Geofence.institution_id == institution_id) & Geofence.cared_person_id.is_(None))
+        geofences = db.query(Geofence).filter(Geofence.is_active == True, scope).all()
+        if not geofences:
+            return []
+
+        previous = db.query(LocationTracking.latitude, LocationTracking.longitude).filter(
+            LocationTracking.cared_person_id == cared_person_id,
+            LocationTracking.recorded_at < fixes[0].recorded_at,
+        ).order_by(LocationTracking.recorded_at.desc()).first()
+
+        transitions = []
+        for geofence in geofences:
+            inside = geofence_contains(geofence, previous.latitude, previous.longitude) if previous else None
+            for fix in fixes:
+                now_inside = geofence_contains(geofence, fix.latitude, fix.longitude)
+                if inside is not None and now_inside != inside:
+                    transition = "enter" if now_inside else "exit"
+                    if geofence.trigger_action in TRIGGERS[transition] and _geofence_applies(geofence, fix.recorded_at):
+                        transitions.append({
+                            "geofence_id": geofence.id,
+                            "name": geofence.name,
+                            "geofence_type": geofence.geofence_type,
+                            "transition": transition,
+                            "recorded_at": fix.recorded_at,
+                            "latitude": fix.latitude,
+                            "longitude": fix.longitude,
+                        })
+                inside = now_inside
+        transitions.sort(key=lambda t: t["recorded_at"])
+        return transitions
+
+    @staticmethod
+    def get_trajectory(
+        db: Session,
+        cared_person_id: UUID,
+        day: date,
+        tolerance_meters: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Obtener la polilínea simplificada del recorrido de un día (UTC)
+
+        Los días ya compactados se leen de `location_trajectories`; los recientes
+        se simplifican al vuelo leyendo solo (lat, lng, recorded_at) por el índice
+        (cared_person_id, recorded_at).
+
+        Args:
+            db: Sesión de base de datos
+            cared_person_id: ID de la persona bajo cuidado
+            day: Día a consultar
+            tolerance_meters: Tolerancia de simplificación
+
+        Returns:
+            dict: Trayectoria con sus puntos y estadísticas
+        """
+        tolerance = settings.location_simplify_tolerance_meters if tolerance_meters is None else tolerance_meters
+        stored = db.query(LocationTrajectory).filter(
+            LocationTrajectory.cared_person_id == cared_person_id,
+            LocationTrajectory.day == day,
+        ).first()
+        raw = LocationTrackingService._raw_points(db, cared_person_id, day)
+
+        points: List[TrackPoint] = raw
+        raw_count = len(raw)
+        if stored:
+            raw_count += stored.raw_point_count
+            if not raw and tolerance < stored.tolerance_meters:
+                # El detalle descartado al compactar no se puede recuperar
+                tolerance = stored.tolerance_meters
+            points = sorted([tuple(p) for p in json.loads(stored.points)] + raw, key=lambda p: p[2])
+
+        simplified = simplify_track(points, tolerance)
+        return {
+            "cared_person_id": cared_person_id,
+            "day": day,
+            "compacted": stored is not None,
+            "raw_point_count": raw_count,
+            "point_count": len(simplified),
+            "distance_meters": round(track_length_meters(simplified), 1),
+            "tolerance_meters": tolerance,
+            "points": [
+                {
+                    "latitude": lat,
+                    "longitude": lng,
+                    "recorded_at": datetime.fromtimestamp(ts, tz=timezone.utc),
+                }
+                for lat, lng, ts in simplified
+            ],
+        }
+
+    @staticmethod
+    def _raw_points(db: Session, cared_person_id: UUID, day: date) -> List[TrackPoint]:
+        start, end = _day_bounds(day)
+        rows = db.query(
+            LocationTracking.latitude, LocationTracking.longitude, LocationTracking.recorded_at
+        ).filter(
+            LocationTracking.cared_person_id == cared_person_id,
+            LocationTracking.recorded_at >= start,
+            LocationTracking.recorded_at < end,
+        ).order_by(LocationTracking.recorded_at).all()
+        return [(lat, lng, _epoch(recorded_at)) for lat, lng, recorded_at in rows]
+
+    @staticmethod
+    def compact_day(
+        db: Session,
+        cared_person_id: UUID,
+        day: date,
+        tolerance_meters: Optional[float] = None,
+    ) -> Optional[LocationTrajectory]:
+        """
+        Reemplazar los fixes crudos de un día por su trayectoria simplificada
+
+        Si el día ya tenía trayectoria (fixes que llegaron tarde), se fusionan
+        ambos y se vuelve a simplificar.
+        """
+        tolerance = settings.location_simplify_tolerance_meters if tolerance_meters is None else tolerance_meters
+        raw = LocationTrackingService._raw_points(db, cared_person_id, day)
+        if not raw:
+            return None
+
+        trajectory = db.query(LocationTrajectory).filter(
+            LocationTrajectory.cared_person_id == cared_person_id,
+            LocationTrajectory.day == day,
+        ).with_for_update().first()
+        points = raw
+        raw_count = len(raw)
+        if trajectory:
+            points = sorted([tuple(p) for p in json.loads(trajectory.points)] + raw, key=lambda p: p[2])
+            raw_count += trajectory.raw_point_count
+        else:
+            trajectory = LocationTrajectory(cared_person_id=cared_person_id, day=day)
+            db.add(trajectory)
+
+        simplified = simplify_track(points, tolerance)
+        trajectory.points = json.dumps([[lat, lng, ts] for lat, lng, ts in simplified])
+        trajectory.point_count = len(simplified)
+        trajectory.raw_point_count = raw_count
+        trajectory.distance_meters = round(track_length_meters(simplified), 1)
+        trajectory.tolerance_meters = tolerance
+        trajectory.started_at = datetime.fromtimestamp(simplified[0][2], tz=timezone.utc)
+        trajectory.ended_at = datetime.fromtimestamp(simplified[-1][2], tz=timezone.utc)
+
+        start, end = _day_bounds(day)
+        day_filter = (
+            LocationTracking.cared_person_id == cared_person_id,
+            LocationTracking.recorded_at >= start,
+            LocationTracking.recorded_at < end,
+        )
+        if settings.archive_enabled:
+            # Los fixes crudos se copian al archivo en frío antes de borrarlos,
+            # así la retención de location_tracking sigue aplicando a su historial
+            ColdStorageArchiver.archive_rows(db, ARCHIVED_TABLES_BY_NAME["location_tracking"], *day_filter)
+        db.query(LocationTracking).filter(*day_filter).delete(synchronize_session=False)
+        db.commit()
+        return trajectory
+
+    @staticmethod
+    def compact_history(db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Compactar los días completos que quedaron fuera de la ventana de fixes crudos
+
+        Returns:
+            int: Días compactados
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(hours=settings.location_raw_retention_hours)
+        boundary, _ = _day_bounds(cutoff.date())
+        utc_day = func.date(func.timezone("UTC", LocationTracking.recorded_at))
+        pending = db.query(LocationTracking.cared_person_id, utc_day).filter(
+            LocationTracking.cared_person_id.isnot(None),
+            LocationTracking.recorded_at < boundary,
+        ).distinct().all()
+
+        compacted = 0
+        for cared_person_id, day in pending:
+            try:
+                if LocationTrackingService.compact_day(db, cared_person_id, day):
+                    compacted += 1
+            except Exception:
+                db.rollback()
+                logger.exception("Failed to compact locations of %s on %s", cared_person_id, day)
+        return compacted
+
+
+class TrajectoryCompactor(PeriodicWorker):
+    """Ejecuta la compactación de historial de ubicaciones de forma periódica"""
+
+    thread_name = "trajectory-compactor"
+    failure_message = "Location compaction failed"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval: Optional[timedelta] = None,
+    ):
+        self.session_factory = session_factory
+        super().__init__(interval or timedelta(minutes=settings.location_compaction_interval_minutes))
+
+    def run_once(self) -> int:
+        db = self.session_factory()
+        try:
+            compacted = LocationTrackingService.compact_history(db)
+            if compacted:
+                logger.info("Compacted %s location days", compacted)
+            return compacted
+        finally:
+            db.close()
+
+
+# Instancia global usada por la API
+trajectory_compactor = TrajectoryCompactor()
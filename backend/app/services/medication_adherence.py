@@ -0,0 +1,319 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+from zoneinfo import ZoneInfo
+import logging
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.periodic import PeriodicWorker
+from app.models.cared_person import CaredPerson
+from app.models.medication_adherence import MedicationAdherenceDaily
+from app.models.medication_schedule import MedicationSchedule
+
+logger = logging.getLogger(__name__)
+
+REFRESH_LOCK_KEY = 724_303
+# Margen sobre la última actualización: tomas confirmadas por transacciones que
+# empezaron antes del refresco anterior pero terminaron después
+WATERMARK_OVERLAP = timedelta(minutes=5)
+COUNT_COLUMNS = ("doses_logged", "doses_taken", "doses_missed", "doses_timed", "doses_on_time", "side_effect_reports")
+
+# Pares (pauta, día local) a recalcular: tomas cambiadas desde la marca de agua
+# y los días recientes ya resumidos (por si se borró alguna toma)
+AFFECTED_SQL = """
+CREATE TEMP TABLE adherence_affected ON COMMIT DROP AS
+SELECT DISTINCT medication_schedule_id, (taken_at AT TIME ZONE :tz)::date AS day
+FROM medication_logs
+{log_filter}
+UNION
+SELECT medication_schedule_id, day
+FROM medication_adherence_daily
+{summary_filter}
+"""
+
+# Cada toma se compara con el horario más cercano de la pauta
+# (schedule_details.times, "HH:MM" en hora local, del día anterior, del mismo o
+# del siguiente) elegido con row_number() sobre los candidatos
+UPSERT_SQL = """
+INSERT INTO medication_adherence_daily (
+    medication_schedule_id, day, cared_person_id, institution_id,
+    doses_logged, doses_taken, doses_missed, doses_timed, doses_on_time, side_effect_reports,
+    created_at, updated_at, is_active
+)
+SELECT
+    medication_schedule_id, day, cared_person_id, institution_id,
+    count(*),
+    count(*) FILTER (WHERE NOT is_missed),
+    count(*) FILTER (WHERE is_missed),
+    count(*) FILTER (WHERE NOT is_missed AND scheduled_at IS NOT NULL),
+    count(*) FILTER (WHERE NOT is_missed AND abs(extract(epoch FROM taken_at - scheduled_at)) <= :tolerance_seconds),
+    count(*) FILTER (WHERE has_side_effects),
+    now(), now(), true
+FROM (
+    SELECT
+        l.medication_schedule_id, a.day, s.cared_person_id, cp.institution_id, l.taken_at,
+        coalesce(l.is_missed, false) AS is_missed,
+        coalesce(btrim(l.side_effects), '') <> '' AS has_side_effects,
+        dose.scheduled_at,
+        row_number() OVER (
+            PARTITION BY l.id
+            ORDER BY abs(extract(epoch FROM l.taken_at - dose.scheduled_at))
+        ) AS nearest
+    FROM adherence_affected a
+    JOIN medication_logs l
+        ON l.medication_schedule_id = a.medication_schedule_id
+        AND (l.taken_at AT TIME ZONE :tz)::date = a.day
+    JOIN medication_schedules s ON s.id = l.medication_schedule_id
+    JOIN cared_persons cp ON cp.id = s.cared_person_id
+    LEFT JOIN LATERAL (
+        SELECT ((a.day + shift.days) + times.value::time) AT TIME ZONE :tz AS scheduled_at
+        FROM jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(s.schedule_details -> 'times') = 'array' THEN s.schedule_details -> 'times' END
+        ) AS times(value)
+        CROSS JOIN (VALUES (-1), (0), (1)) AS shift(days)
+        WHERE times.value ~ '^([01]?[0-9]|2[0-3]):[0-5][0-9](:[0-5][0-9])?$'
+    ) AS dose ON true
+    WHERE l.is_active
+) AS logs
+WHERE nearest = 1
+GROUP BY medication_schedule_id, day, cared_person_id, institution_id
+ON CONFLICT ON CONSTRAINT uq_medication_adherence_daily_schedule_day DO UPDATE SET
+    cared_person_id = EXCLUDED.cared_person_id,
+    institution_id = EXCLUDED.institution_id,
+    doses_logged = EXCLUDED.doses_logged,
+    doses_taken = EXCLUDED.doses_taken,
+    doses_missed = EXCLUDED.doses_missed,
+    doses_timed = EXCLUDED.doses_timed,
+    doses_on_time = EXCLUDED.doses_on_time,
+    side_effect_reports = EXCLUDED.side_effect_reports,
+    updated_at = now()
+"""
+
+# Pares recalculados que ya no tienen tomas (now() es el inicio de la transacción)
+DELETE_STALE_SQL = """
+DELETE FROM medication_adherence_daily d
+USING adherence_affected a
+WHERE d.medication_schedule_id = a.medication_schedule_id
+    AND d.day = a.day
+    AND d.updated_at < now()
+"""
+
+# Totales de una ventana móvil de `window` días por cada día del rango
+TREND_SQL = """
+SELECT * FROM (
+    SELECT
+        day,
+        {window_sums}
+    FROM medication_adherence_daily
+    WHERE {scope} = :scope_id AND day BETWEEN :window_start AND :end_day
+    GROUP BY day
+    WINDOW w AS (ORDER BY day RANGE BETWEEN INTERVAL '{preceding} days' PRECEDING AND CURRENT ROW)
+) AS rolling
+WHERE day >= :start_day
+ORDER BY day
+"""
+
+
+def _ratio(numerator: int, denominator: int) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def adherence_metrics(counts: Any) -> Dict[str, Any]:
+    """
+    Métricas de adherencia a partir de los contadores sumados
+
+    - taken_ratio: tomadas / registradas (tomadas + omitidas)
+    - on_time_ratio: a tiempo / tomadas con horario conocido
+    - side_effect_rate: reportes de efectos adversos / tomadas
+    """
+    values = {name: int(getattr(counts, name) or 0) for name in COUNT_COLUMNS}
+    values["taken_ratio"] = _ratio(values["doses_taken"], values["doses_logged"])
+    values["on_time_ratio"] = _ratio(values["doses_on_time"], values["doses_timed"])
+    values["side_effect_rate"] = _ratio(values["side_effect_reports"], values["doses_taken"])
+    return values
+
+
+def local_today(now: Optional[datetime] = None) -> date:
+    now = now or datetime.now(timezone.utc)
+    return now.astimezone(ZoneInfo(settings.medication_timezone)).date()
+
+
+class MedicationAdherenceService:
+    """
+    Adherencia a la medicación por pauta, persona bajo cuidado e institución
+
+    Las tomas se resumen por pauta y día local en `medication_adherence_daily`
+    con SQL (cada toma se compara con el horario más cercano de la pauta); el
+    refresco solo recalcula los días con tomas cambiadas desde el anterior. Las
+    consultas del panel leen el resumen y las tendencias se calculan con
+    ventanas móviles sobre él.
+    """
+
+    @staticmethod
+    def refresh(db: Session, now: Optional[datetime] = None, full: bool = False) -> int:
+        """
+        Recalcular el resumen diario
+
+        Args:
+            db: Sesión de base de datos
+            now: Momento de referencia (para los días recientes)
+            full: Recalcular todas las tomas en lugar de solo las cambiadas
+
+        Returns:
+            Cantidad de pares (pauta, día) recalculados
+        """
+        watermark = None
+        if not full:
+            watermark = db.query(func.max(MedicationAdherenceDaily.updated_at)).scalar()
+        params: Dict[str, Any] = {
+            "tz": settings.medication_timezone,
+            "tolerance_seconds": settings.medication_on_time_tolerance_minutes * 60,
+        }
+        log_filter = summary_filter = ""
+        if watermark is not None:
+            log_filter = "WHERE updated_at > :watermark"
+            summary_filter = "WHERE day >= :since_day"
+            params["watermark"] = watermark - WATERMARK_OVERLAP
+            params["since_day"] = local_today(now) - timedelta(days=settings.adherence_refresh_lookback_days)
+
+        db.execute(text(AFFECTED_SQL.format(log_filter=log_filter, summary_filter=summary_filter)), params)
+        affected = db.execute(text("SELECT count(*) FROM adherence_affected")).scalar()
+        if affected:
+            db.execute(text(UPSERT_SQL), params)
+            db.execute(text(DELETE_STALE_SQL))
+        db.commit()
+        if affected:
+            logger.info("Refreshed medication adherence for %s schedule-days", affected)
+        return affected
+
+    @staticmethod
+    def _summary_query(db: Session, start: date, end: date, *columns):
+        sums = [func.sum(getattr(MedicationAdherenceDaily, name)).label(name) for name in COUNT_COLUMNS]
+        return db.query(*columns, *sums).filter(
+            MedicationAdherenceDaily.day >= start,
+            MedicationAdherenceDaily.day <= end,
+        )
+
+    @staticmethod
+    def for_cared_person(db: Session, cared_person_id: UUID, start: date, end: date) -> Dict[str, Any]:
+        """Adherencia total y por pauta de una persona bajo cuidado entre `start` y `end` (inclusive)"""
+        base = MedicationAdherenceService._summary_query(db, start, end).filter(
+            MedicationAdherenceDaily.cared_person_id == cared_person_id
+        )
+        rows = (
+            MedicationAdherenceService._summary_query(
+                db, start, end, MedicationSchedule.id, MedicationSchedule.medication_name
+            )
+            .join(MedicationSchedule, MedicationSchedule.id == MedicationAdherenceDaily.medication_schedule_id)
+            .filter(MedicationAdherenceDaily.cared_person_id == cared_person_id)
+            .group_by(MedicationSchedule.id, MedicationSchedule.medication_name)
+            .order_by(MedicationSchedule.medication_name)
+            .all()
+        )
+        return {
+            "start": start,
+            "end": end,
+            "totals": adherence_metrics(base.one()),
+            "schedules": [
+                {"medication_schedule_id": row.id, "medication_name": row.medication_name, **adherence_metrics(row)}
+                for row in rows
+            ],
+        }
+
+    @staticmethod
+    def for_institution(db: Session, institution_id: int, start: date, end: date) -> Dict[str, Any]:
+        """Adherencia total y por persona bajo cuidado de una institución (peor adherencia primero)"""
+        base = MedicationAdherenceService._summary_query(db, start, end).filter(
+            MedicationAdherenceDaily.institution_id == institution_id
+        )
+        rows = (
+            MedicationAdherenceService._summary_query(
+                db, start, end, CaredPerson.id, CaredPerson.first_name, CaredPerson.last_name
+            )
+            .join(CaredPerson, CaredPerson.id == MedicationAdherenceDaily.cared_person_id)
+            .filter(MedicationAdherenceDaily.institution_id == institution_id)
+            .group_by(CaredPerson.id, CaredPerson.first_name, CaredPerson.last_name)
+            .all()
+        )
+        cared_persons = [
+            {"cared_person_id": row.id, "name": f"{row.first_name} {row.last_name}", **adherence_metrics(row)}
+            for row in rows
+        ]
+        cared_persons.sort(key=lambda item: (item["taken_ratio"] is None, item["taken_ratio"] or 0))
+        return {
+            "start": start,
+            "end": end,
+            "totals": adherence_metrics(base.one()),
+            "cared_persons": cared_persons,
+        }
+
+    @staticmethod
+    def trend_query(scope: str, window: int):
+        """Consulta de tendencia: sumas de los últimos `window` días para cada día"""
+        if scope not in ("cared_person_id", "institution_id"):
+            raise ValueError(f"Alcance de tendencia desconocido: {scope}")
+        window_sums = ",\n        ".join(f"sum(sum({name})) OVER w AS {name}" for name in COUNT_COLUMNS)
+        return text(TREND_SQL.format(window_sums=window_sums, scope=scope, preceding=int(window) - 1))
+
+    @staticmethod
+    def trend(db: Session, scope: str, scope_id: Any, start: date, end: date, window: int = 7) -> List[Dict[str, Any]]:
+        """
+        Tendencia diaria con ventana móvil
+
+        Args:
+            scope: "cared_person_id" o "institution_id"
+            scope_id: Persona bajo cuidado o institución
+            window: Días de la ventana móvil
+
+        Returns:
+            List[dict]: Un punto por día con datos, con las métricas de la ventana que termina ese día
+        """
+        rows = db.execute(MedicationAdherenceService.trend_query(scope, window), {
+            "scope_id": scope_id,
+            "window_start": start - timedelta(days=window - 1),
+            "start_day": start,
+            "end_day": end,
+        })
+        return [{"day": row.day, **adherence_metrics(row)} for row in rows]
+
+
+class AdherenceRefresher(PeriodicWorker):
+    """Ejecuta el refresco incremental de la adherencia de forma periódica"""
+
+    thread_name = "adherence-refresher"
+    failure_message = "Medication adherence refresh failed"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval: Optional[timedelta] = None,
+    ):
+        self.session_factory = session_factory
+        super().__init__(interval or timedelta(minutes=settings.adherence_refresh_interval_minutes))
+
+    def run_once(self, full: bool = False) -> int:
+        db = self.session_factory()
+        try:
+            with db.get_bind().connect() as lock_connection:
+                locked = lock_connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": REFRESH_LOCK_KEY}
+                ).scalar()
+                if not locked:
+                    return 0
+                try:
+                    return MedicationAdherenceService.refresh(db, full=full)
+                finally:
+                    lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": REFRESH_LOCK_KEY})
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+# Instancia global usada por la API
+adherence_refresher = AdherenceRefresher()
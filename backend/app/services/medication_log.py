@@ -30,11 +30,12 @@ class MedicationLogService:
         ).order_by(MedicationLog.taken_at.desc()).all()
 
     @staticmethod
-    def get_by_cared_person_id(db: Session, cared_person_id: UUID, limit: int = 100) -> List[MedicationLog]:
-        """Get medication logs for a cared person"""
+    def get_by_cared_person_id(db: Session, cared_person_id: UUID, limit: int = 100, columns: Optional[list] = None) -> List[MedicationLog]:
+        """Get medication logs for a cared person (only `columns` as rows when given)"""
         from app.models.medication_schedule import MedicationSchedule
         
-        return db.query(MedicationLog).join(MedicationSchedule).filter(
+        query = db.query(*columns) if columns else db.query(MedicationLog)
+        return query.join(MedicationSchedule, MedicationLog.medication_schedule_id == MedicationSchedule.id).filter(
             MedicationSchedule.cared_person_id == cared_person_id
         ).order_by(MedicationLog.taken_at.desc()).limit(limit).all()
 
@@ -54,9 +55,10 @@ class MedicationLogService:
         ).order_by(MedicationLog.taken_at.desc()).all()
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[MedicationLog]:
-        """Get all medication logs"""
-        return db.query(MedicationLog).offset(skip).limit(limit).all()
+    def get_all(db: Session, skip: int = 0, limit: int = 100, columns: Optional[list] = None) -> List[MedicationLog]:
+        """Get all medication logs (only `columns` as rows when given)"""
+        query = db.query(*columns) if columns else db.query(MedicationLog)
+        return query.offset(skip).limit(limit).all()
 
     @staticmethod
     def update(db: Session, log_id: UUID, medication_log: MedicationLogUpdate) -> MedicationLog:
@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Notifier(ABC):
+    """Canal de notificación enchufable usado por los procesos en segundo plano"""
+
+    @abstractmethod
+    def send(self, topic: str, payload: Dict[str, Any]) -> None:
+        """
+        Enviar una notificación
+
+        Args:
+            topic: Tema de la notificación (ej. "reminder.due")
+            payload: Datos serializables de la notificación
+        """
+
+
+class LoggingNotifier(Notifier):
+    """Notificador por defecto: registra la notificación en el log"""
+
+    def send(self, topic: str, payload: Dict[str, Any]) -> None:
+        logger.info("Notification %s: %s", topic, payload)
+
+
+class CompositeNotifier(Notifier):
+    """Reenvía cada notificación a varios notificadores"""
+
+    def __init__(self, notifiers: List[Notifier]):
+        self.notifiers = list(notifiers)
+
+    def add(self, notifier: Notifier) -> None:
+        """Agregar un notificador al final de la cadena"""
+        self.notifiers.append(notifier)
+
+    def send(self, topic: str, payload: Dict[str, Any]) -> None:
+        for notifier in self.notifiers:
+            try:
+                notifier.send(topic, payload)
+            except Exception:
+                # Un canal caído no debe impedir que el resto reciba la notificación
+                logger.exception("Notifier %s failed for %s", type(notifier).__name__, topic)
@@ -170,8 +170,9 @@ class PackageService:
             current_amount=final_price,
             next_billing_date=next_billing,
             status_type_id=active_status.id if active_status else None,
-            referral_code_used=getattr(subscription_data, "referral_code", None),
-            referral_commission_applied=referral_applied,
+            # Solo se guarda un código válido; la comisión la genera el lote de referidos
+            referral_code_used=referral_code if referral_applied else None,
+            referral_commission_applied=False,
             legal_capacity_verified=legal_check["verification_status"] == "verified"
         )
         db.add(db_user_package)
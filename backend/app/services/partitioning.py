@@ -0,0 +1,236 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.periodic import PeriodicWorker
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock: con varios procesos del API solo uno mantiene las particiones a la vez
+MAINTENANCE_LOCK_KEY = 724_302
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    """Tabla particionada por rango mensual sobre una columna de tiempo"""
+    name: str
+    column: str
+    retention_setting: str
+
+    @property
+    def retention_months(self) -> int:
+        return getattr(settings, self.retention_setting)
+
+    @property
+    def default_partition(self) -> str:
+        return f"{self.name}_default"
+
+
+PARTITIONED_TABLES = (
+    PartitionedTable("events", "event_time", "events_retention_months"),
+    PartitionedTable("location_tracking", "recorded_at", "location_tracking_retention_months"),
+    PartitionedTable("debug_events", "event_time", "debug_events_retention_months"),
+)
+
+
+def month_start(value) -> date:
+    """Primer día del mes (UTC) de una fecha o datetime"""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        value = value.date()
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bounds(month: date) -> tuple:
+    """Rango [desde, hasta) en UTC de la partición del mes"""
+    lower = datetime.combine(month, time.min, tzinfo=timezone.utc)
+    upper = datetime.combine(add_months(month, 1), time.min, tzinfo=timezone.utc)
+    return lower, upper
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def partition_month(table: str, name: str) -> Optional[date]:
+    """Mes de una partición a partir de su nombre, o None si no es mensual"""
+    match = re.fullmatch(rf"{re.escape(table)}_p(\d{{4}})(\d{{2}})", name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def expired_months(months: Iterable[date], retention_months: int, today: date) -> List[date]:
+    """
+    Meses cuya partición quedó completa fuera de la ventana de retención
+
+    Con retención de 12 meses y hoy en octubre de 2026 se conservan las
+    particiones desde octubre de 2025: las que terminan antes se eliminan.
+    """
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(today), -retention_months)
+    return sorted(month for month in months if add_months(month, 1) <= cutoff)
+
+
+class PartitionManager:
+    """
+    Mantenimiento de las particiones mensuales de las tablas de series de tiempo
+
+    Crea por adelantado las particiones de los próximos meses (si hay filas
+    para ese mes en la partición DEFAULT las mueve a la nueva) y aplica la
+    política de retención soltando particiones completas, sin DELETE masivos
+    ni VACUUM sobre tablas gigantes.
+    """
+
+    @staticmethod
+    def existing_partitions(db: Session, table: PartitionedTable) -> Dict[date, str]:
+        """Particiones mensuales adjuntas a la tabla, por mes"""
+        names = db.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ), {"table": table.name}).scalars()
+        partitions = {}
+        for name in names:
+            month = partition_month(table.name, name)
+            if month is not None:
+                partitions[month] = name
+        return partitions
+
+    @staticmethod
+    def create_partition(db: Session, table: PartitionedTable, month: date) -> str:
+        """
+        Crear la partición de un mes
+
+        Si la partición DEFAULT tiene filas de ese mes, PostgreSQL no permite
+        crearla directamente: se crea suelta, se mueven las filas y se adjunta.
+        """
+        name = partition_name(table.name, month)
+        lower, upper = month_bounds(month)
+        bounds = {"lower": lower, "upper": upper}
+        db.execute(text("SET LOCAL lock_timeout = '5s'"))
+        stray = db.execute(text(
+            f'SELECT 1 FROM "{table.default_partition}" '
+            f'WHERE "{table.column}" >= :lower AND "{table.column}" < :upper LIMIT 1'
+        ), bounds).first()
+        range_sql = f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        if stray is None:
+            db.execute(text(f'CREATE TABLE "{name}" PARTITION OF "{table.name}" {range_sql}'))
+        else:
+            db.execute(text(f'CREATE TABLE "{name}" (LIKE "{table.name}" INCLUDING DEFAULTS)'))
+            db.execute(text(
+                f'WITH moved AS (DELETE FROM "{table.default_partition}" '
+                f'WHERE "{table.column}" >= :lower AND "{table.column}" < :upper RETURNING *) '
+                f'INSERT INTO "{name}" SELECT * FROM moved'
+            ), bounds)
+            db.execute(text(f'ALTER TABLE "{table.name}" ATTACH PARTITION "{name}" {range_sql}'))
+        db.commit()
+        logger.info("Created partition %s", name)
+        return name
+
+    @staticmethod
+    def ensure_future_partitions(db: Session, now: Optional[datetime] = None) -> List[str]:
+        """Crear las particiones del mes actual y de los próximos `partition_premake_months`"""
+        current = month_start(now or datetime.now(timezone.utc))
+        created = []
+        for table in PARTITIONED_TABLES:
+            existing = PartitionManager.existing_partitions(db, table)
+            for offset in range(settings.partition_premake_months + 1):
+                month = add_months(current, offset)
+                if month not in existing:
+                    created.append(PartitionManager.create_partition(db, table, month))
+        return created
+
+    @staticmethod
+    def apply_retention(db: Session, now: Optional[datetime] = None) -> List[str]:
+        """
+        Soltar las particiones fuera de la ventana de retención de cada tabla
+
+        Con `partition_retention_action = "detach"` la partición se desadjunta
+        y queda como tabla independiente para archivarla; con "drop" se borra.
+        """
+        today = (now or datetime.now(timezone.utc)).date()
+        removed = []
+        for table in PARTITIONED_TABLES:
+            existing = PartitionManager.existing_partitions(db, table)
+            for month in expired_months(existing, table.retention_months, today):
+                name = existing[month]
+                db.execute(text("SET LOCAL lock_timeout = '5s'"))
+                db.execute(text(f'ALTER TABLE "{table.name}" DETACH PARTITION "{name}"'))
+                if settings.partition_retention_action == "drop":
+                    db.execute(text(f'DROP TABLE "{name}"'))
+                db.commit()
+                removed.append(name)
+                logger.info("Retention %s partition %s", settings.partition_retention_action, name)
+            if table.retention_months > 0 and settings.partition_retention_action == "drop":
+                cutoff = month_bounds(add_months(month_start(today), -table.retention_months))[0]
+                db.execute(text(
+                    f'DELETE FROM "{table.default_partition}" WHERE "{table.column}" < :cutoff'
+                ), {"cutoff": cutoff})
+                db.commit()
+        return removed
+
+    @staticmethod
+    def maintain(db: Session, now: Optional[datetime] = None) -> Dict[str, List[str]]:
+        created = PartitionManager.ensure_future_partitions(db, now)
+        if settings.archive_enabled:
+            # Si el archivo falla, la excepción corta el ciclo antes de soltar particiones
+            from app.services.archiver import ColdStorageArchiver
+            ColdStorageArchiver.archive_expired(db, now)
+        return {
+            "created": created,
+            "removed": PartitionManager.apply_retention(db, now),
+        }
+
+
+class PartitionMaintainer(PeriodicWorker):
+    """Ejecuta el mantenimiento de particiones de forma periódica"""
+
+    thread_name = "partition-maintainer"
+    failure_message = "Partition maintenance failed"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval: Optional[timedelta] = None,
+    ):
+        self.session_factory = session_factory
+        super().__init__(interval or timedelta(hours=settings.partition_maintenance_interval_hours))
+
+    def run_once(self) -> Dict[str, List[str]]:
+        db = self.session_factory()
+        try:
+            with db.get_bind().connect() as lock_connection:
+                locked = lock_connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+                ).scalar()
+                if not locked:
+                    return {"created": [], "removed": []}
+                try:
+                    return PartitionManager.maintain(db)
+                finally:
+                    lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+# Instancia global usada por la API
+partition_maintainer = PartitionMaintainer()
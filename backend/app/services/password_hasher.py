@@ -0,0 +1,124 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import threading
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """
+    Hash y verificación de contraseñas (bcrypt) en un pool de hilos acotado
+
+    bcrypt es caro a propósito; ejecutarlo dentro del request ocupa los hilos
+    del API justo en los picos de login (cambios de turno). Las operaciones se
+    envían a un pool propio de `password_hash_workers` hilos con una cola de
+    a lo sumo `password_hash_max_queue` trabajos: si la cola está llena se
+    responde 503 en lugar de acumular requests esperando.
+
+    El factor de trabajo es `password_bcrypt_rounds`; los hashes con otro
+    factor se regeneran de forma transparente al verificar la contraseña
+    (`verify_and_update`).
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        rounds: Optional[int] = None,
+    ):
+        self.workers = workers or settings.password_hash_workers
+        self.max_queue = settings.password_hash_max_queue if max_queue is None else max_queue
+        self.rounds = rounds or settings.password_bcrypt_rounds
+        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=self.rounds)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    # --- Cola ---
+
+    def _submit(self, fn: Callable, *args: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                logger.warning("Password hashing queue full (%d pending)", self._pending)
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+            self._pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    @property
+    def queue_depth(self) -> int:
+        """Trabajos esperando un hilo libre"""
+        with self._lock:
+            return max(self._pending - self.workers, 0)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": min(self._pending, self.workers),
+                "queue_depth": max(self._pending - self.workers, 0),
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rounds": self.rounds,
+            }
+
+    # --- API sincrónica (bloquea el hilo que llama, no la CPU del API) ---
+
+    def hash(self, password: str) -> str:
+        return self._submit(self.context.hash, password).result()
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self._submit(self.context.verify, password, password_hash).result()
+
+    def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verificar una contraseña y regenerar el hash si usa otro factor de trabajo
+
+        Returns:
+            tuple: (es válida, nuevo hash o None si no hace falta actualizarlo)
+        """
+        return self._submit(self.context.verify_and_update, password, password_hash).result()
+
+    # --- API asíncrona ---
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(self.context.hash, password))
+
+    async def verify_async(self, password: str, password_hash: str) -> bool:
+        return await asyncio.wrap_future(self._submit(self.context.verify, password, password_hash))
+
+    async def verify_and_update_async(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(self._submit(self.context.verify_and_update, password, password_hash))
+
+    def stop(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+# Instancia global usada por la autenticación
+password_hasher = PasswordHasher()
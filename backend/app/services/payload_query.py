@@ -0,0 +1,69 @@
+from typing import Any, Dict, Optional
+import json
+
+from fastapi import HTTPException, status
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class PayloadQuery:
+    """
+    Predicados SQL sobre columnas JSONB de payload (event_data, alert_data, config_data...)
+
+    Los filtros se resuelven en PostgreSQL en lugar de cargar filas y hacer
+    `json.loads` en Python. `contains` usa el operador `@>`, cubierto por los
+    índices GIN `jsonb_path_ops`; `equals` compara `->>` / `#>>` como texto y
+    aprovecha los índices de expresión (p. ej. `event_data ->> 'sensor'`).
+    """
+
+    @staticmethod
+    def value(column, path: str) -> ColumnElement:
+        """
+        Valor de una clave del payload como texto
+
+        Args:
+            column: Columna JSONB
+            path: Clave, o ruta separada por puntos para claves anidadas ("reading.unit")
+        """
+        keys = path.split(".")
+        if len(keys) == 1:
+            return column[keys[0]].astext
+        return column[tuple(keys)].astext
+
+    @staticmethod
+    def equals(column, path: str, value: Any) -> ColumnElement:
+        """Payload cuya clave `path` vale `value` (comparado como texto)"""
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        return PayloadQuery.value(column, path) == str(value)
+
+    @staticmethod
+    def contains(column, fragment: Dict[str, Any]) -> ColumnElement:
+        """Payload que contiene el fragmento JSON (`column @> fragment`)"""
+        return column.contains(fragment)
+
+    @staticmethod
+    def parse_filter(raw: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Interpretar un filtro de payload recibido como query param
+
+        Args:
+            raw: Objeto JSON, p. ej. '{"location": "Cocina"}'
+
+        Returns:
+            dict | None: Fragmento para `contains`
+
+        Raises:
+            HTTPException: 400 si no es un objeto JSON
+        """
+        if not raw:
+            return None
+        try:
+            fragment = json.loads(raw)
+        except ValueError:
+            fragment = None
+        if not isinstance(fragment, dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Payload filter must be a JSON object"
+            )
+        return fragment
@@ -2,7 +2,7 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
-from datetime import datetime, timedelta
+from datetime import datetime
 import secrets
 import string
 
@@ -338,25 +338,10 @@ class ReferralService:
     
     @staticmethod
     def expire_old_referrals(db: Session) -> int:
-        """Expire referrals older than REFERRAL_EXPIRY_DAYS"""
-        expiry_date = datetime.utcnow() - timedelta(days=ReferralService.REFERRAL_EXPIRY_DAYS)
+        """Expire referrals older than REFERRAL_EXPIRY_DAYS (set-based, in batches)"""
+        from app.services.referral_batch import ReferralBatchService
         
-        # Buscar el ID del status_type "pending"
-        pending_status = db.query(StatusType).filter(StatusType.name == "pending").first()
-        expired_status = db.query(StatusType).filter(StatusType.name == "expired").first()
-        
-        if not pending_status or not expired_status:
-            return 0
-        
-        expired_count = db.query(Referral).filter(
-            and_(
-                Referral.status_type_id == pending_status.id,
-                Referral.created_at < expiry_date
-            )
-        ).update({"status_type_id": expired_status.id, "expired_at": datetime.utcnow()})
-        
-        db.commit()
-        return expired_count
+        return ReferralBatchService.expire_referrals(db)
     
     @staticmethod
     def calculate_commission_amount(
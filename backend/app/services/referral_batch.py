@@ -0,0 +1,215 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.periodic import PeriodicWorker
+from app.models.status_type import StatusType
+from app.services.batch_runs import BatchRunService
+from app.services.referral import ReferralService
+
+logger = logging.getLogger(__name__)
+
+BATCH_KIND = "referrals"
+
+# Pendientes vencidos, de a un lote; el UPDATE devuelve solo el conteo. No vence
+# los que ya usó una suscripción con la comisión por generar (se pagan igual)
+EXPIRE_SQL = """
+WITH expiring AS (
+    SELECT id FROM referrals r
+    WHERE status_type_id = :pending_id AND created_at < :cutoff
+      AND NOT EXISTS (
+          SELECT 1 FROM user_packages up
+          WHERE up.referral_code_used = r.referral_code AND NOT up.referral_commission_applied
+      )
+    ORDER BY created_at
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+), expired AS (
+    UPDATE referrals r
+    SET status_type_id = :expired_id, expired_at = timezone('utc', now()), updated_at = now()
+    FROM expiring
+    WHERE r.id = expiring.id
+    RETURNING r.id
+)
+SELECT count(*) FROM expired
+"""
+
+# Suscripciones con código de referido válido sin comisión: comisión "first_month"
+# para el referente (una por referido), suscripción marcada y referido convertido
+COMMISSIONS_SQL = """
+WITH rates AS (
+    SELECT * FROM unnest(CAST(:rate_types AS text[]), CAST(:rate_values AS double precision[]))
+        AS rates(referrer_type, percentage)
+), candidates AS (
+    SELECT up.id AS user_package_id, r.id AS referral_id, r.referrer_type, r.referrer_id, rates.percentage,
+           round((up.current_amount * rates.percentage)::numeric, 2) AS amount
+    FROM user_packages up
+    JOIN referrals r ON r.referral_code = up.referral_code_used
+    JOIN rates ON rates.referrer_type = r.referrer_type
+    WHERE up.referral_code_used IS NOT NULL
+      AND NOT up.referral_commission_applied
+      AND r.status_type_id IS DISTINCT FROM :expired_id
+      AND r.status_type_id IS DISTINCT FROM :converted_id
+    ORDER BY up.id
+    LIMIT :batch_size
+    FOR UPDATE OF up, r SKIP LOCKED
+), payable AS (
+    SELECT DISTINCT ON (referral_id) * FROM candidates ORDER BY referral_id, user_package_id
+), inserted AS (
+    INSERT INTO referral_commissions (
+        id, referral_id, recipient_type, recipient_id, amount, commission_type, percentage,
+        status_type_id, is_active, created_at, updated_at
+    )
+    SELECT gen_random_uuid(), referral_id, referrer_type, referrer_id, amount, 'first_month', percentage,
+           :pending_id, true, now(), now()
+    FROM payable
+    RETURNING referral_id, amount
+), applied AS (
+    UPDATE user_packages up
+    SET referral_commission_applied = true, updated_at = now()
+    FROM payable p
+    WHERE up.id = p.user_package_id
+    RETURNING up.id
+), converted AS (
+    UPDATE referrals r
+    SET status_type_id = coalesce(:converted_id, r.status_type_id),
+        converted_at = coalesce(r.converted_at, timezone('utc', now())),
+        commission_amount = coalesce(r.commission_amount, 0) + totals.amount,
+        updated_at = now()
+    FROM (SELECT referral_id, sum(amount) AS amount FROM inserted GROUP BY referral_id) totals
+    WHERE r.id = totals.referral_id
+    RETURNING r.id
+)
+SELECT (SELECT count(*) FROM candidates) AS candidates,
+       (SELECT count(*) FROM inserted) AS commissions,
+       (SELECT coalesce(sum(amount), 0) FROM inserted) AS amount,
+       (SELECT count(*) FROM applied) AS subscriptions,
+       (SELECT count(*) FROM converted) AS referrals
+"""
+
+
+def _status_ids(db: Session) -> Dict[str, Optional[int]]:
+    rows = db.query(StatusType.name, StatusType.id).filter(
+        StatusType.name.in_(("pending", "expired", "converted"))
+    ).all()
+    ids = dict(rows)
+    return {name: ids.get(name) for name in ("pending", "expired", "converted")}
+
+
+class ReferralBatchService:
+    """
+    Proceso por lotes de referidos
+
+    Genera las comisiones de las conversiones y después vence los referidos
+    pendientes (un referido usado antes de vencer cobra su comisión) con sentencias set-based (UPDATE/INSERT … RETURNING) de `referral_batch_size`
+    filas por transacción: la memoria no depende del volumen y cada lote
+    libera sus bloqueos al confirmar. Cada día se registra en `batch_runs`.
+    """
+
+    @staticmethod
+    def expire_referrals(db: Session, batch_size: Optional[int] = None) -> int:
+        """Vencer los referidos pendientes de más de REFERRAL_EXPIRY_DAYS"""
+        statuses = _status_ids(db)
+        if not statuses["pending"] or not statuses["expired"]:
+            return 0
+        params = {
+            "pending_id": statuses["pending"],
+            "expired_id": statuses["expired"],
+            "cutoff": datetime.now(timezone.utc) - timedelta(days=ReferralService.REFERRAL_EXPIRY_DAYS),
+            "batch_size": batch_size or settings.referral_batch_size,
+        }
+        total = 0
+        while True:
+            expired = db.execute(text(EXPIRE_SQL), params).scalar()
+            db.commit()
+            total += expired
+            if expired < params["batch_size"]:
+                return total
+
+    @staticmethod
+    def generate_commissions(db: Session, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Comisiones de primer mes de las suscripciones con código de referido"""
+        statuses = _status_ids(db)
+        totals = {"commissions": 0, "commission_amount": 0.0, "converted": 0}
+        if not statuses["expired"] or not statuses["converted"]:
+            return totals
+        rates = {
+            referrer_type: values["first_month"]
+            for referrer_type, values in ReferralService.COMMISSION_RATES.items()
+        }
+        params = {
+            "rate_types": list(rates),
+            "rate_values": list(rates.values()),
+            "pending_id": statuses["pending"],
+            "expired_id": statuses["expired"],
+            "converted_id": statuses["converted"],
+            "batch_size": batch_size or settings.referral_batch_size,
+        }
+        while True:
+            row = db.execute(text(COMMISSIONS_SQL), params).one()
+            db.commit()
+            totals["commissions"] += row.commissions
+            totals["commission_amount"] = round(totals["commission_amount"] + float(row.amount), 2)
+            totals["converted"] += row.referrals
+            if row.candidates < params["batch_size"]:
+                return totals
+
+    @staticmethod
+    def run(db: Session, run_key: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+        """
+        Ejecutar el lote del día (o de `run_key`) una sola vez
+
+        Args:
+            db: Sesión de base de datos
+            run_key: Clave de la ejecución (por defecto la fecha UTC)
+            force: Repetir aunque ya se haya completado
+
+        Returns:
+            dict: run_key, skipped y las filas procesadas por etapa
+        """
+        run_key = run_key or datetime.now(timezone.utc).date().isoformat()
+        run_id = BatchRunService.begin(db, BATCH_KIND, run_key, force)
+        if run_id is None:
+            return {"run_key": run_key, "skipped": True}
+        stats: Dict[str, Any] = {}
+        try:
+            stats.update(ReferralBatchService.generate_commissions(db))
+            stats["expired"] = ReferralBatchService.expire_referrals(db)
+        except Exception as exc:
+            db.rollback()
+            BatchRunService.fail(db, run_id, str(exc), stats)
+            raise
+        BatchRunService.finish(db, run_id, stats)
+        logger.info("Referral batch %s: %s", run_key, stats)
+        return {"run_key": run_key, "skipped": False, **stats}
+
+
+class ReferralBatchProcessor(PeriodicWorker):
+    """Ejecuta el lote de referidos de forma periódica (una vez por día)"""
+
+    thread_name = "referral-batch"
+    failure_message = "Referral batch failed"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval: Optional[timedelta] = None,
+    ):
+        self.session_factory = session_factory
+        super().__init__(interval or timedelta(minutes=settings.referral_batch_interval_minutes))
+
+    def run_once(self) -> Dict[str, Any]:
+        db = self.session_factory()
+        try:
+            return ReferralBatchService.run(db)
+        finally:
+            db.close()
+
+
+# Instancia global usada por la API
+referral_batch_processor = ReferralBatchProcessor()
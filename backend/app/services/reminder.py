@@ -9,6 +9,7 @@ from app.models.cared_person import CaredPerson
 from app.models.status_type import StatusType
 from app.schemas.reminder import ReminderCreate, ReminderUpdate
 from app.core.exceptions import NotFoundException, ValidationException
+from app.services.reminder_dispatcher import reminder_dispatcher
 
 class ReminderService:
     """Servicio para gestión de recordatorios del sistema"""
@@ -61,6 +62,7 @@ class ReminderService:
         db.add(db_reminder)
         db.commit()
         db.refresh(db_reminder)
+        reminder_dispatcher.sync(db_reminder)
         
         return db_reminder
     
@@ -214,6 +216,7 @@ class ReminderService:
         
         db.commit()
         db.refresh(db_reminder)
+        reminder_dispatcher.sync(db_reminder)
         
         return db_reminder
     
@@ -236,6 +239,7 @@ class ReminderService:
         
         db.delete(db_reminder)
         db.commit()
+        reminder_dispatcher.remove(reminder_id)
         
         return True
     
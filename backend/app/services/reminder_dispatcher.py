@@ -0,0 +1,294 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+import calendar
+import logging
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.scheduler import DeadlineScheduler
+from app.core.timeutils import as_utc, utc_now
+from app.models.reminder import Reminder
+from app.models.status_type import StatusType
+from app.services.live_feed import LiveFeedNotifier, live_feed
+from app.services.notifications import CompositeNotifier, LoggingNotifier, Notifier
+
+logger = logging.getLogger(__name__)
+
+# Estados en los que un recordatorio ya no debe dispararse
+FINAL_STATUSES = ("completed", "cancelled", "expired", "archived")
+
+FIXED_STEPS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+MONTH_STEPS = {
+    "monthly": 1,
+    "yearly": 12,
+}
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    """Sumar meses ajustando el día al último día válido del mes"""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def next_occurrence(anchor: datetime, repeat_pattern: Optional[str], not_before: datetime) -> Optional[datetime]:
+    """
+    Calcular la primera ocurrencia de un recordatorio en o después de `not_before`
+
+    La expansión es perezosa: solo se calcula la siguiente ocurrencia, nunca la
+    serie completa. Patrones desconocidos ("custom", "none") se tratan como
+    recordatorios de una sola vez.
+
+    Args:
+        anchor: Hora programada original del recordatorio
+        repeat_pattern: Patrón de repetición (daily, weekly, monthly, yearly)
+        not_before: Límite inferior para la ocurrencia
+
+    Returns:
+        datetime: Próxima ocurrencia en UTC, o None si ya no hay más
+    """
+    anchor = as_utc(anchor)
+    not_before = as_utc(not_before)
+    pattern = (repeat_pattern or "none").strip().lower()
+
+    if anchor >= not_before:
+        return anchor
+
+    if pattern in FIXED_STEPS:
+        step = FIXED_STEPS[pattern]
+        steps = -((anchor - not_before) // step)  # división techo
+        return anchor + steps * step
+
+    if pattern in MONTH_STEPS:
+        step_months = MONTH_STEPS[pattern]
+        elapsed = (not_before.year - anchor.year) * 12 + (not_before.month - anchor.month)
+        steps = max(elapsed // step_months, 0)
+        candidate = _add_months(anchor, steps * step_months)
+        while candidate < not_before:
+            steps += 1
+            candidate = _add_months(anchor, steps * step_months)
+        return candidate
+
+    return None
+
+
+@dataclass
+class ScheduledReminder:
+    """Instantánea mínima de un recordatorio mantenida en el índice"""
+    reminder_id: UUID
+    title: str
+    anchor: datetime
+    repeat_pattern: Optional[str]
+    priority: int
+    user_id: Optional[UUID]
+    cared_person_id: Optional[UUID]
+    fire_at: datetime
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            "reminder_id": str(self.reminder_id),
+            "title": self.title,
+            "priority": self.priority,
+            "repeat_pattern": self.repeat_pattern,
+            "occurrence": self.fire_at.isoformat(),
+            "user_id": str(self.user_id) if self.user_id else None,
+            "cared_person_id": str(self.cared_person_id) if self.cared_person_id else None,
+        }
+
+
+class ReminderDispatcher:
+    """
+    Despachador de recordatorios basado en un heap de próximas ocurrencias
+
+    Cada recordatorio activo ocupa como máximo una entrada en el heap (su próxima
+    ocurrencia). Al dispararse, los recordatorios repetitivos vuelven a entrar con
+    la siguiente ocurrencia calculada de forma perezosa. Las altas, cambios y bajas
+    se reconcilian con `sync`/`remove`, por lo que solo se consulta la tabla
+    completa una vez al arrancar.
+    """
+
+    def __init__(
+        self,
+        notifier: Optional[Notifier] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        grace: Optional[timedelta] = None,
+        clock: Callable[[], datetime] = utc_now,
+    ):
+        self.notifier = notifier or LoggingNotifier()
+        self.session_factory = session_factory
+        self.grace = grace if grace is not None else timedelta(minutes=settings.reminder_dispatch_grace_minutes)
+        self.clock = clock
+        self._scheduler = DeadlineScheduler(
+            "reminder-dispatcher", on_due=self.dispatch_due, on_start=self._load_on_start, clock=clock,
+        )
+
+    # --- Índice ---
+
+    def __len__(self) -> int:
+        return len(self._scheduler)
+
+    @property
+    def next_due_at(self) -> Optional[datetime]:
+        """Hora de la próxima ocurrencia pendiente"""
+        return self._scheduler.next_due_at
+
+    def _schedule(self, entry: ScheduledReminder) -> None:
+        self._scheduler.schedule(entry.reminder_id, entry, entry.fire_at, -entry.priority)
+
+    def _build_entry(
+        self,
+        reminder_id: UUID,
+        title: str,
+        scheduled_time: datetime,
+        repeat_pattern: Optional[str],
+        priority: Optional[int],
+        user_id: Optional[UUID],
+        cared_person_id: Optional[UUID],
+        now: datetime,
+    ) -> Optional[ScheduledReminder]:
+        fire_at = next_occurrence(scheduled_time, repeat_pattern, now - self.grace)
+        if fire_at is None:
+            return None
+        return ScheduledReminder(
+            reminder_id=reminder_id,
+            title=title,
+            anchor=as_utc(scheduled_time),
+            repeat_pattern=repeat_pattern,
+            priority=priority or 5,
+            user_id=user_id,
+            cared_person_id=cared_person_id,
+            fire_at=fire_at,
+        )
+
+    def load(self, db: Session) -> int:
+        """
+        Cargar todos los recordatorios activos en el índice
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            int: Cantidad de recordatorios programados
+        """
+        rows = (
+            db.query(
+                Reminder.id,
+                Reminder.title,
+                Reminder.scheduled_time,
+                Reminder.repeat_pattern,
+                Reminder.priority,
+                Reminder.user_id,
+                Reminder.cared_person_id,
+            )
+            .outerjoin(StatusType, Reminder.status_type_id == StatusType.id)
+            .filter(
+                Reminder.is_active == True,
+                or_(StatusType.name.is_(None), StatusType.name.notin_(FINAL_STATUSES)),
+            )
+            .all()
+        )
+        now = self.clock()
+        loaded = 0
+        with self._scheduler.lock:
+            self._scheduler.clear()
+            for row in rows:
+                entry = self._build_entry(*row, now=now)
+                if entry is not None:
+                    self._schedule(entry)
+                    loaded += 1
+        logger.info("Reminder dispatcher loaded %s reminders", loaded)
+        return loaded
+
+    def sync(self, reminder: Reminder) -> None:
+        """Reconciliar el índice tras crear o actualizar un recordatorio"""
+        status_name = reminder.status_type.name if reminder.status_type else None
+        if not reminder.is_active or status_name in FINAL_STATUSES:
+            self.remove(reminder.id)
+            return
+        entry = self._build_entry(
+            reminder.id,
+            reminder.title,
+            reminder.scheduled_time,
+            reminder.repeat_pattern,
+            reminder.priority,
+            reminder.user_id,
+            reminder.cared_person_id,
+            now=self.clock(),
+        )
+        if entry is None:
+            self._scheduler.unschedule(reminder.id)
+        else:
+            self._schedule(entry)
+
+    def remove(self, reminder_id: UUID) -> None:
+        """Quitar un recordatorio del índice (la entrada del heap se descarta al salir)"""
+        self._scheduler.unschedule(reminder_id)
+
+    # --- Despacho ---
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[ScheduledReminder]:
+        """
+        Extraer las ocurrencias vencidas y reprogramar las repetitivas
+
+        Returns:
+            List[ScheduledReminder]: Ocurrencias a notificar, en orden de vencimiento
+        """
+        with self._scheduler.lock:
+            due = self._scheduler.pop_due(now)
+            for entry in due:
+                following = next_occurrence(entry.anchor, entry.repeat_pattern, entry.fire_at + timedelta(microseconds=1))
+                if following is not None:
+                    self._schedule(ScheduledReminder(
+                        reminder_id=entry.reminder_id,
+                        title=entry.title,
+                        anchor=entry.anchor,
+                        repeat_pattern=entry.repeat_pattern,
+                        priority=entry.priority,
+                        user_id=entry.user_id,
+                        cared_person_id=entry.cared_person_id,
+                        fire_at=following,
+                    ))
+        return due
+
+    def dispatch_due(self, now: Optional[datetime] = None) -> int:
+        """Notificar las ocurrencias vencidas; retorna cuántas se enviaron"""
+        due = self.pop_due(now)
+        for entry in due:
+            try:
+                self.notifier.send("reminder.due", entry.to_payload())
+            except Exception:
+                logger.exception("Failed to dispatch reminder %s", entry.reminder_id)
+        return len(due)
+
+    # --- Ciclo de vida ---
+
+    def start(self) -> None:
+        """Arrancar el hilo despachador (carga el índice en el propio hilo)"""
+        self._scheduler.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Detener el hilo despachador"""
+        self._scheduler.stop(timeout)
+
+    def _load_on_start(self) -> None:
+        db = self.session_factory()
+        try:
+            self.load(db)
+        finally:
+            db.close()
+
+
+# Instancia global usada por la API
+reminder_dispatcher = ReminderDispatcher(
+    notifier=CompositeNotifier([LoggingNotifier(), LiveFeedNotifier(live_feed)])
+)
@@ -0,0 +1,160 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ValidationException
+from app.models.cared_person import CaredPerson
+from app.models.institution import Institution
+from app.models.user import User
+
+SUGGEST_MODES = ("prefix", "contains")
+# pg_trgm no extrae trigramas de un patrón '%xy%': por debajo de este largo
+# el modo contains recorrería todo el índice, así que se busca por prefijo
+CONTAINS_MIN_LENGTH = 3
+
+
+@dataclass(frozen=True)
+class SuggestSource:
+    """Entidad sugerible: columnas buscadas (con índice pg_trgm) y etiqueta"""
+    kind: str
+    model: Any
+    columns: Callable[[], list]
+    label: Callable[[], Any]
+
+
+SUGGEST_SOURCES = (
+    SuggestSource(
+        "user", User,
+        columns=lambda: [User.first_name, User.last_name, User.email, User.username],
+        label=lambda: func.concat_ws(" ", User.first_name, User.last_name),
+    ),
+    SuggestSource(
+        "cared_person", CaredPerson,
+        columns=lambda: [CaredPerson.first_name, CaredPerson.last_name],
+        label=lambda: func.concat_ws(" ", CaredPerson.first_name, CaredPerson.last_name),
+    ),
+    SuggestSource(
+        "institution", Institution,
+        columns=lambda: [Institution.name],
+        label=lambda: Institution.name,
+    ),
+)
+SUGGEST_KINDS = tuple(source.kind for source in SUGGEST_SOURCES)
+
+
+def like_pattern(term: str, mode: str) -> str:
+    """Patrón ILIKE del término con los comodines del usuario escapados"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if mode == "prefix" else f"%{escaped}%"
+
+
+class SearchSuggestService:
+    """
+    Sugerencias para los buscadores con autocompletado (usuarios, personas
+    bajo cuidado, instituciones)
+
+    Cada palabra escrita tiene que coincidir con alguna de las columnas de la
+    entidad ("juan pe" encuentra a Juan Pérez); los filtros ILIKE usan los
+    índices GIN pg_trgm de esas columnas. Solo se devuelven id, etiqueta y tipo.
+    """
+
+    @staticmethod
+    def _source_query(
+        source: SuggestSource,
+        terms: List[str],
+        mode: str,
+        institution_id: Optional[int],
+        user_id: Optional[UUID],
+        limit: int,
+    ):
+        label = source.label()
+        query = select(
+            literal(source.kind).label("kind"),
+            source.model.id.label("id"),
+            label.label("label"),
+        ).where(source.model.is_active == True)
+        for term in terms:
+            pattern = like_pattern(term, mode)
+            query = query.where(or_(*(column.ilike(pattern, escape="\\") for column in source.columns())))
+        if source.model is Institution:
+            # El listado de instituciones es visible para cualquier usuario autenticado
+            pass
+        elif institution_id is not None:
+            if source.model is CaredPerson and user_id is not None:
+                query = query.where(or_(CaredPerson.institution_id == institution_id, CaredPerson.user_id == user_id))
+            else:
+                query = query.where(source.model.institution_id == institution_id)
+        elif user_id is not None:
+            # Usuario sin institución: de las personas, solo las propias
+            if source.model is User:
+                return None
+            query = query.where(CaredPerson.user_id == user_id)
+        if mode == "contains":
+            query = query.order_by(func.similarity(label, " ".join(terms)).desc(), label)
+        else:
+            query = query.order_by(label)
+        return query.limit(limit)
+
+    @staticmethod
+    def build_queries(
+        text: str,
+        kinds: Optional[Iterable[str]] = None,
+        mode: str = "prefix",
+        institution_id: Optional[int] = None,
+        user_id: Optional[UUID] = None,
+        limit: int = 10,
+    ) -> list:
+        """Una consulta por entidad (cada una con su propio límite e índice)"""
+        if mode not in SUGGEST_MODES:
+            raise ValidationException(f"Modo de búsqueda desconocido: {mode}")
+        if kinds is not None:
+            unknown = set(kinds) - set(SUGGEST_KINDS)
+            if unknown:
+                raise ValidationException(f"Tipos desconocidos: {', '.join(sorted(unknown))}")
+        terms = (text or "").split()
+        if not terms:
+            return []
+        if mode == "contains" and min(len(term) for term in terms) < CONTAINS_MIN_LENGTH:
+            mode = "prefix"
+        queries = (
+            SearchSuggestService._source_query(source, terms, mode, institution_id, user_id, limit)
+            for source in SUGGEST_SOURCES
+            if kinds is None or source.kind in kinds
+        )
+        return [query for query in queries if query is not None]
+
+    @staticmethod
+    def suggest(
+        db: Session,
+        text: str,
+        kinds: Optional[Iterable[str]] = None,
+        mode: str = "prefix",
+        institution_id: Optional[int] = None,
+        user_id: Optional[UUID] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Sugerencias para un texto parcial
+
+        Args:
+            db: Sesión de base de datos
+            text: Texto escrito hasta el momento
+            kinds: Entidades a buscar (por defecto todas)
+            mode: "prefix" (las palabras empiezan con el texto) o "contains"
+            institution_id: Acotar a una institución (None = sin restricción)
+            user_id: Usuario que busca, para incluir sus propias personas bajo cuidado
+            limit: Máximo de resultados por entidad
+
+        Returns:
+            List[dict]: kind, id y label de cada sugerencia
+
+        Raises:
+            ValidationException: Si el modo o un tipo no existen
+        """
+        results = []
+        for query in SearchSuggestService.build_queries(text, kinds, mode, institution_id, user_id, limit):
+            results.extend(dict(row._mapping) for row in db.execute(query))
+        return results
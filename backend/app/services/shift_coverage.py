@@ -0,0 +1,357 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import json
+import logging
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timeutils import as_utc, utc_now
+from app.models.cared_person import CaredPerson
+from app.models.caregiver_assignment import CaregiverAssignment
+from app.models.status_type import StatusType
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+# Intervalo concreto [inicio, fin) en UTC
+Interval = Tuple[datetime, datetime]
+
+
+def _minutes(value: str) -> int:
+    hours, _, minutes = str(value).partition(":")
+    total = int(hours) * 60 + int(minutes or 0)
+    if not 0 <= total <= MINUTES_PER_DAY:
+        raise ValueError(f"Hora fuera de rango: {value}")
+    return total
+
+
+def _weekday(value: Any) -> int:
+    if isinstance(value, int) and 0 <= value <= 6:
+        return value
+    key = str(value).strip().lower()[:3]
+    if key not in WEEKDAYS:
+        raise ValueError(f"Día inválido: {value}")
+    return WEEKDAYS[key]
+
+
+def _zone(name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or settings.shift_schedule_timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning("Unknown schedule timezone %s, using %s", name, settings.shift_schedule_timezone)
+        return ZoneInfo(settings.shift_schedule_timezone)
+
+
+def parse_schedule(raw: Optional[str]) -> Tuple[List[Tuple[int, int]], ZoneInfo]:
+    """
+    Compilar el JSON de `CaregiverAssignment.schedule` a turnos semanales
+
+    Formatos aceptados (las horas son locales a `timezone`, por defecto
+    `shift_schedule_timezone`; un turno cuyo fin es anterior al inicio
+    termina al día siguiente):
+
+        {"timezone": "America/Argentina/Buenos_Aires",
+         "shifts": [{"days": ["mon", "tue"], "start": "08:00", "end": "16:00"}]}
+        [{"day": "sat", "start": "22:00", "end": "06:00"}]
+        {"mon": ["08:00-12:00", "14:00-18:00"], "sun": [{"start": "09:00", "end": "13:00"}]}
+
+    Un horario vacío cubre el día completo durante la vigencia de la asignación.
+
+    Returns:
+        tuple: (intervalos [inicio, fin) en minutos de la semana, ordenados y
+        fusionados; zona horaria del horario)
+
+    Raises:
+        ValueError: Si el horario no es JSON válido o un turno es inválido
+    """
+    if raw is None or not str(raw).strip():
+        return [(0, MINUTES_PER_WEEK)], _zone(None)
+    try:
+        data = json.loads(raw) if isinstance(raw, str) else raw
+    except json.JSONDecodeError as exc:
+        raise ValueError("El horario no es JSON válido") from exc
+
+    zone_name = None
+    if isinstance(data, dict) and ("shifts" in data or "timezone" in data):
+        zone_name = data.get("timezone")
+        data = data.get("shifts", [])
+    if isinstance(data, dict):
+        data = [{"day": day, "slot": slot} for day, slots in data.items() for slot in (slots if isinstance(slots, list) else [slots])]
+    if not isinstance(data, list):
+        raise ValueError("Formato de horario no reconocido")
+
+    weekly: List[Tuple[int, int]] = []
+    for shift in data:
+        slot = shift.get("slot", shift)
+        if isinstance(slot, str):
+            start_text, _, end_text = slot.partition("-")
+            slot = {"start": start_text.strip(), "end": end_text.strip()}
+        start, end = _minutes(slot["start"]), _minutes(slot["end"])
+        if end <= start:
+            end += MINUTES_PER_DAY
+        days = shift.get("days", [shift.get("day")] if "day" in shift else list(range(7)))
+        for day in days:
+            offset = _weekday(day) * MINUTES_PER_DAY
+            lower, upper = offset + start, offset + end
+            # Un turno nocturno del domingo sigue el lunes: se parte en el límite de la semana
+            if upper > MINUTES_PER_WEEK:
+                weekly.append((0, upper - MINUTES_PER_WEEK))
+                upper = MINUTES_PER_WEEK
+            weekly.append((lower, upper))
+    if not weekly:
+        return [(0, MINUTES_PER_WEEK)], _zone(zone_name)
+    return merge_intervals(weekly), _zone(zone_name)
+
+
+def merge_intervals(intervals: Iterable[Tuple[Any, Any]]) -> List[Tuple[Any, Any]]:
+    """Ordenar y fusionar intervalos [inicio, fin) que se solapan o tocan"""
+    merged: List[List[Any]] = []
+    for lower, upper in sorted(intervals):
+        if merged and lower <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], upper)
+        else:
+            merged.append([lower, upper])
+    return [(lower, upper) for lower, upper in merged]
+
+
+def complement(intervals: List[Interval], start: datetime, end: datetime) -> List[Interval]:
+    """Huecos de [start, end) no cubiertos por intervalos ya fusionados"""
+    gaps, cursor = [], start
+    for lower, upper in intervals:
+        if lower > cursor:
+            gaps.append((cursor, min(lower, end)))
+        cursor = max(cursor, upper)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return [(lower, upper) for lower, upper in gaps if lower < upper]
+
+
+@dataclass
+class CompiledAssignment:
+    """Asignación activa con su horario compilado a minutos de la semana"""
+    assignment_id: int
+    caregiver_id: UUID
+    cared_person_id: UUID
+    institution_id: Optional[int]
+    start_date: date
+    end_date: Optional[date]
+    is_primary: bool
+    weekly: List[Tuple[int, int]]
+    zone: ZoneInfo
+    _starts: List[int] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        self._starts = [lower for lower, _ in self.weekly]
+
+    def _in_dates(self, day: date) -> bool:
+        return self.start_date <= day and (self.end_date is None or day <= self.end_date)
+
+    def covers(self, at: datetime) -> bool:
+        """¿Está de turno en el instante `at`? (búsqueda binaria sobre la semana)"""
+        local = as_utc(at).astimezone(self.zone)
+        if not self._in_dates(local.date()):
+            return False
+        minute = local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+        index = bisect_right(self._starts, minute) - 1
+        return index >= 0 and minute < self.weekly[index][1]
+
+    def intervals(self, start: datetime, end: datetime) -> List[Interval]:
+        """Intervalos concretos en UTC de los turnos que tocan [start, end)"""
+        start, end = as_utc(start), as_utc(end)
+        first = start.astimezone(self.zone).date() - timedelta(days=1)
+        last = end.astimezone(self.zone).date()
+        week = first - timedelta(days=first.weekday())
+        result = []
+        while week <= last:
+            for lower, upper in self.weekly:
+                local_start = datetime.combine(week, time.min) + timedelta(minutes=lower)
+                local_end = datetime.combine(week, time.min) + timedelta(minutes=upper)
+                if not self._in_dates(local_start.date()):
+                    continue
+                # La vigencia termina al final de end_date aunque el turno siga
+                if self.end_date is not None:
+                    local_end = min(local_end, datetime.combine(self.end_date + timedelta(days=1), time.min))
+                interval_start = local_start.replace(tzinfo=self.zone).astimezone(timezone.utc)
+                interval_end = local_end.replace(tzinfo=self.zone).astimezone(timezone.utc)
+                if interval_end > start and interval_start < end:
+                    result.append((max(interval_start, start), min(interval_end, end)))
+            week += timedelta(days=7)
+        return merge_intervals(result)
+
+
+class ShiftCoverageIndex:
+    """
+    Índice en memoria de la cobertura de turnos de cuidadores
+
+    Compila el horario de cada asignación activa una sola vez y lo indexa por
+    persona bajo cuidado, por cuidador y por institución, de modo que
+    "quién cubre ahora", huecos y dobles asignaciones se resuelven sin leer ni
+    parsear todas las asignaciones. Las escrituras del servicio de asignaciones
+    lo actualizan de forma incremental; cada `shift_coverage_reload_seconds` se
+    reconstruye desde la base para recoger cambios de otros procesos.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = utc_now):
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._assignments: Dict[int, CompiledAssignment] = {}
+        self._by_cared_person: Dict[UUID, Set[int]] = {}
+        self._by_caregiver: Dict[UUID, Set[int]] = {}
+        self._by_institution: Dict[Optional[int], Set[int]] = {}
+        self._loaded_at: Optional[datetime] = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._assignments.clear()
+            self._by_cared_person.clear()
+            self._by_caregiver.clear()
+            self._by_institution.clear()
+            self._loaded_at = None
+
+    def _add(self, entry: CompiledAssignment) -> None:
+        self._assignments[entry.assignment_id] = entry
+        self._by_cared_person.setdefault(entry.cared_person_id, set()).add(entry.assignment_id)
+        self._by_caregiver.setdefault(entry.caregiver_id, set()).add(entry.assignment_id)
+        self._by_institution.setdefault(entry.institution_id, set()).add(entry.assignment_id)
+
+    def remove(self, assignment_id: int) -> None:
+        with self._lock:
+            entry = self._assignments.pop(assignment_id, None)
+            if entry is None:
+                return
+            for index, key in (
+                (self._by_cared_person, entry.cared_person_id),
+                (self._by_caregiver, entry.caregiver_id),
+                (self._by_institution, entry.institution_id),
+            ):
+                index.get(key, set()).discard(assignment_id)
+
+    def _compile(self, assignment_id, caregiver_id, cared_person_id, institution_id, start_date, end_date, is_primary, schedule) -> Optional[CompiledAssignment]:
+        try:
+            weekly, zone = parse_schedule(schedule)
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            logger.warning("Caregiver assignment %s has an invalid schedule: %s", assignment_id, exc)
+            return None
+        return CompiledAssignment(
+            assignment_id, caregiver_id, cared_person_id, institution_id,
+            start_date, end_date, bool(is_primary), weekly, zone,
+        )
+
+    def upsert(self, assignment: CaregiverAssignment, institution_id: Optional[int] = None) -> None:
+        """Reindexar una asignación tras crearla o modificarla"""
+        with self._lock:
+            self.remove(assignment.id)
+            if self._loaded_at is None:
+                return
+            status_name = assignment.status_type.name if assignment.status_type else None
+            if status_name != "active":
+                return
+            if institution_id is None and assignment.cared_person is not None:
+                institution_id = assignment.cared_person.institution_id
+            entry = self._compile(
+                assignment.id, assignment.caregiver_id, assignment.cared_person_id, institution_id,
+                assignment.start_date, assignment.end_date, assignment.is_primary, assignment.schedule,
+            )
+            if entry is not None:
+                self._add(entry)
+
+    def load(self, db: Session) -> int:
+        """Reconstruir el índice con las asignaciones en estado active"""
+        rows = db.query(
+            CaregiverAssignment.id, CaregiverAssignment.caregiver_id, CaregiverAssignment.cared_person_id,
+            CaredPerson.institution_id, CaregiverAssignment.start_date, CaregiverAssignment.end_date,
+            CaregiverAssignment.is_primary, CaregiverAssignment.schedule,
+        ).join(CaredPerson, CaredPerson.id == CaregiverAssignment.cared_person_id).join(
+            StatusType, StatusType.id == CaregiverAssignment.status_type_id
+        ).filter(StatusType.name == "active").all()
+        compiled = [entry for entry in (self._compile(*row) for row in rows) if entry is not None]
+        with self._lock:
+            self.clear()
+            for entry in compiled:
+                self._add(entry)
+            self._loaded_at = self.clock()
+        return len(compiled)
+
+    def ensure_loaded(self, db: Session) -> None:
+        loaded_at = self._loaded_at
+        max_age = timedelta(seconds=settings.shift_coverage_reload_seconds)
+        if loaded_at is None or self.clock() - loaded_at > max_age:
+            self.load(db)
+
+    def _entries(self, index: Dict[Any, Set[int]], key: Any) -> List[CompiledAssignment]:
+        with self._lock:
+            return [self._assignments[assignment_id] for assignment_id in index.get(key, ())]
+
+    def _scope(self, cared_person_id: Optional[UUID], institution_id: Optional[int]) -> List[CompiledAssignment]:
+        if cared_person_id is not None:
+            return self._entries(self._by_cared_person, cared_person_id)
+        return self._entries(self._by_institution, institution_id)
+
+    def covering(self, at: datetime, cared_person_id: Optional[UUID] = None, institution_id: Optional[int] = None) -> List[CompiledAssignment]:
+        """Asignaciones de turno en el instante `at` para una persona o una institución"""
+        entries = [entry for entry in self._scope(cared_person_id, institution_id) if entry.covers(at)]
+        return sorted(entries, key=lambda entry: (str(entry.cared_person_id), not entry.is_primary, entry.assignment_id))
+
+    def gaps(self, cared_person_ids: Iterable[UUID], start: datetime, end: datetime) -> Dict[UUID, List[Interval]]:
+        """Huecos sin ningún cuidador de turno en [start, end), por persona"""
+        start, end = as_utc(start), as_utc(end)
+        result = {}
+        for cared_person_id in cared_person_ids:
+            covered = merge_intervals(
+                interval
+                for entry in self._entries(self._by_cared_person, cared_person_id)
+                for interval in entry.intervals(start, end)
+            )
+            holes = complement(covered, start, end)
+            if holes:
+                result[cared_person_id] = holes
+        return result
+
+    def overlaps(self, start: datetime, end: datetime, caregiver_id: Optional[UUID] = None, institution_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Dobles asignaciones: un cuidador de turno con dos personas a la vez
+
+        Barrido por inicio de intervalo de los turnos de cada cuidador; dos
+        turnos de la misma persona bajo cuidado no cuentan como solapamiento.
+        """
+        start, end = as_utc(start), as_utc(end)
+        if caregiver_id is not None:
+            caregivers = [caregiver_id]
+        else:
+            caregivers = {entry.caregiver_id for entry in self._entries(self._by_institution, institution_id)}
+        conflicts = []
+        for caregiver in caregivers:
+            shifts = sorted((
+                (lower, upper, entry)
+                for entry in self._entries(self._by_caregiver, caregiver)
+                for lower, upper in entry.intervals(start, end)
+            ), key=lambda item: (item[0], item[1], item[2].assignment_id))
+            active: List[Tuple[datetime, datetime, CompiledAssignment]] = []
+            for lower, upper, entry in shifts:
+                active = [item for item in active if item[1] > lower]
+                for other_lower, other_upper, other in active:
+                    if other.cared_person_id != entry.cared_person_id:
+                        conflicts.append({
+                            "caregiver_id": caregiver,
+                            "start": lower,
+                            "end": min(upper, other_upper),
+                            "assignment_ids": sorted([other.assignment_id, entry.assignment_id]),
+                            "cared_person_ids": [other.cared_person_id, entry.cared_person_id],
+                        })
+                active.append((lower, upper, entry))
+        return sorted(conflicts, key=lambda item: (item["start"], str(item["caregiver_id"])))
+
+
+# Instancia global usada por la API
+shift_coverage_index = ShiftCoverageIndex()
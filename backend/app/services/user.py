@@ -80,6 +80,9 @@ class UserService:
             is_freelance=user_data.is_freelance,
             hourly_rate=user_data.hourly_rate,
             availability=user_data.availability,
+            latitude=user_data.latitude,
+            longitude=user_data.longitude,
+            service_radius_km=user_data.service_radius_km,
             is_verified=user_data.is_verified,
             institution_id=user_data.institution_id
         )
@@ -434,6 +437,9 @@ class UserService:
                 experience_years=user.experience_years,
                 hourly_rate=user.hourly_rate,
                 availability=user.availability,
+                latitude=user.latitude,
+                longitude=user.longitude,
+                service_radius_km=user.service_radius_km,
                 last_login=user.last_login,
                 created_at=user.created_at,
                 updated_at=user.updated_at,
@@ -1,6 +1,6 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 import structlog
 from fastapi.exceptions import RequestValidationError
@@ -8,8 +8,22 @@ from starlette.requests import Request
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
 from app.core.config import settings
+from app.core.cache import response_cache
+from app.core.token_cache import token_cache
 from app.core.database import engine, Base
+from app.core.query_counter import install_query_counter
 from app.api.v1.api import api_router
+from app.services.reminder_dispatcher import reminder_dispatcher
+from app.services.alert_escalation import alert_escalation_engine
+from app.services.live_feed import live_feed
+from app.services.device_heartbeat import device_heartbeat_monitor
+from app.services.location_tracking import trajectory_compactor
+from app.services.password_hasher import password_hasher
+from app.services.partitioning import partition_maintainer
+from app.services.medication_adherence import adherence_refresher
+from app.services.jobs import job_worker
+from app.services.referral_batch import referral_batch_processor
+from app.services.billing_run import billing_run_scheduler
 
 # Configurar logging
 structlog.configure(
@@ -38,7 +52,8 @@ app = FastAPI(
     description="API para sistema de acompañamiento de personas bajo cuidado",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Configurar CORS
@@ -58,9 +73,51 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+if settings.query_count_header_enabled:
+    install_query_counter(app, engine)
+
 # Incluir rutas de la API
 app.include_router(api_router, prefix="/api/v1")
 
+@app.on_event("startup")
+def start_background_services():
+    """Arrancar los procesos en segundo plano del API"""
+    if settings.reminder_dispatcher_enabled and settings.environment != "test":
+        reminder_dispatcher.start()
+    if settings.alert_escalation_enabled and settings.environment != "test":
+        alert_escalation_engine.start()
+    if settings.environment != "test":
+        live_feed.start()
+        response_cache.start()
+        token_cache.start()
+        device_heartbeat_monitor.start()
+    if settings.location_compaction_enabled and settings.environment != "test":
+        trajectory_compactor.start()
+    if settings.partition_maintenance_enabled and settings.environment != "test":
+        partition_maintainer.start()
+    if settings.adherence_refresh_enabled and settings.environment != "test":
+        adherence_refresher.start()
+    if settings.job_workers_enabled and settings.environment != "test":
+        job_worker.start()
+    if settings.referral_batch_enabled and settings.environment != "test":
+        referral_batch_processor.start()
+    if settings.billing_run_enabled and settings.environment != "test":
+        billing_run_scheduler.start()
+
+@app.on_event("shutdown")
+def stop_background_services():
+    """Detener los procesos en segundo plano del API"""
+    reminder_dispatcher.stop()
+    alert_escalation_engine.stop()
+    device_heartbeat_monitor.stop()
+    trajectory_compactor.stop()
+    partition_maintainer.stop()
+    adherence_refresher.stop()
+    job_worker.stop()
+    referral_batch_processor.stop()
+    billing_run_scheduler.stop()
+    password_hasher.stop()
+
 @app.get("/")
 async def root():
     """Endpoint raíz de la API"""
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark del costo de autenticación por request
+
+Compara la verificación de tokens JWT sin caché (firma y claims verificados en
+cada request, como antes) contra la caché de claims de `app.core.token_cache`.
+Mide la llamada directa a `AuthService.verify_token` y una ruta mínima de
+FastAPI que solo depende del token. No necesita base de datos: la búsqueda
+del usuario es igual en ambos caminos y no se incluye.
+
+Uso:
+    python3 scripts/benchmark_auth.py --requests 2000 --tokens 50
+    python3 scripts/benchmark_auth.py --output auth.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import timedelta
+from statistics import median
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.token_cache import token_cache
+from app.services.auth import AuthService, security
+
+
+def build_tokens(count: int) -> List[str]:
+    return [
+        AuthService.create_access_token(
+            {"sub": str(uuid.uuid4()), "roles": ["caregiver"]}, expires_delta=timedelta(hours=1)
+        )
+        for _ in range(count)
+    ]
+
+
+def build_client() -> TestClient:
+    app = FastAPI()
+
+    def current_claims(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+        payload = AuthService.verify_token(credentials.credentials)
+        if payload is None:
+            raise HTTPException(status_code=401)
+        return payload
+
+    @app.get("/ping")
+    def ping(claims: dict = Depends(current_claims)):
+        return {"sub": claims["sub"]}
+
+    return TestClient(app)
+
+
+def per_call_us(fn: Callable[[int], None], calls: int) -> float:
+    """Mediana en microsegundos por llamada, en 5 tandas"""
+    samples = []
+    for _ in range(5):
+        started = time.perf_counter()
+        for i in range(calls):
+            fn(i)
+        samples.append((time.perf_counter() - started) * 1_000_000 / calls)
+    return median(samples)
+
+
+def measure(tokens: List[str], calls: int, client: TestClient, cached: bool) -> Dict[str, float]:
+    settings.auth_token_cache_enabled = cached
+    token_cache.clear()
+    headers = [{"Authorization": f"Bearer {token}"} for token in tokens]
+
+    def verify(i: int) -> None:
+        assert AuthService.verify_token(tokens[i % len(tokens)]) is not None
+
+    def request(i: int) -> None:
+        assert client.get("/ping", headers=headers[i % len(headers)]).status_code == 200
+
+    return {
+        "verify_us": round(per_call_us(verify, calls), 2),
+        "request_us": round(per_call_us(request, max(calls // 10, 1)), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de autenticación por request")
+    parser.add_argument("--requests", type=int, default=2000, help="Verificaciones por tanda")
+    parser.add_argument("--tokens", type=int, default=50, help="Tokens distintos en circulación")
+    parser.add_argument("--output", help="Ruta opcional del reporte JSON")
+    args = parser.parse_args()
+
+    tokens = build_tokens(args.tokens)
+    client = build_client()
+    enabled = settings.auth_token_cache_enabled
+    try:
+        before = measure(tokens, args.requests, client, cached=False)
+        after = measure(tokens, args.requests, client, cached=True)
+    finally:
+        settings.auth_token_cache_enabled = enabled
+        token_cache.clear()
+
+    print(f"\n🔐 AUTENTICACIÓN POR REQUEST ({args.tokens} tokens, {args.requests} verificaciones)")
+    print("=" * 30)
+    for name, label in (("verify_us", "verify_token"), ("request_us", "request /ping")):
+        speedup = before[name] / after[name] if after[name] else 0
+        print(f"   {label:<14} sin caché {before[name]:9.2f} µs   con caché {after[name]:9.2f} µs   x{speedup:.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"tokens": args.tokens, "requests": args.requests, "before": before, "after": after}, f, indent=2)
+        print(f"\n📝 Reporte guardado en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
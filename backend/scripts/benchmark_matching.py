@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark del emparejamiento de cuidadores
+
+Genera cuidadores sintéticos repartidos por el AMBA y mide la construcción de
+la matriz de características y la latencia de `CaregiverMatrix.match` para
+personas bajo cuidado en puntos aleatorios. No necesita base de datos.
+
+Uso:
+    python3 scripts/benchmark_matching.py --caregivers 100000 --queries 200
+    python3 scripts/benchmark_matching.py --output matching.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from statistics import median, quantiles
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.caregiver_matching import CaregiverMatrix, MatchCriteria
+
+SPECIALIZATIONS = [
+    "Enfermería", "Acompañante terapéutico", "Kinesiología y rehabilitación", "Geriatría",
+    "Cuidados paliativos", "Demencia y Alzheimer", "Diabetes", None,
+]
+CARE_LEVELS = ["low", "medium", "high", "critical"]
+MOBILITY_LEVELS = ["independent", "assisted", "wheelchair", "bedridden"]
+
+
+def build_records(count: int, rng: np.random.Generator) -> list:
+    latitudes = rng.uniform(-35.0, -34.3, count)
+    longitudes = rng.uniform(-58.9, -58.2, count)
+    specializations = rng.integers(0, len(SPECIALIZATIONS), count)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Cuidador {index}",
+            "latitude": float(latitudes[index]),
+            "longitude": float(longitudes[index]),
+            "specialization": SPECIALIZATIONS[specializations[index]],
+            "experience_years": int(rng.integers(0, 20)),
+            "hourly_rate": int(rng.integers(2000, 9000)),
+            "is_freelance": bool(rng.random() < 0.8),
+            "overall_score": float(rng.uniform(2.5, 5.0)) if rng.random() < 0.7 else None,
+            "completion_rate": float(rng.uniform(70, 100)) if rng.random() < 0.7 else None,
+            "is_verified": bool(rng.random() < 0.3),
+        }
+        for index in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del emparejamiento de cuidadores")
+    parser.add_argument("--caregivers", type=int, default=100_000, help="Cuidadores sintéticos")
+    parser.add_argument("--queries", type=int, default=200, help="Búsquedas a medir")
+    parser.add_argument("--radius", type=float, default=settings.matching_default_radius_km, help="Radio de búsqueda en km")
+    parser.add_argument("--output", help="Ruta opcional del reporte JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    records = build_records(args.caregivers, rng)
+    started = time.perf_counter()
+    matrix = CaregiverMatrix(records, settings.matching_grid_cell_km)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    samples = []
+    for _ in range(args.queries):
+        criteria = MatchCriteria(
+            latitude=float(rng.uniform(-34.9, -34.4)),
+            longitude=float(rng.uniform(-58.8, -58.3)),
+            care_level=CARE_LEVELS[rng.integers(0, 4)],
+            mobility_level=MOBILITY_LEVELS[rng.integers(0, 4)],
+            special_needs="Alzheimer, diabetes" if rng.random() < 0.5 else None,
+            radius_km=args.radius,
+        )
+        started = time.perf_counter()
+        matrix.match(criteria)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    p95 = quantiles(samples, n=20)[-1]
+    print(f"\n🧭 EMPAREJAMIENTO DE CUIDADORES ({args.caregivers} cuidadores, radio {args.radius} km)")
+    print("=" * 30)
+    print(f"   construcción de la matriz {build_ms:9.1f} ms")
+    print(f"   búsqueda p50 {median(samples):7.2f} ms   p95 {p95:7.2f} ms   máx {max(samples):7.2f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "caregivers": args.caregivers, "queries": args.queries, "radius_km": args.radius,
+                "build_ms": round(build_ms, 1), "p50_ms": round(median(samples), 2), "p95_ms": round(p95, 2),
+            }, f, indent=2)
+        print(f"\n📝 Reporte guardado en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización de los listados calientes
+
+Compara, por endpoint, el camino estándar de FastAPI (objetos ORM validados por
+el `response_model` y codificados con jsonable_encoder) contra el camino rápido
+de `app.core.serialization` (filas de columnas serializadas con orjson).
+No necesita base de datos: mide solo el costo de CPU de armar la respuesta.
+
+Uso:
+    python3 scripts/benchmark_serialization.py --rows 1000 --repeat 30
+    python3 scripts/benchmark_serialization.py --output serialization.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from statistics import median
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+import app.models  # noqa: F401  configura todas las relaciones
+from app.core.serialization import list_response
+from app.models.alert import Alert
+from app.models.device import Device
+from app.models.event import Event
+from app.models.medication_log import MedicationLog
+from app.models.status_type import StatusType
+from app.schemas.alert import AlertResponse
+from app.schemas.device import DeviceResponse
+from app.schemas.event import EventResponse
+from app.schemas.medication_log import MedicationLogResponse
+
+NOW = datetime.now(timezone.utc)
+
+
+def common(i: int) -> Dict[str, Any]:
+    moment = NOW - timedelta(minutes=i)
+    return {"id": uuid.uuid4(), "created_at": moment, "updated_at": moment}
+
+
+def event_values(i: int) -> Dict[str, Any]:
+    return {
+        **common(i), "is_active": True,
+        "event_type_id": 1, "event_subtype": "fall", "severity": "warning",
+        "event_data": {"acceleration": 2.4}, "message": f"Evento {i}", "source": "sensor",
+        "latitude": -34.6, "longitude": -58.4, "altitude": None,
+        "event_time": NOW - timedelta(minutes=i), "processed_at": None,
+        "user_id": uuid.uuid4(), "cared_person_id": uuid.uuid4(), "device_id": uuid.uuid4(),
+    }
+
+
+def alert_values(i: int) -> Dict[str, Any]:
+    return {
+        **common(i),
+        "alert_type_id": 1, "alert_subtype": "no_movement", "severity": "high",
+        "title": f"Alerta {i}", "message": "Sin movimiento", "alert_data": None,
+        "status_type_id": 1, "acknowledged_at": None, "resolved_at": None,
+        "priority": 7, "escalation_level": 0, "escalated_at": None,
+        "occurrence_count": 1, "last_seen_at": NOW,
+        "user_id": uuid.uuid4(), "cared_person_id": uuid.uuid4(), "device_id": None, "event_id": None,
+    }
+
+
+def device_values(i: int) -> Dict[str, Any]:
+    return {
+        **common(i), "is_active": True,
+        "device_id": f"DEV-{i:06d}", "name": f"Dispositivo {i}", "device_type_id": 1,
+        "model": "X1", "manufacturer": "CUIOT", "serial_number": f"SN{i}", "status_type_id": 1,
+        "battery_level": 80, "signal_strength": 90, "last_seen": None,
+        "location_description": "Habitación", "latitude": -34.6, "longitude": -58.4, "altitude": None,
+        "settings": None, "firmware_version": "1.0", "hardware_version": "A",
+        "user_id": uuid.uuid4(), "cared_person_id": uuid.uuid4(), "institution_id": 1,
+    }
+
+
+def medication_log_values(i: int) -> Dict[str, Any]:
+    return {
+        **common(i),
+        "medication_schedule_id": uuid.uuid4(), "taken_at": NOW - timedelta(hours=i),
+        "confirmed_by": uuid.uuid4(), "confirmation_method": "app", "notes": None,
+        "dosage_given": "10mg", "is_missed": False, "side_effects": None,
+        "effectiveness_rating": "bueno", "attachment": None, "additional_data": {"source": "app"},
+    }
+
+
+# endpoint -> (modelo, schema, generador de columnas, campos calculados en SQL)
+ENDPOINTS = {
+    "GET /events/": (Event, EventResponse, event_values, {}),
+    "GET /alerts/": (Alert, AlertResponse, alert_values, {"is_active": True, "is_critical": False}),
+    "GET /devices/": (Device, DeviceResponse, device_values, {"is_online": False}),
+    "GET /medication-logs/": (MedicationLog, MedicationLogResponse, medication_log_values, {}),
+}
+
+
+def orm_objects(model, values: List[Dict[str, Any]]) -> List[Any]:
+    columns = set(model.__table__.columns.keys())
+    active = StatusType(id=1, name="active")
+    objects = []
+    for row in values:
+        obj = model(**{key: value for key, value in row.items() if key in columns})
+        if model is Alert:
+            obj.status_type = active
+        objects.append(obj)
+    return objects
+
+
+def time_it(fn: Callable[[], bytes], repeat: int) -> float:
+    fn()  # calentamiento
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return median(samples)
+
+
+def run(rows: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for endpoint, (model, schema, values_fn, computed) in ENDPOINTS.items():
+        values = [values_fn(i) for i in range(rows)]
+        objects = orm_objects(model, values)
+        tuples = [SimpleNamespace(_mapping={**row, **computed}) for row in values]
+        field = create_response_field(name=f"Response_{schema.__name__}", type_=List[schema], mode="serialization")
+
+        def standard() -> bytes:
+            content = asyncio.run(serialize_response(field=field, response_content=objects, is_coroutine=True))
+            return ORJSONResponse(content).body
+
+        def fast() -> bytes:
+            return list_response(schema, tuples).body
+
+        standard_ms = time_it(standard, repeat)
+        fast_ms = time_it(fast, repeat)
+        results[endpoint] = {
+            "standard_ms": round(standard_ms, 2),
+            "fast_ms": round(fast_ms, 2),
+            "speedup": round(standard_ms / fast_ms, 1) if fast_ms else None,
+        }
+        print(f"   {endpoint:<22} estándar {standard_ms:8.2f} ms   rápido {fast_ms:7.2f} ms   x{results[endpoint]['speedup']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listados")
+    parser.add_argument("--rows", type=int, default=1000, help="Filas por página")
+    parser.add_argument("--repeat", type=int, default=20, help="Repeticiones medidas por endpoint")
+    parser.add_argument("--output", help="Ruta opcional del reporte JSON")
+    args = parser.parse_args()
+
+    print(f"\n⏱️  SERIALIZACIÓN DE LISTADOS ({args.rows} filas, mediana de {args.repeat})")
+    print("=" * 30)
+    results = run(args.rows, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows": args.rows, "repeat": args.repeat, "endpoints": results}, f, indent=2)
+        print(f"\n📝 Reporte guardado en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
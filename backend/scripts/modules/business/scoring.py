@@ -15,6 +15,7 @@ from app.models.cared_person import CaredPerson
 from app.models.service_type import ServiceType
 from app.models.status_type import StatusType
 from app.models.user_role import UserRole
+from app.services.bulk_seeder import BulkSeeder
 
 def get_caregiver_role_ids(db):
     from app.models.role import Role
@@ -47,11 +48,14 @@ def populate_caregiver_scores():
     
     print("👨‍⚕️ Generando puntuaciones de cuidadores...")
     
+    # Puntuaciones existentes en una sola consulta
+    scored = {row.caregiver_id for row in db.query(CaregiverScore.caregiver_id)}
+    rows = []
+    
     for caregiver in caregivers:
-        # Verificar si ya existe la puntuación
-        existing_score = db.query(CaregiverScore).filter_by(caregiver_id=caregiver.id).first()
-        if existing_score:
+        if caregiver.id in scored:
             continue
+        scored.add(caregiver.id)
         
         # Generar puntuaciones realistas
         overall_score = round(random.uniform(3.5, 5.0), 1)
@@ -81,7 +85,7 @@ def populate_caregiver_scores():
         last_review = datetime.now() - timedelta(days=random.randint(1, 90))
         
         # Crear puntuación del cuidador SOLO con los campos válidos
-        caregiver_score = CaregiverScore(
+        rows.append(dict(
             caregiver_id=caregiver.id,
             overall_score=overall_score,
             experience_score=experience_score,
@@ -100,12 +104,9 @@ def populate_caregiver_scores():
             is_references_verified=is_references_verified,
             last_calculated=last_calculated,
             last_review=last_review
-        )
-        
-        db.add(caregiver_score)
-        created += 1
+        ))
     
-    db.commit()
+    created = BulkSeeder(db).insert(CaregiverScore, rows)
     print(f"✅ Caregiver Scores creados: {created} (idempotente)")
     db.close()
 
@@ -135,6 +136,7 @@ def populate_caregiver_reviews():
     
     print("⭐ Generando reseñas de cuidadores...")
     
+    rows = []
     for caregiver in caregivers:
         # Generar 2-8 reseñas por cuidador
         num_reviews = random.randint(2, 8)
@@ -190,7 +192,7 @@ def populate_caregiver_reviews():
             service_hours = random.uniform(2.0, 12.0)
             
             # Crear reseña
-            review = CaregiverReview(
+            rows.append(dict(
                 caregiver_id=caregiver.id,
                 reviewer_id=reviewer.id,
                 cared_person_id=cared_person.id if cared_person else None,
@@ -203,12 +205,9 @@ def populate_caregiver_reviews():
                 service_type_id=random.choice(service_types).id if service_types else None,
                 is_verified=True,
                 is_public=True
-            )
-            
-            db.add(review)
-            created += 1
+            ))
     
-    db.commit()
+    created = BulkSeeder(db).insert(CaregiverReview, rows)
     print(f"✅ Caregiver Reviews creados: {created} (idempotente)")
     db.close()
 
@@ -226,11 +225,14 @@ def populate_institution_scores():
     
     print("🏥 Generando puntuaciones de instituciones...")
     
+    # Puntuaciones existentes en una sola consulta
+    scored = {row.institution_id for row in db.query(InstitutionScore.institution_id)}
+    rows = []
+    
     for institution in institutions:
-        # Verificar si ya existe la puntuación
-        existing_score = db.query(InstitutionScore).filter_by(institution_id=institution.id).first()
-        if existing_score:
+        if institution.id in scored:
             continue
+        scored.add(institution.id)
         
         # Generar puntuaciones realistas
         overall_score = round(random.uniform(3.5, 5.0), 1)
@@ -261,7 +263,7 @@ def populate_institution_scores():
         inspection_score = round(random.uniform(3.0, 5.0), 1)
         
         # Crear puntuación de institución
-        institution_score = InstitutionScore(
+        rows.append(dict(
             institution_id=institution.id,
             overall_score=overall_score,
             service_score=service_score,
@@ -282,12 +284,9 @@ def populate_institution_scores():
             last_inspection_date=last_inspection_date,
             inspection_score=inspection_score,
             last_calculated=datetime.now()
-        )
-        
-        db.add(institution_score)
-        created += 1
+        ))
     
-    db.commit()
+    created = BulkSeeder(db).insert(InstitutionScore, rows)
     print(f"✅ Institution Scores creados: {created} (idempotente)")
     db.close()
 
@@ -308,6 +307,7 @@ def populate_institution_reviews():
     
     print("🏢 Generando reseñas de instituciones...")
     
+    rows = []
     for institution in institutions:
         # Generar 3-12 reseñas por institución
         num_reviews = random.randint(3, 12)
@@ -359,7 +359,7 @@ def populate_institution_reviews():
             service_hours = random.uniform(4.0, 24.0)
             
             # Crear reseña SOLO con los campos válidos
-            review = InstitutionReview(
+            rows.append(dict(
                 institution_id=institution.id,
                 reviewer_id=reviewer.id,
                 cared_person_id=cared_person.id if cared_person else None,
@@ -371,12 +371,9 @@ def populate_institution_reviews():
                 service_type_id=random.choice(service_types).id if service_types else None,
                 is_verified=True,
                 is_public=True
-            )
-            
-            db.add(review)
-            created += 1
+            ))
     
-    db.commit()
+    created = BulkSeeder(db).insert(InstitutionReview, rows)
     print(f"✅ Institution Reviews creados: {created} (idempotente)")
     db.close()
 
@@ -15,8 +15,9 @@ from app.models.status_type import StatusType
 from app.models.user import User
 from app.models.cared_person import CaredPerson
 from datetime import datetime, timedelta, timezone, date
+from app.services.bulk_seeder import BulkSeeder
 import random
-import json
+import uuid
 
 def populate_reminders(db: Session, existing_data=None):
     print("   🔔 Poblando recordatorios...")
@@ -35,10 +36,32 @@ def populate_reminders(db: Session, existing_data=None):
     if not reminder_types or not users or not cared_persons:
         print("      ⚠️ Faltan datos requeridos para poblar recordatorios.")
         return {}
+    cared_person_keys = list(cared_persons.keys())[:min(5, len(cared_persons))]
+    user_keys = list(users.keys())[:min(3, len(users))]
+    
+    # Recordatorios ya existentes en una sola consulta (idempotencia)
+    owner_ids = [cared_persons[key].id for key in cared_person_keys] + [users[key].id for key in user_keys]
+    existing = {
+        (row.cared_person_id or row.user_id, row.reminder_type_id, row.title): row.id
+        for row in db.query(Reminder.id, Reminder.cared_person_id, Reminder.user_id, Reminder.reminder_type_id, Reminder.title).filter(
+            (Reminder.cared_person_id.in_(owner_ids)) | (Reminder.user_id.in_(owner_ids))
+        )
+    }
+    
     reminders = {}
-    cared_person_keys = list(cared_persons.keys())
-    user_keys = list(users.keys())
-    for cared_person_key in cared_person_keys[:min(5, len(cared_person_keys))]:
+    rows = []
+    
+    def add_reminder(key, owner_id, reminder_type, reminder_data):
+        existing_key = (owner_id, reminder_type.id, reminder_data["title"])
+        if existing_key in existing:
+            reminders[key] = existing[existing_key]
+            return
+        reminder_data["id"] = uuid.uuid4()
+        existing[existing_key] = reminder_data["id"]
+        rows.append(reminder_data)
+        reminders[key] = reminder_data["id"]
+    
+    for cared_person_key in cared_person_keys:
         cared_person = cared_persons[cared_person_key]
         num_reminders = min(5, len(reminder_types))
         reminder_type_names = list(reminder_types.keys())[:num_reminders]
@@ -49,19 +72,8 @@ def populate_reminders(db: Session, existing_data=None):
                 cared_person=cared_person,
                 status_types=status_types
             )
-            existing_reminder = db.query(Reminder).filter(
-                Reminder.cared_person_id == cared_person.id,
-                Reminder.reminder_type_id == reminder_type.id,
-                Reminder.title == reminder_data["title"]
-            ).first()
-            if existing_reminder:
-                reminders[f"{cared_person_key}_{reminder_type_name}"] = existing_reminder
-                continue
-            reminder = Reminder(**reminder_data)
-            db.add(reminder)
-            db.flush()
-            reminders[f"{cared_person_key}_{reminder_type_name}"] = reminder
-    for user_key in user_keys[:min(3, len(user_keys))]:
+            add_reminder(f"{cared_person_key}_{reminder_type_name}", cared_person.id, reminder_type, reminder_data)
+    for user_key in user_keys:
         user = users[user_key]
         if user.email and "admin" not in user.email.lower():
             num_reminders = min(2, len(reminder_types))
@@ -73,20 +85,9 @@ def populate_reminders(db: Session, existing_data=None):
                     user=user,
                     status_types=status_types
                 )
-                existing_reminder = db.query(Reminder).filter(
-                    Reminder.user_id == user.id,
-                    Reminder.reminder_type_id == reminder_type.id,
-                    Reminder.title == reminder_data["title"]
-                ).first()
-                if existing_reminder:
-                    reminders[f"{user_key}_{reminder_type_name}"] = existing_reminder
-                    continue
-                reminder = Reminder(**reminder_data)
-                db.add(reminder)
-                db.flush()
-                reminders[f"{user_key}_{reminder_type_name}"] = reminder
-    db.commit()
-    print(f"      ✅ {len(reminders)} recordatorios creados")
+                add_reminder(f"{user_key}_{reminder_type_name}", user.id, reminder_type, reminder_data)
+    BulkSeeder(db).insert(Reminder, rows)
+    print(f"      ✅ {len(rows)} recordatorios creados ({len(reminders) - len(rows)} existentes)")
     return reminders
 
 def generate_reminder_data(reminder_type, cared_person=None, user=None, status_types=None):
@@ -122,7 +123,7 @@ def generate_reminder_data(reminder_type, cared_person=None, user=None, status_t
         "repeat_pattern": repeat_pattern,
         "priority": priority,
         "is_important": is_important,
-        "reminder_data": json.dumps(reminder_data) if reminder_data else None,
+        "reminder_data": reminder_data or None,
         "notes": notes,
         "status_type_id": status_type.id if status_type else None,
         "completed_at": completed_at,
@@ -6,11 +6,13 @@ Poblar alertas del sistema
 
 import sys
 import os
+import uuid
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
 from sqlalchemy.orm import Session
 from app.models.alert import Alert
 from app.models.alert_type import AlertType
+from app.services.bulk_seeder import BulkSeeder
 from utils.data_generators import DataGenerator
 
 def populate_alerts(db: Session, devices_data=None, existing_data=None):
@@ -23,7 +25,7 @@ def populate_alerts(db: Session, devices_data=None, existing_data=None):
         existing_data: Datos existentes (tipos de alerta)
     
     Returns:
-        dict: Alertas creadas
+        dict: IDs de las alertas creadas o existentes
     """
     print("   🚨 Poblando alertas IoT...")
     
@@ -37,16 +39,28 @@ def populate_alerts(db: Session, devices_data=None, existing_data=None):
     
     if not devices:
         from app.models.device import Device
-        devices = {f"device_{d.id}": d for d in db.query(Device).all()}
+        devices = {f"device_{d.id}": d.id for d in db.query(Device.id).all()}
     
-    alerts = {}
+    # populate_devices devuelve IDs; se aceptan también objetos Device
+    devices = {key: getattr(device, "id", device) for key, device in devices.items()}
     
     # Crear alertas para algunos dispositivos (no todos)
     device_keys = list(devices.keys())
     devices_with_alerts = device_keys[:min(3, len(device_keys))]  # Máximo 3 dispositivos con alertas
     
+    # Alertas ya existentes en una sola consulta (idempotencia)
+    existing = {
+        (row.device_id, row.alert_type_id): row.id
+        for row in db.query(Alert.id, Alert.device_id, Alert.alert_type_id).filter(
+            Alert.device_id.in_([devices[key] for key in devices_with_alerts])
+        )
+    } if devices_with_alerts else {}
+    
+    alerts = {}
+    rows = []
+    
     for device_key in devices_with_alerts:
-        device = devices[device_key]
+        device_id = devices[device_key]
         
         # Crear 1-2 alertas por dispositivo
         num_alerts = min(2, len(alert_types))
@@ -54,32 +68,21 @@ def populate_alerts(db: Session, devices_data=None, existing_data=None):
         
         for alert_type_name in alert_type_names:
             alert_type = alert_types[alert_type_name]
+            key = f"{device_key}_{alert_type_name}"
+            
+            if (device_id, alert_type.id) in existing:
+                alerts[key] = existing[(device_id, alert_type.id)]
+                continue
             
-            # Generar datos de la alerta
             alert_data = DataGenerator.generate_alert_data(
                 alert_type_id=alert_type.id,
-                device_id=device.id
+                device_id=device_id,
+                id=uuid.uuid4()
             )
-            
-            # Verificar si ya existe
-            existing_alert = db.query(Alert).filter(
-                Alert.device_id == device.id,
-                Alert.alert_type_id == alert_type.id,
-                Alert.message == alert_data["message"]
-            ).first()
-            
-            if existing_alert:
-                alerts[f"{device_key}_{alert_type_name}"] = existing_alert
-                continue
-            
-            # Crear alerta
-            alert = Alert(**alert_data)
-            db.add(alert)
-            db.flush()
-            
-            alerts[f"{device_key}_{alert_type_name}"] = alert
+            rows.append(alert_data)
+            alerts[key] = alert_data["id"]
     
-    db.commit()
-    print(f"      ✅ {len(alerts)} alertas creadas")
+    BulkSeeder(db).insert(Alert, rows)
+    print(f"      ✅ {len(rows)} alertas creadas ({len(alerts) - len(rows)} existentes)")
     
     return alerts 
\ No newline at end of file
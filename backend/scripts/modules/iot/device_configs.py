@@ -13,7 +13,6 @@ from app.models.device import Device
 from app.models.user import User
 from datetime import datetime, timedelta
 import random
-import json
 
 def generate_sensor_config():
     """Generar configuración de sensor realista"""
@@ -26,7 +25,7 @@ def generate_sensor_config():
         "data_retention_days": random.choice([7, 30, 90, 365]),
         "battery_save_mode": random.choice([True, False])
     }
-    return json.dumps(config)
+    return config
 
 def generate_alert_config():
     """Generar configuración de alertas realista"""
@@ -48,7 +47,7 @@ def generate_alert_config():
             "end": "07:00"
         }
     }
-    return json.dumps(config)
+    return config
 
 def generate_notification_config():
     """Generar configuración de notificaciones realista"""
@@ -70,7 +69,7 @@ def generate_notification_config():
         "language": random.choice(["es", "en", "pt"]),
         "timezone": "America/Argentina/Buenos_Aires"
     }
-    return json.dumps(config)
+    return config
 
 def generate_sampling_config():
     """Generar configuración de muestreo realista"""
@@ -83,7 +82,7 @@ def generate_sampling_config():
         "retry_attempts": random.randint(1, 5),
         "timeout_seconds": random.randint(30, 300)
     }
-    return json.dumps(config)
+    return config
 
 def generate_threshold_config():
     """Generar configuración de umbrales realista"""
@@ -111,7 +110,7 @@ def generate_threshold_config():
             "diastolic_max": random.randint(90, 100)
         }
     }
-    return json.dumps(config)
+    return config
 
 def generate_calibration_config():
     """Generar configuración de calibración realista"""
@@ -127,7 +126,7 @@ def generate_calibration_config():
         "drift_correction": random.choice([True, False]),
         "reference_device": f"REF_{random.randint(1000, 9999)}"
     }
-    return json.dumps(config)
+    return config
 
 def generate_network_config():
     """Generar configuración de red realista"""
@@ -154,7 +153,7 @@ def generate_network_config():
             "dns_servers": ["8.8.8.8", "8.8.4.4"]
         }
     }
-    return json.dumps(config)
+    return config
 
 def generate_security_config():
     """Generar configuración de seguridad realista"""
@@ -183,7 +182,7 @@ def generate_security_config():
             "retention_days": random.randint(30, 365)
         }
     }
-    return json.dumps(config)
+    return config
 
 def generate_power_config():
     """Generar configuración de energía realista"""
@@ -211,7 +210,7 @@ def generate_power_config():
             "ups_connected": random.choice([True, False])
         }
     }
-    return json.dumps(config)
+    return config
 
 def populate_device_configs(db, existing_data=None):
     print("   ⚙️ Poblando configuraciones de dispositivos...")
@@ -285,7 +284,7 @@ def populate_device_configs(db, existing_data=None):
                     config_name = f"Configuración de Energía - {device.name}"
                     description = f"Configuración de energía para {device.name}"
                 else:
-                    config_data = json.dumps({"default": True, "device_type": device.type})
+                    config_data = {"default": True, "device_type": device.type}
                     config_name = f"Configuración General - {device.name}"
                     description = f"Configuración general para {device.name}"
                 
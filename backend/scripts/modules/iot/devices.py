@@ -6,6 +6,7 @@ Poblar dispositivos y configuraciones
 
 import sys
 import os
+import uuid
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
 from sqlalchemy.orm import Session
@@ -13,6 +14,7 @@ from app.models.device import Device
 from app.models.device_config import DeviceConfig
 from app.models.device_type import DeviceType
 from app.models.user import User
+from app.services.bulk_seeder import BulkSeeder
 from utils.data_generators import DataGenerator
 
 def populate_devices(db: Session, existing_data=None):
@@ -24,7 +26,7 @@ def populate_devices(db: Session, existing_data=None):
         existing_data: Datos existentes (paquetes, tipos de dispositivo, instituciones, personas cuidadas)
     
     Returns:
-        dict: Dispositivos y configuraciones creados
+        dict: IDs de los dispositivos creados o existentes
     """
     print("   📱 Poblando dispositivos IoT...")
     
@@ -51,8 +53,15 @@ def populate_devices(db: Session, existing_data=None):
         from app.models.cared_person import CaredPerson
         cared_persons = {f"{cp.first_name}_{cp.last_name}": cp for cp in db.query(CaredPerson).all()}
     
+    # Dispositivos ya existentes en una sola consulta (idempotencia)
+    existing = {
+        (row.name, row.institution_id, row.cared_person_id): row.id
+        for row in db.query(Device.id, Device.name, Device.institution_id, Device.cared_person_id)
+    }
+    
     devices = {}
-    device_configs = {}
+    device_rows = []
+    config_rows = []
     
     # Crear dispositivos asociados a paquetes
     package_names = list(packages.keys())
@@ -93,7 +102,8 @@ def populate_devices(db: Session, existing_data=None):
             # Generar datos del dispositivo
             device_data = DataGenerator.generate_device_data(
                 device_type_id=device_type.id,
-                package_id=package.id
+                package_id=package.id,
+                id=uuid.uuid4()
             )
             
             # Agregar campos específicos según la regla de negocio
@@ -102,38 +112,29 @@ def populate_devices(db: Session, existing_data=None):
             elif owner_type == "cared_person":
                 device_data["cared_person_id"] = owner_id
             
-            # Verificar si ya existe
-            existing_device = db.query(Device).filter(
-                Device.name == device_data["name"],
-                Device.institution_id == (owner_id if owner_type == "institution" else None),
-                Device.cared_person_id == (owner_id if owner_type == "cared_person" else None)
-            ).first()
-            
-            if existing_device:
-                devices[f"{package_name}_{device_data['name']}"] = existing_device
+            owner_key = (
+                device_data["name"],
+                owner_id if owner_type == "institution" else None,
+                owner_id if owner_type == "cared_person" else None
+            )
+            if owner_key in existing:
+                devices[f"{package_name}_{device_data['name']}"] = existing[owner_key]
                 continue
+            existing[owner_key] = device_data["id"]
             
-            # Crear dispositivo
-            device = Device(**device_data)
-            db.add(device)
-            db.flush()
-            
-            devices[f"{package_name}_{device_data['name']}"] = device
+            device_rows.append(device_data)
+            devices[f"{package_name}_{device_data['name']}"] = device_data["id"]
             
             # Crear configuración para el dispositivo
-            config_data = DataGenerator.generate_device_config_data(device.id)
-            
-            config = DeviceConfig(**config_data)
-            db.add(config)
-            db.flush()
-            
-            device_configs[f"config_{device.id}"] = config
+            config_rows.append(DataGenerator.generate_device_config_data(device_data["id"]))
     
-    db.commit()
-    print(f"      ✅ {len(devices)} dispositivos creados")
-    print(f"      ✅ {len(device_configs)} configuraciones creadas")
+    seeder = BulkSeeder(db)
+    seeder.insert(Device, device_rows, commit=False)
+    seeder.insert(DeviceConfig, config_rows)
+    print(f"      ✅ {len(device_rows)} dispositivos creados")
+    print(f"      ✅ {len(config_rows)} configuraciones creadas")
     
     return {
         "devices": devices,
-        "device_configs": device_configs
+        "device_configs": len(config_rows)
     } 
\ No newline at end of file
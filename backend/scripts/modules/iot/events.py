@@ -6,11 +6,13 @@ Poblar eventos del sistema
 
 import sys
 import os
+import uuid
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
 from sqlalchemy.orm import Session
 from app.models.event import Event
 from app.models.event_type import EventType
+from app.services.bulk_seeder import BulkSeeder
 from utils.data_generators import DataGenerator
 
 def populate_events(db: Session, devices_data=None, existing_data=None):
@@ -23,7 +25,7 @@ def populate_events(db: Session, devices_data=None, existing_data=None):
         existing_data: Datos existentes (tipos de evento)
     
     Returns:
-        dict: Eventos creados
+        dict: IDs de los eventos creados o existentes
     """
     print("   📊 Poblando eventos IoT...")
     
@@ -37,44 +39,45 @@ def populate_events(db: Session, devices_data=None, existing_data=None):
     
     if not devices:
         from app.models.device import Device
-        devices = {f"device_{d.id}": d for d in db.query(Device).all()}
+        devices = {f"device_{d.id}": d.id for d in db.query(Device.id).all()}
+    
+    # populate_devices devuelve IDs; se aceptan también objetos Device
+    devices = {key: getattr(device, "id", device) for key, device in devices.items()}
+    
+    # Eventos ya existentes en una sola consulta (idempotencia)
+    existing = {
+        (row.device_id, row.event_type_id): row.id
+        for row in db.query(Event.id, Event.device_id, Event.event_type_id).filter(
+            Event.device_id.in_(list(devices.values()))
+        )
+    } if devices else {}
     
     events = {}
+    rows = []
     
     # Crear eventos para cada dispositivo
-    for device_key, device in devices.items():
+    for device_key, device_id in devices.items():
         # Crear 3-5 eventos por dispositivo
         num_events = min(5, len(event_types))
         event_type_names = list(event_types.keys())[:num_events]
         
         for event_type_name in event_type_names:
             event_type = event_types[event_type_name]
+            key = f"{device_key}_{event_type_name}"
+            
+            if (device_id, event_type.id) in existing:
+                events[key] = existing[(device_id, event_type.id)]
+                continue
             
-            # Generar datos del evento
             event_data = DataGenerator.generate_event_data(
                 event_type_id=event_type.id,
-                device_id=device.id
+                device_id=device_id,
+                id=uuid.uuid4()
             )
-            
-            # Verificar si ya existe
-            existing_event = db.query(Event).filter(
-                Event.device_id == device.id,
-                Event.event_type_id == event_type.id,
-                Event.message == event_data["message"]
-            ).first()
-            
-            if existing_event:
-                events[f"{device_key}_{event_type_name}"] = existing_event
-                continue
-            
-            # Crear evento
-            event = Event(**event_data)
-            db.add(event)
-            db.flush()
-            
-            events[f"{device_key}_{event_type_name}"] = event
+            rows.append(event_data)
+            events[key] = event_data["id"]
     
-    db.commit()
-    print(f"      ✅ {len(events)} eventos creados")
+    BulkSeeder(db).insert(Event, rows)
+    print(f"      ✅ {len(rows)} eventos creados ({len(events) - len(rows)} existentes)")
     
-    return events 
\ No newline at end of file
+    return events
@@ -13,6 +13,7 @@ from app.models.geofence import Geofence
 from app.models.location_tracking import LocationTracking
 from app.models.cared_person import CaredPerson
 from app.models.user import User
+from app.services.bulk_seeder import BulkSeeder
 from utils.data_generators import DataGenerator
 
 def populate_tracking(db: Session, existing_data=None):
@@ -24,7 +25,7 @@ def populate_tracking(db: Session, existing_data=None):
         existing_data: Datos existentes (usuarios, personas cuidadas)
     
     Returns:
-        dict: Geofences y tracking creados
+        dict: IDs de geofences y cantidad de registros de tracking por persona
     """
     print("   📍 Poblando seguimiento de ubicación...")
     
@@ -39,68 +40,70 @@ def populate_tracking(db: Session, existing_data=None):
     if not cared_persons:
         cared_persons = {f"{cp.first_name}_{cp.last_name}": cp for cp in db.query(CaredPerson).all()}
     
-    geofences = {}
+    seeder = BulkSeeder(db)
     location_tracking = {}
     
     # Crear geofences para algunos usuarios
     user_emails = list(users.keys())
     users_with_geofences = user_emails[:min(3, len(user_emails))]
+    user_ids = [users[email].id for email in users_with_geofences]
     
+    def geofence_ids():
+        return {
+            (row.user_id, row.name): row.id
+            for row in db.query(Geofence.id, Geofence.user_id, Geofence.name).filter(Geofence.user_id.in_(user_ids))
+        } if user_ids else {}
+    
+    existing_geofences = geofence_ids()
+    geofence_rows = []
     for user_email in users_with_geofences:
         user = users[user_email]
         
         # Crear 1-2 geofences por usuario
         for i in range(2):
             geofence_data = DataGenerator.generate_geofence_data(user.id)
-            
-            # Verificar si ya existe
-            existing_geofence = db.query(Geofence).filter(
-                Geofence.user_id == user.id,
-                Geofence.name == geofence_data["name"]
-            ).first()
-            
-            if existing_geofence:
-                geofences[f"{user_email}_{geofence_data['name']}"] = existing_geofence
+            if (user.id, geofence_data["name"]) in existing_geofences:
                 continue
-            
-            # Crear geofence
-            geofence = Geofence(**geofence_data)
-            db.add(geofence)
-            db.flush()
-            
-            geofences[f"{user_email}_{geofence_data['name']}"] = geofence
+            existing_geofences[(user.id, geofence_data["name"])] = None
+            geofence_rows.append(geofence_data)
+    seeder.insert(Geofence, geofence_rows)
+    
+    # Los IDs enteros los asigna la base: se leen en una sola consulta
+    emails_by_user = {users[email].id: email for email in users_with_geofences}
+    geofences = {
+        f"{emails_by_user[user_id]}_{name}": geofence_id
+        for (user_id, name), geofence_id in geofence_ids().items()
+    }
     
     # Crear tracking de ubicación para personas cuidadas
     cared_person_keys = list(cared_persons.keys())
     cared_persons_with_tracking = cared_person_keys[:min(2, len(cared_person_keys))]
+    tracked = {
+        cared_person_id
+        for (cared_person_id,) in db.query(LocationTracking.cared_person_id).filter(
+            LocationTracking.cared_person_id.in_([cared_persons[key].id for key in cared_persons_with_tracking])
+        ).distinct()
+    } if cared_persons_with_tracking else set()
     
+    tracking_rows = []
     for cared_person_key in cared_persons_with_tracking:
         cared_person = cared_persons[cared_person_key]
         
-        # Crear 3-5 registros de ubicación por persona
-        for i in range(4):
-            tracking_data = DataGenerator.generate_location_tracking_data(cared_person.id)
-            
-            # Verificar si ya existe
-            existing_tracking = db.query(LocationTracking).filter(
-                LocationTracking.cared_person_id == cared_person.id,
-                LocationTracking.recorded_at == tracking_data["recorded_at"]
-            ).first()
-            
-            if existing_tracking:
-                location_tracking[f"{cared_person_key}_{i}"] = existing_tracking
-                continue
-            
-            # Crear tracking
-            tracking = LocationTracking(**tracking_data)
-            db.add(tracking)
-            db.flush()
-            
-            location_tracking[f"{cared_person_key}_{i}"] = tracking
+        # Las personas que ya tienen recorrido no se vuelven a poblar
+        if cared_person.id in tracked:
+            location_tracking[cared_person_key] = 0
+            continue
+        
+        # Crear 4 registros de ubicación por persona
+        tracking_rows.extend(
+            DataGenerator.generate_location_tracking_data(cared_person.id)
+            for _ in range(4)
+        )
+        location_tracking[cared_person_key] = 4
+    seeder.insert(LocationTracking, tracking_rows)
     
-    db.commit()
-    print(f"      ✅ {len(geofences)} geofences creados")
-    print(f"      ✅ {len(location_tracking)} registros de ubicación creados")
+    print(f"      ✅ {len(geofence_rows)} geofences creados")
+    print(f"      ✅ {len(tracking_rows)} registros de ubicación creados")
     
     return {
         "geofences": geofences,
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Benchmark de carga del API CUIOT
+
+Siembra un dataset escalado con inserciones masivas y luego ejercita las rutas
+más consultadas con clientes concurrentes. Emite un reporte JSON con latencias
+p50/p95/p99 y consultas SQL por petición, comparable entre versiones.
+
+Uso:
+    # Dataset completo (10k personas, 1M eventos, 100k observaciones) y reporte
+    python3 scripts/run_benchmark.py --scale full --output benchmark.json
+
+    # Reusar el dataset ya sembrado y comparar contra un reporte anterior
+    python3 scripts/run_benchmark.py --skip-seed --compare benchmark_v1.json
+
+    # Contra un servidor ya levantado (requiere QUERY_COUNT_HEADER_ENABLED=true
+    # en ese servidor para reportar consultas por petición)
+    python3 scripts/run_benchmark.py --skip-seed --base-url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from functools import partial
+from datetime import datetime, timezone
+from statistics import mean
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# En modo en proceso el API debe devolver X-DB-Query-Count
+os.environ.setdefault("QUERY_COUNT_HEADER_ENABLED", "true")
+
+import httpx
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, engine
+from app.core.query_counter import QUERY_COUNT_HEADER
+from app.models.cared_person import CaredPerson
+from app.models.event import Event
+from app.models.event_type import EventType
+from app.models.institution import Institution
+from app.models.role import Role
+from app.models.shift_observation import ShiftObservation
+from app.models.shift_observation_type import ShiftObservationType
+from app.models.user import User
+from app.models.user_role import UserRole
+from app.services.auth import AuthService
+from app.services.bulk_seeder import BulkSeeder, parallel_seed
+from utils.data_generators import DataGenerator
+
+SCALES = {
+    "small": {"cared_persons": 500, "events": 20_000, "shift_observations": 5_000},
+    "medium": {"cared_persons": 2_000, "events": 200_000, "shift_observations": 20_000},
+    "full": {"cared_persons": 10_000, "events": 1_000_000, "shift_observations": 100_000},
+}
+
+BENCH_INSTITUTION = "Benchmark CUIOT"
+BENCH_ADMIN_EMAIL = "bench-admin@benchmark.cuiot.com"
+BENCH_ADMIN_PASSWORD = "Bench1234!"
+BENCH_CAREGIVERS = 200
+CHUNK_SIZE = 5_000
+
+# Rutas calientes del panel web
+ROUTES = {
+    "auth_me": "/api/v1/auth/me",
+    "users_list": "/api/v1/users/?limit=100",
+    "dashboard_summary": "/api/v1/dashboard/summary",
+    "events_list": "/api/v1/events/?limit=100",
+    "shift_observations_list": "/api/v1/shift-observations/?limit=100",
+}
+
+
+# --- Siembra ---
+
+def bulk_insert(db: Session, model, rows_iter, total: int, label: str) -> int:
+    """Insertar filas por bloques (COPY con psycopg2) confirmando cada bloque"""
+    seeder = BulkSeeder(db, CHUNK_SIZE)
+    inserted = 0
+    chunk: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+    for row in rows_iter:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            inserted += seeder.insert(model, chunk)
+            chunk = []
+            print(f"      {label}: {inserted}/{total}", end="\r")
+    if chunk:
+        inserted += seeder.insert(model, chunk)
+    print(f"      ✅ {label}: {inserted} en {time.perf_counter() - started:.1f}s")
+    return inserted
+
+
+def bench_event_row(index: int, event_type_id: int, cared_ids: List[uuid.UUID], user_id: uuid.UUID) -> Dict[str, Any]:
+    """Fila de evento del benchmark (función de módulo para poder usarse en procesos hijos)"""
+    return {
+        **DataGenerator.generate_event_data(
+            event_type_id=event_type_id,
+            device_id=None,
+            cared_person_id=random.choice(cared_ids),
+            user_id=user_id,
+        ),
+        "is_active": True,
+    }
+
+
+def ensure_bench_admin(db: Session, institution: Institution) -> User:
+    admin = db.query(User).filter(User.email == BENCH_ADMIN_EMAIL).first()
+    if admin:
+        return admin
+    admin_role = db.query(Role).filter(Role.name == "admin").first()
+    if not admin_role:
+        raise SystemExit("❌ No existe el rol admin: ejecute primero la población core (run_modular_population.py)")
+    admin = User(
+        email=BENCH_ADMIN_EMAIL,
+        password_hash=AuthService.get_password_hash(BENCH_ADMIN_PASSWORD),
+        first_name="Benchmark",
+        last_name="Admin",
+        is_verified=True,
+        institution_id=institution.id,
+    )
+    db.add(admin)
+    db.flush()
+    db.add(UserRole(user_id=admin.id, role_id=admin_role.id))
+    db.commit()
+    return admin
+
+
+def seed(db: Session, counts: Dict[str, int], workers: int = 1) -> Dict[str, int]:
+    """
+    Sembrar el dataset del benchmark
+
+    Es idempotente a nivel de volumen: solo inserta lo que falta para llegar a
+    los conteos pedidos dentro de la institución de benchmark. Con `workers > 1`
+    los eventos (la tabla más grande) se generan en varios procesos.
+    """
+    print("\n🌱 SIEMBRA DEL DATASET")
+    print("=" * 30)
+
+    event_type = db.query(EventType).order_by(EventType.id).first()
+    observation_type = db.query(ShiftObservationType).order_by(ShiftObservationType.id).first()
+    if not event_type or not observation_type:
+        raise SystemExit("❌ Faltan catálogos (event_types / shift_observation_types): ejecute primero la población core")
+
+    institution = db.query(Institution).filter(Institution.name == BENCH_INSTITUTION).first()
+    if not institution:
+        institution = Institution(name=BENCH_INSTITUTION, institution_type="nursing_home", is_verified=True)
+        db.add(institution)
+        db.commit()
+    admin = ensure_bench_admin(db, institution)
+
+    existing_caregivers = db.query(func.count(User.id)).filter(
+        User.institution_id == institution.id, User.id != admin.id
+    ).scalar()
+    if existing_caregivers < BENCH_CAREGIVERS:
+        password_hash = AuthService.get_password_hash(BENCH_ADMIN_PASSWORD)
+        bulk_insert(db, User, (
+            {
+                "id": uuid.uuid4(),
+                "email": f"bench-caregiver-{i}@benchmark.cuiot.com",
+                "password_hash": password_hash,
+                "first_name": random.choice(DataGenerator.FIRST_NAMES),
+                "last_name": random.choice(DataGenerator.LAST_NAMES),
+                "institution_id": institution.id,
+                "is_active": True,
+                "is_verified": True,
+                "is_freelance": False,
+            }
+            for i in range(existing_caregivers, BENCH_CAREGIVERS)
+        ), BENCH_CAREGIVERS - existing_caregivers, "cuidadores")
+    caregiver_ids = [row.id for row in db.query(User.id).filter(
+        User.institution_id == institution.id, User.id != admin.id
+    )]
+
+    existing_cared = db.query(func.count(CaredPerson.id)).filter(CaredPerson.institution_id == institution.id).scalar()
+    if existing_cared < counts["cared_persons"]:
+        bulk_insert(db, CaredPerson, (
+            DataGenerator.generate_cared_person_data(i, institution_id=institution.id, user_id=admin.id)
+            for i in range(existing_cared, counts["cared_persons"])
+        ), counts["cared_persons"] - existing_cared, "personas bajo cuidado")
+    cared_ids = [row.id for row in db.query(CaredPerson.id).filter(CaredPerson.institution_id == institution.id)]
+
+    existing_events = db.query(func.count(Event.id)).filter(Event.user_id == admin.id).scalar()
+    if existing_events < counts["events"]:
+        missing_events = counts["events"] - existing_events
+        if workers > 1:
+            started = time.perf_counter()
+            inserted = parallel_seed(
+                Event,
+                partial(bench_event_row, event_type_id=event_type.id, cared_ids=cared_ids, user_id=admin.id),
+                missing_events,
+                workers=workers,
+                batch_size=CHUNK_SIZE,
+            )
+            print(f"      ✅ eventos: {inserted} en {time.perf_counter() - started:.1f}s ({workers} procesos)")
+        else:
+            bulk_insert(db, Event, (
+                bench_event_row(i, event_type.id, cared_ids, admin.id)
+                for i in range(existing_events, counts["events"])
+            ), missing_events, "eventos")
+
+    existing_observations = db.query(func.count(ShiftObservation.id)).filter(
+        ShiftObservation.institution_id == institution.id
+    ).scalar()
+    if existing_observations < counts["shift_observations"]:
+        bulk_insert(db, ShiftObservation, (
+            DataGenerator.generate_shift_observation_data(
+                observation_type.id,
+                random.choice(cared_ids),
+                random.choice(caregiver_ids),
+                institution_id=institution.id,
+            )
+            for _ in range(existing_observations, counts["shift_observations"])
+        ), counts["shift_observations"] - existing_observations, "observaciones de turno")
+
+    return dataset_counts(db)
+
+
+def dataset_counts(db: Session) -> Dict[str, int]:
+    return {
+        "users": db.query(func.count(User.id)).scalar(),
+        "cared_persons": db.query(func.count(CaredPerson.id)).scalar(),
+        "events": db.query(func.count(Event.id)).scalar(),
+        "shift_observations": db.query(func.count(ShiftObservation.id)).scalar(),
+    }
+
+
+# --- Carga ---
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Percentil por rango más cercano"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: List[float], queries: List[int], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(mean(ordered), 2) if ordered else None,
+        "p50_ms": round(percentile(ordered, 50), 2) if ordered else None,
+        "p95_ms": round(percentile(ordered, 95), 2) if ordered else None,
+        "p99_ms": round(percentile(ordered, 99), 2) if ordered else None,
+        "max_ms": round(ordered[-1], 2) if ordered else None,
+        "queries_per_request": round(mean(queries), 2) if queries else None,
+        "max_queries": max(queries) if queries else None,
+    }
+
+
+async def drive_route(client: httpx.AsyncClient, path: str, headers: Dict[str, str], requests: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    queries: List[int] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if response.status_code >= 400:
+                errors += 1
+                continue
+            latencies.append(elapsed_ms)
+            if QUERY_COUNT_HEADER in response.headers:
+                queries.append(int(response.headers[QUERY_COUNT_HEADER]))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, queries, errors, time.perf_counter() - started)
+
+
+async def run_load(base_url: Optional[str], requests: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    if base_url:
+        transport = None
+        client_kwargs = {"base_url": base_url}
+    else:
+        from main import app
+
+        transport = httpx.ASGITransport(app=app)
+        client_kwargs = {"base_url": "http://benchmark", "transport": transport}
+
+    async with httpx.AsyncClient(timeout=60.0, **client_kwargs) as client:
+        login = await client.post("/api/v1/auth/login", json={"email": BENCH_ADMIN_EMAIL, "password": BENCH_ADMIN_PASSWORD})
+        if login.status_code != 200:
+            raise SystemExit(f"❌ No se pudo iniciar sesión con el usuario de benchmark: {login.status_code} {login.text}")
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        results = {}
+        for name, path in ROUTES.items():
+            print(f"   🚦 {name}: {requests} peticiones, {concurrency} clientes")
+            if warmup:
+                await drive_route(client, path, headers, warmup, min(concurrency, warmup))
+            results[name] = await drive_route(client, path, headers, requests, concurrency)
+            stats = results[name]
+            print(f"      p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms "
+                  f"queries={stats['queries_per_request']} errors={stats['errors']}")
+        return results
+
+
+# --- Reporte ---
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float) -> List[str]:
+    """Comparar p95 y consultas por petición contra un reporte anterior"""
+    regressions = []
+    print("\n📊 COMPARACIÓN CONTRA BASELINE")
+    print(f"   {'ruta':<26}{'p95 antes':>12}{'p95 ahora':>12}{'Δ%':>8}{'queries':>14}")
+    for name, stats in current["routes"].items():
+        before = baseline.get("routes", {}).get(name)
+        if not before or not before.get("p95_ms") or not stats.get("p95_ms"):
+            continue
+        change = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"]
+        queries = f"{before.get('queries_per_request')}→{stats.get('queries_per_request')}"
+        print(f"   {name:<26}{before['p95_ms']:>12}{stats['p95_ms']:>12}{change * 100:>7.1f}%{queries:>14}")
+        if change > max_regression:
+            regressions.append(f"{name}: p95 +{change * 100:.1f}%")
+        if (stats.get("queries_per_request") or 0) > (before.get("queries_per_request") or 0):
+            regressions.append(f"{name}: consultas por petición {queries}")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark de carga del API CUIOT")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Tamaño del dataset a sembrar")
+    parser.add_argument("--cared-persons", type=int, help="Sobrescribe el conteo de personas bajo cuidado")
+    parser.add_argument("--events", type=int, help="Sobrescribe el conteo de eventos")
+    parser.add_argument("--shift-observations", type=int, help="Sobrescribe el conteo de observaciones de turno")
+    parser.add_argument("--skip-seed", action="store_true", help="No sembrar; usar el dataset existente")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos para generar eventos en paralelo")
+    parser.add_argument("--requests", type=int, default=500, help="Peticiones medidas por ruta")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clientes concurrentes")
+    parser.add_argument("--warmup", type=int, default=20, help="Peticiones de calentamiento por ruta")
+    parser.add_argument("--base-url", help="Servidor a medir; por defecto el API en proceso")
+    parser.add_argument("--output", default="benchmark_report.json", help="Ruta del reporte JSON")
+    parser.add_argument("--compare", help="Reporte anterior contra el que comparar")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Aumento de p95 tolerado (0.2 = 20%%)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    engine.echo = False
+
+    counts = dict(SCALES[args.scale])
+    for key in counts:
+        override = getattr(args, key)
+        if override is not None:
+            counts[key] = override
+
+    db = SessionLocal()
+    try:
+        dataset = dataset_counts(db) if args.skip_seed else seed(db, counts, args.workers)
+        if args.skip_seed:
+            # Asegurar el usuario con el que se autentican los clientes
+            institution = db.query(Institution).filter(Institution.name == BENCH_INSTITUTION).first()
+            if not institution:
+                raise SystemExit("❌ No hay dataset de benchmark: ejecute sin --skip-seed")
+            ensure_bench_admin(db, institution)
+    finally:
+        db.close()
+
+    print("\n🚀 CARGA SOBRE RUTAS CALIENTES")
+    print("=" * 30)
+    routes = asyncio.run(run_load(args.base_url, args.requests, args.concurrency, args.warmup))
+
+    report = {
+        "meta": {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "mode": "http" if args.base_url else "in_process",
+            "scale": args.scale,
+            "requests_per_route": args.requests,
+            "concurrency": args.concurrency,
+            "dataset": dataset,
+        },
+        "routes": routes,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📝 Reporte guardado en {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_reports(json.load(f), report, args.max_regression)
+        if regressions:
+            print("\n❌ Regresiones detectadas:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print("\n✅ Sin regresiones")
+
+
+if __name__ == "__main__":
+    main()
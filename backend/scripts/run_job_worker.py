@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Worker dedicado de trabajos en segundo plano
+
+Ejecuta la cola de la tabla `jobs` fuera de la API. Se pueden lanzar varios
+procesos (y máquinas) a la vez: cada trabajo se toma con FOR UPDATE SKIP
+LOCKED. Con workers dedicados conviene desactivar los de la API
+(JOB_WORKERS_ENABLED=false).
+
+Uso:
+    python3 scripts/run_job_worker.py --workers 4
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.jobs import JobWorker
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=settings.job_workers, help="Hilos de este proceso")
+    parser.add_argument("--poll", type=float, default=settings.job_poll_seconds, help="Espera con la cola vacía (s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = JobWorker(workers=args.workers, poll_interval=args.poll)
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+
+    worker.start()
+    logging.info("Job worker %s running with %s threads", worker.name, args.workers)
+    stopped.wait()
+    worker.stop()
+
+
+if __name__ == "__main__":
+    main()
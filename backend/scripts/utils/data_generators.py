@@ -5,7 +5,6 @@ Generadores de datos realistas para población de base de datos
 
 import random
 import uuid
-import json
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any
 
@@ -117,7 +116,7 @@ class DataGenerator:
             "event_type_id": event_type_id,
             "device_id": device_id,
             "message": description,
-            "event_data": json.dumps(event_data),  # Convertir a JSON string
+            "event_data": event_data,
             "severity": random.choice(["info", "warning", "error", "critical"]),
             "event_time": datetime.now(timezone.utc),
             "created_at": datetime.now(timezone.utc),
@@ -141,7 +140,7 @@ class DataGenerator:
             "device_id": device_id,
             "title": f"Alerta: {description[:50]}...",
             "message": description,
-            "alert_data": json.dumps(alert_data),  # Convertir a JSON string
+            "alert_data": alert_data,
             "severity": random.choice(["low", "medium", "high", "critical"]),
             "priority": random.randint(1, 10),
             "escalation_level": random.randint(0, 3),
@@ -176,7 +175,7 @@ class DataGenerator:
             "device_id": device_id,
             "config_type": config_type,
             "config_name": f"Configuración {config_type.title()}",
-            "config_data": json.dumps(config_data),  # Convertir a JSON string
+            "config_data": config_data,
             "is_active": True,
             "created_at": datetime.now(timezone.utc),
             "updated_at": datetime.now(timezone.utc),
@@ -233,4 +232,61 @@ class DataGenerator:
             "created_at": datetime.now(timezone.utc),
             "updated_at": datetime.now(timezone.utc),
             **kwargs
-        } 
\ No newline at end of file
+        }
+    
+    FIRST_NAMES = [
+        "María", "José", "Ana", "Juan", "Carmen", "Luis", "Rosa", "Carlos", "Elena", "Pedro",
+        "Isabel", "Jorge", "Teresa", "Manuel", "Lucía", "Francisco", "Marta", "Antonio"
+    ]
+    
+    LAST_NAMES = [
+        "González", "Rodríguez", "Fernández", "López", "Martínez", "Sánchez", "Pérez",
+        "Gómez", "Díaz", "Torres", "Ramírez", "Flores", "Rojas", "Morales", "Castro"
+    ]
+    
+    @staticmethod
+    def generate_cared_person_data(index: int, **kwargs) -> Dict[str, Any]:
+        """Generar datos de una persona bajo cuidado (index hace única la identificación)"""
+        return {
+            "id": uuid.uuid4(),
+            "first_name": random.choice(DataGenerator.FIRST_NAMES),
+            "last_name": random.choice(DataGenerator.LAST_NAMES),
+            "date_of_birth": (datetime.now(timezone.utc) - timedelta(days=random.randint(65 * 365, 95 * 365))).date(),
+            "gender": random.choice(["male", "female"]),
+            "identification_number": f"BENCH-{index:08d}",
+            "is_self_care": False,
+            "care_level": random.choice(["low", "medium", "high", "critical"]),
+            "mobility_level": random.choice(["independent", "assisted", "wheelchair", "bedridden"]),
+            "latitude": -34.6037 + random.uniform(-0.05, 0.05),
+            "longitude": -58.3816 + random.uniform(-0.05, 0.05),
+            "is_active": True,
+            **kwargs
+        }
+    
+    @staticmethod
+    def generate_shift_observation_data(shift_observation_type_id: int, cared_person_id, caregiver_id, **kwargs) -> Dict[str, Any]:
+        """Generar datos de una observación de turno"""
+        shift_type, start_hour = random.choice([("morning", 7), ("afternoon", 15), ("night", 23)])
+        day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=random.randint(0, 365))
+        shift_start = day + timedelta(hours=start_hour)
+        return {
+            "id": uuid.uuid4(),
+            "shift_observation_type_id": shift_observation_type_id,
+            "shift_type": shift_type,
+            "shift_start": shift_start,
+            "shift_end": shift_start + timedelta(hours=8),
+            "observation_date": shift_start + timedelta(hours=random.randint(1, 7)),
+            "physical_condition": random.choice(["excellent", "good", "fair", "poor"]),
+            "mental_state": random.choice(["alert", "confused", "drowsy", "calm"]),
+            "mood": random.choice(["happy", "sad", "anxious", "neutral"]),
+            "pain_level": random.randint(0, 10),
+            "appetite": random.choice(["excellent", "good", "fair", "poor"]),
+            "incidents_occurred": random.random() < 0.05,
+            "handover_notes": "Sin novedades relevantes",
+            "cared_person_id": cared_person_id,
+            "caregiver_id": caregiver_id,
+            "created_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc),
+            "is_active": True,
+            **kwargs
+        }
@@ -0,0 +1,92 @@
+import uuid
+from types import SimpleNamespace
+
+from app.services.alert_dedup import AlertDeduplicator, MemoryDedupIndex
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fingerprint_window_slides_on_each_hit():
+    clock = FakeClock()
+    index = MemoryDedupIndex(window_seconds=60, rate_limit_per_minute=10, clock=clock)
+    index.put("fp", "alert-1")
+
+    clock.now += 50
+    assert index.get("fp") == "alert-1"
+    # Cada repetición renueva la ventana
+    clock.now += 50
+    assert index.get("fp") == "alert-1"
+    clock.now += 61
+    assert index.get("fp") is None
+
+    index.put("fp", "alert-2")
+    index.forget("fp")
+    assert index.get("fp") is None
+
+
+def test_device_rate_limit_refills_over_time():
+    clock = FakeClock()
+    index = MemoryDedupIndex(window_seconds=60, rate_limit_per_minute=3, clock=clock)
+
+    assert [index.allow("device-1") for _ in range(4)] == [True, True, True, False]
+    assert index.allow("device-2")
+
+    clock.now += 20
+    assert index.allow("device-1")
+    assert not index.allow("device-1")
+
+
+def test_fingerprint_ignores_alert_content():
+    device_id = uuid.uuid4()
+    base = {"device_id": device_id, "alert_type_id": 3, "cared_person_id": None, "alert_subtype": "fall_detected"}
+
+    same = AlertDeduplicator.fingerprint({**base, "title": "Otra", "message": "Distinto"})
+    other_type = AlertDeduplicator.fingerprint({**base, "alert_type_id": 4})
+
+    assert AlertDeduplicator.fingerprint(base) == same
+    assert AlertDeduplicator.fingerprint(base) != other_type
+
+
+class _Query:
+    """Sin alertas abiertas en la base: todo se resuelve con el índice"""
+
+    def filter(self, *criteria):
+        return self
+
+    def order_by(self, *columns):
+        return self
+
+    def first(self):
+        return None
+
+
+class _Session:
+    def query(self, *entities):
+        return _Query()
+
+
+def test_storm_only_collapses_repeats_of_the_same_fingerprint():
+    clock = FakeClock()
+    dedup = AlertDeduplicator(MemoryDedupIndex(window_seconds=60, rate_limit_per_minute=1, clock=clock))
+    device_id, person_id = uuid.uuid4(), uuid.uuid4()
+    battery = {"device_id": device_id, "alert_type_id": 3, "cared_person_id": person_id, "alert_subtype": "battery_low"}
+    fall = {**battery, "alert_type_id": 1, "alert_subtype": "fall_detected"}
+
+    assert dedup.find_duplicate(_Session(), battery) is None
+    battery_alert = SimpleNamespace(id=uuid.uuid4(), **battery)
+    dedup.remember(battery_alert)
+    assert dedup.find_duplicate(_Session(), battery) == battery_alert.id
+
+    # El dispositivo ya agotó su límite: la caída igual crea su propia alerta
+    assert not dedup.index.allow(str(device_id))
+    assert dedup.find_duplicate(_Session(), fall) is None
+    fall_alert = SimpleNamespace(id=uuid.uuid4(), **fall)
+    dedup.remember(fall_alert)
+    assert dedup.find_duplicate(_Session(), fall) == fall_alert.id
+    assert dedup.find_duplicate(_Session(), battery) == battery_alert.id
@@ -0,0 +1,114 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services.alert_escalation import (
+    AlertEscalationEngine,
+    EmergencyProtocolCache,
+    ParsedProtocol,
+    alert_escalation_engine,
+    escalation_deadline,
+)
+
+CREATED = datetime(2025, 7, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_escalation_deadline_follows_severity_schedule():
+    assert escalation_deadline("critical", 0, CREATED) == CREATED
+    assert escalation_deadline("critical", 1, CREATED) == CREATED + timedelta(minutes=2)
+    assert escalation_deadline("low", 0, CREATED) == CREATED + timedelta(hours=1)
+    assert escalation_deadline("critical", 5, CREATED) is None
+
+
+def test_protocol_cache_prefers_institution_protocol_above_threshold():
+    cache = EmergencyProtocolCache(ttl_seconds=3600)
+    global_fall = ParsedProtocol(
+        id=1, name="Global", crisis_type="fall", severity_threshold="low",
+        institution_id=None, is_default=True,
+        steps=["Evaluar", "Llamar"], contacts=[{"name": "Emergencias"}, {"name": "Familia"}],
+    )
+    local_fall = ParsedProtocol(
+        id=2, name="Local", crisis_type="fall", severity_threshold="high",
+        institution_id=7, is_default=True,
+    )
+    cache._index = {(None, "fall"): [global_fall], (7, "fall"): [local_fall]}
+    cache._loaded_at = time.monotonic()
+
+    assert cache.match(None, 7, ("fall", None), "critical") is local_fall
+    # Bajo el umbral del protocolo local se usa el global
+    assert cache.match(None, 7, ("fall", None), "medium") is global_fall
+    assert cache.match(None, 7, ("fire", None), "critical") is None
+
+    assert global_fall.contacts_for_level(1) == [{"name": "Emergencias"}]
+    assert global_fall.step_for_level(2) == "Llamar"
+
+
+class _Session:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_failed_escalation_is_retried_with_backoff(monkeypatch):
+    now = [CREATED]
+    engine = AlertEscalationEngine(session_factory=_Session, clock=lambda: now[0])
+    alert = SimpleNamespace(
+        id=uuid.uuid4(), title="Caída", severity="critical", priority=5, escalation_level=0,
+        created_at=CREATED, escalated_at=None, alert_subtype=None, alert_type=None,
+        cared_person_id=None, cared_person=None, acknowledged_at=None, resolved_at=None,
+    )
+    engine.track(alert)
+
+    attempts = []
+
+    def escalate(db, entry):
+        attempts.append(now[0])
+        if len(attempts) == 1:
+            raise RuntimeError("database is unavailable")
+        return 1
+    monkeypatch.setattr(engine, "_escalate", escalate)
+
+    assert engine.escalate_due() == 0
+    # La alerta sigue registrada y vuelve al heap tras el backoff
+    assert len(engine) == 1
+    assert engine.escalate_due() == 0
+    now[0] = CREATED + timedelta(seconds=settings.alert_escalation_retry_seconds)
+    assert engine.escalate_due() == 1
+    assert attempts == [CREATED, now[0]]
+
+
+@pytest.mark.asyncio
+async def test_critical_alert_escalates_and_acknowledge_stops_it(async_client, auth_headers, normalized_catalogs):
+    response = await async_client.post("/api/v1/cared-persons/", json={
+        "first_name": "Rosa",
+        "last_name": "Díaz",
+        "date_of_birth": "1938-05-02",
+        "address": "Calle 9 de Julio 100"
+    }, headers=auth_headers)
+    assert response.status_code == 201
+    cared_person = response.json()
+
+    response = await async_client.post("/api/v1/alerts/", json={
+        "alert_type_id": normalized_catalogs["alert_type_id"],
+        "cared_person_id": cared_person["id"],
+        "title": "Caída detectada",
+        "severity": "critical"
+    }, headers=auth_headers)
+    assert response.status_code == 201
+    alert = response.json()
+
+    assert alert_escalation_engine.escalate_due() >= 1
+    response = await async_client.get(f"/api/v1/alerts/{alert['id']}", headers=auth_headers)
+    assert response.json()["escalation_level"] == 1
+    assert response.json()["escalated_at"] is not None
+
+    response = await async_client.post(f"/api/v1/alerts/{alert['id']}/acknowledge", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["acknowledged_at"] is not None
+    assert alert_escalation_engine.escalate_due(datetime.now(timezone.utc) + timedelta(hours=1)) == 0
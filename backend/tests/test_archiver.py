@@ -0,0 +1,78 @@
+from datetime import date, datetime, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.services.archiver import (
+    ARCHIVED_TABLES_BY_NAME,
+    ColdStorageArchiver,
+    archive_directory,
+    archive_value,
+    group_rows,
+    retention_cutoff,
+)
+
+
+def test_rows_are_grouped_by_month_and_institution():
+    march = datetime(2024, 3, 31, 23, 0, tzinfo=timezone.utc)
+    april = datetime(2024, 4, 1, 1, 0, tzinfo=timezone.utc)
+    rows = [({"id": 1, "event_time": march}, 7), ({"id": 2, "event_time": april}, 7), ({"id": 3, "event_time": march}, None)]
+    groups = group_rows(rows, "event_time")
+    assert [row["id"] for row in groups[(date(2024, 3, 1), 7)]] == [1]
+    assert [row["id"] for row in groups[(date(2024, 4, 1), 7)]] == [2]
+    assert [row["id"] for row in groups[(date(2024, 3, 1), None)]] == [3]
+
+    assert archive_directory(Path("/data"), "events", date(2024, 3, 1), None) == Path("/data/events/month=2024-03/institution=none")
+    assert archive_value({"sensor": "door"}, JSONB()) == '{"sensor": "door"}'
+
+
+def test_retention_cutoff_matches_partition_retention(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "audit_logs_retention_months", 12)
+    cutoff = retention_cutoff(ARCHIVED_TABLES_BY_NAME["audit_logs"], date(2026, 10, 19))
+    assert cutoff == datetime(2025, 10, 1, tzinfo=timezone.utc)
+    monkeypatch.setattr(settings, "audit_logs_retention_months", 0)
+    assert retention_cutoff(ARCHIVED_TABLES_BY_NAME["audit_logs"], date(2026, 10, 19)) is None
+
+
+def test_archived_history_is_read_back_with_filters(tmp_path):
+    pytest.importorskip("pyarrow")
+    table = ARCHIVED_TABLES_BY_NAME["events"]
+    person, other = uuid4(), uuid4()
+
+    def row(cared_person_id, when):
+        return {"id": str(uuid4()), "event_type_id": 1, "severity": "info", "event_time": when,
+                "cared_person_id": str(cared_person_id), "event_data": '{"sensor": "door"}', "is_active": True}
+
+    march = datetime(2024, 3, 5, tzinfo=timezone.utc)
+    april = datetime(2024, 4, 5, tzinfo=timezone.utc)
+    ColdStorageArchiver._write_group(tmp_path, table, date(2024, 3, 1), 7, [row(person, march), row(other, march)])
+    ColdStorageArchiver._write_group(tmp_path, table, date(2024, 4, 1), 7, [row(person, april)])
+
+    history = ColdStorageArchiver.read_history("events", person, root=tmp_path)
+    assert [item["event_time"] for item in history] == [april, march]
+    assert history[0]["event_data"] == {"sensor": "door"}
+    assert len(ColdStorageArchiver.read_history("events", person, start=april, root=tmp_path)) == 1
+    assert ColdStorageArchiver.read_history("events", person, institution_id=8, root=tmp_path) == []
+    with pytest.raises(ValueError):
+        ColdStorageArchiver.read_history("audit_logs", person, root=tmp_path)
+
+
+def test_history_accepts_naive_bounds_and_skips_unfinished_files(tmp_path):
+    pytest.importorskip("pyarrow")
+    table = ARCHIVED_TABLES_BY_NAME["events"]
+    person = uuid4()
+    march = datetime(2024, 3, 5, tzinfo=timezone.utc)
+    path = ColdStorageArchiver._write_group(tmp_path, table, date(2024, 3, 1), 7, [
+        {"id": str(uuid4()), "event_type_id": 1, "event_time": march, "cared_person_id": str(person), "is_active": True},
+    ])
+    (path.parent / "part-interrupted.tmp").write_bytes(b"PAR1 partial")
+
+    history = ColdStorageArchiver.read_history(
+        "events", person, start=datetime(2024, 3, 1), end=datetime(2024, 4, 1), root=tmp_path,
+    )
+    assert [item["event_time"] for item in history] == [march]
+    assert ColdStorageArchiver.read_history("events", person, root=tmp_path / "missing") == []
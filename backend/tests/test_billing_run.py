@@ -0,0 +1,161 @@
+from datetime import date
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.core.exceptions import ValidationException
+from app.models.billing_record import INVOICE_BLOCK_SIZE, BillingRecord
+from app.models.package import Package, PackageAddOn, UserPackage, UserPackageAddOn
+from app.models.user import User
+from app.services import billing_run
+from app.services.batch_runs import BatchRunService
+from app.services.billing_run import CHARGES_SQL, BillingRunService, parse_period, shard_key
+
+
+def test_charges_sql_binds_expected_parameters():
+    assert set(text(CHARGES_SQL).compile().params) == {
+        "after", "institution_id", "inactive_ids", "period_start", "period_end", "period_month",
+        "batch_size", "invoice_prefix", "block_start", "period_label", "currency", "tax_rate",
+        "due_date", "pending_id",
+    }
+    assert "ON CONFLICT DO NOTHING" in CHARGES_SQL
+    # Los adicionales se facturan según su ciclo aunque el plan no venza en el período
+    assert "WHERE package_due OR add_on_amount > 0" in CHARGES_SQL
+
+
+def test_period_parsing_and_shard_keys():
+    assert parse_period("2025-09") == date(2025, 9, 1)
+    assert parse_period(None).day == 1
+    with pytest.raises(ValidationException):
+        parse_period("09/2025")
+    assert shard_key(date(2025, 9, 1), 4) == "2025-09:4"
+    assert shard_key(date(2025, 9, 1), None) == "2025-09:none"
+
+
+class _Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def one(self):
+        return self.value
+
+
+class _Session:
+    """Devuelve los resultados en orden y registra los parámetros de cada sentencia"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.params = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        self.params.append(dict(params) if params else params)
+        return _Result(self.results.pop(0))
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def test_shard_is_billed_in_numbered_blocks(monkeypatch):
+    monkeypatch.setattr(billing_run, "_status_ids", lambda db: {"pending": 1, "cancelled": 5, "expired": 6})
+    last_id = uuid4()
+    db = _Session([
+        1, SimpleNamespace(subscriptions=2, last_id=last_id, invoices=2, total_amount=24200),
+        1001, SimpleNamespace(subscriptions=1, last_id=uuid4(), invoices=0, total_amount=0),
+    ])
+    stats = BillingRunService.bill_shard(db, date(2025, 2, 1), 4, batch_size=2)
+
+    assert stats == {"subscriptions": 3, "invoices": 2, "total_amount": 24200}
+    assert db.commits == 2
+    first, second = db.params[1], db.params[3]
+    assert first["block_start"] == 1 and second["block_start"] == 1001
+    assert first["after"] == UUID(int=0) and second["after"] == last_id
+    assert first["period_end"] == date(2025, 2, 28)
+    assert first["invoice_prefix"] == "INV-202502-"
+    assert first["inactive_ids"] == [5, 6] and first["pending_id"] == 1
+
+
+def test_batch_size_is_capped_by_invoice_block(monkeypatch):
+    monkeypatch.setattr(billing_run, "_status_ids", lambda db: {})
+    db = _Session([1, SimpleNamespace(subscriptions=0, last_id=None, invoices=0, total_amount=0)])
+    BillingRunService.bill_shard(db, date(2025, 2, 1), None, batch_size=INVOICE_BLOCK_SIZE * 5)
+    assert db.params[1]["batch_size"] == INVOICE_BLOCK_SIZE
+
+
+def test_shard_runs_once_per_period_and_institution(monkeypatch):
+    keys = []
+    monkeypatch.setattr(BatchRunService, "begin", staticmethod(lambda db, kind, run_key, force: keys.append(run_key) or (None if len(keys) > 1 else 3)))
+    monkeypatch.setattr(BatchRunService, "finish", staticmethod(lambda db, run_id, stats: None))
+    monkeypatch.setattr(BillingRunService, "bill_shard", staticmethod(lambda db, period_start, institution_id: {"invoices": 2}))
+
+    first = BillingRunService.run_shard(_Session([]), "2025-09", 4)
+    assert first == {"run_key": "2025-09:4", "skipped": False, "invoices": 2}
+    assert BillingRunService.run_shard(_Session([]), "2025-09", 4) == {"run_key": "2025-09:4", "skipped": True}
+
+
+def test_scheduler_reruns_completed_shards_once_per_tick(monkeypatch):
+    enqueued = []
+    monkeypatch.setattr(BillingRunService, "shards", staticmethod(lambda db, period_start: [4, None]))
+    monkeypatch.setattr(
+        billing_run.JobService, "enqueue",
+        staticmethod(lambda db, kind, payload, idempotency_key=None, created_by=None: enqueued.append((payload, idempotency_key))),
+    )
+
+    BillingRunService.enqueue(None, "2025-09", tick="480")
+    BillingRunService.enqueue(None, "2025-09")
+
+    assert enqueued[0] == ({"period": "2025-09", "institution_id": 4, "force": True}, "billing:2025-09:4@480")
+    assert enqueued[1][1] == "billing:2025-09:none@480"
+    assert enqueued[2] == ({"period": "2025-09", "institution_id": 4, "force": False}, "billing:2025-09:4")
+
+
+@pytest.mark.asyncio
+async def test_billing_run_endpoint_enqueues_shards(async_client, admin_auth):
+    headers = admin_auth["headers"]
+    response = await async_client.post("/api/v1/billing-runs/?period=2025-09", headers=headers)
+    assert response.status_code == 202
+    assert all(job["kind"] == "billing.shard" for job in response.json())
+
+    again = await async_client.post("/api/v1/billing-runs/?period=2025-09", headers=headers)
+    assert [job["id"] for job in again.json()] == [job["id"] for job in response.json()]
+
+    invalid = await async_client.post("/api/v1/billing-runs/?period=septiembre", headers=headers)
+    assert invalid.status_code == 400
+
+
+def test_monthly_add_ons_of_yearly_plans_are_billed_every_month(db_session, normalized_catalogs):
+    db = db_session
+    user = User(email="anual@example.com", password_hash="x", first_name="Eva")
+    package = Package(package_type="individual", name="Anual", price_monthly=100000)
+    add_on = PackageAddOn(name="Sensor extra", add_on_type="devices", price_monthly=5000)
+    db.add_all([user, package, add_on])
+    db.flush()
+    subscription = UserPackage(
+        user_id=user.id, package_id=package.id, start_date=date(2025, 3, 10), billing_cycle="yearly",
+        current_amount=1000000, next_billing_date=date(2026, 3, 10),
+    )
+    db.add(subscription)
+    db.flush()
+    db.add(UserPackageAddOn(
+        user_package_id=subscription.id, add_on_id=add_on.id, quantity=2, current_amount=5000, billing_cycle="monthly",
+    ))
+    db.commit()
+
+    september = BillingRunService.bill_shard(db, date(2025, 9, 1), None)
+    march = BillingRunService.bill_shard(db, date(2026, 3, 1), None)
+
+    assert september["invoices"] == 1 and march["invoices"] == 1
+    amounts = {
+        record.billing_date: (record.amount, record.description)
+        for record in db.query(BillingRecord).filter(BillingRecord.user_package_id == subscription.id)
+    }
+    assert amounts[date(2025, 9, 1)] == (10000, "Adicionales Anual 09/2025")
+    assert amounts[date(2026, 3, 1)] == (1010000, "Suscripción Anual 03/2026")
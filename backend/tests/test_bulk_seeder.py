@@ -0,0 +1,44 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.orm import Session
+
+from app.services.bulk_seeder import BulkSeeder, _copy_text
+
+metadata = MetaData()
+items = Table(
+    "items",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False),
+    Column("note", String(50), nullable=True),
+    Column("is_active", Boolean, default=True),
+)
+
+
+def test_insert_writes_in_batches_and_applies_python_defaults():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with Session(engine) as db:
+        seeder = BulkSeeder(db, batch_size=3)
+        assert seeder.method == "insert"
+
+        # Filas con columnas distintas y un generador de más de un lote
+        rows = ({"name": f"item {i}", **({"note": "x"} if i % 2 else {})} for i in range(7))
+        assert seeder.insert(items, rows) == 7
+
+        stored = db.execute(select(items).order_by(items.c.name)).all()
+        assert [row.name for row in stored] == [f"item {i}" for i in range(7)]
+        assert [row.note for row in stored] == [None, "x", None, "x", None, "x", None]
+        assert all(row.is_active for row in stored)
+
+
+def test_copy_text_escapes_values():
+    value = uuid.uuid4()
+    assert _copy_text(None) == "\\N"
+    assert _copy_text(True) == "t"
+    assert _copy_text(value) == str(value)
+    assert _copy_text("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+    assert _copy_text({"k": 1}) == '{"k": 1}'
+    assert _copy_text(datetime(2024, 1, 2, 3, 4, 5)) == "2024-01-02T03:04:05"
@@ -0,0 +1,54 @@
+import uuid
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.exceptions import ValidationException
+from app.services.cared_person_overview import (
+    CaredPersonOverviewService,
+    OverviewCache,
+    SECTIONS_BY_TABLE,
+    dump,
+)
+
+
+def test_sections_resolve_from_repeated_or_comma_separated_values():
+    assert len(CaredPersonOverviewService.resolve_sections(None)) == 11
+    names = [section.name for section in CaredPersonOverviewService.resolve_sections(["alerts,devices", "diagnoses"])]
+    assert names == ["diagnoses", "alerts", "devices"]
+    with pytest.raises(ValidationException):
+        CaredPersonOverviewService.resolve_sections(["alerts,billing"])
+    assert SECTIONS_BY_TABLE["medication_schedules"] == ["medication_schedules", "medication_logs"]
+
+
+def test_cache_invalidates_per_cared_person_and_skips_stale_loads():
+    cache = OverviewCache()
+    ana, beto = uuid.uuid4(), uuid.uuid4()
+    cache.set(ana, "alerts", ["a"])
+    cache.set(beto, "alerts", ["b"])
+    cache.set(ana, "devices", ["d"])
+
+    cache.invalidate(ana, ["alerts"])
+    assert cache.get(ana, "alerts") == (False, None)
+    assert cache.get(beto, "alerts") == (True, ["b"])
+    assert cache.get(ana, "devices") == (True, ["d"])
+
+    # Una carga iniciada antes de una invalidación no se guarda
+    generation = cache.generation
+    cache.invalidate(None, ["devices"])
+    cache.set(ana, "devices", ["viejo"], generation)
+    assert cache.get(ana, "devices") == (False, None)
+
+
+def test_dump_reports_missing_status_flags_as_false():
+    class Schema(BaseModel):
+        id: int
+        is_overdue: bool
+        note: Optional[str] = "sin nota"
+
+    class Row:
+        id = 3
+        is_overdue = None
+
+    assert dump(Schema, Row()) == {"id": 3, "is_overdue": False, "note": "sin nota"}
@@ -0,0 +1,55 @@
+from uuid import uuid4
+
+import numpy as np
+
+from app.services.caregiver_matching import CaregiverMatrix, MatchCriteria
+
+# Obelisco, Buenos Aires
+HOME = (-34.6037, -58.3816)
+
+
+def caregiver(name, latitude, longitude, **fields):
+    record = {"id": uuid4(), "name": name, "latitude": latitude, "longitude": longitude, "is_freelance": True}
+    record.update(fields)
+    return record
+
+
+def build_matrix():
+    return CaregiverMatrix([
+        caregiver("Cerca experta", -34.61, -58.39, specialization="Enfermería geriátrica, movilidad",
+                  experience_years=8, overall_score=4.8, completion_rate=98, is_verified=True, hourly_rate=5000),
+        caregiver("Cerca novata", -34.60, -58.38, specialization="Acompañante", experience_years=0, hourly_rate=2500),
+        caregiver("Lejos", -34.92, -57.95, specialization="Enfermería", experience_years=10, overall_score=5.0),
+        caregiver("Radio corto", -34.70, -58.40, specialization="Enfermería", service_radius_km=5),
+        caregiver("Institucional", -34.605, -58.385, is_freelance=False, institution_id=3),
+        caregiver("Sin ubicación", None, None, specialization="Enfermería"),
+    ], cell_km=10)
+
+
+def test_match_ranks_by_needs_within_radius():
+    matrix = build_matrix()
+    criteria = MatchCriteria(latitude=HOME[0], longitude=HOME[1], care_level="critical", mobility_level="wheelchair", radius_km=20)
+    matches = matrix.match(criteria)
+    assert [match["name"] for match in matches] == ["Cerca experta", "Cerca novata"]
+    assert matches[0]["matched_skills"] == ["nursing", "mobility"]
+    assert 0 < matches[0]["distance_km"] < 3
+
+    assert [m["name"] for m in matrix.match(MatchCriteria(latitude=HOME[0], longitude=HOME[1], max_hourly_rate=3000))] == ["Cerca novata"]
+    institutional = matrix.match(MatchCriteria(latitude=HOME[0], longitude=HOME[1], freelance_only=False, institution_id=3))
+    assert [m["name"] for m in institutional] == ["Institucional"]
+    # Sin ubicación de la persona no hay prefiltro geográfico
+    assert len(matrix.match(MatchCriteria(special_needs="Alzheimer"))) == 5
+
+
+def test_grid_prefilter_agrees_with_exact_distances():
+    rng = np.random.default_rng(7)
+    records = [
+        caregiver(str(index), float(lat), float(lon))
+        for index, (lat, lon) in enumerate(zip(rng.uniform(-35.2, -34.0, 5000), rng.uniform(-59.0, -57.8, 5000)))
+    ]
+    matrix = CaregiverMatrix(records, cell_km=7)
+    everyone = np.arange(len(matrix))
+    expected = set(everyone[matrix.distances_km(everyone, *HOME) <= 15])
+    candidates = matrix.nearby(*HOME, 15)
+    assert expected <= set(candidates)
+    assert len(candidates) < len(matrix) / 4
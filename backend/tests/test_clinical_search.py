@@ -0,0 +1,30 @@
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.models.diagnosis import Diagnosis
+from app.models.report import Report
+from app.services.clinical_search import ClinicalSearchService
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_models_declare_generated_search_vectors():
+    ddl = str(CreateTable(Diagnosis.__table__).compile(dialect=postgresql.dialect()))
+    assert "search_vector TSVECTOR GENERATED ALWAYS AS" in ddl
+    assert "setweight(to_tsvector('spanish'::regconfig, coalesce(diagnosis_name, '')), 'A')" in ddl
+    assert "STORED" in ddl
+    index = next(index for index in Report.__table__.indexes if index.name == "ix_reports_search_vector")
+    assert index.dialect_options["postgresql"]["using"] == "gin"
+
+
+def test_search_filters_by_index_and_highlights_only_the_page():
+    sql = _sql(ClinicalSearchService.build_query("caída nocturna", institution_id=3, kinds=["diagnosis", "medication_log"], limit=10))
+    assert sql.count("@@ websearch_to_tsquery") == 2
+    assert "shift_observations" not in sql
+    assert "LEFT OUTER JOIN medication_schedules" in sql
+    # ts_headline se aplica una vez, sobre la página ya limitada
+    assert sql.count("ts_headline(") == 1
+    assert sql.index("ts_headline") < sql.index("LIMIT")
+    assert "ts_rank_cd(diagnoses.search_vector" in sql
@@ -0,0 +1,143 @@
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import ValidationException
+from app.services.handover_report import (
+    JOB_KIND,
+    HandoverReport,
+    HandoverReportService,
+    ResidentHandover,
+)
+from app.services.jobs import JobService
+
+
+def _observation(**values):
+    observation = {
+        "shift_type": "night", "observation_date": datetime(2026, 3, 2, 6, 30),
+        "handover_notes": None, "incidents_occurred": False, "incident_details": None,
+        "safety_concerns": None, "caregiver_name": "Laura Gómez",
+    }
+    observation.update(values)
+    return observation
+
+
+def _report(residents):
+    return HandoverReport(
+        "Residencia <Norte>", datetime(2026, 3, 1, 19, tzinfo=timezone.utc),
+        datetime(2026, 3, 2, 7, tzinfo=timezone.utc), residents,
+    )
+
+
+def test_resident_blocks_cover_vitals_incidents_missed_doses_and_notes():
+    resident = ResidentHandover(uuid.uuid4(), "Ana Pérez")
+    resident.vitals = {"heart_rate": 88, "temperature": 37.9, "oxygen_saturation": None}
+    resident.observations = [
+        _observation(incidents_occurred=True, incident_details="Caída leve en el baño"),
+        _observation(handover_notes="Durmió bien <sin> dolor", observation_date=datetime(2026, 3, 2, 5, 0)),
+    ]
+    resident.missed_medications = [{"medication_name": "Enalapril", "reason": "vómitos"}]
+
+    blocks = HandoverReportService.resident_blocks(resident)
+    assert blocks[0] == ("", "<b>Signos vitales:</b> FC 88 · T° 37.9")
+    assert blocks[1] == ("incident", "<b>Incidente (06:30):</b> Caída leve en el baño")
+    assert blocks[2] == ("", "<b>Medicación omitida:</b><br/>• Enalapril — vómitos")
+    # Las notas del personal se escapan
+    assert "Durmió bien &lt;sin&gt; dolor" in blocks[3][1]
+    assert "<i>Laura Gómez</i>" in blocks[3][1]
+
+
+def test_render_html_streams_one_section_per_resident():
+    quiet = ResidentHandover(uuid.uuid4(), "Beto Ruiz")
+    busy = ResidentHandover(uuid.uuid4(), "Ana Pérez", observations=[_observation(handover_notes="Sin novedades")])
+
+    chunks = list(HandoverReportService.render_html(_report([busy, quiet])))
+    assert len(chunks) == 4
+    assert "Residencia &lt;Norte&gt;" in chunks[0]
+    assert "2 personas" in chunks[0]
+    assert chunks[1].startswith("<section><h2>Ana Pérez</h2>")
+    assert "Sin observaciones en el turno." in chunks[2]
+    assert chunks[-1] == "</body></html>"
+
+
+def test_pdf_without_reportlab_is_rejected_before_queueing():
+    try:
+        import reportlab  # noqa: F401
+        pytest.skip("reportlab instalado")
+    except ImportError:
+        pass
+    with pytest.raises(RuntimeError):
+        HandoverReportService.check_format("pdf")
+    with pytest.raises(ValidationException):
+        HandoverReportService.check_format("docx")
+
+
+class _Query:
+    def __init__(self, first=None):
+        self._first = first
+
+    def filter(self, *criteria):
+        return self
+
+    def order_by(self, *columns):
+        return self
+
+    def first(self):
+        return self._first
+
+    def __iter__(self):
+        return iter([])
+
+
+class _Session:
+    """La institución existe y no tiene personas activas"""
+
+    def query(self, *entities):
+        return _Query(SimpleNamespace(name="Residencia Norte"))
+
+
+def test_collect_accepts_naive_and_aware_bounds():
+    report = HandoverReportService.collect(
+        _Session(), 1, start=datetime(2026, 3, 1, 19), end=datetime(2026, 3, 2, 7, tzinfo=timezone.utc),
+    )
+    assert report.start == datetime(2026, 3, 1, 19, tzinfo=timezone.utc)
+    assert report.end - report.start == timedelta(hours=12)
+    with pytest.raises(ValidationException):
+        HandoverReportService.collect(
+            _Session(), 1, start=datetime(2026, 3, 2, 8), end=datetime(2026, 3, 2, 7, tzinfo=timezone.utc),
+        )
+
+
+def test_render_job_writes_report_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "handover_report_path", str(tmp_path))
+    calls = []
+
+    def collect(db, institution_id, start, end, cared_person_ids):
+        calls.append((institution_id, start, cared_person_ids))
+        return _report([ResidentHandover(uuid.uuid4(), "Ana Pérez")])
+
+    monkeypatch.setattr(HandoverReportService, "collect", staticmethod(collect))
+    payload = {"institution_id": 1, "format": "html", "start": "2026-03-01T19:00:00", "end": None, "cared_person_ids": None}
+    result = JobService.run_inline(None, JOB_KIND, payload)
+
+    assert result["residents"] == 1 and result["format"] == "html"
+    assert "Ana Pérez" in (tmp_path / result["file"]).read_text(encoding="utf-8")
+    assert calls == [(1, datetime(2026, 3, 1, 19), None)]
+
+
+def test_expired_report_files_are_pruned(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "handover_report_retention_minutes", 60)
+    old, recent = tmp_path / "viejo.html", tmp_path / "nuevo.html"
+    old.write_text("x")
+    recent.write_text("x")
+    two_hours_ago = time.time() - 7200
+    os.utime(old, (two_hours_ago, two_hours_ago))
+
+    assert HandoverReportService.prune_files(tmp_path) == 1
+    assert not old.exists() and recent.exists()
+    assert HandoverReportService.prune_files(tmp_path / "missing") == 0
@@ -0,0 +1,181 @@
+from types import SimpleNamespace
+from datetime import timedelta
+import time
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.core.exceptions import ValidationException
+from app.services import jobs
+from app.services.jobs import JobFailed, JobService, JobWorker, job_handler, load_handlers, retry_delay
+
+
+def test_admin_operations_are_registered_as_jobs():
+    assert {
+        "catalogs.initialize", "debug.generate_test_data", "referrals.expire_old",
+        "caregiver_scores.calculate", "users.delete",
+    } <= set(load_handlers())
+    assert load_handlers()["debug.generate_test_data"].max_attempts == 1
+
+
+def test_retry_delay_doubles_up_to_one_hour(monkeypatch):
+    monkeypatch.setattr(settings, "job_retry_backoff_seconds", 30)
+    assert [retry_delay(attempt).total_seconds() for attempt in (1, 2, 3)] == [30, 60, 120]
+    assert retry_delay(20) == timedelta(hours=1)
+
+
+def test_claim_takes_next_queued_job_skipping_locked_rows():
+    sql = str(JobService.claim_statement("host:1/0").compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "ORDER BY jobs.priority DESC, jobs.run_at" in sql
+    assert "attempts=(jobs.attempts + %(attempts_1)s)" in sql
+    assert sql.rstrip().endswith("RETURNING jobs.id, jobs.kind, jobs.payload, jobs.attempts, jobs.max_attempts")
+
+
+class _Session:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Cola en memoria: un trabajo por tipo pedido y los resultados registrados"""
+    queue, outcomes = [], []
+    monkeypatch.setattr(JobService, "claim", staticmethod(lambda db, worker_id: queue.pop(0) if queue else None))
+    monkeypatch.setattr(
+        JobService, "complete",
+        staticmethod(lambda db, job_id, result, worker_id=None: outcomes.append(("completed", result)) or True),
+    )
+    monkeypatch.setattr(
+        JobService, "fail",
+        staticmethod(lambda db, job_id, error, retry_in=None, worker_id=None: outcomes.append(("retry" if retry_in else "failed", error)) or True),
+    )
+    monkeypatch.setattr(JobService, "heartbeat", staticmethod(lambda db, job_id, worker_id: True))
+    load_handlers()
+    monkeypatch.setattr(jobs, "JOB_HANDLERS", dict(jobs.JOB_HANDLERS))
+
+    def add(kind, attempts=1, max_attempts=3):
+        queue.append(SimpleNamespace(id=uuid.uuid4(), kind=kind, payload={"n": 2}, attempts=attempts, max_attempts=max_attempts))
+    return SimpleNamespace(add=add, outcomes=outcomes)
+
+
+def test_worker_completes_retries_and_fails_jobs(recorded):
+    @job_handler("test.double")
+    def double(db, payload, progress):
+        return {"value": payload["n"] * 2}
+
+    @job_handler("test.flaky")
+    def flaky(db, payload, progress):
+        raise ConnectionError("sin conexión")
+
+    @job_handler("test.invalid")
+    def invalid(db, payload, progress):
+        raise JobFailed("No existe")
+
+    worker = JobWorker(session_factory=_Session, workers=1)
+    for kind, attempts in (("test.double", 1), ("test.flaky", 1), ("test.flaky", 3), ("test.invalid", 1), ("test.missing", 1)):
+        recorded.add(kind, attempts)
+        assert worker.run_once() is True
+    assert worker.run_once() is False
+
+    assert recorded.outcomes == [
+        ("completed", {"value": 4}),
+        ("retry", "ConnectionError: sin conexión"),
+        ("failed", "ConnectionError: sin conexión"),  # Último intento
+        ("failed", "No existe"),
+        ("failed", "Tipo de trabajo desconocido: test.missing"),
+    ]
+
+
+class _Recorder(_Session):
+    """Guarda las sentencias ejecutadas"""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(rowcount=0)
+
+
+def test_outcomes_are_fenced_by_worker_and_status():
+    db = _Recorder()
+    job_id = uuid.uuid4()
+    assert JobService.complete(db, job_id, {"ok": True}, "host:1/0") is False
+    assert JobService.fail(db, job_id, "error", worker_id="host:1/0") is False
+    assert JobService.heartbeat(db, job_id, "host:1/0") is False
+    for statement in db.statements:
+        where = str(statement.whereclause.compile(dialect=postgresql.dialect()))
+        assert "jobs.status = %(status_1)s" in where
+        assert "jobs.locked_by = %(locked_by_1)s" in where
+
+
+def test_worker_renews_heartbeat_while_the_handler_runs(recorded, monkeypatch):
+    monkeypatch.setattr(settings, "job_heartbeat_seconds", 0.01)
+    beats = []
+    monkeypatch.setattr(JobService, "heartbeat", staticmethod(lambda db, job_id, worker_id: beats.append(worker_id) or True))
+
+    @job_handler("test.slow")
+    def slow(db, payload, progress):
+        time.sleep(0.1)
+        return {"done": True}
+
+    recorded.add("test.slow")
+    assert JobWorker(session_factory=_Session, workers=1).run_once("host:1/0") is True
+    assert recorded.outcomes == [("completed", {"done": True})]
+    assert beats and set(beats) == {"host:1/0"}
+    count = len(beats)
+    time.sleep(0.05)
+    assert len(beats) == count  # El hilo termina con el trabajo
+
+
+def test_enqueue_rejects_unknown_kinds():
+    with pytest.raises(ValidationException):
+        JobService.enqueue(None, "billing.unknown")
+
+
+@pytest.mark.asyncio
+async def test_background_request_is_queued_once_and_run_by_a_worker(async_client, admin_auth, db_session):
+    headers = {**admin_auth["headers"], "Idempotency-Key": "expire-2025-08-14"}
+    first = await async_client.post("/api/v1/referrals/expire-old?background=true", headers=headers)
+    assert first.status_code == 202
+    job = first.json()
+    assert job["status"] == "queued"
+    assert first.headers["location"] == f"/api/v1/jobs/{job['id']}"
+
+    # Mismo pedido con la misma clave: mismo trabajo
+    second = await async_client.post("/api/v1/referrals/expire-old?background=true", headers=headers)
+    assert second.json()["id"] == job["id"]
+
+    assert JobWorker().run_once() is True
+    response = await async_client.get(f"/api/v1/jobs/{job['id']}", headers=admin_auth["headers"])
+    assert response.status_code == 200
+    done = response.json()
+    assert done["status"] == "completed"
+    assert done["attempts"] == 1
+    assert done["result"] == {"expired_count": 0}
+
+    cancel = await async_client.post(f"/api/v1/jobs/{job['id']}/cancel", headers=admin_auth["headers"])
+    assert cancel.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_idempotency_keys_are_scoped_per_user(admin_auth, db_session):
+    from app.models.user import User
+
+    admin_id = db_session.query(User.id).filter(User.email == "admin@example.com").scalar()
+    mine = JobService.enqueue(db_session, "referrals.expire_old", {}, idempotency_key="expire-daily", created_by=admin_id)
+    system = JobService.enqueue(db_session, "referrals.expire_old", {}, idempotency_key="expire-daily")
+
+    # La misma clave de otro dueño no devuelve el trabajo ajeno
+    assert system.id != mine.id
+    assert JobService.enqueue(db_session, "referrals.expire_old", {}, idempotency_key="expire-daily", created_by=admin_id).id == mine.id
+    assert JobService.enqueue(db_session, "referrals.expire_old", {}, idempotency_key="expire-daily").id == system.id
@@ -0,0 +1,57 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services.device_heartbeat import DeviceHeartbeatMonitor
+from app.services.live_feed import LiveFeedBroker
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_subscription_filters_by_scope_and_replays_after_last_event_id():
+    async def scenario():
+        broker = LiveFeedBroker(buffer_size=10, queue_size=10)
+        cared_person_id = uuid.uuid4()
+
+        broker.publish("alert.created", {"n": 1}, institution_id=1)
+        broker.publish("alert.created", {"n": 2}, institution_id=2)
+        broker.publish("alert.created", {"n": 3}, cared_person_id=cared_person_id)
+        first = broker.recent()[0].id
+
+        institution = broker.subscribe(institution_ids={1})
+        family = broker.subscribe(cared_person_ids={cared_person_id}, last_event_id=first)
+        admin = broker.subscribe()
+
+        broker.publish("device.offline", {"n": 4}, institution_id=1, cared_person_id=cared_person_id)
+        await asyncio.sleep(0)
+
+        assert [e.data["n"] for e in drain(institution)] == [4]
+        # Reanudación: recibe lo perdido de su persona bajo cuidado y lo nuevo
+        assert [e.data["n"] for e in drain(family)] == [3, 4]
+        assert [e.data["n"] for e in drain(admin)] == [4]
+
+        broker.unsubscribe(admin)
+        assert broker.subscriber_count == 2
+
+    asyncio.run(scenario())
+
+
+def test_heartbeat_monitor_publishes_only_transitions():
+    published = []
+    broker = SimpleNamespace(publish=lambda topic, *args: published.append(topic))
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    monitor = DeviceHeartbeatMonitor(broker=broker, timeout=timedelta(minutes=5), clock=lambda: now)
+    device = SimpleNamespace(id=uuid.uuid4(), name="Pulsera", institution_id=1, cared_person_id=None)
+
+    assert monitor.beat(device, now)
+    assert not monitor.beat(device, now + timedelta(minutes=3))
+    # El segundo latido reprogramó el plazo: aún no vence
+    assert monitor.expire(now + timedelta(minutes=6)) == 0
+    assert monitor.expire(now + timedelta(minutes=9)) == 1
+    assert published == ["device.online", "device.offline"]
@@ -0,0 +1,95 @@
+import json
+from datetime import date
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.core.config import settings
+from app.services.archiver import ColdStorageArchiver
+from app.services.location_tracking import LocationTrackingService, geofence_contains, haversine_meters, simplify_track
+
+
+def test_simplify_track_drops_collinear_fixes_and_keeps_turns():
+    # Tramo recto hacia el este, giro y tramo hacia el norte, un fix por segundo
+    east = [(-33.45, -70.66 + i * 0.00001, float(i)) for i in range(200)]
+    corner = east[-1]
+    north = [(corner[0] + i * 0.00001, corner[1], 200.0 + i) for i in range(1, 200)]
+    track = east + north
+
+    simplified = simplify_track(track, tolerance_meters=5)
+
+    assert simplified[0] == track[0] and simplified[-1] == track[-1]
+    assert corner in simplified
+    assert len(simplified) <= 4
+
+
+def test_simplify_track_keeps_round_trip():
+    # Ida y vuelta al mismo punto: la recta inicio-fin es degenerada
+    out = [(-33.45 + i * 0.0001, -70.66, float(i)) for i in range(50)]
+    back = [(p[0], p[1], 100.0 - p[2]) for p in reversed(out[:-1])]
+
+    simplified = simplify_track(out + back, tolerance_meters=10)
+
+    far = max(haversine_meters(-33.45, -70.66, p[0], p[1]) for p in simplified)
+    assert far > 500
+
+
+def test_geofence_contains_circle_and_polygon():
+    circle = SimpleNamespace(id=1, polygon_coordinates=None, radius=100, center_latitude=-33.45, center_longitude=-70.66)
+    assert geofence_contains(circle, -33.4505, -70.66)
+    assert not geofence_contains(circle, -33.452, -70.66)
+
+    square = SimpleNamespace(
+        id=2,
+        radius=None,
+        center_latitude=0,
+        center_longitude=0,
+        polygon_coordinates=json.dumps([[0, 0], [0, 1], [1, 1], [1, 0]]),
+    )
+    assert geofence_contains(square, 0.5, 0.5)
+    assert not geofence_contains(square, 1.5, 0.5)
+
+
+class _Query:
+    def __init__(self, events):
+        self.events = events
+
+    def filter(self, *criteria):
+        return self
+
+    def with_for_update(self):
+        return self
+
+    def first(self):
+        return None
+
+    def delete(self, synchronize_session):
+        self.events.append("delete")
+
+
+class _Session:
+    def __init__(self):
+        self.events = []
+
+    def query(self, model):
+        return _Query(self.events)
+
+    def add(self, instance):
+        pass
+
+    def commit(self):
+        self.events.append("commit")
+
+
+def test_compaction_archives_raw_fixes_before_deleting_them(monkeypatch):
+    monkeypatch.setattr(settings, "archive_enabled", True)
+    points = [(-34.6, -58.4, 1760000000.0), (-34.61, -58.41, 1760000600.0)]
+    monkeypatch.setattr(LocationTrackingService, "_raw_points", staticmethod(lambda db, cared_person_id, day: points))
+    db = _Session()
+    monkeypatch.setattr(ColdStorageArchiver, "archive_rows", staticmethod(
+        lambda db, table, *criteria, root=None: db.events.append(("archive", table.name, len(criteria))) or len(points)
+    ))
+
+    trajectory = LocationTrackingService.compact_day(db, uuid4(), date(2025, 10, 9))
+
+    assert trajectory.raw_point_count == 2
+    assert db.events == [("archive", "location_tracking", 3), "delete", "commit"]
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from app.services.medication_adherence import (
+    AFFECTED_SQL,
+    UPSERT_SQL,
+    MedicationAdherenceService,
+    adherence_metrics,
+)
+
+
+def test_metrics_ratios_and_empty_windows():
+    counts = SimpleNamespace(
+        doses_logged=10, doses_taken=8, doses_missed=2, doses_timed=6, doses_on_time=3, side_effect_reports=2
+    )
+    metrics = adherence_metrics(counts)
+    assert (metrics["taken_ratio"], metrics["on_time_ratio"], metrics["side_effect_rate"]) == (0.8, 0.5, 0.25)
+
+    # Sin filas en el rango las sumas llegan como NULL
+    empty = adherence_metrics(SimpleNamespace(**{name: None for name in vars(counts)}))
+    assert empty["doses_logged"] == 0
+    assert empty["taken_ratio"] is None and empty["on_time_ratio"] is None
+
+
+def test_refresh_sql_only_binds_expected_parameters():
+    # Los ':' del patrón de horarios y los casts '::' no deben leerse como parámetros
+    assert set(text(UPSERT_SQL).compile().params) == {"tz", "tolerance_seconds"}
+    incremental = AFFECTED_SQL.format(log_filter="WHERE updated_at > :watermark", summary_filter="WHERE day >= :since_day")
+    assert set(text(incremental).compile().params) == {"tz", "watermark", "since_day"}
+    assert "row_number() OVER" in UPSERT_SQL
+
+
+def test_trend_uses_a_rolling_window_over_the_summary():
+    sql = str(MedicationAdherenceService.trend_query("institution_id", 7))
+    assert "RANGE BETWEEN INTERVAL '6 days' PRECEDING AND CURRENT ROW" in sql
+    assert "sum(sum(doses_on_time)) OVER w AS doses_on_time" in sql
+    assert "WHERE institution_id = :scope_id" in sql
+    with pytest.raises(ValueError):
+        MedicationAdherenceService.trend_query("user_id; drop table users", 7)
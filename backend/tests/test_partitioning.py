@@ -0,0 +1,55 @@
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query
+from sqlalchemy.schema import CreateTable
+
+from app.models.event import Event
+from app.models.location_tracking import LocationTracking
+from app.services.event import in_time_range
+from app.services.partitioning import (
+    add_months,
+    expired_months,
+    month_bounds,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+
+def test_month_arithmetic_and_partition_names():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    # 23:30 del 31/10 en Buenos Aires ya es noviembre en UTC
+    late = datetime(2026, 10, 31, 23, 30, tzinfo=timezone(timedelta(hours=-3)))
+    assert month_start(late) == date(2026, 11, 1)
+
+    lower, upper = month_bounds(date(2026, 12, 1))
+    assert (lower.isoformat(), upper.isoformat()) == ("2026-12-01T00:00:00+00:00", "2027-01-01T00:00:00+00:00")
+
+    name = partition_name("location_tracking", date(2026, 3, 1))
+    assert name == "location_tracking_p202603"
+    assert partition_month("location_tracking", name) == date(2026, 3, 1)
+    assert partition_month("location_tracking", "location_tracking_default") is None
+    assert partition_month("events", "debug_events_p202603") is None
+
+
+def test_expired_months_keep_the_retention_window():
+    months = [add_months(date(2025, 1, 1), i) for i in range(22)]  # 2025-01 .. 2026-10
+    expired = expired_months(months, retention_months=12, today=date(2026, 10, 19))
+    assert expired[0] == date(2025, 1, 1)
+    assert expired[-1] == date(2025, 9, 1)
+    assert expired_months(months, retention_months=0, today=date(2026, 10, 19)) == []
+
+
+def test_models_declare_partitioned_tables_and_time_range_queries():
+    ddl = str(CreateTable(LocationTracking.__table__).compile(dialect=postgresql.dialect()))
+    assert "PRIMARY KEY (id, recorded_at)" in ddl
+    assert "PARTITION BY RANGE (recorded_at)" in ddl
+    assert [column.name for column in Event.__mapper__.primary_key] == ["id"]
+
+    start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    sql = str(in_time_range(Query(Event), start, start + timedelta(days=7)).statement.compile(
+        dialect=postgresql.dialect()
+    ))
+    assert "events.event_time >= %(event_time_1)s AND events.event_time < %(event_time_2)s" in sql
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.password_hasher import PasswordHasher
+
+
+def test_verify_and_update_rehashes_when_work_factor_changes():
+    old = PasswordHasher(workers=1, rounds=4)
+    new = PasswordHasher(workers=1, rounds=5)
+    try:
+        stored = old.hash("secreto")
+        assert stored.startswith("$2b$04$")
+
+        assert new.verify_and_update("otro", stored) == (False, None)
+        valid, rehashed = new.verify_and_update("secreto", stored)
+        assert valid and rehashed.startswith("$2b$05$")
+        assert new.verify_and_update("secreto", rehashed) == (True, None)
+        assert asyncio.run(new.verify_async("secreto", rehashed)) is True
+    finally:
+        old.stop()
+        new.stop()
+
+
+def test_full_queue_is_rejected_with_503():
+    hasher = PasswordHasher(workers=1, max_queue=1, rounds=4)
+    release = threading.Event()
+    try:
+        running = hasher._submit(release.wait)
+        queued = hasher._submit(release.wait)
+        assert hasher.queue_depth == 1
+        with pytest.raises(HTTPException) as exc:
+            hasher.hash("secreto")
+        assert exc.value.status_code == 503
+        assert hasher.stats()["rejected"] == 1
+
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        # result() vuelve antes de que el callback descuente el trabajo: se espera al contador
+        deadline = time.monotonic() + 5
+        while hasher.stats()["completed"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert hasher.stats()["completed"] == 2
+        assert hasher.verify("secreto", hasher.hash("secreto"))
+        assert hasher.queue_depth == 0
+    finally:
+        release.set()
+        hasher.stop()
@@ -0,0 +1,42 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.event import Event
+from app.schemas.event import EventCreate
+from app.services.payload_query import PayloadQuery
+
+
+def compile_sql(clause) -> str:
+    return str(select(Event.id).where(clause).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+
+
+def test_payload_predicates_compile_to_jsonb_operators():
+    assert "(events.event_data ->> 'sensor') = 'accelerometer'" in compile_sql(
+        PayloadQuery.equals(Event.event_data, "sensor", "accelerometer")
+    )
+    assert "events.event_data #>> '{reading, unit}'" in compile_sql(
+        PayloadQuery.equals(Event.event_data, "reading.unit", "C")
+    )
+    contains = select(Event.id).where(PayloadQuery.contains(Event.event_data, {"location": "Cocina"}))
+    compiled = contains.compile(dialect=postgresql.dialect())
+    assert "events.event_data @> %(event_data_1)s" in str(compiled)
+    assert compiled.params["event_data_1"] == {"location": "Cocina"}
+
+
+def test_parse_filter_requires_a_json_object():
+    assert PayloadQuery.parse_filter(None) is None
+    assert PayloadQuery.parse_filter('{"sensor": "door"}') == {"sensor": "door"}
+    for raw in ("[1, 2]", "not json"):
+        with pytest.raises(HTTPException):
+            PayloadQuery.parse_filter(raw)
+
+
+def test_event_schema_accepts_legacy_json_strings():
+    base = {"event_type_id": 1, "event_time": "2024-05-01T12:00:00Z"}
+    assert EventCreate(**base, event_data='{"sensor": "door"}').event_data == {"sensor": "door"}
+    assert EventCreate(**base, event_data={"sensor": "door"}).event_data == {"sensor": "door"}
+    assert EventCreate(**base, event_data="texto libre").event_data == "texto libre"
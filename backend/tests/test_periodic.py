@@ -0,0 +1,33 @@
+import threading
+from datetime import timedelta
+
+from app.core.periodic import PeriodicWorker
+
+
+class _Flaky(PeriodicWorker):
+    thread_name = "flaky-worker"
+    failure_message = "Flaky work failed"
+
+    def __init__(self):
+        super().__init__(timedelta(milliseconds=1))
+        self.calls = 0
+        self.done = threading.Event()
+
+    def run_once(self):
+        self.calls += 1
+        if self.calls == 3:
+            self.done.set()
+        if self.calls == 1:
+            raise RuntimeError("boom")
+
+
+def test_worker_keeps_running_after_a_failed_pass(caplog):
+    worker = _Flaky()
+    worker.start()
+    try:
+        assert worker.done.wait(2)
+    finally:
+        worker.stop()
+
+    assert worker._thread is None
+    assert "Flaky work failed" in caplog.text
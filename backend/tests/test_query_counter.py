@@ -0,0 +1,27 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.query_counter import QUERY_COUNT_HEADER, install_query_counter
+
+
+def test_query_count_header_counts_queries_of_sync_endpoints():
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    install_query_counter(app, engine)
+
+    @app.get("/two-queries")
+    def two_queries():
+        # Endpoint síncrono: corre en el threadpool con el contexto copiado
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"ok": True}
+
+    @app.get("/none")
+    async def no_queries():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.get("/two-queries").headers[QUERY_COUNT_HEADER] == "2"
+    assert client.get("/none").headers[QUERY_COUNT_HEADER] == "0"
@@ -0,0 +1,191 @@
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.models.package import Package, UserPackage
+from app.models.referral import Referral, ReferralCommission
+from app.models.status_type import StatusType
+from app.models.user import User
+from app.services import referral_batch
+from app.services.batch_runs import BatchRunService
+from app.services.referral import ReferralService
+from app.services.referral_batch import COMMISSIONS_SQL, EXPIRE_SQL, ReferralBatchService
+
+
+def test_batch_sql_binds_expected_parameters():
+    assert set(text(EXPIRE_SQL).compile().params) == {"pending_id", "expired_id", "cutoff", "batch_size"}
+    assert set(text(COMMISSIONS_SQL).compile().params) == {
+        "rate_types", "rate_values", "pending_id", "expired_id", "converted_id", "batch_size",
+    }
+    assert "FOR UPDATE SKIP LOCKED" in EXPIRE_SQL
+    assert "FOR UPDATE OF up, r SKIP LOCKED" in COMMISSIONS_SQL
+    assert "/ 100" not in COMMISSIONS_SQL
+
+
+class _Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def one(self):
+        return self.value
+
+
+class _Session:
+    """Devuelve los resultados en orden y cuenta los commits (un lote por commit)"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.params = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, params):
+        self.params.append(params)
+        return _Result(self.results.pop(0))
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def statuses(monkeypatch):
+    monkeypatch.setattr(referral_batch, "_status_ids", lambda db: {"pending": 1, "expired": 2, "converted": 3})
+
+
+def test_expiry_runs_in_batches_until_a_short_one(statuses):
+    db = _Session([5, 5, 2])
+    assert ReferralBatchService.expire_referrals(db, batch_size=5) == 12
+    assert db.commits == 3
+    assert db.params[0]["pending_id"] == 1 and db.params[0]["expired_id"] == 2
+
+
+def test_commissions_use_first_month_rates_and_sum_batches(statuses):
+    db = _Session([
+        SimpleNamespace(candidates=2, commissions=2, amount=30.5, subscriptions=2, referrals=2),
+        SimpleNamespace(candidates=1, commissions=1, amount=4.25, subscriptions=1, referrals=1),
+    ])
+    totals = ReferralBatchService.generate_commissions(db, batch_size=2)
+    assert totals == {"commissions": 3, "commission_amount": 34.75, "converted": 3}
+    params = db.params[0]
+    assert dict(zip(params["rate_types"], params["rate_values"]))["caregiver"] == 0.15
+    assert params["converted_id"] == 3
+
+
+def test_run_is_recorded_once_per_key(monkeypatch, statuses):
+    calls = []
+    monkeypatch.setattr(BatchRunService, "begin", staticmethod(lambda db, kind, run_key, force: None if calls else 7))
+    monkeypatch.setattr(BatchRunService, "finish", staticmethod(lambda db, run_id, stats: calls.append(("finish", run_id, stats))))
+    monkeypatch.setattr(ReferralBatchService, "expire_referrals", staticmethod(lambda db: 4))
+    monkeypatch.setattr(ReferralBatchService, "generate_commissions", staticmethod(lambda db: {"commissions": 1}))
+
+    first = ReferralBatchService.run(_Session([]), "2025-08-15")
+    assert first == {"run_key": "2025-08-15", "skipped": False, "expired": 4, "commissions": 1}
+    assert calls == [("finish", 7, {"expired": 4, "commissions": 1})]
+    assert ReferralBatchService.run(_Session([]), "2025-08-15") == {"run_key": "2025-08-15", "skipped": True}
+
+
+def test_failed_run_is_logged_with_partial_stats(monkeypatch, statuses):
+    failures = []
+    monkeypatch.setattr(BatchRunService, "begin", staticmethod(lambda db, kind, run_key, force: 9))
+    monkeypatch.setattr(BatchRunService, "fail", staticmethod(lambda db, run_id, error, stats: failures.append((run_id, error, stats))))
+    monkeypatch.setattr(ReferralBatchService, "generate_commissions", staticmethod(lambda db: {"commissions": 1}))
+
+    def broken(db):
+        raise RuntimeError("deadlock detected")
+    monkeypatch.setattr(ReferralBatchService, "expire_referrals", staticmethod(broken))
+
+    db = _Session([])
+    with pytest.raises(RuntimeError):
+        ReferralBatchService.run(db, "2025-08-15")
+    assert failures == [(9, "deadlock detected", {"commissions": 1})]
+    assert db.rollbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_runs_once_per_key(async_client, admin_auth):
+    headers = admin_auth["headers"]
+    first = await async_client.post("/api/v1/referrals/batch-runs?run_key=test-run", headers=headers)
+    assert first.status_code == 200
+    assert first.json()["skipped"] is False
+
+    second = await async_client.post("/api/v1/referrals/batch-runs?run_key=test-run", headers=headers)
+    assert second.json() == {"run_key": "test-run", "skipped": True}
+
+    runs = await async_client.get("/api/v1/referrals/batch-runs", headers=headers)
+    assert [(run["run_key"], run["status"]) for run in runs.json()] == [("test-run", "completed")]
+
+
+def test_commissions_are_paid_once_per_valid_referral(db_session, normalized_catalogs):
+    db = db_session
+    db.add(StatusType(name="converted", description="Converted status", category="general"))
+    referrer_id = uuid4()
+    referral = Referral(
+        referral_code="BATCH15", referrer_type="caregiver", referrer_id=referrer_id,
+        referred_email="referido@example.com", referral_type_id=normalized_catalogs["referral_type_id"],
+    )
+    user = User(email="suscriptor@example.com", password_hash="x", first_name="Ana")
+    package = Package(package_type="individual", name="Básico", price_monthly=100000)
+    db.add_all([referral, user, package])
+    db.flush()
+    for _ in range(2):
+        db.add(UserPackage(
+            user_id=user.id, package_id=package.id, start_date=date.today(), billing_cycle="monthly",
+            current_amount=100000, next_billing_date=date.today() + timedelta(days=30),
+            referral_code_used="BATCH15",
+        ))
+    db.commit()
+
+    totals = ReferralBatchService.generate_commissions(db)
+
+    assert totals == {"commissions": 1, "commission_amount": 15000.0, "converted": 1}
+    commission = db.query(ReferralCommission).filter(ReferralCommission.referral_id == referral.id).one()
+    assert commission.amount == 15000.0
+    assert commission.percentage == 0.15
+    assert commission.recipient_id == referrer_id
+    db.refresh(referral)
+    assert referral.status_type.name == "converted"
+    assert ReferralBatchService.generate_commissions(db)["commissions"] == 0
+
+
+def test_referral_used_before_expiry_is_paid_instead_of_expired(db_session, normalized_catalogs, monkeypatch):
+    monkeypatch.setattr(BatchRunService, "begin", staticmethod(lambda db, kind, run_key, force: 11))
+    monkeypatch.setattr(BatchRunService, "finish", staticmethod(lambda db, run_id, stats: None))
+    db = db_session
+    db.add(StatusType(name="converted", description="Converted status", category="general"))
+    pending = db.query(StatusType).filter(StatusType.name == "pending").one()
+    old = datetime.now(timezone.utc) - timedelta(days=ReferralService.REFERRAL_EXPIRY_DAYS + 5)
+    used, unused = (
+        Referral(
+            referral_code=code, referrer_type="family", referrer_id=uuid4(), referred_email=f"{code.lower()}@example.com",
+            referral_type_id=normalized_catalogs["referral_type_id"], status_type_id=pending.id, created_at=old,
+        )
+        for code in ("LATE01", "LATE02")
+    )
+    user = User(email="tardio@example.com", password_hash="x", first_name="Beto")
+    package = Package(package_type="individual", name="Básico", price_monthly=100000)
+    db.add_all([used, unused, user, package])
+    db.flush()
+    db.add(UserPackage(
+        user_id=user.id, package_id=package.id, start_date=date.today(), billing_cycle="monthly",
+        current_amount=100000, next_billing_date=date.today() + timedelta(days=30), referral_code_used="LATE01",
+    ))
+    db.commit()
+
+    # Aunque se venza primero, el referido usado no se vence
+    assert ReferralBatchService.expire_referrals(db) == 1
+    stats = ReferralBatchService.run(db, "late-referral")
+
+    assert stats["commissions"] == 1 and stats["expired"] == 0
+    db.refresh(used)
+    db.refresh(unused)
+    assert used.status_type.name == "converted"
+    assert unused.status_type.name == "expired"
@@ -0,0 +1,120 @@
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services.notifications import Notifier
+from app.services.reminder_dispatcher import ReminderDispatcher, next_occurrence
+
+
+class RecordingNotifier(Notifier):
+    def __init__(self):
+        self.sent = []
+
+    def send(self, topic, payload):
+        self.sent.append((topic, payload))
+
+
+NOW = datetime(2025, 7, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def make_reminder(scheduled_time, repeat_pattern=None, priority=5, is_active=True, status="pending"):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        title="Tomar medicación",
+        scheduled_time=scheduled_time,
+        repeat_pattern=repeat_pattern,
+        priority=priority,
+        is_active=is_active,
+        status_type=SimpleNamespace(name=status) if status else None,
+        user_id=None,
+        cared_person_id=uuid.uuid4(),
+    )
+
+
+def make_dispatcher(notifier=None):
+    return ReminderDispatcher(
+        notifier=notifier or RecordingNotifier(),
+        session_factory=None,
+        grace=timedelta(minutes=5),
+        clock=lambda: NOW,
+    )
+
+
+def test_next_occurrence_expands_repeat_patterns():
+    anchor = datetime(2025, 1, 31, 8, 0, tzinfo=timezone.utc)
+
+    assert next_occurrence(anchor, None, NOW) is None
+    assert next_occurrence(anchor, "daily", NOW) == datetime(2025, 7, 2, 8, 0, tzinfo=timezone.utc)
+    assert next_occurrence(anchor, "weekly", NOW) == datetime(2025, 7, 4, 8, 0, tzinfo=timezone.utc)
+    # Los meses sin día 31 se ajustan al último día sin desplazar la serie
+    assert next_occurrence(anchor, "monthly", NOW) == datetime(2025, 7, 31, 8, 0, tzinfo=timezone.utc)
+    assert next_occurrence(anchor, "monthly", datetime(2025, 2, 1, tzinfo=timezone.utc)) == datetime(2025, 2, 28, 8, 0, tzinfo=timezone.utc)
+    assert next_occurrence(anchor, "yearly", NOW) == datetime(2026, 1, 31, 8, 0, tzinfo=timezone.utc)
+
+
+def test_dispatch_fires_due_reminders_in_order_and_reschedules():
+    notifier = RecordingNotifier()
+    dispatcher = make_dispatcher(notifier)
+
+    once = make_reminder(NOW - timedelta(minutes=1), priority=3)
+    daily = make_reminder(NOW - timedelta(minutes=2), repeat_pattern="daily")
+    later = make_reminder(NOW + timedelta(hours=1))
+    for reminder in (once, daily, later):
+        dispatcher.sync(reminder)
+
+    assert dispatcher.dispatch_due(NOW) == 2
+    fired = [payload["reminder_id"] for _, payload in notifier.sent]
+    assert fired == [str(daily.id), str(once.id)]
+
+    # El diario vuelve a entrar con su siguiente ocurrencia, el único desaparece
+    assert len(dispatcher) == 2
+    assert dispatcher.next_due_at == later.scheduled_time
+    assert dispatcher.dispatch_due(NOW + timedelta(days=1)) == 2
+
+
+def test_sync_and_remove_reconcile_the_index():
+    notifier = RecordingNotifier()
+    dispatcher = make_dispatcher(notifier)
+
+    reminder = make_reminder(NOW - timedelta(minutes=1))
+    dispatcher.sync(reminder)
+
+    reminder.scheduled_time = NOW + timedelta(minutes=30)
+    dispatcher.sync(reminder)
+    assert dispatcher.dispatch_due(NOW) == 0
+
+    reminder.is_active = False
+    dispatcher.sync(reminder)
+    assert len(dispatcher) == 0
+
+    other = make_reminder(NOW - timedelta(minutes=1))
+    dispatcher.sync(other)
+    dispatcher.remove(other.id)
+    assert dispatcher.dispatch_due(NOW + timedelta(hours=1)) == 0
+    assert notifier.sent == []
+
+
+def test_overdue_reminders_outside_grace_are_skipped():
+    dispatcher = make_dispatcher()
+
+    dispatcher.sync(make_reminder(NOW - timedelta(hours=2)))
+    dispatcher.sync(make_reminder(NOW - timedelta(hours=2), status="completed"))
+
+    assert len(dispatcher) == 0
+
+
+def test_dispatcher_thread_wakes_up_for_a_new_due_reminder():
+    fired = threading.Event()
+
+    class SignalingNotifier(Notifier):
+        def send(self, topic, payload):
+            fired.set()
+
+    dispatcher = ReminderDispatcher(notifier=SignalingNotifier(), session_factory=lambda: None, grace=timedelta(minutes=5))
+    dispatcher.start()
+    try:
+        dispatcher.sync(make_reminder(datetime.now(timezone.utc)))
+        assert fired.wait(timeout=5)
+    finally:
+        dispatcher.stop()
@@ -0,0 +1,100 @@
+from typing import List
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import StaticPool
+
+from app.core.cache import cached_response, response_cache
+
+Base = declarative_base()
+
+
+class Color(Base):
+    __tablename__ = "cache_test_colors"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(20), nullable=False)
+
+
+class ColorSchema(BaseModel):
+    id: int
+    name: str
+
+
+def build_app():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    calls = {"endpoint": 0, "auth": 0}
+    app = FastAPI()
+
+    def current_user():
+        calls["auth"] += 1
+        return "user"
+
+    @app.get("/colors", response_model=List[ColorSchema])
+    @cached_response(List[ColorSchema], ("cache_test_colors",))
+    def list_colors(user: str = Depends(current_user)):
+        calls["endpoint"] += 1
+        with Session(engine) as db:
+            return db.query(Color).order_by(Color.id).all()
+
+    return TestClient(app), engine, calls
+
+
+def test_cached_response_serves_hits_and_revalidates_etag():
+    response_cache.clear()
+    client, engine, calls = build_app()
+    with Session(engine) as db:
+        db.add(Color(id=1, name="rojo"))
+        db.commit()
+
+    first = client.get("/colors")
+    second = client.get("/colors")
+    assert first.json() == [{"id": 1, "name": "rojo"}]
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert second.content == first.content
+    # La autenticación se sigue ejecutando; el cuerpo del endpoint no
+    assert calls == {"endpoint": 1, "auth": 2}
+
+    not_modified = client.get("/colors", headers={"If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+def test_orm_commit_invalidates_dependent_responses():
+    response_cache.clear()
+    client, engine, calls = build_app()
+    etag = client.get("/colors").headers["etag"]
+
+    with Session(engine) as db:
+        db.add(Color(id=2, name="verde"))
+        db.commit()
+
+    refreshed = client.get("/colors", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["x-cache"] == "MISS"
+    assert refreshed.json() == [{"id": 2, "name": "verde"}]
+    assert calls["endpoint"] == 2
+
+
+def test_vary_scopes_entries_per_caller():
+    response_cache.clear()
+    app = FastAPI()
+    calls = {"endpoint": 0}
+
+    def current_user(user: str = "ana"):
+        return user
+
+    @app.get("/whoami")
+    @cached_response(None, ("cache_test_colors",), vary=lambda kwargs: kwargs["caller"])
+    def whoami(caller: str = Depends(current_user)):
+        calls["endpoint"] += 1
+        return {"caller": caller}
+
+    client = TestClient(app)
+    assert client.get("/whoami?user=ana").json() == {"caller": "ana"}
+    assert client.get("/whoami?user=ana").headers["x-cache"] == "HIT"
+    assert client.get("/whoami?user=beto").json() == {"caller": "beto"}
+    assert calls["endpoint"] == 2
@@ -0,0 +1,40 @@
+import uuid
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.models.user import User
+from app.services.search_suggest import SearchSuggestService, like_pattern
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_models_declare_trigram_indexes():
+    index = next(index for index in User.__table__.indexes if index.name == "ix_users_last_name_trgm")
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert ddl == "CREATE INDEX ix_users_last_name_trgm ON users USING gin (last_name gin_trgm_ops)"
+
+
+def test_patterns_escape_wildcards_and_short_terms_fall_back_to_prefix():
+    assert like_pattern("50%_a", "prefix") == "50\\%\\_a%"
+    assert like_pattern("pérez", "contains") == "%pérez%"
+
+    queries = SearchSuggestService.build_queries("juan pe", kinds=["user"], mode="contains", institution_id=4, user_id=uuid.uuid4())
+    sql = _sql(queries[0])
+    # "pe" es demasiado corto para trigramas: ambas palabras se buscan por prefijo
+    assert "users.first_name ILIKE 'juan%%'" in sql
+    assert "users.last_name ILIKE 'pe%%'" in sql
+    assert "users.institution_id = 4" in sql
+    assert "similarity" not in sql
+    assert "LIMIT 10" in sql
+
+
+def test_scope_without_institution_only_suggests_own_cared_persons():
+    user_id = uuid.uuid4()
+    queries = SearchSuggestService.build_queries("mar", user_id=user_id)
+    kinds = [_sql(query) for query in queries]
+    assert len(kinds) == 2  # cared_person e institution; los usuarios no se sugieren
+    assert f"cared_persons.user_id = '{user_id}'" in kinds[0]
+    assert SearchSuggestService.build_queries("   ") == []
@@ -0,0 +1,66 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.core.serialization import list_response, response_columns
+from app.models.alert import Alert
+from app.models.event import Event
+from app.schemas.alert import AlertResponse
+from app.schemas.event import EventResponse
+
+
+def make_event_row(index: int) -> SimpleNamespace:
+    now = datetime(2024, 5, 1, 12, 0, index, 123456, tzinfo=timezone.utc)
+    return SimpleNamespace(_mapping={
+        "id": uuid.uuid4(),
+        "event_type_id": 1,
+        "event_subtype": None,
+        "severity": "warning",
+        "event_data": {"value": 1},
+        "message": f"Evento {index}",
+        "source": "sensor",
+        "latitude": -34.6,
+        "longitude": -58.4,
+        "altitude": None,
+        "event_time": now,
+        "processed_at": None,
+        "user_id": uuid.uuid4(),
+        "cared_person_id": None,
+        "device_id": None,
+        "created_at": now,
+        "updated_at": now,
+        "is_active": True,
+    })
+
+
+def test_list_response_matches_validated_serialization():
+    rows = [make_event_row(i) for i in range(3)]
+
+    fast = json.loads(list_response(EventResponse, rows).body)
+
+    adapter = TypeAdapter(List[EventResponse])
+    validated = adapter.validate_python([dict(row._mapping) for row in rows])
+    assert fast == json.loads(adapter.dump_json(validated))
+
+
+def test_response_columns_selects_schema_fields_and_computed_expressions():
+    columns = response_columns(Event, EventResponse)
+    assert {column.key for column in columns} == set(EventResponse.model_fields)
+
+    columns = response_columns(
+        Alert, AlertResponse,
+        is_active=Alert.status_type_id.isnot(None),
+        is_critical=Alert.severity == "critical",
+    )
+    assert {"is_active", "is_critical"} <= {column.key for column in columns}
+
+
+def test_response_columns_rejects_required_fields_without_column():
+    # Alert.is_active es una propiedad, no una columna
+    with pytest.raises(ValueError):
+        response_columns(Alert, AlertResponse, is_critical=Alert.severity == "critical")
@@ -0,0 +1,95 @@
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import ValidationException
+from app.schemas.caregiver_assignment import ShiftCoverageEntry
+from app.services.caregiver_assignment import CaregiverAssignmentService
+from app.services.shift_coverage import (
+    MINUTES_PER_WEEK,
+    CompiledAssignment,
+    ShiftCoverageIndex,
+    parse_schedule,
+)
+
+ART = timezone(timedelta(hours=-3))
+
+
+def compiled(assignment_id, caregiver_id, cared_person_id, schedule, institution_id=1, end_date=None):
+    weekly, zone = parse_schedule(schedule)
+    return CompiledAssignment(
+        assignment_id, caregiver_id, cared_person_id, institution_id,
+        date(2026, 1, 1), end_date, False, weekly, zone,
+    )
+
+
+def build_index(*entries):
+    index = ShiftCoverageIndex()
+    for entry in entries:
+        index._add(entry)
+    return index
+
+
+def test_schedule_formats_compile_to_weekly_minutes():
+    weekly, zone = parse_schedule('{"timezone": "UTC", "shifts": [{"days": ["mon", "tue"], "start": "08:00", "end": "16:00"}]}')
+    assert weekly == [(480, 960), (1920, 2400)]
+    assert zone.key == "UTC"
+    # Nocturno del domingo: se parte en el límite de la semana
+    weekly, _ = parse_schedule('[{"day": "sun", "start": "22:00", "end": "06:00"}]')
+    assert weekly == [(0, 360), (MINUTES_PER_WEEK - 120, MINUTES_PER_WEEK)]
+    weekly, _ = parse_schedule('{"mon": ["08:00-12:00", "12:00-18:00"]}')
+    assert weekly == [(480, 1080)]
+    assert parse_schedule(None)[0] == [(0, MINUTES_PER_WEEK)]
+    with pytest.raises(ValueError):
+        parse_schedule("lunes a viernes")
+
+
+def test_point_in_time_and_gap_queries():
+    person, day_nurse, night_nurse = uuid4(), uuid4(), uuid4()
+    index = build_index(
+        compiled(1, day_nurse, person, '{"shifts": [{"start": "08:00", "end": "20:00"}]}'),
+        compiled(2, night_nurse, person, '{"shifts": [{"days": ["mon", "tue", "wed", "thu", "fri"], "start": "20:00", "end": "08:00"}]}'),
+    )
+    monday_noon = datetime(2026, 10, 19, 12, 0, tzinfo=ART)
+    assert [entry.caregiver_id for entry in index.covering(monday_noon, cared_person_id=person)] == [day_nurse]
+    assert [entry.caregiver_id for entry in index.covering(monday_noon + timedelta(hours=12), institution_id=1)] == [night_nurse]
+
+    # Sin turno nocturno el sábado: queda el hueco 20:00 sáb -> 08:00 dom
+    start = datetime(2026, 10, 24, 0, 0, tzinfo=ART)
+    gaps = index.gaps([person], start, start + timedelta(days=2))
+    assert gaps[person] == [
+        (datetime(2026, 10, 24, 23, 0, tzinfo=timezone.utc), datetime(2026, 10, 25, 11, 0, tzinfo=timezone.utc)),
+        (datetime(2026, 10, 25, 23, 0, tzinfo=timezone.utc), datetime(2026, 10, 26, 3, 0, tzinfo=timezone.utc)),
+    ]
+    assert index.gaps([uuid4()], start, start + timedelta(hours=1)) != {}
+
+    entry = index.covering(monday_noon, cared_person_id=person)[0]
+    assert ShiftCoverageEntry.model_validate(entry).assignment_id == 1
+
+
+def test_overlaps_flag_double_bookings_only_across_cared_persons():
+    caregiver, first, second = uuid4(), uuid4(), uuid4()
+    index = build_index(
+        compiled(1, caregiver, first, '{"mon": ["08:00-14:00"]}'),
+        compiled(2, caregiver, first, '{"mon": ["13:00-15:00"]}'),
+        compiled(3, caregiver, second, '{"mon": ["12:00-18:00"]}'),
+    )
+    start = datetime(2026, 10, 19, 0, 0, tzinfo=ART)
+    overlaps = index.overlaps(start, start + timedelta(days=7), institution_id=1)
+    assert [(item["assignment_ids"], item["start"].astimezone(ART).hour, item["end"].astimezone(ART).hour) for item in overlaps] == [
+        ([1, 3], 12, 14),
+        ([2, 3], 13, 15),
+    ]
+    index.remove(3)
+    assert index.overlaps(start, start + timedelta(days=7), caregiver_id=caregiver) == []
+
+
+def test_coverage_window_accepts_mixed_naive_and_aware_bounds():
+    start, end = CaregiverAssignmentService._coverage_window(
+        datetime(2026, 10, 19, 8, 0), datetime(2026, 10, 19, 8, 0, tzinfo=ART)
+    )
+    assert start == datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc)
+    assert end - start == timedelta(hours=3)
+    with pytest.raises(ValidationException):
+        CaregiverAssignmentService._coverage_window(datetime(2026, 10, 19, 12, 0), datetime(2026, 10, 19, 8, 0, tzinfo=ART))
@@ -0,0 +1,50 @@
+import time
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+from jose import jwt
+
+from app.core.token_cache import TokenCache, token_cache, token_digest
+from app.services.auth import AuthService
+
+
+def make_token(**claims) -> str:
+    return AuthService.create_access_token(
+        {"sub": str(uuid.uuid4()), **claims}, expires_delta=timedelta(minutes=5)
+    )
+
+
+def test_verify_token_decodes_once_and_rejects_revoked_tokens():
+    token_cache.clear()
+    token = make_token()
+
+    with patch("app.services.auth.jwt.decode", wraps=jwt.decode) as decode:
+        first = AuthService.verify_token(token)
+        second = AuthService.verify_token(token)
+    assert first == second and first["sub"]
+    assert decode.call_count == 1
+
+    assert AuthService.revoke_token(token) is True
+    assert AuthService.verify_token(token) is None
+    assert AuthService.verify_token("not-a-jwt") is None
+    token_cache.clear()
+
+
+def test_token_cache_is_bounded_and_honours_exp():
+    cache = TokenCache(max_entries=2)
+    now = time.time()
+    cache.set("a", {"exp": now + 60})
+    cache.set("b", {"exp": now + 60})
+    cache.get("a")
+    cache.set("c", {"exp": now + 60})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    cache.set("expired", {"exp": now - 1})
+    assert cache.get("expired") is None
+    cache.set("no-exp", {"sub": "x"})
+    assert cache.get("no-exp") is None
+
+    cache.revoke(token_digest("old"), now - 1)
+    assert not cache.is_revoked(token_digest("old"))